@@ -12,7 +12,9 @@ import os
 import time
 import traceback
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure, task_success, task_retry
+from celery.signals import (
+    task_prerun, task_postrun, task_failure, task_success, task_retry, worker_process_shutdown
+)
 from prometheus_client import Counter, Histogram
 from dotenv import load_dotenv
 import structlog
@@ -91,7 +93,9 @@ celery_app = Celery(
         'app.tasks.crewai_workflows',
         'app.tasks.source_processing',  # Task 61: Project source processing
         'app.tasks.content_prep_tasks',  # Feature 007: Content Prep Agent
-        'app.tasks.research_tasks'  # Task 187: Research project tasks
+        'app.tasks.research_tasks',  # Task 187: Research project tasks
+        'app.tasks.asset_dedup_tasks',  # Asset near-duplicate index backfill
+        'app.tasks.query_rollup_tasks'  # Query analytics rollup backfill/retention
     ]
 )
 
@@ -154,6 +158,23 @@ celery_app.conf.update(
                 'retention_days': 90,
             },
         },
+        # Drop minute-level query rollups past their retention (hour rows stay)
+        'purge-query-rollup-minutes-hourly': {
+            'task': 'app.tasks.query_rollup_tasks.purge_query_rollup_minutes',
+            'schedule': 3600,
+            'options': {
+                'priority': 1,
+            },
+        },
+        # Index studio assets created outside AssetManagementService for
+        # near-duplicate lookups (only assets without lsh_bands are touched)
+        'backfill-asset-lsh-signatures': {
+            'task': 'app.tasks.asset_dedup_tasks.backfill_asset_lsh_signatures',
+            'schedule': 900,
+            'options': {
+                'priority': 1,
+            },
+        },
     },
 )
 
@@ -548,6 +569,19 @@ def task_retry_handler(sender=None, request=None, reason=None, einfo=None, **kwa
         logger.warning("status_broadcast_failed_task_retry", error=str(e))
 
 
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(**kwargs):
+    """
+    Flush batched status updates before a worker process exits.
+    Prefork children exit without running atexit hooks.
+    """
+    if _status_broadcaster is not None:
+        try:
+            _status_broadcaster.close()
+        except Exception as e:
+            logger.warning("status_broadcaster_close_failed", error=str(e))
+
+
 # Health check task
 @celery_app.task(name='app.tasks.health_check')
 def health_check():
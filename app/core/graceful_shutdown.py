@@ -395,6 +395,12 @@ class GracefulShutdown:
                 # Mark in-progress entries as pending for replay
                 logger.debug("WAL flush completed")
 
+            # Flush queued audit log rows
+            await self._flush_audit_logs()
+
+            # Flush pending query analytics rollups
+            await self._flush_query_rollups()
+
             # Flush telemetry
             await self._flush_telemetry()
 
@@ -416,6 +422,30 @@ class GracefulShutdown:
             self.progress.errors.append(f"Data flush error: {str(e)}")
             return False
 
+    async def _flush_audit_logs(self):
+        """Write audit rows still queued in the audit log sink"""
+        try:
+            from app.services.audit_log_sink import get_audit_log_sink
+            sink = get_audit_log_sink()
+            written = await asyncio.wait_for(sink.flush(), timeout=10.0)
+            logger.debug("Audit logs flushed", rows=written)
+        except asyncio.TimeoutError:
+            logger.warning("Audit log flush timeout")
+        except Exception as e:
+            logger.warning("Error flushing audit logs", error=str(e))
+
+    async def _flush_query_rollups(self):
+        """Write query analytics rollup deltas not yet flushed"""
+        try:
+            from app.services.query_analytics_service import get_query_analytics_service
+            service = get_query_analytics_service()
+            written = await asyncio.wait_for(service.flush_rollups(), timeout=10.0)
+            logger.debug("Query rollups flushed", rows=written)
+        except asyncio.TimeoutError:
+            logger.warning("Query rollup flush timeout")
+        except Exception as e:
+            logger.warning("Error flushing query rollups", error=str(e))
+
     async def _flush_telemetry(self):
         """Flush telemetry and tracing data"""
         try:
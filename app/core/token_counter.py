@@ -6,7 +6,10 @@ Feature: Chat Context Window Management (011)
 """
 
 import os
-from typing import Optional, List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict
 from datetime import datetime
 import structlog
 from prometheus_client import Counter, Gauge, Histogram
@@ -78,11 +81,21 @@ ROLE_TOKEN_OVERHEAD = {
 }
 
 
+# Token count memoization
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "20000"))
+BATCH_ENCODE_THREADS = int(os.getenv("TOKEN_BATCH_ENCODE_THREADS", "8"))
+
+
 class TokenCounterError(Exception):
     """Raised when token counting fails"""
     pass
 
 
+def _content_key(text: str) -> str:
+    """Content hash used to key memoized token counts."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
 class TokenCounter:
     """
     Token counting service using tiktoken with cl100k_base encoding.
@@ -102,6 +115,11 @@ class TokenCounter:
         self.max_tokens = self._get_model_context_limit(model)
         self._encoding = None
 
+        # content hash -> token count (LRU)
+        self._count_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._count_cache_size = TOKEN_COUNT_CACHE_SIZE
+        self._lock = threading.Lock()
+
     def _get_model_context_limit(self, model: str) -> int:
         """Get the context window limit for a model."""
         return MODEL_CONTEXT_LIMITS.get(model, MODEL_CONTEXT_LIMITS["default"])
@@ -136,23 +154,112 @@ class TokenCounter:
         if not text:
             return 0
 
-        try:
-            if self.encoding is not None:
-                token_count = len(self.encoding.encode(text))
+        key = _content_key(text)
+        token_count = self._get_cached_count(key)
+
+        if token_count is None:
+            try:
+                if self.encoding is not None:
+                    token_count = len(self.encoding.encode(text))
+                else:
+                    token_count = self._estimate_tokens(text)
+            except Exception as e:
+                logger.warning("Token counting failed, using estimation", error=str(e))
+                return self._estimate_tokens(text)
+            self._cache_count(key, token_count)
+
+        # Record Prometheus metrics
+        if record_metrics:
+            CONTEXT_TOKENS_COUNTED.labels(
+                operation="count_tokens",
+                model=self.model
+            ).inc(token_count)
+
+        return token_count
+
+    def count_tokens_batch(
+        self,
+        texts: List[str],
+        record_metrics: bool = True,
+        num_threads: int = BATCH_ENCODE_THREADS
+    ) -> List[int]:
+        """
+        Count tokens for many texts at once.
+
+        Memoized counts are reused; the rest are encoded together with
+        tiktoken's threaded encode_batch.
+
+        Args:
+            texts: Texts to count tokens for
+            record_metrics: Whether to record Prometheus metrics
+            num_threads: Threads used by tiktoken's encode_batch
+
+        Returns:
+            Token counts in input order
+        """
+        counts: List[int] = [0] * len(texts)
+        missing: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = _content_key(text)
+            cached = self._get_cached_count(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                counts[i] = cached
+
+        if missing:
+            keys = list(missing)
+            pending = [texts[missing[key][0]] for key in keys]
+            try:
+                if self.encoding is not None:
+                    encoded = self.encoding.encode_batch(pending, num_threads=num_threads)
+                    pending_counts = [len(tokens) for tokens in encoded]
+                else:
+                    pending_counts = [self._estimate_tokens(text) for text in pending]
+            except Exception as e:
+                logger.warning("Batch token counting failed, using estimation", error=str(e))
+                pending_counts = [self._estimate_tokens(text) for text in pending]
             else:
-                token_count = self._estimate_tokens(text)
+                for key, count in zip(keys, pending_counts):
+                    self._cache_count(key, count)
 
-            # Record Prometheus metrics
-            if record_metrics:
-                CONTEXT_TOKENS_COUNTED.labels(
-                    operation="count_tokens",
-                    model=self.model
-                ).inc(token_count)
+            for key, count in zip(keys, pending_counts):
+                for i in missing[key]:
+                    counts[i] = count
 
-            return token_count
-        except Exception as e:
-            logger.warning("Token counting failed, using estimation", error=str(e))
-            return self._estimate_tokens(text)
+        if record_metrics:
+            CONTEXT_TOKENS_COUNTED.labels(
+                operation="count_tokens",
+                model=self.model
+            ).inc(sum(counts))
+
+        return counts
+
+    def _get_cached_count(self, key: str) -> Optional[int]:
+        """Look up a memoized token count, marking it most recently used."""
+        with self._lock:
+            count = self._count_cache.get(key)
+            if count is not None:
+                self._count_cache.move_to_end(key)
+            return count
+
+    def _cache_count(self, key: str, count: int) -> None:
+        """Memoize a token count, evicting the least recently used entries."""
+        if self._count_cache_size <= 0:
+            return
+        with self._lock:
+            self._count_cache[key] = count
+            self._count_cache.move_to_end(key)
+            while len(self._count_cache) > self._count_cache_size:
+                self._count_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop memoized token counts."""
+        with self._lock:
+            self._count_cache.clear()
 
     def _estimate_tokens(self, text: str) -> int:
         """
@@ -348,15 +455,17 @@ class TokenCounter:
         return max(0, available_tokens // avg_tokens_per_message)
 
 
-# Global token counter instance with default model
-_default_counter: Optional[TokenCounter] = None
+# Global token counter instances, one per model
+_counters: Dict[str, TokenCounter] = {}
+_counters_lock = threading.Lock()
 
 
 def get_token_counter(model: str = "claude-3-5-sonnet-20241022") -> TokenCounter:
     """
     Get a token counter instance for the specified model.
 
-    Uses a cached instance for the default model.
+    Instances are cached per model so memoized counts are shared by all
+    callers.
 
     Args:
         model: Model ID to get counter for
@@ -364,14 +473,11 @@ def get_token_counter(model: str = "claude-3-5-sonnet-20241022") -> TokenCounter
     Returns:
         TokenCounter instance
     """
-    global _default_counter
-
-    if model == "claude-3-5-sonnet-20241022":
-        if _default_counter is None:
-            _default_counter = TokenCounter(model)
-        return _default_counter
-
-    return TokenCounter(model)
+    counter = _counters.get(model)
+    if counter is None:
+        with _counters_lock:
+            counter = _counters.setdefault(model, TokenCounter(model))
+    return counter
 
 
 # Convenience functions
@@ -380,6 +486,11 @@ def count_tokens(text: str, record_metrics: bool = True) -> int:
     return get_token_counter().count_tokens(text, record_metrics=record_metrics)
 
 
+def count_tokens_batch(texts: List[str], record_metrics: bool = True) -> List[int]:
+    """Count tokens for many texts using the default counter."""
+    return get_token_counter().count_tokens_batch(texts, record_metrics=record_metrics)
+
+
 def count_message_tokens(content: str, role: str = "user", record_metrics: bool = True) -> int:
     """Count tokens in a message using the default counter."""
     return get_token_counter().count_message_tokens(content, role, record_metrics=record_metrics)
@@ -3,6 +3,7 @@ Empire v7.3 - FastAPI Main Application
 Production-grade API server with monitoring, error handling, and authentication
 """
 
+import asyncio
 import os
 from contextlib import asynccontextmanager
 import structlog
@@ -13,7 +14,6 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import Response
-import time
 from typing import Optional
 from dotenv import load_dotenv
 from pathlib import Path
@@ -60,13 +60,9 @@ except ImportError:
 # Import security middleware (Task 41.1, 41.2, 41.4, 41.5)
 from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.rate_limit import configure_rate_limiting, limiter
-from app.middleware.rls_context import configure_rls_context
-from app.middleware.input_validation import configure_input_validation
-from app.middleware.audit import configure_audit_logging
-from app.middleware.org_context import configure_org_context
+from app.middleware.pipeline import configure_request_pipeline
 
 # Task 136: Request tracing middleware for X-Request-ID propagation
-from app.middleware.request_tracing import RequestTracingMiddleware
 from app.core.logging_config import configure_logging
 
 # Task 154: Standardized Exception Handling Framework
@@ -210,6 +206,31 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("websocket_manager_initialization_failed", error=str(e))
 
+    # Principal cache: receive key/role/membership invalidations from other pods
+    try:
+        from app.services.principal_cache import get_principal_cache
+        subscribed = await get_principal_cache().start()
+        logger.info("principal_cache_initialized", redis_invalidation=subscribed)
+    except Exception as e:
+        logger.warning("principal_cache_initialization_failed", error=str(e))
+
+    # Query analytics rollups: flush deltas on time even when traffic stops
+    try:
+        from app.services.query_analytics_service import get_query_analytics_service
+        get_query_analytics_service().start_rollup_flusher()
+        logger.info("query_rollup_flusher_started")
+    except Exception as e:
+        logger.warning("query_rollup_flusher_start_failed", error=str(e))
+
+    # Sparse (BM25) index: build or load its snapshot in the background so the
+    # first search does not pay for a full chunks scan
+    try:
+        from app.services.hybrid_search_service import get_hybrid_search_service
+        app.state.bm25_warm_task = asyncio.create_task(get_hybrid_search_service().warm_sparse_index())
+        logger.info("bm25_index_warming_started")
+    except Exception as e:
+        logger.warning("bm25_index_warm_failed", error=str(e))
+
     # Initialize task scheduler (recovers persisted schedules automatically on first access)
     try:
         from app.services.task_scheduler import get_task_scheduler
@@ -248,6 +269,26 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("websocket_manager_shutdown_error", error=str(e))
 
+    try:
+        from app.services.principal_cache import get_principal_cache
+        await get_principal_cache().stop()
+    except Exception as e:
+        logger.warning("principal_cache_shutdown_error", error=str(e))
+
+    # Write pending rollup deltas and queued audit log rows before the
+    # database connections go away
+    try:
+        from app.services.query_analytics_service import get_query_analytics_service
+        await get_query_analytics_service().stop_rollup_flusher()
+    except Exception as e:
+        logger.warning("query_rollup_flusher_shutdown_error", error=str(e))
+
+    try:
+        from app.services.audit_log_sink import get_audit_log_sink
+        await get_audit_log_sink().stop()
+    except Exception as e:
+        logger.warning("audit_log_sink_shutdown_error", error=str(e))
+
     # Task 36: Close database connections gracefully
     try:
         await connection_manager.shutdown()
@@ -315,30 +356,16 @@ logger.info("response_compression_enabled", min_size_bytes=1000)
 # Configure rate limiting for all endpoints
 configure_rate_limiting(app)
 
-# Task 41.2: RLS Context Middleware
-# Sets PostgreSQL session variables for row-level security enforcement
-configure_rls_context(app)
-
-# Task 41.4: Input Validation - Request body size limits and security validators
-configure_input_validation(app, max_body_size=100 * 1024 * 1024)  # 100MB default
-logger.info("input_validation_middleware_enabled", max_body_size_mb=100)
-
-# Task 41.5: Audit Logging - Track security events
-configure_audit_logging(app)
-logger.info("audit_logging_middleware_enabled")
-
-# Task 136: Request Tracing - X-Request-ID propagation for agent chains
-app.add_middleware(
-    RequestTracingMiddleware,
-    header_name="X-Request-ID",
-    log_requests=os.getenv("ENVIRONMENT") != "production",  # Verbose logging in dev only
-    include_path=True,
-    include_timing=True
-)
-logger.info("request_tracing_middleware_enabled", header="X-Request-ID")
-
-# Organization Context: X-Org-Id header validation and membership caching
-configure_org_context(app)
+# Request middleware pipeline (single pure ASGI middleware, outermost first):
+# - Request metrics: Prometheus count/latency and X-Process-Time
+# - Identity: resolves the caller once for the layers below
+# - Organization Context: X-Org-Id header validation and membership caching
+# - Task 136: Request Tracing - X-Request-ID propagation for agent chains
+# - Task 41.5: Audit Logging - Track security events
+# - Task 41.4: Input Validation - Request body size limits (100MB)
+# - Task 41.2: RLS Context - PostgreSQL session variables for row-level security
+configure_request_pipeline(app, request_latency=REQUEST_LATENCY, request_count=REQUEST_COUNT)
+logger.info("request_pipeline_enabled", header="X-Request-ID", max_body_size_mb=100)
 
 # Mount static files
 static_dir = Path(__file__).parent / "static"
@@ -346,33 +373,6 @@ if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 
-# Middleware for request tracking
-@app.middleware("http")
-async def track_requests(request, call_next):
-    """Track request metrics"""
-    start_time = time.time()
-
-    response = await call_next(request)
-
-    # Record metrics
-    duration = time.time() - start_time
-    REQUEST_LATENCY.labels(
-        method=request.method,
-        endpoint=request.url.path
-    ).observe(duration)
-
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-
-    # Add timing header
-    response.headers["X-Process-Time"] = str(duration)
-
-    return response
-
-
 # Health check endpoints
 @app.get("/health", tags=["Health"])
 async def health_check():
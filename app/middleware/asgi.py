@@ -0,0 +1,51 @@
+"""
+Empire v7.3 - Pure ASGI Middleware Helpers
+
+Shared building blocks for the request middlewares. Unlike
+BaseHTTPMiddleware, pure ASGI middlewares call the next app directly (no
+extra task or memory stream per layer) and pass response messages through
+as they are sent, so streaming (SSE) responses reach the client chunk by
+chunk.
+
+- scope_state: the per-request state dict behind request.state
+- ResponseTracker: wraps send to record the status and edit headers on
+  http.response.start
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import Message, Send
+
+# Called with the (mutable) response headers and the start message
+StartHook = Callable[[MutableHeaders, Message], None]
+
+
+def scope_state(scope: Dict[str, Any]) -> Dict[str, Any]:
+    """The dict backing request.state (created if missing)"""
+    return scope.setdefault("state", {})
+
+
+class ResponseTracker:
+    """
+    send wrapper that records the response status and start time, and lets
+    a middleware add headers before the response starts
+    """
+
+    def __init__(self, send: Send, on_start: Optional[StartHook] = None):
+        self._send = send
+        self._on_start = on_start
+        self.started = False
+        self.status_code: Optional[int] = None
+        self.started_at: Optional[float] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.started = True
+            self.status_code = message["status"]
+            self.started_at = time.perf_counter()
+            if self._on_start is not None:
+                message["headers"] = list(message.get("headers", []))
+                self._on_start(MutableHeaders(scope=message), message)
+        await self._send(message)
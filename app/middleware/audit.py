@@ -3,8 +3,9 @@ Audit Logging Middleware - Task 41.5
 Captures security events and persists to audit_logs table
 """
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from typing import Optional, Dict, Any
 import structlog
 import time
@@ -12,13 +13,15 @@ from datetime import datetime
 import json
 
 from app.core.supabase_client import get_supabase_client
+from app.middleware.asgi import ResponseTracker, scope_state
+from app.services.audit_log_sink import get_audit_log_sink
 
 logger = structlog.get_logger(__name__)
 
 
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
+class AuditLoggingMiddleware:
     """
-    Middleware to log security-relevant events to audit_logs table
+    Pure ASGI middleware to log security-relevant events to audit_logs table
 
     Captures:
     - Authentication events (login, logout)
@@ -26,14 +29,17 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
     - Administrative actions (config changes, user management)
     - Security violations (rate limiting, invalid input)
     - System errors (500 errors, exceptions)
+
+    The audit record is written once the response has been sent, so it
+    never delays the first byte of streaming responses.
     """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         exempt_paths: Optional[list[str]] = None
     ):
-        super().__init__(app)
+        self.app = app
         # Paths that don't need audit logging (health checks, metrics, docs)
         self.exempt_paths = exempt_paths or [
             "/health",
@@ -60,42 +66,30 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             "/api/monitoring": "config_change"
         }
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and log audit events"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Skip exempt paths
-        if any(request.url.path.startswith(path) for path in self.exempt_paths):
-            return await call_next(request)
+        if any(scope["path"].startswith(path) for path in self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
 
         # Capture request start time
-        start_time = time.time()
-
-        # Extract user context from headers/auth
-        user_id = self._extract_user_id(request)
+        start_time = time.perf_counter()
+        request = Request(scope)
         ip_address = self._extract_ip(request)
-
-        # Process request
-        response = None
-        error_message = None
+        tracker = ResponseTracker(send)
 
         try:
-            response = await call_next(request)
-
-            # Log audit event after successful processing
-            await self._log_audit_event(
-                request=request,
-                response=response,
-                user_id=user_id,
-                ip_address=ip_address,
-                duration_ms=int((time.time() - start_time) * 1000),
-                error_message=None
-            )
-
-            return response
+            await self.app(scope, receive, tracker)
 
         except Exception as e:
             # Log system error
             error_message = str(e)
+            user_id = self._extract_user_id(request)
 
             logger.error(
                 "request_failed",
@@ -104,34 +98,48 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 user_id=user_id
             )
 
+            if tracker.started:
+                # Response already on the wire; nothing left to replace
+                raise
+
             # Create error response
-            from fastapi.responses import JSONResponse
             response = JSONResponse(
                 status_code=500,
                 content={"error": "Internal server error"}
             )
+            await response(scope, receive, send)
 
             # Log audit event for error
             await self._log_audit_event(
                 request=request,
-                response=response,
+                status_code=500,
                 user_id=user_id,
                 ip_address=ip_address,
-                duration_ms=int((time.time() - start_time) * 1000),
+                duration_ms=int((time.perf_counter() - start_time) * 1000),
                 error_message=error_message
             )
-
-            return response
+            return
+
+        # Log audit event after successful processing (duration up to the
+        # response headers, as before)
+        end_time = tracker.started_at or time.perf_counter()
+        await self._log_audit_event(
+            request=request,
+            status_code=tracker.status_code or 500,
+            user_id=self._extract_user_id(request),
+            ip_address=ip_address,
+            duration_ms=int((end_time - start_time) * 1000),
+            error_message=None
+        )
 
     def _extract_user_id(self, request: Request) -> Optional[str]:
-        """Extract user ID from request headers or auth context"""
+        """Extract user ID from the resolved identity or request headers"""
 
-        # Try Authorization header (JWT)
-        auth_header = request.headers.get("authorization", "")
-        if auth_header.startswith("Bearer "):
-            # In production, decode JWT and extract user_id
-            # For now, check if user context was set by RLS middleware
-            pass
+        # User resolved from the Authorization header by IdentityMiddleware /
+        # RLSContextMiddleware
+        user_id = scope_state(request.scope).get("user_id")
+        if user_id:
+            return user_id
 
         # Try custom user ID header
         user_id = request.headers.get("x-user-id")
@@ -165,12 +173,12 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
 
         return "unknown"
 
-    def _determine_event_type(self, request: Request, response: Response) -> str:
-        """Determine event type based on request path and response"""
+    def _determine_event_type(self, request: Request, status_code: int) -> str:
+        """Determine event type based on request path and response status"""
 
         path = request.url.path
         method = request.method
-        status = response.status_code
+        status = status_code
 
         # Check explicit mapping
         for pattern, event_type in self.event_type_mapping.items():
@@ -210,25 +218,23 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
     async def _log_audit_event(
         self,
         request: Request,
-        response: Response,
+        status_code: int,
         user_id: Optional[str],
         ip_address: str,
         duration_ms: int,
         error_message: Optional[str]
     ):
-        """Persist audit log to Supabase"""
+        """Queue the audit log for the background sink (or persist it inline)"""
 
         try:
-            supabase = get_supabase_client()
-
             # Determine event type
-            event_type = self._determine_event_type(request, response)
+            event_type = self._determine_event_type(request, status_code)
 
             # Build metadata
             metadata = {
                 "method": request.method,
                 "path": request.url.path,
-                "status_code": response.status_code,
+                "status_code": status_code,
                 "duration_ms": duration_ms,
                 "user_agent": request.headers.get("user-agent", "unknown"),
                 "referer": request.headers.get("referer"),
@@ -247,8 +253,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             if content_length:
                 metadata["content_length"] = int(content_length)
 
-            # Insert audit log
-            supabase.table("audit_logs").insert({
+            row = {
                 "user_id": user_id,
                 "event_type": event_type,
                 "ip_address": ip_address,
@@ -256,16 +261,25 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 "resource_id": self._extract_resource_id(request.url.path),
                 "action": f"{request.method} {request.url.path}",
                 "metadata": json.dumps(metadata),
-                "severity": self._determine_severity(response.status_code, event_type),
+                "severity": self._determine_severity(status_code, event_type),
                 "category": self._determine_category(request.url.path, event_type),
-                "status": "success" if response.status_code < 400 else "failure"
-            }).execute()
+                "status": "success" if status_code < 400 else "failure"
+            }
+
+            sink = get_audit_log_sink()
+            if sink.config.enabled:
+                # Batched insert off the request path
+                sink.enqueue(row)
+            else:
+                # Insert audit log
+                supabase = get_supabase_client()
+                supabase.table("audit_logs").insert(row).execute()
 
             logger.debug(
                 "audit_log_created",
                 event_type=event_type,
                 user_id=user_id,
-                status=response.status_code
+                status=status_code
             )
 
         except Exception as e:
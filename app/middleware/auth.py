@@ -8,11 +8,35 @@ from fastapi import HTTPException, status, Header, Depends
 from typing import Optional
 import structlog
 
+from app.services.principal_cache import get_principal_cache
 from app.services.rbac_service import RBACService, get_rbac_service
 
 logger = structlog.get_logger(__name__)
 
 
+def _verify_jwt(token: str) -> Optional[str]:
+    """
+    Verify a Clerk session token and return its user ID (None if invalid).
+
+    Verified tokens are cached by hash until they expire (at most the
+    principal cache TTL), so repeat requests skip signature verification.
+    """
+    cache = get_principal_cache()
+    cache_key = cache.credential_key(token)
+    cached = cache.get_principal(cache_key)
+    if cached is not None:
+        return cached["user_id"]
+
+    from app.middleware.clerk_auth import clerk_client
+
+    session = clerk_client.sessions.verify_token(token)
+    if not session:
+        return None
+
+    cache.set_token_principal(cache_key, session.user_id, token)
+    return session.user_id
+
+
 async def get_current_user(
     authorization: Optional[str] = Header(None),
     rbac_service: RBACService = Depends(get_rbac_service)
@@ -69,14 +93,11 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"}
             )
 
-        # Clerk JWT validation
-        from app.middleware.clerk_auth import clerk_client
-
         try:
             # Verify the session token with Clerk
-            session = clerk_client.sessions.verify_token(token)
+            user_id = _verify_jwt(token)
 
-            if not session:
+            if not user_id:
                 logger.warning("clerk_jwt_invalid")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,8 +105,6 @@ async def get_current_user(
                     headers={"WWW-Authenticate": "Bearer"}
                 )
 
-            # Get user ID from session
-            user_id = session.user_id
             logger.debug("jwt_authentication_success", user_id=user_id)
             return user_id
 
@@ -224,17 +243,14 @@ async def validate_token(token: str) -> str:
         return user_id
 
     # Otherwise treat as JWT token
-    from app.middleware.clerk_auth import clerk_client
-
     try:
         # Verify the session token with Clerk
-        session = clerk_client.sessions.verify_token(token)
+        user_id = _verify_jwt(token)
 
-        if not session:
+        if not user_id:
             logger.warning("ws_jwt_invalid")
             raise ValueError("Invalid or expired JWT token")
 
-        user_id = session.user_id
         logger.debug("ws_jwt_auth_success", user_id=user_id)
         return user_id
 
@@ -12,13 +12,14 @@ across all agent services with comprehensive logging.
 import uuid
 import traceback
 import sys
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import ValidationError
 import structlog
 
@@ -199,9 +200,9 @@ class RateLimitError(AgentError):
 # ERROR HANDLER MIDDLEWARE
 # =============================================================================
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """
-    Middleware that catches all exceptions and returns standardized error responses.
+    Pure ASGI middleware that catches all exceptions and returns standardized error responses.
 
     This middleware:
     - Catches unhandled exceptions
@@ -233,19 +234,48 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         "/api/content-prep": "AGENT-016",
     }
 
-    async def dispatch(self, request: Request, call_next: Callable):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and handle any exceptions"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
         # Generate or extract request ID
         request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
 
         # Add request_id to request state for use by handlers
         request.state.request_id = request_id
 
+        response_started = False
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                # Add request ID to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as e:
+            if response_started:
+                # Too late for an error response; let the server close the connection
+                raise
+            response = self._handle_exception(e, request, request_id)
+            await response(scope, receive, send)
+
+    def _handle_exception(self, exc: Exception, request: Request, request_id: str) -> JSONResponse:
+        """Build the standardized error response for an exception"""
+        # Re-raise so the handlers below match by type and the traceback is
+        # available to exc_info logging
         try:
-            response = await call_next(request)
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            return response
+            raise exc
 
         except AgentError as e:
             # Handle our custom agent errors
@@ -0,0 +1,127 @@
+"""
+Empire v7.3 - Request Identity Middleware
+
+Resolves the caller's user ID and primary role once per request and stores
+them in request.state (scope["state"]) for the middlewares behind it:
+- OrgContextMiddleware checks X-Org-Id membership against state.user_id
+- AuditLoggingMiddleware records state.user_id
+- RLSContextMiddleware sets the PostgreSQL RLS context from state.user_id /
+  state.user_role without authenticating again
+
+Only /api/ requests with an Authorization header are resolved. Failed
+authentication leaves the request anonymous; endpoints still enforce auth
+through their own dependencies.
+"""
+
+from typing import Any, Dict, Optional
+
+import structlog
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.asgi import scope_state
+
+logger = structlog.get_logger(__name__)
+
+# Paths that never carry user identity (same as the RLS middleware skips)
+SKIP_PATHS = frozenset({
+    "/health", "/health/detailed", "/health/ready", "/health/live",
+    "/docs", "/redoc", "/openapi.json",
+})
+
+# Role precedence when a user holds several roles
+ROLE_PRIORITY = {"admin": 4, "editor": 3, "viewer": 2, "guest": 1}
+
+
+async def get_user_from_authorization(authorization: str) -> Optional[str]:
+    """
+    Authenticate an Authorization header value (API key or Clerk JWT)
+
+    Returns:
+        User ID, or None if authentication fails
+    """
+    from app.middleware.auth import get_current_user
+    from app.services.rbac_service import get_rbac_service
+
+    try:
+        rbac_service = get_rbac_service()
+        return await get_current_user(authorization=authorization, rbac_service=rbac_service)
+    except Exception as e:
+        logger.debug("auth_extraction_failed", error=str(e))
+        return None
+
+
+async def get_primary_role(user_id: str) -> str:
+    """
+    User's highest-priority role (admin > editor > viewer > guest)
+
+    Returns:
+        Role name, "guest" if the user has no roles or lookup fails
+    """
+    from app.services.rbac_service import get_rbac_service
+
+    try:
+        rbac_service = get_rbac_service()
+        roles = await rbac_service.get_user_roles(user_id)
+
+        if not roles:
+            return "guest"
+
+        user_roles = [
+            r.get("role", {}).get("role_name", "guest")
+            for r in roles
+            if r.get("role")
+        ]
+
+        return max(user_roles, key=lambda r: ROLE_PRIORITY.get(r, 0), default="guest")
+
+    except Exception as e:
+        logger.warning("get_user_role_failed", error=str(e), user_id=user_id)
+        return "guest"
+
+
+def needs_identity(path: str) -> bool:
+    """Whether requests to this path are resolved"""
+    return path.startswith("/api/") and path not in SKIP_PATHS
+
+
+async def resolve_identity(scope: Scope) -> Dict[str, Any]:
+    """
+    Resolve user_id / user_role into scope["state"] (once per request)
+
+    Sets state["identity_resolved"] so later middlewares know not to
+    authenticate again, even when the request turned out anonymous.
+    """
+    state = scope_state(scope)
+    if state.get("identity_resolved"):
+        return state
+
+    if not state.get("user_id"):
+        authorization = Request(scope).headers.get("Authorization")
+        if authorization:
+            try:
+                user_id = await get_user_from_authorization(authorization)
+                if user_id:
+                    state["user_id"] = user_id
+                    state["user_role"] = await get_primary_role(user_id)
+            except Exception as e:
+                logger.warning(
+                    "identity_resolution_failed",
+                    error=str(e),
+                    path=scope.get("path")
+                )
+
+    state["identity_resolved"] = True
+    return state
+
+
+class IdentityMiddleware:
+    """Pure ASGI middleware that resolves the caller once per request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and needs_identity(scope["path"]):
+            await resolve_identity(scope)
+        await self.app(scope, receive, send)
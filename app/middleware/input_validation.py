@@ -3,15 +3,17 @@ Input Validation Middleware - Task 41.4
 Provides request body size limits and basic input validation
 """
 
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from typing import Optional
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+class RequestSizeLimitMiddleware:
     """
     Middleware to limit request body size to prevent DoS attacks
 
@@ -19,54 +21,67 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
     - Prevents memory exhaustion from large payloads
     - Protects against DoS attacks
     - Configurable per-environment limits
+
+    Pure ASGI: oversized requests are answered with 413 directly (raising
+    HTTPException from middleware is not handled by the route exception
+    handlers).
     """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         max_body_size: int = 100 * 1024 * 1024,  # 100MB default
         exempt_paths: Optional[list[str]] = None
     ):
-        super().__init__(app)
+        self.app = app
         self.max_body_size = max_body_size
         self.exempt_paths = exempt_paths or ["/docs", "/redoc", "/openapi.json"]
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Check request body size before processing"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Skip size check for exempt paths
-        if any(request.url.path.startswith(path) for path in self.exempt_paths):
-            return await call_next(request)
+        path = scope["path"]
+        if any(path.startswith(exempt) for exempt in self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
 
         # Check Content-Length header
-        content_length = request.headers.get("content-length")
+        content_length = Headers(scope=scope).get("content-length")
 
         if content_length:
             content_length = int(content_length)
 
             if content_length > self.max_body_size:
+                client = scope.get("client")
                 logger.warning(
                     "request_body_too_large",
-                    path=request.url.path,
+                    path=path,
                     content_length=content_length,
                     max_allowed=self.max_body_size,
-                    ip=request.client.host if request.client else "unknown"
+                    ip=client[0] if client else "unknown"
                 )
 
-                raise HTTPException(
+                response = JSONResponse(
                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail={
-                        "error": "Request body too large",
-                        "max_size_bytes": self.max_body_size,
-                        "max_size_mb": self.max_body_size // (1024 * 1024),
-                        "received_bytes": content_length,
-                        "message": f"Request body must not exceed {self.max_body_size // (1024 * 1024)}MB"
+                    content={
+                        "detail": {
+                            "error": "Request body too large",
+                            "max_size_bytes": self.max_body_size,
+                            "max_size_mb": self.max_body_size // (1024 * 1024),
+                            "received_bytes": content_length,
+                            "message": f"Request body must not exceed {self.max_body_size // (1024 * 1024)}MB"
+                        }
                     }
                 )
+                await response(scope, receive, send)
+                return
 
         # Process request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
 def configure_input_validation(app, max_body_size: int = 100 * 1024 * 1024):
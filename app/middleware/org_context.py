@@ -10,10 +10,14 @@ When present, validates:
 Endpoints that don't require org context (health, auth, etc.) skip validation.
 """
 
+import uuid
+
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.asgi import scope_state
 
 logger = structlog.get_logger(__name__)
 
@@ -32,34 +36,50 @@ SKIP_PREFIXES = (
 )
 
 
-class OrgContextMiddleware(BaseHTTPMiddleware):
+class OrgContextMiddleware:
     """
-    Middleware that validates X-Org-Id header and caches membership.
+    Pure ASGI middleware that validates X-Org-Id header and caches membership.
 
     Sets on request.state:
       - org_id: str | None
       - org_role: str | None  (owner/admin/member/viewer)
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = await self._check(scope)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _check(self, scope: Scope):
+        """Set org state; returns an error response to send instead of the app, if any"""
         # Initialize state
-        request.state.org_id = None
-        request.state.org_role = None
+        state = scope_state(scope)
+        state["org_id"] = None
+        state["org_role"] = None
 
         # Skip paths that don't need org context
-        path = request.url.path.rstrip("/") or "/"
+        path = scope["path"].rstrip("/") or "/"
         if path in SKIP_PATHS or any(path.startswith(p) for p in SKIP_PREFIXES):
-            return await call_next(request)
+            return None
 
         # Check for X-Org-Id header
-        org_id = request.headers.get("x-org-id")
+        org_id = Request(scope).headers.get("x-org-id")
         if not org_id:
             # No org header — proceed without org context
             # Individual endpoints can enforce org requirement if needed
-            return await call_next(request)
+            return None
 
         # Validate UUID format
-        import uuid
         try:
             uuid.UUID(org_id)
         except ValueError:
@@ -68,9 +88,9 @@ class OrgContextMiddleware(BaseHTTPMiddleware):
                 content={"error": "Invalid X-Org-Id header: must be a valid UUID"},
             )
 
-        # Get user_id from auth (may not be set yet if auth middleware runs after)
+        # Get user_id from auth (set by IdentityMiddleware when it runs first)
         # We'll do a lightweight check — if user isn't authed, let the auth middleware handle it
-        user_id = getattr(request.state, "user_id", None)
+        user_id = state.get("user_id")
 
         if user_id:
             # Validate membership
@@ -85,8 +105,8 @@ class OrgContextMiddleware(BaseHTTPMiddleware):
                         content={"error": "Not a member of this organization"},
                     )
 
-                request.state.org_id = org_id
-                request.state.org_role = role
+                state["org_id"] = org_id
+                state["org_role"] = role
             except Exception as e:
                 logger.warning("Org membership check failed", org_id=org_id, error=str(e))
                 # Fail closed — don't set org_id if membership can't be verified
@@ -96,9 +116,9 @@ class OrgContextMiddleware(BaseHTTPMiddleware):
                 )
         else:
             # Auth hasn't run yet — store org_id, validation happens at endpoint level
-            request.state.org_id = org_id
+            state["org_id"] = org_id
 
-        return await call_next(request)
+        return None
 
 
 def configure_org_context(app):
@@ -0,0 +1,151 @@
+"""
+Empire v7.3 - Request Middleware Pipeline
+
+Composes the per-request middlewares (metrics, identity, org context,
+tracing, audit, size limit, RLS) into a single pure ASGI middleware.
+
+Each layer used to be a separate BaseHTTPMiddleware, which costs a task,
+a memory stream and a response wrapper per layer and per request, and
+authenticated the caller more than once. In the pipeline:
+- IdentityMiddleware resolves the user once into scope["state"]; the org,
+  audit and RLS layers read it from there
+- response messages pass straight through every layer, so streaming (SSE)
+  responses are not delayed by the stack
+- the whole stack is one entry in app.user_middleware
+"""
+
+import os
+import time
+from typing import Any, Sequence
+
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.middleware import Middleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.asgi import ResponseTracker
+
+logger = structlog.get_logger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording Prometheus request count and latency
+
+    Latency is measured up to the start of the response (as the former
+    http middleware did) and also returned in X-Process-Time.
+    """
+
+    def __init__(self, app: ASGIApp, request_latency: Any, request_count: Any):
+        """
+        Args:
+            app: ASGI application
+            request_latency: Histogram labelled by method and endpoint
+            request_count: Counter labelled by method, endpoint and status
+        """
+        self.app = app
+        self.request_latency = request_latency
+        self.request_count = request_count
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+
+        def record(headers: MutableHeaders, message: Message) -> None:
+            duration = time.time() - start_time
+            self.request_latency.labels(method=method, endpoint=path).observe(duration)
+            self.request_count.labels(
+                method=method,
+                endpoint=path,
+                status=message["status"]
+            ).inc()
+
+            # Add timing header
+            headers["X-Process-Time"] = str(duration)
+
+        await self.app(scope, receive, ResponseTracker(send, record))
+
+
+class RequestPipelineMiddleware:
+    """
+    Runs a list of pure ASGI middlewares as one middleware
+
+    Layers are given outermost first, in the same form as FastAPI's
+    middleware list: Middleware(cls, **options).
+
+    Usage:
+        app.add_middleware(
+            RequestPipelineMiddleware,
+            layers=[Middleware(IdentityMiddleware), Middleware(OrgContextMiddleware)],
+        )
+    """
+
+    def __init__(self, app: ASGIApp, layers: Sequence[Middleware] = ()):
+        self.layers = list(layers)
+
+        # Build inside out so layers[0] sees the request first
+        for cls, args, kwargs in reversed(self.layers):
+            app = cls(app, *args, **kwargs)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
+
+
+def configure_request_pipeline(app, request_latency: Any, request_count: Any) -> None:
+    """
+    Register the request middleware stack as a single pipeline
+
+    Order (outermost first): metrics, identity, org context, tracing,
+    audit, size limit, RLS.
+
+    Args:
+        app: FastAPI application instance
+        request_latency: Prometheus request latency histogram
+        request_count: Prometheus request counter
+    """
+    from app.middleware.audit import AuditLoggingMiddleware
+    from app.middleware.identity import IdentityMiddleware
+    from app.middleware.input_validation import RequestSizeLimitMiddleware
+    from app.middleware.org_context import OrgContextMiddleware
+    from app.middleware.request_tracing import RequestTracingMiddleware
+    from app.middleware.rls_context import RLSContextMiddleware
+
+    max_body_size = 100 * 1024 * 1024  # 100MB
+
+    layers = [
+        Middleware(
+            RequestMetricsMiddleware,
+            request_latency=request_latency,
+            request_count=request_count,
+        ),
+        Middleware(IdentityMiddleware),
+        Middleware(OrgContextMiddleware),
+        Middleware(
+            RequestTracingMiddleware,
+            header_name="X-Request-ID",
+            log_requests=os.getenv("ENVIRONMENT") != "production",  # Verbose logging in dev only
+            include_path=True,
+            include_timing=True,
+        ),
+        Middleware(AuditLoggingMiddleware),
+        Middleware(
+            RequestSizeLimitMiddleware,
+            max_body_size=max_body_size,
+            exempt_paths=["/docs", "/redoc", "/openapi.json", "/health"],
+        ),
+        Middleware(RLSContextMiddleware),
+    ]
+
+    app.add_middleware(RequestPipelineMiddleware, layers=layers)
+
+    logger.info(
+        "request_pipeline_configured",
+        layers=[layer.cls.__name__ for layer in layers],
+        max_body_size_mb=max_body_size // (1024 * 1024),
+    )
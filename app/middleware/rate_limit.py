@@ -21,7 +21,7 @@ Uses slowapi library for flexible rate limiting with Redis backend support (FR-0
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 from fastapi import Request, Response
 from typing import Callable, Optional
 from datetime import datetime, timezone
@@ -277,8 +277,8 @@ def configure_rate_limiting(app):
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
-    # Add SlowAPI middleware
-    app.add_middleware(SlowAPIMiddleware)
+    # Add SlowAPI middleware (pure ASGI variant, does not buffer streaming responses)
+    app.add_middleware(SlowAPIASGIMiddleware)
 
     logger.info("rate_limiting_configured")
 
@@ -17,11 +17,12 @@ import time
 from contextvars import ContextVar
 from typing import Optional, Dict, Any, Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
+from app.middleware.asgi import ResponseTracker
+
 logger = structlog.get_logger(__name__)
 
 
@@ -44,9 +45,9 @@ request_context_var: ContextVar[Dict[str, Any]] = ContextVar(
 # ============================================================================
 
 
-class RequestTracingMiddleware(BaseHTTPMiddleware):
+class RequestTracingMiddleware:
     """
-    Middleware for X-Request-ID generation and propagation.
+    Pure ASGI middleware for X-Request-ID generation and propagation.
 
     Features:
     - Generates UUID if X-Request-ID not provided
@@ -81,30 +82,33 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             include_path: Include request path in logs
             include_timing: Include request duration in response headers
         """
-        super().__init__(app)
+        self.app = app
         self.header_name = header_name
         self.log_requests = log_requests
         self.include_path = include_path
         self.include_timing = include_timing
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request with tracing context.
 
         1. Extract or generate request ID
         2. Set context variables
         3. Process request
-        4. Add response headers
+        4. Add response headers (when the response starts)
         5. Log if enabled
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
 
         # Extract existing request ID or generate new one
-        request_id = request.headers.get(self.header_name)
+        request_id = Headers(scope=scope).get(self.header_name)
         is_generated = False
 
         if not request_id:
@@ -119,16 +123,16 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             logger.warning(
                 "Received non-UUID request ID",
                 request_id=request_id,
-                path=request.url.path
+                path=path
             )
 
         # Set context variables for this request
         request_id_token = request_id_var.set(request_id)
         context_token = request_context_var.set({
             "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "client_host": request.client.host if request.client else None,
+            "method": method,
+            "path": path,
+            "client_host": client[0] if client else None,
             "start_time": start_time,
             "is_generated": is_generated,
         })
@@ -138,37 +142,35 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             logger.info(
                 "Request started",
                 request_id=request_id,
-                method=request.method,
-                path=request.url.path if self.include_path else "[redacted]",
+                method=method,
+                path=path if self.include_path else "[redacted]",
                 generated_id=is_generated
             )
 
-        try:
-            # Process the request
-            response = await call_next(request)
-
-            # Calculate processing time
-            process_time = time.perf_counter() - start_time
-
+        def add_headers(headers: MutableHeaders, message: Message) -> None:
             # Add response headers
-            response.headers[self.header_name] = request_id
+            headers[self.header_name] = request_id
 
             if self.include_timing:
-                response.headers["X-Process-Time"] = f"{process_time:.4f}"
+                headers["X-Process-Time"] = f"{time.perf_counter() - start_time:.4f}"
+
+        tracker = ResponseTracker(send, add_headers)
+
+        try:
+            # Process the request
+            await self.app(scope, receive, tracker)
 
             # Log completed request
             if self.log_requests:
                 logger.info(
                     "Request completed",
                     request_id=request_id,
-                    method=request.method,
-                    path=request.url.path if self.include_path else "[redacted]",
-                    status_code=response.status_code,
-                    duration_ms=round(process_time * 1000, 2)
+                    method=method,
+                    path=path if self.include_path else "[redacted]",
+                    status_code=tracker.status_code,
+                    duration_ms=round((time.perf_counter() - start_time) * 1000, 2)
                 )
 
-            return response
-
         except Exception as e:
             # Calculate time even on error
             process_time = time.perf_counter() - start_time
@@ -177,8 +179,8 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             logger.error(
                 "Request failed",
                 request_id=request_id,
-                method=request.method,
-                path=request.url.path if self.include_path else "[redacted]",
+                method=method,
+                path=path if self.include_path else "[redacted]",
                 error=str(e),
                 error_type=type(e).__name__,
                 duration_ms=round(process_time * 1000, 2)
@@ -17,95 +17,102 @@ Security Benefits:
 - Compliance: GDPR, HIPAA, SOC 2 enforced at database level
 """
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from typing import Optional
 import structlog
 import os
 import uuid
 
-from app.services.rbac_service import get_rbac_service
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.asgi import scope_state
+from app.middleware.identity import get_primary_role, get_user_from_authorization
 from app.core.database import db_manager
 
 logger = structlog.get_logger(__name__)
 
+# Paths under /api/ that never get an RLS context
+SKIP_PATHS = frozenset({
+    "/health", "/health/detailed", "/health/ready", "/health/live",
+    "/docs", "/redoc", "/openapi.json",
+})
+
 
-class RLSContextMiddleware(BaseHTTPMiddleware):
+class RLSContextMiddleware:
     """
     Middleware to set PostgreSQL session variables for RLS enforcement
 
     This middleware runs AFTER authentication but BEFORE route handlers.
     It extracts user context (user_id, role) and sets PostgreSQL session
     variables that RLS policies use to filter data.
+
+    Pure ASGI: uses the identity already resolved into request.state by
+    IdentityMiddleware when present, and only authenticates itself when
+    running without it.
     """
 
-    def __init__(self, app):
+    def __init__(self, app: ASGIApp):
         """
         Initialize RLS context middleware
 
         Args:
-            app: FastAPI application
+            app: ASGI application
         """
-        super().__init__(app)
+        self.app = app
         self.is_enabled = os.getenv("RLS_ENABLED", "true").lower() == "true"
 
         if not self.is_enabled:
             logger.warning("RLS context middleware disabled - set RLS_ENABLED=true to enable")
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Set RLS context for authenticated requests
-
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware in chain
-
-        Returns:
-            Response with RLS context set
+        Set RLS context for authenticated API requests, then run the app
         """
-        # Skip RLS context for non-API endpoints
-        if not request.url.path.startswith("/api/"):
-            return await call_next(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Skip RLS context for health checks and docs
-        if request.url.path in ["/health", "/health/detailed", "/health/ready", "/health/live", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
+        path = scope["path"]
 
-        # Skip if RLS is disabled
-        if not self.is_enabled:
-            return await call_next(request)
+        # Skip RLS context for non-API endpoints, health checks and docs,
+        # or if RLS is disabled
+        if not path.startswith("/api/") or path in SKIP_PATHS or not self.is_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope_state(scope)
 
-        # Extract user context from request state (set by auth middleware)
-        user_id = getattr(request.state, "user_id", None)
-        user_role = getattr(request.state, "user_role", "guest")
+        # Extract user context from request state (set by identity/auth middleware)
+        user_id = state.get("user_id")
+        user_role = state.get("user_role", "guest")
 
-        # If no user_id, try to extract from authorization header
-        if not user_id:
-            authorization = request.headers.get("Authorization")
+        # If no user_id and nothing resolved it yet, try the authorization header
+        if not user_id and not state.get("identity_resolved"):
+            authorization = Request(scope).headers.get("Authorization")
 
             if authorization:
                 try:
                     # Get user_id from authentication
-                    user_id = await self._get_user_from_auth(authorization, request)
+                    user_id = await self._get_user_from_auth(authorization)
 
                     # Get user's role
                     if user_id:
                         user_role = await self._get_user_role(user_id)
 
                         # Store in request state for other middleware
-                        request.state.user_id = user_id
-                        request.state.user_role = user_role
+                        state["user_id"] = user_id
+                        state["user_role"] = user_role
 
                 except Exception as e:
                     logger.warning(
                         "rls_auth_extraction_failed",
                         error=str(e),
-                        path=request.url.path
+                        path=path
                     )
 
         # Generate request ID for tracing
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        state["request_id"] = request_id
 
         # Set PostgreSQL session variables if user is authenticated
         if user_id:
@@ -115,7 +122,7 @@ class RLSContextMiddleware(BaseHTTPMiddleware):
                 user_id=user_id,
                 role=user_role,
                 request_id=request_id,
-                path=request.url.path
+                path=path
             )
         else:
             # For unauthenticated requests, set guest context
@@ -123,38 +130,24 @@ class RLSContextMiddleware(BaseHTTPMiddleware):
             logger.debug(
                 "rls_context_set_anonymous",
                 request_id=request_id,
-                path=request.url.path
+                path=path
             )
 
         # Process the request
-        response = await call_next(request)
-
-        # Clear RLS context after request (optional - connection pooling handles this)
-        # await self._clear_rls_context()
-
-        return response
+        await self.app(scope, receive, send)
 
-    async def _get_user_from_auth(self, authorization: str, request: Request) -> str:
+    async def _get_user_from_auth(self, authorization: str, request: Optional[Request] = None) -> Optional[str]:
         """
         Extract user ID from authorization header
 
         Args:
             authorization: Authorization header value
-            request: FastAPI request object
+            request: Unused, kept for compatibility
 
         Returns:
             User ID if authentication succeeds, None otherwise
         """
-        from app.middleware.auth import get_current_user
-        from app.services.rbac_service import get_rbac_service
-
-        try:
-            rbac_service = get_rbac_service()
-            user_id = await get_current_user(authorization=authorization, rbac_service=rbac_service)
-            return user_id
-        except Exception as e:
-            logger.debug("auth_extraction_failed", error=str(e))
-            return None
+        return await get_user_from_authorization(authorization)
 
     async def _get_user_role(self, user_id: str) -> str:
         """
@@ -166,29 +159,7 @@ class RLSContextMiddleware(BaseHTTPMiddleware):
         Returns:
             Role name (admin, editor, viewer, guest)
         """
-        try:
-            rbac_service = get_rbac_service()
-            roles = await rbac_service.get_user_roles(user_id)
-
-            if not roles:
-                return "guest"
-
-            # Priority: admin > editor > viewer > guest
-            role_priority = {"admin": 4, "editor": 3, "viewer": 2, "guest": 1}
-
-            user_roles = [
-                r.get("role", {}).get("role_name", "guest")
-                for r in roles
-                if r.get("role")
-            ]
-
-            # Return highest priority role
-            primary_role = max(user_roles, key=lambda r: role_priority.get(r, 0), default="guest")
-            return primary_role
-
-        except Exception as e:
-            logger.warning("get_user_role_failed", error=str(e), user_id=user_id)
-            return "guest"
+        return await get_primary_role(user_id)
 
     async def _set_rls_context(self, user_id: str, role: str, request_id: str = None):
         """
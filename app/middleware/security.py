@@ -12,19 +12,20 @@ Implements HTTP security headers to prevent common web vulnerabilities:
 - Content-Security-Policy (CSP)
 """
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import os
 
 import structlog
 
+from app.middleware.asgi import ResponseTracker
+
 logger = structlog.get_logger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
-    Middleware to add security headers to all HTTP responses
+    Pure ASGI middleware to add security headers to all HTTP responses
 
     Security headers help protect against:
     - Man-in-the-middle attacks (HSTS)
@@ -35,7 +36,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Unwanted browser features (Permissions-Policy)
     """
 
-    def __init__(self, app, enable_hsts: bool = True, enable_csp: bool = True):
+    def __init__(self, app: ASGIApp, enable_hsts: bool = True, enable_csp: bool = True):
         """
         Initialize security headers middleware
 
@@ -44,7 +45,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             enable_hsts: Enable HSTS header (should be False in development)
             enable_csp: Enable Content-Security-Policy header
         """
-        super().__init__(app)
+        self.app = app
         self.enable_hsts = enable_hsts
         self.enable_csp = enable_csp
 
@@ -56,46 +57,61 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             logger.warning("hsts_disabled_in_development", environment="development")
             self.enable_hsts = False
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Add security headers to response
+        Add security headers to the response when it starts
 
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware in chain
-
-        Returns:
-            Response with security headers added
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
+        def add_headers(headers: MutableHeaders, message: Message) -> None:
+            self._add_security_headers(headers, path)
+
         # Process the request
-        response = await call_next(request)
+        await self.app(scope, receive, ResponseTracker(send, add_headers))
 
+    def _add_security_headers(self, headers: MutableHeaders, path: str) -> None:
+        """
+        Set the security headers for a response to the given path
+
+        Args:
+            headers: Response headers (modified in place)
+            path: Request path
+        """
         # Strict Transport Security (HSTS)
         # Forces HTTPS for 1 year and includes all subdomains
         if self.enable_hsts:
-            response.headers["Strict-Transport-Security"] = (
+            headers["Strict-Transport-Security"] = (
                 "max-age=31536000; includeSubDomains; preload"
             )
 
         # Prevent MIME type sniffing
         # Browsers must respect the Content-Type header
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Content-Type-Options"] = "nosniff"
 
         # Prevent clickjacking attacks
         # Don't allow this site to be embedded in iframes
-        response.headers["X-Frame-Options"] = "DENY"
+        headers["X-Frame-Options"] = "DENY"
 
         # XSS Protection (legacy but still useful for older browsers)
         # Block page if XSS attack detected
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        headers["X-XSS-Protection"] = "1; mode=block"
 
         # Control referrer information sent to external sites
         # Only send origin for cross-origin requests
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         # Disable unnecessary browser features
         # Prevent access to geolocation, microphone, camera
-        response.headers["Permissions-Policy"] = (
+        headers["Permissions-Policy"] = (
             "geolocation=(), microphone=(), camera=(), payment=(), usb=(), "
             "magnetometer=(), gyroscope=(), accelerometer=()"
         )
@@ -118,7 +134,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             ]
 
             # Relax CSP for /docs and /redoc endpoints (FastAPI docs need inline scripts)
-            if request.url.path.startswith("/docs") or request.url.path.startswith("/redoc"):
+            if path.startswith("/docs") or path.startswith("/redoc"):
                 csp_directives = [
                     "default-src 'self'",
                     "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # FastAPI docs need eval
@@ -128,18 +144,16 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
                     "connect-src 'self'"
                 ]
 
-            response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
+            headers["Content-Security-Policy"] = "; ".join(csp_directives)
 
         # Additional security headers
         # Remove server identification
-        response.headers["Server"] = "Empire"
+        headers["Server"] = "Empire"
 
         # Cache control for sensitive data
-        if "/api/" in request.url.path and request.url.path not in ["/api/health", "/health"]:
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
-
-        return response
+        if "/api/" in path and path not in ["/api/health", "/health"]:
+            headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
+            headers["Pragma"] = "no-cache"
 
 
 def get_security_headers_middleware(enable_hsts: bool = None, enable_csp: bool = True):
@@ -43,7 +43,7 @@ class RerankRequest(BaseModel):
     """Request to rerank documents"""
     query: str = Field(..., description="Search query to rank documents against")
     documents: List[DocumentToRerank] = Field(..., description="Documents to rerank")
-    provider: Optional[str] = Field("ollama", description="Reranking provider: ollama (primary), llm (Qwen 3.5 fallback)")
+    provider: Optional[str] = Field("ollama", description="Reranking provider: ollama (primary), llm (Qwen 3.5 fallback), batch (cross-encoder /rerank server)")
     model: Optional[str] = Field(None, description="Model name (provider-specific)")
     top_k: Optional[int] = Field(10, ge=1, le=100, description="Number of top results to return")
     score_threshold: Optional[float] = Field(0.3, ge=0.0, le=1.0, description="Minimum score threshold")
@@ -106,6 +106,7 @@ async def rerank_documents(request: RerankRequest):
         provider_map: dict = {
             "ollama": RerankingProvider.OLLAMA,
             "llm": RerankingProvider.LLM,
+            "batch": RerankingProvider.BATCH,
         }
         normalized_provider = (request.provider or "ollama").lower()
         if normalized_provider not in provider_map:
@@ -118,7 +119,7 @@ async def rerank_documents(request: RerankRequest):
         # Create config
         config = RerankingConfig(
             provider=provider,
-            model=request.model or ("bge-reranker-v2-m3" if provider == RerankingProvider.OLLAMA else None),
+            model=request.model or ("bge-reranker-v2-m3" if provider != RerankingProvider.LLM else None),
             top_k=request.top_k,
             max_input_results=len(request.documents),
             score_threshold=request.score_threshold,
@@ -26,6 +26,9 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+# Seconds to wait for the connection_timeout notice to be sent before closing
+TIMEOUT_NOTICE_FLUSH_SECONDS = 2.0
+
 
 @router.websocket("/notifications")
 async def websocket_notifications(
@@ -573,23 +576,25 @@ async def websocket_authenticated(
         )
 
         # Send authentication confirmation
-        await websocket.send_json({
+        await manager.send_personal_message({
             "event": "authenticated",
             "user_id": auth_context.user_id,
             "role": auth_context.role,
             "is_authenticated": auth_context.is_authenticated,
             "connection_id": connection_id,
             "timestamp": datetime.utcnow().isoformat()
-        })
+        }, connection_id)
 
         # Set up connection monitor with callbacks
         async def on_timeout():
             """Handle connection timeout."""
             try:
-                await websocket.send_json({
+                # Through the connection's writer so queued messages go first
+                await manager.send_personal_message({
                     "event": "connection_timeout",
                     "message": "Connection closed due to inactivity"
-                })
+                }, connection_id)
+                await manager.flush([connection_id], timeout=TIMEOUT_NOTICE_FLUSH_SECONDS)
                 await websocket.close(code=1000, reason="Connection timeout")
             except Exception:
                 pass
@@ -599,7 +604,7 @@ async def websocket_authenticated(
             try:
                 if auth_context.token_exp:
                     message = create_token_refresh_message(auth_context.token_exp)
-                    await websocket.send_json(message)
+                    await manager.send_personal_message(message, connection_id)
             except Exception as e:
                 logger.warning("token_refresh_notification_failed", error=str(e))
 
@@ -625,7 +630,7 @@ async def websocket_authenticated(
                 )
 
                 if response:
-                    await websocket.send_json(response)
+                    await manager.send_personal_message(response, connection_id)
                     continue
 
                 # Handle custom messages
@@ -636,28 +641,28 @@ async def websocket_authenticated(
                     resource_type = data.get("resource_type")
                     resource_id = data.get("resource_id")
 
-                    await websocket.send_json({
+                    await manager.send_personal_message({
                         "event": "subscription_info",
                         "message": f"Use /ws/{resource_type}/{{id}} for resource subscriptions",
                         "resource_type": resource_type,
                         "resource_id": resource_id
-                    })
+                    }, connection_id)
 
                 elif event_type == "echo":
                     # Echo back for testing
-                    await websocket.send_json({
+                    await manager.send_personal_message({
                         "event": "echo",
                         "data": data.get("data"),
                         "timestamp": datetime.utcnow().isoformat()
-                    })
+                    }, connection_id)
 
             except WebSocketDisconnect:
                 break
             except json.JSONDecodeError:
-                await websocket.send_json({
+                await manager.send_personal_message({
                     "event": "error",
                     "message": "Invalid JSON format"
-                })
+                }, connection_id)
 
     except Exception as e:
         logger.error(
@@ -761,22 +766,23 @@ async def websocket_secure_resource(
         )
 
         # Send subscription confirmation
-        await websocket.send_json({
+        await manager.send_personal_message({
             "event": "subscription_confirmed",
             "resource_type": resource_type,
             "resource_id": resource_id,
             "user_id": auth_context.user_id,
             "role": auth_context.role,
             "timestamp": datetime.utcnow().isoformat()
-        })
+        }, connection_id)
 
         # Set up connection monitor
         async def on_timeout():
             try:
-                await websocket.send_json({
+                await manager.send_personal_message({
                     "event": "connection_timeout",
                     "message": "Connection closed due to inactivity"
-                })
+                }, connection_id)
+                await manager.flush([connection_id], timeout=TIMEOUT_NOTICE_FLUSH_SECONDS)
                 await websocket.close(code=1000)
             except Exception:
                 pass
@@ -784,8 +790,9 @@ async def websocket_secure_resource(
         async def on_token_refresh_needed():
             try:
                 if auth_context.token_exp:
-                    await websocket.send_json(
-                        create_token_refresh_message(auth_context.token_exp)
+                    await manager.send_personal_message(
+                        create_token_refresh_message(auth_context.token_exp),
+                        connection_id
                     )
             except Exception:
                 pass
@@ -811,15 +818,15 @@ async def websocket_secure_resource(
                 )
 
                 if response:
-                    await websocket.send_json(response)
+                    await manager.send_personal_message(response, connection_id)
 
             except WebSocketDisconnect:
                 break
             except json.JSONDecodeError:
-                await websocket.send_json({
+                await manager.send_personal_message({
                     "event": "error",
                     "message": "Invalid JSON format"
-                })
+                }, connection_id)
 
     except Exception as e:
         logger.error(
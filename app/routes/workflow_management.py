@@ -93,6 +93,7 @@ class WorkflowListResponse(BaseModel):
     completed: int
     failed: int
     cancelled: int
+    next_cursor: Optional[str] = None
 
 
 class WorkflowMetricsResponse(BaseModel):
@@ -194,16 +195,22 @@ async def list_workflows(
     status: Optional[str] = Query(None, description="Filter by status"),
     workflow_type: Optional[str] = Query(None, description="Filter by workflow type"),
     limit: int = Query(100, ge=1, le=500, description="Maximum results"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ) -> WorkflowListResponse:
-    """List all workflows with optional filtering."""
+    """List workflows (most recently updated first) with optional filtering."""
     manager = get_workflow_manager()
     await manager.initialize()
 
     status_filter = WorkflowStatus(status) if status else None
-    workflows = await manager.list_workflows(status=status_filter, workflow_type=workflow_type)
-
-    # Apply limit
-    workflows = workflows[:limit]
+    try:
+        workflows, next_cursor = await manager.list_workflows_page(
+            status=status_filter,
+            workflow_type=workflow_type,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Calculate stats
     running = sum(1 for w in workflows if w.status == WorkflowStatus.RUNNING)
@@ -218,6 +225,7 @@ async def list_workflows(
         completed=completed,
         failed=failed,
         cancelled=cancelled,
+        next_cursor=next_cursor,
     )
 
 
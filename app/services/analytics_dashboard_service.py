@@ -10,6 +10,9 @@ Features:
 - Filtering by date range, search type, and department
 - Widget configuration and layout management
 
+All metrics are read from the minute/hour query rollups (see
+query_rollup_service); raw query_logs rows are never scanned.
+
 Usage:
     from app.services.analytics_dashboard_service import get_analytics_dashboard_service
 
@@ -37,6 +40,7 @@ from enum import Enum
 from collections import defaultdict
 
 from app.services.query_analytics_service import QueryAnalyticsService, get_query_analytics_service
+from app.services.query_rollup_service import QueryRollupService, RollupBucket
 
 logger = logging.getLogger(__name__)
 
@@ -142,7 +146,8 @@ class AnalyticsDashboardService:
         self,
         storage,
         analytics_service: Optional[QueryAnalyticsService] = None,
-        config: Optional[DashboardConfig] = None
+        config: Optional[DashboardConfig] = None,
+        rollups: Optional[QueryRollupService] = None
     ):
         """
         Initialize analytics dashboard service
@@ -151,10 +156,12 @@ class AnalyticsDashboardService:
             storage: Supabase storage client
             analytics_service: Query analytics service
             config: Dashboard configuration
+            rollups: Rollup reader (created over storage if omitted)
         """
         self.storage = storage
         self.analytics_service = analytics_service or get_query_analytics_service()
         self.config = config or DashboardConfig()
+        self.rollups = rollups or QueryRollupService(storage)
 
         logger.info("Initialized AnalyticsDashboardService")
 
@@ -187,28 +194,19 @@ class AnalyticsDashboardService:
         if end_date < start_date:
             raise ValueError("end_date must be after start_date")
 
-        # Get queries
-        if search_type or department:
-            # Use storage for filtered queries
-            queries = await self._get_filtered_queries(
-                start_date=start_date,
-                end_date=end_date,
-                search_type=search_type,
-                department=department
-            )
-        else:
-            # Use analytics service
-            queries = await self.analytics_service.get_queries_by_date_range(
-                start_date=start_date,
-                end_date=end_date
-            )
+        buckets = await self.rollups.read_rollups(
+            start_date=start_date,
+            end_date=end_date,
+            search_type=search_type,
+            department=department
+        )
 
-        total_queries = len(queries)
+        total_queries = sum(bucket.query_count for bucket in buckets)
         days = max(1, (end_date - start_date).days)
         avg_queries_per_day = total_queries / days if days > 0 else 0
 
         # Generate time series data
-        time_series = self._aggregate_by_time(queries, start_date, end_date)
+        time_series = self._aggregate_by_time(buckets, start_date, end_date)
 
         return {
             "total_queries": total_queries,
@@ -220,14 +218,31 @@ class AnalyticsDashboardService:
             }
         }
 
-    async def get_latency_metrics(self) -> Dict[str, Any]:
+    async def get_latency_metrics(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search_type: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get latency metrics
 
+        Args:
+            start_date: Start of date range
+            end_date: End of date range
+            search_type: Filter by search type
+            department: Filter by department
+
         Returns:
             Dictionary with latency statistics
         """
-        stats = await self.analytics_service.get_latency_statistics()
+        stats = await self.analytics_service.get_latency_statistics(
+            start_date=start_date,
+            end_date=end_date,
+            search_type=search_type,
+            department=department
+        )
 
         # Return defaults if stats are empty
         if not stats:
@@ -289,7 +304,12 @@ class AnalyticsDashboardService:
             department=department
         )
 
-        latency_stats = await self.get_latency_metrics()
+        latency_stats = await self.get_latency_metrics(
+            start_date=start_date,
+            end_date=end_date,
+            search_type=search_type,
+            department=department
+        )
         ctr_stats = await self.get_ctr_metrics()
 
         return DashboardMetrics(
@@ -317,37 +337,14 @@ class AnalyticsDashboardService:
         Returns:
             TimeSeriesData for query volume
         """
-        queries = await self.analytics_service.get_queries_by_date_range(
+        series = await self.rollups.time_series(
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            interval=self._parse_interval(interval)
         )
 
-        # Parse interval
-        interval_delta = self._parse_interval(interval)
-
-        # Aggregate queries by interval
-        aggregated = defaultdict(int)
-        current = start_date
-
-        # Create buckets
-        timestamps = []
-        while current <= end_date:
-            timestamps.append(current)
-            current += interval_delta
-
-        # Count queries per bucket
-        for query in queries:
-            query_time = datetime.fromisoformat(query["created_at"].replace("Z", "+00:00"))
-
-            # Find the bucket for this query
-            for i, ts in enumerate(timestamps):
-                next_ts = timestamps[i + 1] if i + 1 < len(timestamps) else end_date + interval_delta
-                if ts <= query_time < next_ts:
-                    aggregated[ts] += 1
-                    break
-
-        # Build values list
-        values = [aggregated.get(ts, 0) for ts in timestamps]
+        timestamps = [ts for ts, _ in series]
+        values = [bucket.query_count for _, bucket in series]
 
         return TimeSeriesData(
             timestamps=timestamps,
@@ -372,23 +369,20 @@ class AnalyticsDashboardService:
         Returns:
             TimeSeriesData for latency
         """
-        # Query aggregated latency data from storage
-        mock_result = await self.storage.table("query_logs_aggregated")\
-            .select("date, avg_latency")\
-            .gte("date", start_date.isoformat())\
-            .lte("date", end_date.isoformat())\
-            .execute()
-
-        if not mock_result.data:
-            return TimeSeriesData(timestamps=[], values=[], label="Latency")
-
-        timestamps = [datetime.fromisoformat(r["date"]) for r in mock_result.data]
-        values = [r["avg_latency"] for r in mock_result.data]
+        series = await self.rollups.time_series(
+            start_date=start_date,
+            end_date=end_date,
+            interval=self._parse_interval(interval)
+        )
 
         return TimeSeriesData(
-            timestamps=timestamps,
-            values=values,
-            label="Average Latency (ms)"
+            timestamps=[ts for ts, _ in series],
+            values=[round(bucket.avg_latency, 2) for _, bucket in series],
+            label="Average Latency (ms)",
+            metadata={
+                "p95_latency": [round(bucket.percentile(0.95), 2) for _, bucket in series],
+                "query_count": [bucket.query_count for _, bucket in series]
+            }
         )
 
     async def get_ctr_time_series(
@@ -408,23 +402,20 @@ class AnalyticsDashboardService:
         Returns:
             TimeSeriesData for CTR
         """
-        # Query aggregated CTR data from storage
-        mock_result = await self.storage.table("ctr_aggregated")\
-            .select("date, ctr")\
-            .gte("date", start_date.isoformat())\
-            .lte("date", end_date.isoformat())\
-            .execute()
-
-        if not mock_result.data:
-            return TimeSeriesData(timestamps=[], values=[], label="CTR")
-
-        timestamps = [datetime.fromisoformat(r["date"]) for r in mock_result.data]
-        values = [r["ctr"] for r in mock_result.data]
+        series = await self.rollups.time_series(
+            start_date=start_date,
+            end_date=end_date,
+            interval=self._parse_interval(interval)
+        )
 
         return TimeSeriesData(
-            timestamps=timestamps,
-            values=values,
-            label="Click-Through Rate"
+            timestamps=[ts for ts, _ in series],
+            values=[bucket.ctr for _, bucket in series],
+            label="Click-Through Rate",
+            metadata={
+                "clicks": [bucket.clicks for _, bucket in series],
+                "impressions": [bucket.impressions for _, bucket in series]
+            }
         )
 
     def get_default_layout(self) -> List[WidgetConfig]:
@@ -473,67 +464,27 @@ class AnalyticsDashboardService:
             )
         ]
 
-    async def _get_filtered_queries(
-        self,
-        start_date: datetime,
-        end_date: datetime,
-        search_type: Optional[str] = None,
-        department: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Get filtered queries from storage
-
-        Args:
-            start_date: Start of date range
-            end_date: End of date range
-            search_type: Filter by search type
-            department: Filter by department
-
-        Returns:
-            List of query records
-        """
-        query = self.storage.table("query_logs").select("*")
-
-        if search_type:
-            query = query.eq("search_type", search_type)
-
-        if department:
-            query = query.eq("department", department)
-
-        if start_date:
-            query = query.gte("created_at", start_date.isoformat())
-
-        if end_date:
-            query = query.lte("created_at", end_date.isoformat())
-
-        result = await query.execute()
-        return result.data if result.data else []
-
     def _aggregate_by_time(
         self,
-        queries: List[Dict[str, Any]],
+        buckets: List[RollupBucket],
         start_date: datetime,
         end_date: datetime
     ) -> List[Dict[str, Any]]:
         """
-        Aggregate queries by time buckets
+        Aggregate rollup rows by day
 
         Args:
-            queries: List of query records
+            buckets: Rollup rows in the date range
             start_date: Start of date range
             end_date: End of date range
 
         Returns:
             List of time-series data points
         """
-        # Simple daily aggregation
         daily_counts = defaultdict(int)
 
-        for query in queries:
-            if "created_at" in query:
-                created_at = datetime.fromisoformat(query["created_at"].replace("Z", "+00:00"))
-                date_key = created_at.date().isoformat()
-                daily_counts[date_key] += 1
+        for bucket in buckets:
+            daily_counts[bucket.bucket_start.date().isoformat()] += bucket.query_count
 
         # Build time series
         time_series = []
@@ -6,15 +6,24 @@ without blocking creation — users see warnings, not errors.
 
 Uses content hashing (MD5, first 16 hex chars) for exact matches
 and Jaccard similarity (word-level) for near matches.
+
+Near-match candidates come from MinHash/LSH band keys stored with each
+asset (lsh_bands): only assets sharing a band bucket are fetched and
+compared, so a check costs a handful of comparisons regardless of how many
+assets exist. New versions are indexed on save; assets created elsewhere are
+indexed by backfill_lsh_signatures() (scheduled in Celery beat) and are
+compared directly until then.
 """
 
 import asyncio
 import hashlib
+import os
 import re
 from typing import Optional, List, Dict, Any
 
 import structlog
 
+from app.services.minhash_lsh import get_min_hasher
 from app.services.supabase_storage import get_supabase_storage
 
 logger = structlog.get_logger(__name__)
@@ -28,9 +37,14 @@ class AssetDedupService:
     """Advisory duplicate detection for studio assets."""
 
     JACCARD_THRESHOLD = 0.75
+    MAX_LSH_CANDIDATES = 20
+    LEGACY_SCAN_LIMIT = 50
 
-    def __init__(self):
+    def __init__(self, use_lsh: Optional[bool] = None):
         self._supabase = None
+        if use_lsh is None:
+            use_lsh = os.getenv("ASSET_DEDUP_LSH", "true").lower() == "true"
+        self.use_lsh = use_lsh
 
     @property
     def supabase(self):
@@ -55,6 +69,16 @@ class AssetDedupService:
         union = len(words_a | words_b)
         return intersection / union
 
+    @staticmethod
+    def compute_lsh_fields(content: str) -> Dict[str, Any]:
+        """MinHash signature and LSH band keys to store with an asset."""
+        hasher = get_min_hasher()
+        signature = hasher.signature(content)
+        return {
+            "minhash_signature": signature,
+            "lsh_bands": hasher.band_keys(signature),
+        }
+
     async def check_duplicates(
         self,
         content: str,
@@ -101,22 +125,18 @@ class AssetDedupService:
                     "similarity": 1.0,
                 })
 
-            # Find near matches — fetch candidates (limit 50)
-            candidate_query = (
-                self.supabase.client.table("studio_assets")
-                .select("id, title, name, asset_type, department, content")
-                .eq("user_id", user_id)
-                .neq("content_hash", content_hash)
-                .order("updated_at", desc=True)
-                .limit(50)
-            )
-            if asset_type:
-                candidate_query = candidate_query.eq("asset_type", asset_type)
-            if exclude_id:
-                candidate_query = candidate_query.neq("id", exclude_id)
-            candidate_result = await asyncio.to_thread(candidate_query.execute)
+            # Find near matches — only assets sharing an LSH bucket are fetched
+            if self.use_lsh:
+                bands = self.compute_lsh_fields(content)["lsh_bands"]
+                candidate_rows = await self._lsh_candidates(
+                    bands, content_hash, user_id, asset_type, exclude_id
+                ) if bands else []
+            else:
+                candidate_rows = await self._recent_candidates(
+                    content_hash, user_id, asset_type, exclude_id
+                )
 
-            for row in candidate_result.data or []:
+            for row in candidate_rows:
                 if not row.get("content"):
                     continue
                 sim = self.jaccard_similarity(content, row["content"])
@@ -144,6 +164,141 @@ class AssetDedupService:
             "has_duplicates": len(exact_matches) > 0 or len(near_matches) > 0,
         }
 
+    async def _lsh_candidates(
+        self,
+        bands: List[str],
+        content_hash: str,
+        user_id: str,
+        asset_type: Optional[str],
+        exclude_id: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Assets sharing at least one LSH band bucket (GIN-indexed overlap),
+        plus assets not indexed yet, which no band lookup can find.
+        """
+        query = (
+            self.supabase.client.table("studio_assets")
+            .select("id, title, name, asset_type, department, content")
+            .eq("user_id", user_id)
+            .overlaps("lsh_bands", bands)
+            .neq("content_hash", content_hash)
+            .order("updated_at", desc=True)
+            .limit(self.MAX_LSH_CANDIDATES)
+        )
+        unindexed = (
+            self.supabase.client.table("studio_assets")
+            .select("id, title, name, asset_type, department, content")
+            .eq("user_id", user_id)
+            .is_("lsh_bands", "null")
+            .neq("content_hash", content_hash)
+            .order("updated_at", desc=True)
+            .limit(self.LEGACY_SCAN_LIMIT)
+        )
+        if asset_type:
+            query = query.eq("asset_type", asset_type)
+            unindexed = unindexed.eq("asset_type", asset_type)
+        if exclude_id:
+            query = query.neq("id", exclude_id)
+            unindexed = unindexed.neq("id", exclude_id)
+        results = await asyncio.gather(
+            asyncio.to_thread(query.execute),
+            asyncio.to_thread(unindexed.execute),
+        )
+        rows = {}
+        for result in results:
+            for row in result.data or []:
+                rows.setdefault(row["id"], row)
+        return list(rows.values())
+
+    async def _recent_candidates(
+        self,
+        content_hash: str,
+        user_id: str,
+        asset_type: Optional[str],
+        exclude_id: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Legacy scan: the most recently updated assets."""
+        query = (
+            self.supabase.client.table("studio_assets")
+            .select("id, title, name, asset_type, department, content")
+            .eq("user_id", user_id)
+            .neq("content_hash", content_hash)
+            .order("updated_at", desc=True)
+            .limit(self.LEGACY_SCAN_LIMIT)
+        )
+        if asset_type:
+            query = query.eq("asset_type", asset_type)
+        if exclude_id:
+            query = query.neq("id", exclude_id)
+        result = await asyncio.to_thread(query.execute)
+        return result.data or []
+
+    async def backfill_lsh_signatures(
+        self,
+        batch_size: int = 200,
+        max_batches: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute and store LSH fields for assets saved before indexing existed.
+
+        Pages through assets with lsh_bands IS NULL and writes each page with
+        one bulk_update_asset_lsh RPC call. Safe to re-run; indexed assets are
+        skipped. Stops early when a page makes no progress (nothing written,
+        or only assets an earlier page already wrote), so a write that does
+        not take effect cannot loop forever.
+
+        Returns:
+            {updated: int, batches: int}
+        """
+        from app.services.supabase_bulk_writer import SupabaseBulkWriter
+
+        client = self.supabase.client
+        updated = 0
+        batches = 0
+        seen: set = set()
+
+        def write_batch(batch: List[Dict[str, Any]]) -> int:
+            client.rpc("bulk_update_asset_lsh", {"p_rows": batch}).execute()
+            return len(batch)
+
+        while max_batches is None or batches < max_batches:
+            result = await asyncio.to_thread(
+                client.table("studio_assets")
+                .select("id, content")
+                .is_("lsh_bands", "null")
+                .limit(batch_size)
+                .execute
+            )
+            rows = result.data or []
+            if not rows:
+                break
+            ids = {row["id"] for row in rows}
+            if ids <= seen:
+                logger.warning("Asset LSH backfill made no progress", pending=len(ids))
+                break
+            seen |= ids
+
+            # Assets without words get an empty band list so they are not refetched
+            payload = [
+                {"id": row["id"], **self.compute_lsh_fields(row.get("content") or "")}
+                for row in rows
+            ]
+            writer = SupabaseBulkWriter(
+                client, "studio_assets", batch_size=batch_size, batch_fn=write_batch
+            )
+            stats = await asyncio.to_thread(writer.write, payload)
+            updated += stats.rows_written
+            batches += 1
+            if stats.rows_written == 0:
+                logger.warning("Asset LSH backfill wrote nothing", pending=len(rows))
+                break
+
+            if len(rows) < batch_size:
+                break
+
+        logger.info("Asset LSH backfill finished", updated=updated, batches=batches)
+        return {"updated": updated, "batches": batches}
+
     async def find_duplicates_for_asset(
         self,
         asset_id: str,
@@ -437,6 +437,7 @@ class AssetManagementService:
                 "version": new_version,
                 "parent_version_id": asset.id,
                 "content_hash": AssetDedupService.compute_content_hash(content),
+                **AssetDedupService.compute_lsh_fields(content),
                 "created_at": datetime.now(timezone.utc).isoformat(),
                 "updated_at": datetime.now(timezone.utc).isoformat(),
             }
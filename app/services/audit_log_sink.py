@@ -0,0 +1,398 @@
+"""
+Empire v7.3 - Audit Log Sink
+Background, batched writer for the audit_logs table
+
+AuditLoggingMiddleware used to insert one audit row per request inline, so
+every API call paid an extra Supabase round trip. The sink takes that write
+off the request path.
+
+Features:
+- Bounded in-memory queue; enqueue() never blocks the request
+- One background worker bulk-inserts batches when batch_size rows are
+  waiting or flush_interval seconds have passed since the first one
+- Batches that cannot be written (Supabase unavailable) are spilled to a
+  local append-only JSONL file, as are rows arriving while the queue is full
+- The spill file is replayed into Supabase once writes succeed again; it is
+  shared by all worker processes, so appends and replays take flock locks
+  and only one process replays at a time
+- flush() drains the queue and is run by the graceful shutdown coordinator
+
+Usage:
+    from app.services.audit_log_sink import get_audit_log_sink
+
+    get_audit_log_sink().enqueue({"event_type": "data_access", ...})
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+AUDIT_TABLE = "audit_logs"
+
+# Queued by stop() to wake the worker
+_STOP = object()
+
+
+@dataclass
+class AuditLogSinkConfig:
+    """Configuration for the audit log sink"""
+    enabled: bool = True
+    queue_size: int = 10000
+    batch_size: int = 200
+    flush_interval_seconds: float = 1.0
+    spill_path: str = "/tmp/empire_audit_spill.jsonl"
+    replay_interval_seconds: float = 30.0  # Min gap between replay attempts
+    replay_batch_size: int = 500
+
+    @classmethod
+    def from_env(cls) -> "AuditLogSinkConfig":
+        """Create config from environment variables"""
+        return cls(
+            enabled=os.getenv("AUDIT_SINK_ENABLED", "true").lower() == "true",
+            queue_size=int(os.getenv("AUDIT_SINK_QUEUE_SIZE", "10000")),
+            batch_size=int(os.getenv("AUDIT_SINK_BATCH_SIZE", "200")),
+            flush_interval_seconds=float(os.getenv("AUDIT_SINK_FLUSH_INTERVAL", "1.0")),
+            spill_path=os.getenv(
+                "AUDIT_SINK_SPILL_PATH",
+                os.path.join(os.getenv("TEMP_STORAGE_DIR", "/tmp"), "empire_audit_spill.jsonl")
+            ),
+            replay_interval_seconds=float(os.getenv("AUDIT_SINK_REPLAY_INTERVAL", "30")),
+            replay_batch_size=int(os.getenv("AUDIT_SINK_REPLAY_BATCH", "500")),
+        )
+
+
+class AuditLogSink:
+    """
+    Queue + worker that bulk-inserts audit rows
+
+    The worker belongs to the event loop that first enqueued a row; if that
+    loop goes away (tests, reloads) the next enqueue starts a new worker and
+    carries over rows still queued.
+    """
+
+    def __init__(self, config: Optional[AuditLogSinkConfig] = None, supabase=None):
+        """
+        Args:
+            config: Sink configuration (defaults to from_env())
+            supabase: Supabase client (defaults to get_supabase_client(),
+                resolved on first write)
+        """
+        self.config = config or AuditLogSinkConfig.from_env()
+        self._supabase = supabase
+        self._spill_path = Path(self.config.spill_path)
+        self._replaying_path = self._spill_path.with_name(self._spill_path.name + ".replaying")
+        # Held briefly around appends and the spill -> replaying rename
+        self._spill_lock_path = self._spill_path.with_name(self._spill_path.name + ".lock")
+        # Held (non-blocking) for a whole replay so processes never replay the same rows
+        self._replay_lock_path = self._spill_path.with_name(self._spill_path.name + ".replay.lock")
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._collecting: List[Dict[str, Any]] = []  # Batch the worker is filling
+        self._stopped = False
+        self._last_replay_attempt = 0.0
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "write_failures": 0,
+        }
+
+    # =========================================================================
+    # PRODUCER SIDE
+    # =========================================================================
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue an audit row for the background writer
+
+        Returns:
+            True if queued, False if it was spilled to disk instead
+            (queue full, sink stopped or no running event loop)
+        """
+        self.stats["enqueued"] += 1
+
+        if self._stopped or not self._ensure_worker():
+            self._spill([row])
+            return False
+
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("audit_sink_queue_full", queue_size=self.config.queue_size)
+            self._spill([row])
+            return False
+
+    def _ensure_worker(self) -> bool:
+        """Start the worker on the running loop if needed"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return True
+
+        carried = self._drain_nowait()
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.config.queue_size)
+        self._write_lock = asyncio.Lock()
+        for row in carried:
+            self._queue.put_nowait(row)
+        self._worker = loop.create_task(self._run(), name="audit-log-sink")
+        return True
+
+    def _drain_nowait(self) -> List[Dict[str, Any]]:
+        """Take the worker's partial batch and everything queued"""
+        rows, self._collecting = self._collecting, []
+        if self._queue is None:
+            return rows
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if row is not _STOP:
+                rows.append(row)
+        return rows
+
+    # =========================================================================
+    # WORKER
+    # =========================================================================
+
+    async def _run(self):
+        """Collect batches by size or time and write them until stopped"""
+        queue = self._queue
+        while not self._stopped:
+            row = await queue.get()
+            if row is not _STOP:
+                self._collecting.append(row)
+            deadline = time.monotonic() + self.config.flush_interval_seconds
+
+            while len(self._collecting) < self.config.batch_size and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if row is not _STOP:
+                    self._collecting.append(row)
+
+            if self._collecting:
+                batch, self._collecting = self._collecting, []
+                try:
+                    await self._write(batch)
+                except Exception as e:
+                    # Keep the worker alive; _write has spilled the batch unless
+                    # the failure was after the insert (e.g. during replay)
+                    logger.error("audit_sink_worker_error", rows=len(batch), error=str(e))
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """Insert one batch; spill it if Supabase is unavailable"""
+        async with self._write_lock:
+            try:
+                await asyncio.to_thread(self._insert, batch)
+            except Exception as e:
+                self.stats["write_failures"] += 1
+                logger.warning("audit_sink_write_failed", rows=len(batch), error=str(e))
+                await asyncio.to_thread(self._spill, batch)
+                return False
+
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+
+            # Supabase is reachable: bring back anything spilled earlier
+            if self._has_spilled() and time.monotonic() - self._last_replay_attempt >= self.config.replay_interval_seconds:
+                try:
+                    await self._replay_locked()
+                except Exception as e:
+                    logger.error("audit_sink_replay_error", error=str(e))
+            return True
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        if self._supabase is None:
+            from app.core.supabase_client import get_supabase_client
+            self._supabase = get_supabase_client()
+        self._supabase.table(AUDIT_TABLE).insert(rows).execute()
+
+    # =========================================================================
+    # SPILL FILE
+    # =========================================================================
+
+    @contextmanager
+    def _file_lock(self, path: Path, blocking: bool = True):
+        """
+        Exclusive flock on path, shared by every process using the spill file
+
+        Yields False if blocking is off and another process holds the lock.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _spill(self, rows: List[Dict[str, Any]]):
+        """Append rows to the spill file (one JSON object per line)"""
+        try:
+            with self._file_lock(self._spill_lock_path):
+                with open(self._spill_path, "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, default=str) + "\n")
+            self.stats["spilled"] += len(rows)
+        except OSError as e:
+            logger.error("audit_sink_spill_failed", rows=len(rows), path=str(self._spill_path), error=str(e))
+
+    def _has_spilled(self) -> bool:
+        return self._spill_path.exists() or self._replaying_path.exists()
+
+    async def replay(self) -> int:
+        """
+        Write spilled rows to Supabase
+
+        Returns:
+            Number of rows replayed
+        """
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            return await self._replay_locked()
+
+    async def _replay_locked(self) -> int:
+        self._last_replay_attempt = time.monotonic()
+        return await asyncio.to_thread(self._replay_file)
+
+    def _replay_file(self) -> int:
+        """
+        Move the spill file aside, insert its rows in batches and re-spill
+        whatever could not be written
+
+        A .replaying file left by a crash mid-replay is picked up first.
+        Returns 0 without waiting if another process is replaying.
+        """
+        with self._file_lock(self._replay_lock_path, blocking=False) as acquired:
+            if not acquired:
+                logger.debug("audit_sink_replay_in_progress_elsewhere")
+                return 0
+            return self._replay_file_locked()
+
+    def _replay_file_locked(self) -> int:
+        if not self._replaying_path.exists():
+            # Rename under the spill lock so no append lands in the file being replayed
+            with self._file_lock(self._spill_lock_path):
+                if not self._spill_path.exists():
+                    return 0
+                os.replace(self._spill_path, self._replaying_path)
+
+        rows = []
+        with open(self._replaying_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning("audit_sink_spill_line_invalid")
+
+        replayed = 0
+        size = max(self.config.replay_batch_size, 1)
+        for start in range(0, len(rows), size):
+            batch = rows[start:start + size]
+            try:
+                self._insert(batch)
+            except Exception as e:
+                logger.warning("audit_sink_replay_failed", remaining=len(rows) - start, error=str(e))
+                self._spill(rows[start:])
+                break
+            replayed += len(batch)
+
+        self._replaying_path.unlink(missing_ok=True)
+        self.stats["replayed"] += replayed
+        if replayed:
+            logger.info("audit_sink_replayed", rows=replayed)
+        return replayed
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def flush(self) -> int:
+        """
+        Write everything queued now (used on shutdown)
+
+        Returns:
+            Number of rows written
+        """
+        rows = self._drain_nowait()
+        if not rows:
+            return 0
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        written = 0
+        size = max(self.config.batch_size, 1)
+        for start in range(0, len(rows), size):
+            batch = rows[start:start + size]
+            if await self._write(batch):
+                written += len(batch)
+        return written
+
+    async def stop(self):
+        """Stop the worker and flush queued rows; later rows go to the spill file"""
+        self._stopped = True
+        if self._worker is not None and not self._worker.done():
+            try:
+                self._queue.put_nowait(_STOP)
+            except asyncio.QueueFull:
+                pass  # The worker is not waiting and checks _stopped after its write
+            try:
+                await self._worker
+            except Exception as e:
+                logger.warning("audit_sink_worker_error", error=str(e))
+        self._worker = None
+        written = await self.flush()
+        logger.info("audit_sink_stopped", flushed=written, **self.stats)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current queue depth"""
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "spill_pending": self._has_spilled(),
+        }
+
+
+# Singleton
+_audit_log_sink: Optional[AuditLogSink] = None
+
+
+def get_audit_log_sink() -> AuditLogSink:
+    global _audit_log_sink
+    if _audit_log_sink is None:
+        _audit_log_sink = AuditLogSink()
+    return _audit_log_sink
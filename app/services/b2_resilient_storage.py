@@ -6,6 +6,8 @@ Enhanced B2 storage service with comprehensive error handling:
 - SHA1 checksum verification for data integrity
 - Redis-based dead letter queue for failed operations
 - Prometheus metrics for monitoring
+- Streaming uploads: SHA1 computed incrementally while spooling to a temp
+  file, large files sent as concurrent multipart (B2 large file) uploads
 
 Author: Claude Code
 Date: 2025-01-15
@@ -17,6 +19,8 @@ import hashlib
 import time
 import asyncio
 import logging
+import tempfile
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, List, BinaryIO, Callable
 from datetime import datetime, timedelta
 from enum import Enum
@@ -106,6 +110,25 @@ DLQ_NAME = "b2_dead_letter_queue"
 CHUNK_SIZE = 8192  # For checksum calculation
 
 
+@dataclass
+class B2StreamingConfig:
+    """Configuration for streaming (constant-memory) transfers"""
+    enabled: bool = True
+    memory_threshold: int = 16 * 1024 * 1024  # Larger uploads are spooled to disk
+    chunk_size: int = 1024 * 1024  # Read size while spooling and hashing
+    spool_dir: Optional[str] = None  # Temp dir for spooled uploads (system default)
+
+    @classmethod
+    def from_env(cls) -> "B2StreamingConfig":
+        """Create config from environment variables"""
+        return cls(
+            enabled=os.getenv("B2_STREAMING_UPLOADS", "true").lower() == "true",
+            memory_threshold=int(os.getenv("B2_UPLOAD_MEMORY_THRESHOLD", str(16 * 1024 * 1024))),
+            chunk_size=int(os.getenv("B2_STREAM_CHUNK_SIZE", str(1024 * 1024))),
+            spool_dir=os.getenv("B2_UPLOAD_SPOOL_DIR") or None,
+        )
+
+
 # =============================================================================
 # DEAD LETTER QUEUE
 # =============================================================================
@@ -324,23 +347,120 @@ def calculate_sha1(data: bytes) -> str:
     return sha1.hexdigest()
 
 
-def calculate_sha1_file(file_path: str) -> str:
+def calculate_sha1_file(file_path: str, chunk_size: int = CHUNK_SIZE) -> str:
     """
     Calculate SHA1 checksum for a file.
 
     Args:
         file_path: Path to the file
+        chunk_size: Read size
 
     Returns:
         str: Hexadecimal SHA1 checksum
     """
     sha1 = hashlib.sha1()
     with open(file_path, 'rb') as f:
-        while chunk := f.read(CHUNK_SIZE):
+        while chunk := f.read(chunk_size):
             sha1.update(chunk)
     return sha1.hexdigest()
 
 
+@dataclass
+class SpooledUpload:
+    """Upload data read once from a stream, with its SHA1"""
+    sha1: str
+    size: int
+    data: Optional[bytes] = None  # Small uploads stay in memory
+    path: Optional[str] = None  # Larger uploads are spooled to this file
+    owns_path: bool = False  # Whether path is a temp file to delete
+
+    def cleanup(self) -> None:
+        """Delete the spool file, if one was created"""
+        if self.owns_path and self.path:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+def _local_path_of(file_data: BinaryIO) -> Optional[str]:
+    """Path of a file object opened on a regular file at position 0"""
+    name = getattr(file_data, "name", None)
+    if not isinstance(name, str) or not os.path.isfile(name):
+        return None
+    try:
+        return name if file_data.seekable() and file_data.tell() == 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def spool_with_sha1(
+    file_data: BinaryIO,
+    memory_threshold: int,
+    chunk_size: int = CHUNK_SIZE,
+    spool_dir: Optional[str] = None
+) -> SpooledUpload:
+    """
+    Read a stream once in chunks, computing SHA1 as it goes
+
+    Data up to memory_threshold bytes is kept in memory; beyond that it is
+    written to a temp file, so peak memory stays near memory_threshold
+    regardless of stream size. Files already on disk are hashed in place.
+    Blocking; run in a thread from async code.
+
+    Args:
+        file_data: Readable binary stream
+        memory_threshold: Maximum bytes held in memory
+        chunk_size: Read size
+        spool_dir: Directory for the temp file
+
+    Returns:
+        SpooledUpload with the data or spool path
+    """
+    local_path = _local_path_of(file_data)
+    if local_path is not None:
+        return SpooledUpload(
+            sha1=calculate_sha1_file(local_path, chunk_size),
+            size=os.path.getsize(local_path),
+            path=local_path
+        )
+
+    sha1 = hashlib.sha1()
+    size = 0
+    buffer = BytesIO()
+    spool = None
+
+    try:
+        while chunk := file_data.read(chunk_size):
+            sha1.update(chunk)
+            size += len(chunk)
+
+            if spool is None and size > memory_threshold:
+                spool = tempfile.NamedTemporaryFile(
+                    prefix="b2-upload-", dir=spool_dir, delete=False
+                )
+                spool.write(buffer.getbuffer())
+                buffer = None
+
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                buffer.write(chunk)
+
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+
+    if spool is None:
+        return SpooledUpload(sha1=sha1.hexdigest(), size=size, data=buffer.getvalue())
+
+    spool.close()
+    return SpooledUpload(sha1=sha1.hexdigest(), size=size, path=spool.name, owns_path=True)
+
+
 def _verify_checksums_match(
     local_checksum: str,
     remote_checksum: str,
@@ -392,7 +512,8 @@ class ResilientB2StorageService:
         self,
         max_retries: int = DEFAULT_MAX_RETRIES,
         min_wait: int = DEFAULT_RETRY_MIN_WAIT,
-        max_wait: int = DEFAULT_RETRY_MAX_WAIT
+        max_wait: int = DEFAULT_RETRY_MAX_WAIT,
+        streaming_config: Optional[B2StreamingConfig] = None
     ):
         """
         Initialize resilient B2 storage service.
@@ -401,8 +522,10 @@ class ResilientB2StorageService:
             max_retries: Maximum retry attempts
             min_wait: Minimum wait between retries (seconds)
             max_wait: Maximum wait between retries (seconds)
+            streaming_config: Streaming transfer settings (from env if None)
         """
         self.b2_service = get_b2_service()
+        self.streaming_config = streaming_config or B2StreamingConfig.from_env()
         self.dead_letter_queue = B2DeadLetterQueue()
         self.max_retries = max_retries
         self.min_wait = min_wait
@@ -412,6 +535,7 @@ class ResilientB2StorageService:
         self._stats = {
             "uploads_successful": 0,
             "uploads_failed": 0,
+            "uploads_streamed": 0,
             "downloads_successful": 0,
             "downloads_failed": 0,
             "checksum_verifications": 0,
@@ -448,11 +572,19 @@ class ResilientB2StorageService:
         metadata: Optional[dict] = None,
         encrypt: bool = False,
         encryption_password: Optional[str] = None,
-        verify_checksum: bool = True
+        verify_checksum: bool = True,
+        streaming: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Upload a file with retry logic and checksum verification.
 
+        In streaming mode (the default, B2_STREAMING_UPLOADS) the file is read
+        once in chunks while its SHA1 is computed; uploads above
+        memory_threshold are spooled to a temp file (or read in place when
+        file_data is a file on disk) and uploaded from disk, as a concurrent
+        multipart large file when big enough. Encrypted uploads use the
+        in-memory path because encryption needs the whole payload.
+
         Args:
             file_data: File-like object to upload
             filename: Name of the file
@@ -462,6 +594,7 @@ class ResilientB2StorageService:
             encrypt: Whether to encrypt
             encryption_password: Encryption password
             verify_checksum: Whether to verify checksum after upload
+            streaming: Override streaming mode (None uses the configured default)
 
         Returns:
             Dict with upload result
@@ -474,12 +607,28 @@ class ResilientB2StorageService:
         retry_count = 0
         last_error = None
 
-        # Read file data for checksum calculation
-        file_bytes = file_data.read()
-        local_checksum = calculate_sha1(file_bytes) if verify_checksum else None
+        spooled: Optional[SpooledUpload] = None
+        if streaming is None:
+            streaming = self.streaming_config.enabled
+
+        if streaming and not encrypt:
+            spooled = await asyncio.to_thread(
+                spool_with_sha1,
+                file_data,
+                self.streaming_config.memory_threshold,
+                self.streaming_config.chunk_size,
+                self.streaming_config.spool_dir
+            )
+            local_checksum = spooled.sha1
+            if spooled.path is None:
+                file_data = BytesIO(spooled.data)
+        else:
+            # Read file data for checksum calculation
+            file_bytes = file_data.read()
+            local_checksum = calculate_sha1(file_bytes) if verify_checksum else None
 
-        # Reset file position
-        file_data = BytesIO(file_bytes)
+            # Reset file position
+            file_data = BytesIO(file_bytes)
 
         try:
             # Create retry wrapper
@@ -490,6 +639,16 @@ class ResilientB2StorageService:
                 if retry_count > 1:
                     B2_RETRY_COUNTER.labels(operation_type="upload").inc()
 
+                if spooled is not None and spooled.path is not None:
+                    return await self.b2_service.upload_local_file(
+                        local_path=spooled.path,
+                        filename=filename,
+                        folder=folder,
+                        content_type=content_type,
+                        metadata=dict(metadata) if metadata else None,
+                        sha1_sum=spooled.sha1
+                    )
+
                 # Reset BytesIO position for retry
                 file_data.seek(0)
 
@@ -505,8 +664,9 @@ class ResilientB2StorageService:
 
             result = await _do_upload()
 
-            # Verify checksum if requested
-            if verify_checksum and local_checksum:
+            # Verify checksum if requested (B2 hashes the ciphertext of
+            # encrypted uploads, so those cannot be compared)
+            if verify_checksum and local_checksum and not encrypt:
                 # B2 stores SHA1 in content_sha1 field
                 remote_checksum = result.get("content_sha1")
                 if remote_checksum:
@@ -520,12 +680,16 @@ class ResilientB2StorageService:
             B2_OPERATION_LATENCY.labels(operation_type="upload").observe(duration)
 
             self._stats["uploads_successful"] += 1
+            if spooled is not None and spooled.path is not None:
+                self._stats["uploads_streamed"] += 1
 
             logger.info(
                 "File uploaded successfully",
                 filename=filename,
                 retry_count=retry_count,
-                duration=duration
+                duration=duration,
+                size=spooled.size if spooled is not None else None,
+                from_disk=spooled is not None and spooled.path is not None
             )
 
             return result
@@ -580,6 +744,10 @@ class ResilientB2StorageService:
             logger.error("Upload failed", filename=filename, error=str(e))
             raise
 
+        finally:
+            if spooled is not None:
+                spooled.cleanup()
+
     async def download_file(
         self,
         file_id: str,
@@ -627,7 +795,12 @@ class ResilientB2StorageService:
 
             # Verify checksum if requested
             if verify_checksum and os.path.exists(destination_path):
-                local_checksum = calculate_sha1_file(destination_path)
+                # Hash in chunks off the event loop; the file may be many GB
+                local_checksum = await asyncio.to_thread(
+                    calculate_sha1_file,
+                    destination_path,
+                    self.streaming_config.chunk_size
+                )
 
                 if expected_checksum:
                     _verify_checksums_match(local_checksum, expected_checksum, destination_path)
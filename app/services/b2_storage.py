@@ -4,6 +4,7 @@ Handles file uploads to B2 with folder structure management
 """
 
 import os
+import asyncio
 from typing import Optional, BinaryIO, List, Dict, Any
 from enum import Enum
 from datetime import datetime, timedelta
@@ -82,8 +83,16 @@ class B2StorageService:
             )
 
         # Initialize B2 API
+        # Large files are uploaded as concurrent parts and downloaded as
+        # concurrent ranged streams by b2sdk's transfer managers
+        download_streams = os.getenv("B2_DOWNLOAD_STREAMS_PER_FILE")
         self.info = InMemoryAccountInfo()
-        self.b2_api = B2Api(self.info)
+        self.b2_api = B2Api(
+            self.info,
+            max_upload_workers=int(os.getenv("B2_MAX_UPLOAD_WORKERS", "10")),
+            max_download_workers=int(os.getenv("B2_MAX_DOWNLOAD_WORKERS", "10")),
+            max_download_streams_per_file=int(download_streams) if download_streams else None
+        )
         self._bucket = None
         self._is_authorized = False
 
@@ -246,6 +255,7 @@ class B2StorageService:
                 "content_type": file_version.content_type,
                 "upload_timestamp": file_version.upload_timestamp,
                 "url": self.b2_api.get_download_url_for_file_name(self.bucket_name, file_path),
+                "content_sha1": _version_sha1(file_version),
                 "encrypted": encrypt,
                 "encryption_metadata": encryption_metadata if encrypt else None
             }
@@ -257,6 +267,79 @@ class B2StorageService:
             logger.error(f"B2 upload failed for {filename}: {e}")
             raise
 
+    async def upload_local_file(
+        self,
+        local_path: str,
+        filename: str,
+        folder: B2Folder = B2Folder.PENDING,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        sha1_sum: Optional[str] = None
+    ) -> dict:
+        """
+        Upload a file from local disk without reading it into memory
+
+        b2sdk streams the file from disk; files larger than the account's
+        recommended part size are uploaded as a B2 large file with parts sent
+        concurrently (B2_MAX_UPLOAD_WORKERS). Runs in a worker thread.
+
+        Args:
+            local_path: Path of the file to upload
+            filename: Name of the file in B2
+            folder: Destination folder in B2 (default: pending/courses)
+            content_type: MIME type of the file
+            metadata: Optional metadata dictionary
+            sha1_sum: Precomputed SHA1 (saves b2sdk a pass over the file and
+                is recorded as large_file_sha1 for multipart uploads)
+
+        Returns:
+            dict: Upload result with file_id, file_name, url and content_sha1
+
+        Raises:
+            B2Error: If upload fails
+        """
+        try:
+            bucket = self._get_bucket()
+
+            folder_path = folder.value if isinstance(folder, B2Folder) else folder
+            file_path = f"{folder_path}/{filename}"
+
+            file_info = metadata or {}
+            file_info.update({
+                "uploaded_by": "empire_v7.3",
+                "folder": folder_path
+            })
+
+            logger.info(f"Uploading {local_path} to {file_path}")
+
+            file_version = await asyncio.to_thread(
+                bucket.upload_local_file,
+                local_file=local_path,
+                file_name=file_path,
+                content_type=content_type,
+                file_info=file_info,
+                sha1_sum=sha1_sum
+            )
+
+            result = {
+                "file_id": file_version.id_,
+                "file_name": file_version.file_name,
+                "size": file_version.size,
+                "content_type": file_version.content_type,
+                "upload_timestamp": file_version.upload_timestamp,
+                "url": self.b2_api.get_download_url_for_file_name(self.bucket_name, file_path),
+                "content_sha1": _version_sha1(file_version),
+                "encrypted": False,
+                "encryption_metadata": None
+            }
+
+            logger.info(f"Successfully uploaded {filename} (ID: {file_version.id_}) from disk")
+            return result
+
+        except B2Error as e:
+            logger.error(f"B2 upload failed for {filename}: {e}")
+            raise
+
     async def list_files(self, folder: str = "pending/courses", limit: int = 100) -> list:
         """
         List files in a specific folder
@@ -368,9 +451,13 @@ class B2StorageService:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(destination_path), exist_ok=True)
 
-            # Download file
-            downloaded_file = bucket.download_file_by_id(file_id)
-            downloaded_file.save_to(destination_path)
+            # Download file (streamed to disk in a worker thread; large files
+            # are fetched as concurrent ranged streams)
+            def _download():
+                downloaded_file = bucket.download_file_by_id(file_id)
+                downloaded_file.save_to(destination_path)
+
+            await asyncio.to_thread(_download)
 
             logger.info(f"Downloaded file {file_name} to {destination_path}")
             return True
@@ -745,6 +832,22 @@ class B2StorageService:
             raise
 
 
+def _version_sha1(file_version) -> Optional[str]:
+    """
+    SHA1 recorded by B2 for an uploaded file
+
+    Large (multipart) files have content_sha1 "none"; their whole-file SHA1
+    is kept in the large_file_sha1 file info when it was known at upload.
+    Hashes sent after the data are reported with an "unverified:" prefix.
+    """
+    sha1 = getattr(file_version, "content_sha1", None)
+    if isinstance(sha1, str) and sha1 != "none":
+        return sha1.replace("unverified:", "", 1)
+    file_info = getattr(file_version, "file_info", None) or {}
+    large_file_sha1 = file_info.get("large_file_sha1") if isinstance(file_info, dict) else None
+    return large_file_sha1 if isinstance(large_file_sha1, str) else None
+
+
 # Singleton instance
 _b2_service = None
 
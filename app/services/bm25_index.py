@@ -0,0 +1,657 @@
+"""
+Empire v7.3 - BM25 Sparse Index
+
+In-process inverted index used by HybridSearchService for sparse (BM25)
+retrieval when the PostgreSQL RPC path is unavailable.
+
+Features:
+- True Okapi BM25 with corpus IDF and average document length
+- Posting lists in document order with WAND top-k pruning
+- Incremental add/remove (removals are tombstoned and compacted lazily;
+  document frequencies are kept as live counters)
+- One index over the chunks table, built in the background with keyset
+  pagination and snapshotted to disk so restarts do not rescan Supabase
+- Freshness: a row trigger logs every chunk insert, update and delete in
+  chunk_changes; the manager applies the changes after the last sequence it
+  saw with add_document/remove_document. A full rebuild only happens on a
+  cold start, after TRUNCATE, or for drift repair (log pruned past the
+  index, or repair_seconds elapsed). Without the change log RPCs the index
+  is rebuilt once it is older than max_age_seconds
+
+Usage:
+    from app.services.bm25_index import get_bm25_index_manager
+
+    manager = get_bm25_index_manager()
+    await manager.warm(supabase)                # At startup
+    index = manager.get_index(supabase)         # None until the first build finishes
+                                                # (callers fall back to SQL search)
+    hits = index.search("insurance policy", k=20)
+"""
+
+import asyncio
+import gzip
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "to", "was",
+    "were", "will", "with"
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    return [t for t in TOKEN_PATTERN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+@dataclass
+class BM25Config:
+    """BM25 parameters and index maintenance settings"""
+    k1: float = 1.2
+    b: float = 0.75
+    compact_ratio: float = 0.2          # Compact when tombstones exceed 20% of docs
+    build_page_size: int = 1000         # Rows per keyset page when building from Supabase
+    snapshot_dir: Optional[str] = None  # Directory for on-disk snapshots (None = disabled)
+    refresh_seconds: float = 30.0       # How often searches pull chunk changes
+    repair_seconds: float = 86400.0     # Full rebuild age (drift repair)
+    max_age_seconds: float = 900.0      # Rebuild age when the change log is unavailable
+    change_retention: str = "7 days"    # chunk_changes kept after a rebuild
+
+    @classmethod
+    def from_env(cls) -> "BM25Config":
+        """Create config from environment variables"""
+        return cls(
+            k1=float(os.getenv("BM25_K1", "1.2")),
+            b=float(os.getenv("BM25_B", "0.75")),
+            build_page_size=int(os.getenv("BM25_BUILD_PAGE_SIZE", "1000")),
+            snapshot_dir=os.getenv("BM25_SNAPSHOT_DIR") or None,
+            refresh_seconds=float(os.getenv("BM25_REFRESH_SECONDS", "30")),
+            repair_seconds=float(os.getenv("BM25_REPAIR_SECONDS", "86400")),
+            max_age_seconds=float(os.getenv("BM25_MAX_AGE_SECONDS", "900")),
+            change_retention=os.getenv("BM25_CHANGE_RETENTION", "7 days"),
+        )
+
+
+class _Cursor:
+    """Iterator over one term's posting list"""
+
+    __slots__ = ("docs", "tfs", "pos", "idf", "upper_bound")
+
+    def __init__(self, docs: List[int], tfs: List[int], idf: float, upper_bound: float):
+        self.docs = docs
+        self.tfs = tfs
+        self.pos = 0
+        self.idf = idf
+        self.upper_bound = upper_bound
+
+    @property
+    def doc(self) -> Optional[int]:
+        return self.docs[self.pos] if self.pos < len(self.docs) else None
+
+    def advance_to(self, target: int):
+        self.pos = bisect_left(self.docs, target, self.pos)
+
+
+class BM25Index:
+    """
+    Inverted index with BM25 scoring and WAND top-k retrieval
+
+    Documents get monotonically increasing ordinals, so appending to a
+    posting list keeps it sorted. Removed documents are tombstoned and
+    dropped from posting lists on compaction; document frequencies count
+    live documents only, so IDF does not depend on the tombstones.
+    """
+
+    def __init__(self, config: Optional[BM25Config] = None):
+        self.config = config or BM25Config()
+        self._lock = threading.RLock()
+
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._doc_freqs: Dict[str, int] = {}        # term -> live documents containing it
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}  # ordinal -> distinct terms
+        self._doc_ids: Dict[int, str] = {}          # ordinal -> chunk id
+        self._ordinals: Dict[str, int] = {}         # chunk id -> ordinal
+        self._doc_lengths: Dict[int, int] = {}
+        self._doc_meta: Dict[int, Dict[str, Any]] = {}
+        self._tombstones: set = set()
+        self._next_ordinal = 0
+        self._total_length = 0
+
+        # Last chunk_changes sequence applied (None = change log not used)
+        self.change_seq: Optional[int] = None
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._ordinals
+
+    @property
+    def avg_doc_length(self) -> float:
+        return self._total_length / len(self._ordinals) if self._ordinals else 0.0
+
+    def idf(self, term: str) -> float:
+        """BM25 IDF (always non-negative variant)"""
+        df = self._doc_freqs.get(term, 0)
+        if not df:
+            return 0.0
+        n = len(self._ordinals)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def add_document(
+        self,
+        doc_id: str,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Add or replace a document"""
+        tokens = tokenize(text)
+        with self._lock:
+            if doc_id in self._ordinals:
+                self._remove_locked(doc_id)
+
+            ordinal = self._next_ordinal
+            self._next_ordinal += 1
+
+            term_freqs: Dict[str, int] = {}
+            for token in tokens:
+                term_freqs[token] = term_freqs.get(token, 0) + 1
+
+            for term, tf in term_freqs.items():
+                docs, tfs = self._postings.setdefault(term, ([], []))
+                docs.append(ordinal)
+                tfs.append(tf)
+                self._doc_freqs[term] = self._doc_freqs.get(term, 0) + 1
+
+            self._doc_terms[ordinal] = tuple(term_freqs)
+            self._doc_ids[ordinal] = doc_id
+            self._ordinals[doc_id] = ordinal
+            self._doc_lengths[ordinal] = len(tokens)
+            self._doc_meta[ordinal] = metadata or {}
+            self._total_length += len(tokens)
+
+    def add_documents(self, documents: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]):
+        """Add many (doc_id, text, metadata) tuples"""
+        for doc_id, text, metadata in documents:
+            self.add_document(doc_id, text, metadata)
+
+    def remove_document(self, doc_id: str) -> bool:
+        """Remove a document; returns True if it was indexed"""
+        with self._lock:
+            removed = self._remove_locked(doc_id)
+            if removed:
+                if len(self._tombstones) > self.config.compact_ratio * max(len(self._ordinals), 1):
+                    self._compact_locked()
+            return removed
+
+    def _remove_locked(self, doc_id: str) -> bool:
+        ordinal = self._ordinals.pop(doc_id, None)
+        if ordinal is None:
+            return False
+        self._tombstones.add(ordinal)
+        for term in self._doc_terms.pop(ordinal, ()):
+            remaining = self._doc_freqs[term] - 1
+            if remaining:
+                self._doc_freqs[term] = remaining
+            else:
+                del self._doc_freqs[term]
+        self._total_length -= self._doc_lengths.pop(ordinal, 0)
+        self._doc_meta.pop(ordinal, None)
+        self._doc_ids.pop(ordinal, None)
+        return True
+
+    def _compact_locked(self):
+        """Drop tombstoned ordinals from posting lists"""
+        if not self._tombstones:
+            return
+        dead = self._tombstones
+        for term in list(self._postings):
+            docs, tfs = self._postings[term]
+            kept = [(d, tf) for d, tf in zip(docs, tfs) if d not in dead]
+            if kept:
+                self._postings[term] = ([d for d, _ in kept], [tf for _, tf in kept])
+            else:
+                del self._postings[term]
+        self._tombstones = set()
+
+    def get_metadata(self, doc_id: str) -> Dict[str, Any]:
+        ordinal = self._ordinals.get(doc_id)
+        return self._doc_meta.get(ordinal, {}) if ordinal is not None else {}
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        doc_filter: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k BM25 search using WAND
+
+        Args:
+            query: Query text
+            k: Number of results
+            doc_filter: Optional predicate on document metadata
+
+        Returns:
+            List of (doc_id, score) sorted by score descending
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or k <= 0:
+            return []
+
+        with self._lock:
+            if not self._ordinals:
+                return []
+
+            k1, b = self.config.k1, self.config.b
+            avgdl = self.avg_doc_length or 1.0
+
+            cursors = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = self.idf(term)
+                # tf component of BM25 is bounded by (k1 + 1)
+                cursors.append(_Cursor(postings[0], postings[1], idf, idf * (k1 + 1)))
+
+            heap: List[Tuple[float, int]] = []
+            threshold = 0.0
+
+            while True:
+                cursors = [c for c in cursors if c.doc is not None]
+                if not cursors:
+                    break
+                cursors.sort(key=lambda c: c.doc)
+
+                # Find pivot: first cursor where cumulative upper bound beats threshold
+                accumulated = 0.0
+                pivot = None
+                for i, cursor in enumerate(cursors):
+                    accumulated += cursor.upper_bound
+                    if accumulated > threshold:
+                        pivot = i
+                        break
+                if pivot is None:
+                    break
+
+                pivot_doc = cursors[pivot].doc
+
+                if cursors[0].doc == pivot_doc:
+                    score = 0.0
+                    doc_len = self._doc_lengths.get(pivot_doc, 0)
+                    norm = k1 * (1 - b + b * doc_len / avgdl)
+                    for cursor in cursors:
+                        if cursor.doc != pivot_doc:
+                            break
+                        tf = cursor.tfs[cursor.pos]
+                        score += cursor.idf * tf * (k1 + 1) / (tf + norm)
+                        cursor.pos += 1
+
+                    if pivot_doc in self._tombstones:
+                        continue
+                    if doc_filter and not doc_filter(self._doc_meta.get(pivot_doc, {})):
+                        continue
+
+                    if len(heap) < k:
+                        heapq.heappush(heap, (score, pivot_doc))
+                    elif score > heap[0][0]:
+                        heapq.heapreplace(heap, (score, pivot_doc))
+                    if len(heap) == k:
+                        threshold = heap[0][0]
+                else:
+                    for cursor in cursors[:pivot]:
+                        cursor.advance_to(pivot_doc)
+
+            ranked = sorted(heap, key=lambda item: (-item[0], item[1]))
+            return [(self._doc_ids[ordinal], score) for score, ordinal in ranked]
+
+    # =========================================================================
+    # Snapshots
+    # =========================================================================
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dict (compacted)"""
+        with self._lock:
+            self._compact_locked()
+            return {
+                "version": 1,
+                "change_seq": self.change_seq,
+                "built_at": self.built_at,
+                "next_ordinal": self._next_ordinal,
+                "docs": [
+                    [ordinal, doc_id, self._doc_lengths[ordinal], self._doc_meta.get(ordinal, {})]
+                    for ordinal, doc_id in self._doc_ids.items()
+                ],
+                "postings": {term: [docs, tfs] for term, (docs, tfs) in self._postings.items()},
+            }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any], config: Optional[BM25Config] = None) -> "BM25Index":
+        """Restore an index saved with to_snapshot"""
+        index = cls(config)
+        index._next_ordinal = data["next_ordinal"]
+        index.change_seq = data.get("change_seq")
+        index.built_at = data.get("built_at", 0.0)
+        for ordinal, doc_id, length, metadata in data["docs"]:
+            index._doc_ids[ordinal] = doc_id
+            index._ordinals[doc_id] = ordinal
+            index._doc_lengths[ordinal] = length
+            index._doc_meta[ordinal] = metadata
+            index._total_length += length
+        index._postings = {
+            term: (list(docs), list(tfs)) for term, (docs, tfs) in data["postings"].items()
+        }
+        # Snapshots are compacted, so every posting is a live document
+        doc_terms: Dict[int, List[str]] = {}
+        for term, (docs, _) in index._postings.items():
+            index._doc_freqs[term] = len(docs)
+            for ordinal in docs:
+                doc_terms.setdefault(ordinal, []).append(term)
+        index._doc_terms = {ordinal: tuple(terms) for ordinal, terms in doc_terms.items()}
+        return index
+
+    def save(self, path: str):
+        """Atomically write a gzipped JSON snapshot"""
+        snapshot = self.to_snapshot()
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, config: Optional[BM25Config] = None) -> "BM25Index":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls.from_snapshot(json.load(f), config)
+
+
+# =============================================================================
+# Index manager
+# =============================================================================
+
+class BM25IndexManager:
+    """
+    Owns the chunks BM25 index and keeps it in sync with the database
+
+    Searches never build the index themselves: get_index() returns the
+    current index (None before the first build) and, at most every
+    refresh_seconds, schedules a background refresh that applies the chunk
+    changes logged since the last one.
+    """
+
+    SNAPSHOT_NAME = "bm25_chunks.json.gz"
+
+    def __init__(self, config: Optional[BM25Config] = None):
+        self.config = config or BM25Config.from_env()
+        self._index: Optional[BM25Index] = None
+        self._checked_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _snapshot_path(self) -> Optional[str]:
+        if not self.config.snapshot_dir:
+            return None
+        return os.path.join(self.config.snapshot_dir, self.SNAPSHOT_NAME)
+
+    def peek(self) -> Optional[BM25Index]:
+        """Return the index if it is already loaded"""
+        return self._index
+
+    def get_index(self, supabase) -> Optional[BM25Index]:
+        """
+        Current index, scheduling a background refresh when one is due
+
+        Returns:
+            The loaded index, or None while the first build is running
+        """
+        if time.monotonic() - self._checked_at >= self.config.refresh_seconds:
+            self.start_refresh(supabase)
+        return self._index
+
+    def start_refresh(self, supabase) -> asyncio.Task:
+        """Start a background refresh unless one is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._checked_at = time.monotonic()
+            self._refresh_task = asyncio.create_task(self.refresh(supabase), name="bm25-index-refresh")
+        return self._refresh_task
+
+    async def warm(self, supabase) -> Optional[BM25Index]:
+        """Load or build the index (for startup); returns it when ready"""
+        await self.start_refresh(supabase)
+        return self._index
+
+    async def refresh(self, supabase) -> bool:
+        """
+        Bring the index up to date with the chunks table
+
+        Applies chunk_changes after the index's sequence number; rebuilds
+        from scratch only when there is no usable index or snapshot, after
+        a TRUNCATE, or for drift repair.
+
+        Returns:
+            True if the index was loaded, rebuilt or changed
+        """
+        try:
+            head = await self._change_head(supabase)
+            if head is None:
+                return await self._refresh_by_age(supabase)
+            first_seq, last_seq = head
+
+            loaded = False
+            if self._index is None:
+                snapshot = await self._load_snapshot()
+                if snapshot is not None and self._can_catch_up(snapshot, first_seq):
+                    self._index = snapshot
+                    loaded = True
+
+            index = self._index
+            if index is None or not self._can_catch_up(index, first_seq) \
+                    or time.time() - index.built_at >= self.config.repair_seconds:
+                await self._rebuild(supabase, last_seq)
+                return True
+
+            applied = await self._apply_changes(supabase, index)
+            if applied is None:
+                await self._rebuild(supabase, last_seq)
+                return True
+            return loaded or applied > 0
+
+        except Exception as e:
+            logger.error(f"BM25 index refresh failed: {e}")
+            return False
+
+    @staticmethod
+    def _can_catch_up(index: BM25Index, first_seq: int) -> bool:
+        """Whether the log still holds every change after the index's sequence"""
+        if index.change_seq is None:
+            return False
+        return first_seq == 0 or index.change_seq >= first_seq - 1
+
+    async def _refresh_by_age(self, supabase) -> bool:
+        """Rebuild on age alone (change log RPCs not deployed)"""
+        if self._index is None:
+            snapshot = await self._load_snapshot()
+            if snapshot is not None and not self._too_old(snapshot):
+                self._index = snapshot
+                return True
+        if self._index is not None and not self._too_old(self._index):
+            return False
+        index = await self._build(supabase)
+        self._index = index
+        await asyncio.to_thread(self._save, index)
+        return True
+
+    def _too_old(self, index: BM25Index) -> bool:
+        return time.time() - index.built_at >= self.config.max_age_seconds
+
+    async def _rebuild(self, supabase, last_seq: int):
+        """
+        Full rebuild (cold start or drift repair)
+
+        last_seq is read before the scan, so changes written during it are
+        applied on top afterwards; applying a change twice is harmless.
+        """
+        while True:
+            index = await self._build(supabase)
+            index.change_seq = last_seq
+            if await self._apply_changes(supabase, index) is not None:
+                break
+            # Truncated during the scan; scan again
+            last_seq = await self._last_seq(supabase, last_seq)
+        self._index = index
+        await asyncio.to_thread(self._save, index)
+        await self._prune_changes(supabase)
+
+    async def _apply_changes(self, supabase, index: BM25Index) -> Optional[int]:
+        """
+        Apply logged chunk changes after index.change_seq
+
+        Returns:
+            Number of changes applied, or None if a TRUNCATE was logged
+            (the index must be rebuilt)
+        """
+        applied = 0
+        while True:
+            result = await supabase.rpc(
+                "get_chunk_changes",
+                {"p_after_seq": index.change_seq, "p_limit": self.config.build_page_size}
+            ).execute()
+            rows = result.data or []
+            for row in rows:
+                op = row["op"]
+                if op == "T":
+                    return None
+                if op == "D":
+                    index.remove_document(str(row["chunk_id"]))
+                else:
+                    index.add_document(str(row["chunk_id"]), row.get("content") or "", _index_metadata(row))
+                index.change_seq = row["seq"]
+                applied += 1
+            if len(rows) < self.config.build_page_size:
+                break
+
+        if applied:
+            logger.debug(f"Applied {applied} chunk changes to BM25 index (seq={index.change_seq})")
+        return applied
+
+    async def _change_head(self, supabase) -> Optional[Tuple[int, int]]:
+        """(first_seq, last_seq) of chunk_changes, or None if the RPC is unavailable"""
+        try:
+            result = await supabase.rpc("get_chunk_changes_head").execute()
+            head = result.data or {}
+            return int(head.get("first_seq") or 0), int(head.get("last_seq") or 0)
+        except Exception as e:
+            logger.debug(f"Chunk change log unavailable, using max age: {e}")
+            return None
+
+    async def _last_seq(self, supabase, default: int) -> int:
+        head = await self._change_head(supabase)
+        return head[1] if head is not None else default
+
+    async def _prune_changes(self, supabase):
+        """Drop change log rows older than change_retention"""
+        try:
+            await supabase.rpc(
+                "prune_chunk_changes", {"p_keep": self.config.change_retention}
+            ).execute()
+        except Exception as e:
+            logger.debug(f"Failed to prune chunk_changes: {e}")
+
+    async def _load_snapshot(self) -> Optional[BM25Index]:
+        path = self._snapshot_path()
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            index = await asyncio.to_thread(BM25Index.load, path, self.config)
+            logger.info(f"Loaded BM25 snapshot ({len(index)} docs)")
+            return index
+        except Exception as e:
+            logger.warning(f"Failed to load BM25 snapshot {path}: {e}")
+            return None
+
+    async def _build(self, supabase) -> BM25Index:
+        """Build an index from the chunks table using keyset pagination"""
+        start = time.time()
+        index = BM25Index(self.config)
+        last_id = None
+
+        while True:
+            query = supabase.table("chunks").select("id, content, metadata, file_id")
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            result = await query.order("id").limit(self.config.build_page_size).execute()
+
+            rows = result.data or []
+            for row in rows:
+                index.add_document(str(row["id"]), row.get("content", ""), _index_metadata(row))
+            if len(rows) < self.config.build_page_size:
+                break
+            last_id = rows[-1]["id"]
+
+        index.built_at = time.time()
+        logger.info(
+            f"Built BM25 index: {len(index)} docs, "
+            f"avgdl={index.avg_doc_length:.1f}, {(time.time() - start) * 1000:.0f}ms"
+        )
+        return index
+
+    def _save(self, index: BM25Index):
+        path = self._snapshot_path()
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            index.save(path)
+        except Exception as e:
+            logger.warning(f"Failed to save BM25 snapshot {path}: {e}")
+
+    def remove_chunks(self, chunk_ids: Iterable[str]):
+        """Drop chunks found to be deleted before their change is pulled"""
+        if self._index is None:
+            return
+        for chunk_id in chunk_ids:
+            self._index.remove_document(str(chunk_id))
+
+    def reset(self):
+        """Forget the loaded index so the next refresh rebuilds it"""
+        self._index = None
+        self._checked_at = 0.0
+
+
+def _index_metadata(row: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = dict(row.get("metadata") or {})
+    if row.get("file_id"):
+        metadata["_file_id"] = str(row["file_id"])
+    return metadata
+
+
+# Singleton instance
+_bm25_index_manager: Optional[BM25IndexManager] = None
+
+
+def get_bm25_index_manager() -> BM25IndexManager:
+    """Get or create singleton BM25 index manager"""
+    global _bm25_index_manager
+    if _bm25_index_manager is None:
+        _bm25_index_manager = BM25IndexManager()
+    return _bm25_index_manager
+
+
+def reset_bm25_index_manager():
+    """Reset singleton for testing"""
+    global _bm25_index_manager
+    _bm25_index_manager = None
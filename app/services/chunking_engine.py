@@ -0,0 +1,410 @@
+"""
+Empire v7.3 - Executor-backed Chunking Engine
+Run CPU-bound chunking (SentenceSplitter, header regex splitting) off the event loop
+
+Features:
+- Configurable ProcessPoolExecutor using the spawn start method, so workers
+  never inherit a forked copy of the API process (its threads, locks and
+  event loop); thread pool inside daemonic processes such as Celery prefork
+  workers, which cannot start children
+- Many documents chunked in parallel
+- Large documents split into segments (at top-level markdown headers or
+  paragraph breaks) and chunked in parallel
+- Chunks streamed back in document order as segments complete, with
+  chunk_index and character/line offsets rebased to the whole document
+
+Usage:
+    from app.services.chunking_engine import get_chunking_engine
+
+    engine = get_chunking_engine()
+    async for chunk in engine.stream_chunks(text, document_id="doc-1"):
+        ...
+
+    # Any picklable top-level function over text segments
+    pieces = await engine.map_segments(split_fn, text, 512)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.chunking_service import (
+    HEADER_PATTERN,
+    Chunk,
+    MarkdownChunkerConfig,
+    MarkdownChunkerStrategy,
+    SemanticChunker,
+    resolve_auto_strategy,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkingEngineConfig:
+    """Configuration for the chunking engine"""
+    max_workers: int = max((os.cpu_count() or 2) - 1, 1)
+    use_processes: bool = True
+    segment_chars: int = 100_000      # Target segment size for large documents
+    offload_min_chars: int = 50_000   # Smaller texts are chunked inline
+
+    @classmethod
+    def from_env(cls) -> "ChunkingEngineConfig":
+        """Create config from environment variables"""
+        default_workers = max((os.cpu_count() or 2) - 1, 1)
+        return cls(
+            max_workers=int(os.getenv("CHUNKING_MAX_WORKERS", str(default_workers))),
+            use_processes=os.getenv("CHUNKING_USE_PROCESSES", "true").lower() == "true",
+            segment_chars=int(os.getenv("CHUNKING_SEGMENT_CHARS", "100000")),
+            offload_min_chars=int(os.getenv("CHUNKING_OFFLOAD_MIN_CHARS", "50000")),
+        )
+
+
+@dataclass
+class ChunkJob:
+    """One document to chunk"""
+    document_id: str
+    text: str
+    strategy: str = "auto"  # auto, markdown, sentence
+    chunk_size: int = 1024
+    chunk_overlap: int = 200
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class TextSegment:
+    """A slice of a larger document"""
+    text: str
+    start_char: int
+    start_line: int
+
+
+# ============================================================================
+# Worker functions (top-level so they can be pickled)
+# ============================================================================
+
+def chunk_segment(
+    strategy: str,
+    text: str,
+    document_id: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    metadata: Optional[Dict[str, Any]] = None
+) -> List[Chunk]:
+    """Chunk one text with a concrete strategy (runs inside the executor)"""
+    if strategy == "markdown":
+        # Segments start at a header, so a single header is enough structure
+        chunker = MarkdownChunkerStrategy(MarkdownChunkerConfig(
+            max_chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            min_headers_threshold=1
+        ))
+        return list(chunker.iter_chunks(text, document_id, metadata))
+
+    chunker = SemanticChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return list(chunker.iter_chunks(text, document_id, metadata))
+
+
+def _call(fn: Callable, args: Tuple) -> Any:
+    return fn(*args)
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+class ChunkingEngine:
+    """Executor-backed chunking for large and many documents"""
+
+    def __init__(self, config: Optional[ChunkingEngineConfig] = None):
+        self.config = config or ChunkingEngineConfig.from_env()
+        self._executor: Optional[Executor] = None
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def uses_processes(self) -> bool:
+        """Whether work runs in a process pool (False inside daemonic processes)"""
+        return self.config.use_processes and not multiprocessing.current_process().daemon
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.uses_processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = self._get_thread_executor()
+        return self._executor
+
+    def _get_thread_executor(self) -> ThreadPoolExecutor:
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.config.max_workers,
+                thread_name_prefix="chunking"
+            )
+        return self._thread_executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) in the executor without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, _call, fn, args)
+        except BrokenProcessPool:
+            logger.warning("Chunking process pool broke, recreating it")
+            # Other in-flight calls may have already replaced the broken pool
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            return await loop.run_in_executor(self._get_executor(), _call, fn, args)
+
+    async def map(self, fn: Callable, items: Sequence[Any], *args) -> List[Any]:
+        """Run fn(item, *args) for every item in parallel; results in input order"""
+        return list(await asyncio.gather(*(self.run(fn, item, *args) for item in items)))
+
+    async def stream(
+        self,
+        fn: Callable,
+        items: Sequence[Any],
+        *args
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Run fn(item, *args) for every item in parallel, yielding (index, result)
+        in input order as soon as each result and all earlier ones are ready
+        """
+        tasks = [asyncio.ensure_future(self.run(fn, item, *args)) for item in items]
+        try:
+            for index, task in enumerate(tasks):
+                yield index, await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def map_segments(self, fn: Callable, text: str, *args) -> List[Any]:
+        """
+        Apply a list-returning fn(segment_text, *args) to the segments of text
+        in parallel and concatenate the results in document order
+        """
+        segments = self.split_segments(text)
+        if len(segments) == 1 and len(text) < self.config.offload_min_chars:
+            return fn(text, *args)
+
+        results = await self.map(fn, [s.text for s in segments], *args)
+        return [item for result in results for item in result]
+
+    # ------------------------------------------------------------------------
+    # Segmentation
+    # ------------------------------------------------------------------------
+
+    def split_segments(self, text: str, markdown: Optional[bool] = None) -> List[TextSegment]:
+        """
+        Split text into roughly segment_chars pieces on natural boundaries
+
+        Markdown documents are split only before headers of the shallowest
+        level present, so every deeper header keeps its parents in the same
+        segment. Other text is split at paragraph breaks.
+        """
+        if len(text) <= self.config.segment_chars:
+            return [TextSegment(text=text, start_char=0, start_line=0)]
+
+        if markdown is None:
+            markdown = resolve_auto_strategy(text) == "markdown"
+
+        if markdown:
+            headers = list(HEADER_PATTERN.finditer(text))
+            top_level = min(len(m.group(1)) for m in headers)
+            boundaries = [m.start() for m in headers if len(m.group(1)) == top_level]
+        else:
+            boundaries = [m.end() for m in re.finditer(r"\n\s*\n", text)]
+
+        cuts = [0]
+        for position in boundaries:
+            if position - cuts[-1] >= self.config.segment_chars:
+                cuts.append(position)
+        cuts.append(len(text))
+
+        segments = []
+        line = 0
+        for start, end in zip(cuts, cuts[1:]):
+            if end <= start:
+                continue
+            segments.append(TextSegment(text=text[start:end], start_char=start, start_line=line))
+            line += text.count("\n", start, end)
+        return segments
+
+    # ------------------------------------------------------------------------
+    # Chunk streaming
+    # ------------------------------------------------------------------------
+
+    async def stream_chunks(
+        self,
+        text: str,
+        document_id: str,
+        strategy: str = "auto",
+        chunk_size: int = 1024,
+        chunk_overlap: int = 200,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Chunk]:
+        """
+        Chunk one document in the executor, yielding chunks in document order
+
+        Args:
+            text: Document text
+            document_id: Source document identifier
+            strategy: auto, markdown or sentence
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Token overlap between chunks
+            metadata: Additional metadata to attach
+
+        Yields:
+            Chunk objects with chunk_index and offsets relative to the document
+        """
+        if strategy == "auto":
+            strategy = resolve_auto_strategy(text)
+
+        segments = self.split_segments(text, markdown=(strategy == "markdown"))
+        chunk_index = 0
+
+        async for position, chunks in self.stream(
+            _chunk_segment_job,
+            segments,
+            strategy,
+            document_id,
+            chunk_size,
+            chunk_overlap,
+            metadata
+        ):
+            segment = segments[position]
+            for chunk in chunks:
+                yield _rebase(chunk, chunk_index, segment)
+                chunk_index += 1
+
+    async def chunk_document(
+        self,
+        text: str,
+        document_id: str,
+        strategy: str = "auto",
+        chunk_size: int = 1024,
+        chunk_overlap: int = 200,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Chunk]:
+        """Chunk one document in the executor and return all chunks"""
+        return [
+            chunk async for chunk in self.stream_chunks(
+                text, document_id, strategy, chunk_size, chunk_overlap, metadata
+            )
+        ]
+
+    async def stream_documents(
+        self,
+        jobs: Sequence[ChunkJob]
+    ) -> AsyncIterator[Tuple[str, Chunk]]:
+        """
+        Chunk many documents in parallel
+
+        Yields:
+            (document_id, chunk) pairs; each document's chunks arrive in order,
+            documents interleave as their segments complete
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def produce(job: ChunkJob):
+            try:
+                async for chunk in self.stream_chunks(
+                    job.text,
+                    job.document_id,
+                    job.strategy,
+                    job.chunk_size,
+                    job.chunk_overlap,
+                    job.metadata
+                ):
+                    await queue.put((job.document_id, chunk))
+            finally:
+                await queue.put(done)
+
+        producers = [asyncio.ensure_future(produce(job)) for job in jobs]
+        remaining = len(producers)
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+            # Surface worker errors
+            for producer in producers:
+                producer.result()
+        finally:
+            for producer in producers:
+                producer.cancel()
+
+    async def chunk_many(self, jobs: Sequence[ChunkJob]) -> Dict[str, List[Chunk]]:
+        """Chunk many documents in parallel, grouped by document_id"""
+        results: Dict[str, List[Chunk]] = {job.document_id: [] for job in jobs}
+        async for document_id, chunk in self.stream_documents(jobs):
+            results[document_id].append(chunk)
+        return results
+
+    def shutdown(self, wait: bool = True):
+        """Shut down executors"""
+        if self._executor is not None and self._executor is not self._thread_executor:
+            self._executor.shutdown(wait=wait)
+        if self._thread_executor is not None:
+            self._thread_executor.shutdown(wait=wait)
+        self._executor = None
+        self._thread_executor = None
+
+
+def _chunk_segment_job(
+    segment: TextSegment,
+    strategy: str,
+    document_id: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    metadata: Optional[Dict[str, Any]]
+) -> List[Chunk]:
+    return chunk_segment(strategy, segment.text, document_id, chunk_size, chunk_overlap, metadata)
+
+
+def _rebase(chunk: Chunk, chunk_index: int, segment: TextSegment) -> Chunk:
+    """Renumber a segment chunk and shift its offsets to document coordinates"""
+    meta = chunk.metadata
+    return Chunk(
+        content=chunk.content,
+        metadata=replace(
+            meta,
+            chunk_index=chunk_index,
+            start_char=meta.start_char + segment.start_char if meta.start_char is not None else None,
+            end_char=meta.end_char + segment.start_char if meta.end_char is not None else None,
+            start_line=meta.start_line + segment.start_line if meta.start_line is not None else None,
+            end_line=meta.end_line + segment.start_line if meta.end_line is not None else None,
+        )
+    )
+
+
+# Singleton instance
+_chunking_engine: Optional[ChunkingEngine] = None
+
+
+def get_chunking_engine() -> ChunkingEngine:
+    """Get or create singleton chunking engine"""
+    global _chunking_engine
+    if _chunking_engine is None:
+        _chunking_engine = ChunkingEngine()
+    return _chunking_engine
+
+
+def reset_chunking_engine():
+    """Shut down and reset singleton (for testing)"""
+    global _chunking_engine
+    if _chunking_engine is not None:
+        _chunking_engine.shutdown(wait=False)
+    _chunking_engine = None
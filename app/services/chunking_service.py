@@ -5,9 +5,10 @@ Implement semantic, code, and transcript chunking with configurable size and ove
 
 import os
 import ast
+import asyncio
 import logging
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -110,6 +111,52 @@ class Chunk:
 # Header detection regex pattern: matches # through ###### headers
 HEADER_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
 
+# Minimum headers for text to count as markdown
+MIN_MARKDOWN_HEADERS = 2
+
+# Text is fed to sentence splitters in windows of about this many characters
+# so streaming callers get first chunks early and memory stays bounded
+STREAM_WINDOW_CHARS = 20_000
+
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n\s*\n')
+
+
+def resolve_auto_strategy(text: str, min_headers: int = MIN_MARKDOWN_HEADERS) -> str:
+    """
+    Resolve the "auto" chunking strategy for a text
+
+    Returns "markdown" when text has at least min_headers markdown headers,
+    otherwise "sentence".
+    """
+    return "markdown" if len(HEADER_PATTERN.findall(text)) >= min_headers else "sentence"
+
+
+def iter_text_windows(text: str, window_chars: int = STREAM_WINDOW_CHARS) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (start_char, window) slices of text, cut at paragraph breaks
+
+    A window only ends early at a paragraph break, so a paragraph longer than
+    window_chars stays whole.
+    """
+    if len(text) <= window_chars:
+        yield 0, text
+        return
+
+    start = 0
+    for match in PARAGRAPH_BREAK_PATTERN.finditer(text):
+        if match.end() - start >= window_chars:
+            yield start, text[start:match.end()]
+            start = match.end()
+    if start < len(text):
+        yield start, text[start:]
+
+
+async def aiter_sync(chunks: Iterable["Chunk"]) -> AsyncIterator["Chunk"]:
+    """Drive a chunk generator, yielding to the event loop between chunks"""
+    for chunk in chunks:
+        yield chunk
+        await asyncio.sleep(0)
+
 
 @dataclass
 class MarkdownSection:
@@ -149,7 +196,7 @@ class MarkdownChunkerConfig:
     """
     max_chunk_size: int = 1024
     chunk_overlap: int = 200
-    min_headers_threshold: int = 2
+    min_headers_threshold: int = MIN_MARKDOWN_HEADERS
     include_header_in_chunk: bool = True
     preserve_hierarchy: bool = True
     max_header_length: int = 200
@@ -198,8 +245,7 @@ class MarkdownChunkerStrategy:
         Returns:
             True if text has >= min_headers_threshold markdown headers
         """
-        headers = HEADER_PATTERN.findall(text)
-        return len(headers) >= self.config.min_headers_threshold
+        return resolve_auto_strategy(text, self.config.min_headers_threshold) == "markdown"
 
     def _count_tokens(self, text: str) -> int:
         """
@@ -227,7 +273,10 @@ class MarkdownChunkerStrategy:
         Returns:
             List of MarkdownSection objects representing each section
         """
-        sections = []
+        return list(self._iter_sections(text))
+
+    def _iter_sections(self, text: str) -> Iterator[MarkdownSection]:
+        """Yield markdown sections in document order (see _split_by_headers)"""
         lines = text.split('\n')
         current_section_start = 0
         current_header = ""
@@ -244,7 +293,7 @@ class MarkdownChunkerStrategy:
                     if section_content.strip():
                         # Build parent headers list
                         parent_headers = [h[1] for h in header_stack if h[0] < current_level]
-                        sections.append(MarkdownSection(
+                        yield MarkdownSection(
                             header=current_header,
                             header_text=current_header_text,
                             level=current_level,
@@ -252,7 +301,7 @@ class MarkdownChunkerStrategy:
                             start_line=current_section_start,
                             end_line=i - 1,
                             parent_headers=parent_headers
-                        ))
+                        )
 
                 # Start new section
                 hashes, header_text = match.groups()
@@ -270,7 +319,7 @@ class MarkdownChunkerStrategy:
         section_content = '\n'.join(lines[current_section_start:])
         if section_content.strip():
             parent_headers = [h[1] for h in header_stack[:-1]] if header_stack else []
-            sections.append(MarkdownSection(
+            yield MarkdownSection(
                 header=current_header,
                 header_text=current_header_text,
                 level=current_level,
@@ -278,9 +327,7 @@ class MarkdownChunkerStrategy:
                 start_line=current_section_start,
                 end_line=len(lines) - 1,
                 parent_headers=parent_headers
-            ))
-
-        return sections
+            )
 
     def _build_header_hierarchy(self, section: MarkdownSection) -> Dict[str, str]:
         """
@@ -387,6 +434,35 @@ class MarkdownChunkerStrategy:
         Returns:
             List of Chunk objects with header-aware metadata
         """
+        return list(self.iter_chunks(text, document_id, metadata))
+
+    async def aiter_chunks(
+        self,
+        text: str,
+        document_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Chunk]:
+        """Async variant of iter_chunks that yields to the event loop between chunks"""
+        async for chunk in aiter_sync(self.iter_chunks(text, document_id, metadata)):
+            yield chunk
+
+    def iter_chunks(
+        self,
+        text: str,
+        document_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Chunk]:
+        """
+        Chunk markdown document by headers, yielding chunks as sections are split.
+
+        Args:
+            text: Markdown document text
+            document_id: Source document identifier
+            metadata: Additional metadata to attach to chunks
+
+        Yields:
+            Chunk objects with header-aware metadata
+        """
         if not self.is_markdown_content(text):
             logger.info(
                 "Text does not meet markdown threshold, using sentence splitting",
@@ -394,33 +470,28 @@ class MarkdownChunkerStrategy:
             )
             # Fallback to sentence splitting
             if self._sentence_splitter and LLAMAINDEX_SUPPORT:
-                doc = Document(text=text)
-                nodes = self._sentence_splitter.get_nodes_from_documents([doc])
-                return [
-                    Chunk(
-                        content=node.text,
-                        metadata=ChunkMetadata(
-                            chunk_index=i,
-                            source_document_id=document_id,
-                            strategy=ChunkingStrategy.SENTENCE,
-                            is_header_split=False
+                chunk_index = 0
+                for _, window in iter_text_windows(text):
+                    nodes = self._sentence_splitter.get_nodes_from_documents([Document(text=window)])
+                    for node in nodes:
+                        yield Chunk(
+                            content=node.text,
+                            metadata=ChunkMetadata(
+                                chunk_index=chunk_index,
+                                source_document_id=document_id,
+                                strategy=ChunkingStrategy.SENTENCE,
+                                is_header_split=False
+                            )
                         )
-                    )
-                    for i, node in enumerate(nodes)
-                ]
-            return []
-
-        # Split by headers
-        sections = self._split_by_headers(text)
-        logger.info(
-            "Markdown document split by headers",
-            extra={"doc_id": document_id, "section_count": len(sections)}
-        )
+                        chunk_index += 1
+            return
 
-        chunks = []
         chunk_index = 0
+        section_count = 0
+        header_split_chunks = 0
 
-        for section in sections:
+        for section in self._iter_sections(text):
+            section_count += 1
             token_count = self._count_tokens(section.content)
 
             if token_count > self.config.max_chunk_size:
@@ -432,12 +503,12 @@ class MarkdownChunkerStrategy:
                 section_chunks = self._chunk_oversized_section(
                     section, document_id, chunk_index
                 )
-                chunks.extend(section_chunks)
                 chunk_index += len(section_chunks)
+                yield from section_chunks
             else:
                 # Section fits in one chunk
                 hierarchy = self._build_header_hierarchy(section)
-                chunks.append(Chunk(
+                yield Chunk(
                     content=section.content,
                     metadata=ChunkMetadata(
                         chunk_index=chunk_index,
@@ -451,20 +522,20 @@ class MarkdownChunkerStrategy:
                         is_header_split=True,
                         total_section_chunks=1
                     )
-                ))
+                )
                 chunk_index += 1
+                header_split_chunks += 1
 
         logger.info(
             "Markdown chunking complete",
             extra={
                 "doc_id": document_id,
-                "total_chunks": len(chunks),
-                "header_split_chunks": sum(1 for c in chunks if c.metadata.is_header_split)
+                "section_count": section_count,
+                "total_chunks": chunk_index,
+                "header_split_chunks": header_split_chunks
             }
         )
 
-        return chunks
-
 
 # ============================================================================
 # SUBTASK 13.1: Semantic Chunking for Documents
@@ -517,14 +588,48 @@ class SemanticChunker:
         Returns:
             List of Chunk objects with metadata
         """
+        chunks = list(self.iter_chunks(text, document_id, metadata))
+        logger.info(f"Created {len(chunks)} semantic chunks from document {document_id}")
+        return chunks
+
+    async def aiter_chunks(
+        self,
+        text: str,
+        document_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Chunk]:
+        """Async variant of iter_chunks that yields to the event loop between chunks"""
+        async for chunk in aiter_sync(self.iter_chunks(text, document_id, metadata)):
+            yield chunk
+
+    def iter_chunks(
+        self,
+        text: str,
+        document_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Chunk]:
+        """
+        Chunk document using semantic strategy, yielding chunks as they are produced.
+
+        Sentence splitting runs window by window (see iter_text_windows) with
+        character offsets relative to the whole document. Semantic splitting
+        needs the whole document and is not windowed.
+
+        Args:
+            text: Document text to chunk
+            document_id: Source document identifier
+            metadata: Additional metadata to attach
+
+        Yields:
+            Chunk objects with metadata
+        """
         if not LLAMAINDEX_SUPPORT:
             # Fallback to simple chunking
-            return await self._fallback_chunking(text, document_id, metadata)
+            yield from self._iter_fallback_chunks(text, document_id, metadata)
+            return
 
+        idx = 0
         try:
-            # Create LlamaIndex document
-            doc = Document(text=text, metadata=metadata or {})
-
             if self.use_semantic and self.embed_model:
                 # Use semantic similarity-based chunking
                 splitter = SemanticSplitterNodeParser(
@@ -532,39 +637,38 @@ class SemanticChunker:
                     breakpoint_percentile_threshold=95,
                     embed_model=self.embed_model
                 )
+                windows = [(0, text)]
             else:
                 # Use sentence-based chunking
                 splitter = SentenceSplitter(
                     chunk_size=self.chunk_size,
                     chunk_overlap=self.chunk_overlap,
                 )
+                windows = iter_text_windows(text)
 
-            # Split document into nodes
-            nodes = splitter.get_nodes_from_documents([doc])
+            for offset, window in windows:
+                # Split window into nodes
+                doc = Document(text=window, metadata=metadata or {})
+                nodes = splitter.get_nodes_from_documents([doc])
 
-            # Convert nodes to Chunk objects
-            chunks = []
-            for idx, node in enumerate(nodes):
-                chunk_metadata = ChunkMetadata(
-                    chunk_index=idx,
-                    source_document_id=document_id,
-                    strategy=ChunkingStrategy.SEMANTIC if self.use_semantic else ChunkingStrategy.SENTENCE,
-                    start_char=node.start_char_idx,
-                    end_char=node.end_char_idx,
-                    overlap_chars=self.chunk_overlap if idx > 0 else 0
-                )
-
-                chunks.append(Chunk(
-                    content=node.text,
-                    metadata=chunk_metadata
-                ))
-
-            logger.info(f"Created {len(chunks)} semantic chunks from document {document_id}")
-            return chunks
+                for node in nodes:
+                    chunk_metadata = ChunkMetadata(
+                        chunk_index=idx,
+                        source_document_id=document_id,
+                        strategy=ChunkingStrategy.SEMANTIC if self.use_semantic else ChunkingStrategy.SENTENCE,
+                        start_char=node.start_char_idx + offset if node.start_char_idx is not None else None,
+                        end_char=node.end_char_idx + offset if node.end_char_idx is not None else None,
+                        overlap_chars=self.chunk_overlap if idx > 0 else 0
+                    )
+                    yield Chunk(content=node.text, metadata=chunk_metadata)
+                    idx += 1
 
         except Exception as e:
+            # Chunks already handed out cannot be taken back
+            if idx > 0:
+                raise
             logger.error(f"Semantic chunking failed: {e}")
-            return await self._fallback_chunking(text, document_id, metadata)
+            yield from self._iter_fallback_chunks(text, document_id, metadata)
 
     async def _fallback_chunking(
         self,
@@ -573,7 +677,15 @@ class SemanticChunker:
         metadata: Optional[Dict[str, Any]] = None
     ) -> List[Chunk]:
         """Simple fallback chunking when LlamaIndex unavailable"""
-        chunks = []
+        return list(self._iter_fallback_chunks(text, document_id, metadata))
+
+    def _iter_fallback_chunks(
+        self,
+        text: str,
+        document_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Chunk]:
+        """Yield fixed-size character chunks (see _fallback_chunking)"""
         text_length = len(text)
         start_idx = 0
         chunk_idx = 0
@@ -594,10 +706,10 @@ class SemanticChunker:
                 overlap_chars=effective_overlap if chunk_idx > 0 else 0
             )
 
-            chunks.append(Chunk(
+            yield Chunk(
                 content=chunk_text,
                 metadata=chunk_metadata
-            ))
+            )
 
             # Move forward, ensuring we always make progress
             if end_idx == text_length:
@@ -605,8 +717,6 @@ class SemanticChunker:
             start_idx = end_idx - effective_overlap
             chunk_idx += 1
 
-        return chunks
-
 
 # ============================================================================
 # SUBTASK 13.2: Code Chunking Using AST Parsing
@@ -655,26 +765,55 @@ class CodeChunker:
         Returns:
             List of Chunk objects with code metadata
         """
+        chunks = list(self.iter_chunks(code, document_id, language))
+        logger.info(f"Created {len(chunks)} code chunks from {filename or document_id}")
+        return chunks
+
+    async def aiter_chunks(
+        self,
+        code: str,
+        document_id: str,
+        language: str = "python"
+    ) -> AsyncIterator[Chunk]:
+        """Async variant of iter_chunks that yields to the event loop between chunks"""
+        async for chunk in aiter_sync(self.iter_chunks(code, document_id, language)):
+            yield chunk
+
+    def iter_chunks(
+        self,
+        code: str,
+        document_id: str,
+        language: str = "python"
+    ) -> Iterator[Chunk]:
+        """
+        Chunk code using AST parsing, yielding chunks as code units are grouped.
+
+        Args:
+            code: Source code to chunk
+            document_id: Source document identifier
+            language: Programming language (currently supports "python")
+
+        Yields:
+            Chunk objects with code metadata
+        """
         if language.lower() != "python":
             logger.warning(f"AST chunking only supports Python, falling back for {language}")
-            return await self._fallback_code_chunking(code, document_id, language)
+            yield from self._iter_fallback_code_chunks(code, document_id, language)
+            return
 
         try:
             # Parse code into AST
             tree = ast.parse(code)
-
-            # Extract top-level definitions
-            code_units = self._extract_code_units(tree, code)
-
-            # Group code units into chunks
-            chunks = self._group_into_chunks(code_units, code, document_id, language)
-
-            logger.info(f"Created {len(chunks)} AST-based code chunks from {filename or document_id}")
-            return chunks
-
         except SyntaxError as e:
             logger.error(f"Code parsing failed: {e}")
-            return await self._fallback_code_chunking(code, document_id, language)
+            yield from self._iter_fallback_code_chunks(code, document_id, language)
+            return
+
+        # Extract top-level definitions
+        code_units = self._extract_code_units(tree, code)
+
+        # Group code units into chunks
+        yield from self._iter_grouped_chunks(code_units, code, document_id, language)
 
     def _extract_code_units(self, tree: ast.AST, source_code: str) -> List[Dict[str, Any]]:
         """Extract functions, classes, and methods from AST"""
@@ -734,7 +873,16 @@ class CodeChunker:
         language: str
     ) -> List[Chunk]:
         """Group code units into chunks respecting size limits"""
-        chunks = []
+        return list(self._iter_grouped_chunks(code_units, source_code, document_id, language))
+
+    def _iter_grouped_chunks(
+        self,
+        code_units: List[Dict[str, Any]],
+        source_code: str,
+        document_id: str,
+        language: str
+    ) -> Iterator[Chunk]:
+        """Yield chunks of grouped code units (see _group_into_chunks)"""
         lines = source_code.split('\n')
         current_chunk_units = []
         current_chunk_lines = 0
@@ -746,14 +894,13 @@ class CodeChunker:
             # Check if adding this unit exceeds max chunk size
             if current_chunk_lines + unit_lines > self.max_chunk_lines and current_chunk_units:
                 # Create chunk from current units
-                chunk = self._create_chunk_from_units(
+                yield self._create_chunk_from_units(
                     current_chunk_units,
                     lines,
                     chunk_idx,
                     document_id,
                     language
                 )
-                chunks.append(chunk)
 
                 # Start new chunk with overlap
                 current_chunk_units = self._get_overlap_units(current_chunk_units)
@@ -774,16 +921,13 @@ class CodeChunker:
 
         # Create final chunk
         if current_chunk_units:
-            chunk = self._create_chunk_from_units(
+            yield self._create_chunk_from_units(
                 current_chunk_units,
                 lines,
                 chunk_idx,
                 document_id,
                 language
             )
-            chunks.append(chunk)
-
-        return chunks
 
     def _create_chunk_from_units(
         self,
@@ -840,7 +984,15 @@ class CodeChunker:
         language: str
     ) -> List[Chunk]:
         """Simple line-based chunking fallback"""
-        chunks = []
+        return list(self._iter_fallback_code_chunks(code, document_id, language))
+
+    def _iter_fallback_code_chunks(
+        self,
+        code: str,
+        document_id: str,
+        language: str
+    ) -> Iterator[Chunk]:
+        """Yield line-based chunks (see _fallback_code_chunking)"""
         lines = code.split('\n')
         total_lines = len(lines)
         chunk_idx = 0
@@ -864,7 +1016,7 @@ class CodeChunker:
                 overlap_chars=0
             )
 
-            chunks.append(Chunk(content=content, metadata=chunk_metadata))
+            yield Chunk(content=content, metadata=chunk_metadata)
 
             # Move forward, ensuring we always make progress
             if end_line == total_lines:
@@ -872,8 +1024,6 @@ class CodeChunker:
             start_line = end_line - effective_overlap
             chunk_idx += 1
 
-        return chunks
-
 
 # ============================================================================
 # SUBTASK 13.3: Time/Topic-Based Transcript Chunking
@@ -926,17 +1076,58 @@ class TranscriptChunker:
         else:
             return await self._chunk_by_time(transcript, document_id)
 
+    async def aiter_chunks(
+        self,
+        transcript: List[Dict[str, Any]],
+        document_id: str,
+        strategy: str = "time"
+    ) -> AsyncIterator[Chunk]:
+        """Async variant of iter_chunks that yields to the event loop between chunks"""
+        async for chunk in aiter_sync(self.iter_chunks(transcript, document_id, strategy)):
+            yield chunk
+
+    def iter_chunks(
+        self,
+        transcript: List[Dict[str, Any]],
+        document_id: str,
+        strategy: str = "time"
+    ) -> Iterator[Chunk]:
+        """
+        Chunk transcript by time or topic, yielding chunks window by window.
+
+        Args:
+            transcript: List of transcript segments with timestamps
+            document_id: Source document identifier
+            strategy: "time" or "topic"
+
+        Yields:
+            Chunk objects with transcript metadata
+        """
+        if strategy == "topic" and self.use_topic_detection:
+            yield from self._iter_by_topic(transcript, document_id)
+        else:
+            yield from self._iter_by_time(transcript, document_id)
+
     async def _chunk_by_time(
         self,
         transcript: List[Dict[str, Any]],
         document_id: str
     ) -> List[Chunk]:
         """Chunk transcript using fixed time windows"""
-        chunks = []
+        chunks = list(self._iter_by_time(transcript, document_id))
+        logger.info(f"Created {len(chunks)} time-based transcript chunks")
+        return chunks
+
+    def _iter_by_time(
+        self,
+        transcript: List[Dict[str, Any]],
+        document_id: str
+    ) -> Iterator[Chunk]:
+        """Yield fixed time window chunks (see _chunk_by_time)"""
         chunk_idx = 0
 
         if not transcript:
-            return chunks
+            return
 
         # Sort by start time
         sorted_transcript = sorted(transcript, key=lambda x: x.get("start", 0))
@@ -977,26 +1168,32 @@ class TranscriptChunker:
                     overlap_chars=0  # Time-based overlap
                 )
 
-                chunks.append(Chunk(content=chunk_text, metadata=chunk_metadata))
+                yield Chunk(content=chunk_text, metadata=chunk_metadata)
                 chunk_idx += 1
 
             # Move to next window with overlap
             current_time = window_end - self.overlap_seconds
 
-        logger.info(f"Created {len(chunks)} time-based transcript chunks")
-        return chunks
-
     async def _chunk_by_topic(
         self,
         transcript: List[Dict[str, Any]],
         document_id: str
     ) -> List[Chunk]:
         """Chunk transcript using simple topic detection (speaker changes + pauses)"""
-        chunks = []
+        chunks = list(self._iter_by_topic(transcript, document_id))
+        logger.info(f"Created {len(chunks)} topic-based transcript chunks")
+        return chunks
+
+    def _iter_by_topic(
+        self,
+        transcript: List[Dict[str, Any]],
+        document_id: str
+    ) -> Iterator[Chunk]:
+        """Yield topic chunks (see _chunk_by_topic)"""
         chunk_idx = 0
 
         if not transcript:
-            return chunks
+            return
 
         # Sort by start time
         sorted_transcript = sorted(transcript, key=lambda x: x.get("start", 0))
@@ -1017,13 +1214,12 @@ class TranscriptChunker:
 
             if is_topic_boundary and current_chunk_segments:
                 # Create chunk from current segments
-                chunk = self._create_transcript_chunk(
+                yield self._create_transcript_chunk(
                     current_chunk_segments,
                     chunk_idx,
                     document_id,
                     ChunkingStrategy.TRANSCRIPT_TOPIC
                 )
-                chunks.append(chunk)
                 chunk_idx += 1
                 current_chunk_segments = []
 
@@ -1033,16 +1229,12 @@ class TranscriptChunker:
 
         # Create final chunk
         if current_chunk_segments:
-            chunk = self._create_transcript_chunk(
+            yield self._create_transcript_chunk(
                 current_chunk_segments,
                 chunk_idx,
                 document_id,
                 ChunkingStrategy.TRANSCRIPT_TOPIC
             )
-            chunks.append(chunk)
-
-        logger.info(f"Created {len(chunks)} topic-based transcript chunks")
-        return chunks
 
     def _create_transcript_chunk(
         self,
@@ -1081,14 +1273,34 @@ class ChunkingService:
     Provides a single interface for document, code, transcript, and markdown chunking.
 
     Feature 006: Added MarkdownChunkerStrategy for header-aware document splitting.
+
+    Texts of at least engine.config.offload_min_chars are chunked by the
+    executor-backed ChunkingEngine so large documents never block the event loop.
     """
 
-    def __init__(self):
-        """Initialize chunking service with default strategies"""
+    def __init__(self, engine: Optional[Any] = None):
+        """
+        Initialize chunking service with default strategies
+
+        Args:
+            engine: Optional ChunkingEngine (defaults to the shared engine)
+        """
         self.semantic_chunker = SemanticChunker()
         self.code_chunker = CodeChunker()
         self.transcript_chunker = TranscriptChunker()
         self.markdown_chunker = MarkdownChunkerStrategy()
+        self._engine = engine
+
+    @property
+    def engine(self):
+        """Lazy load the chunking engine (imports this module)"""
+        if self._engine is None:
+            from app.services.chunking_engine import get_chunking_engine
+            self._engine = get_chunking_engine()
+        return self._engine
+
+    def _should_offload(self, text: str) -> bool:
+        return len(text) >= self.engine.config.offload_min_chars
 
     async def chunk_document(
         self,
@@ -1100,6 +1312,11 @@ class ChunkingService:
         metadata: Optional[Dict[str, Any]] = None
     ) -> List[Chunk]:
         """Chunk a text document"""
+        if not use_semantic and self._should_offload(text):
+            return await self.engine.chunk_document(
+                text, document_id, "sentence", chunk_size, chunk_overlap, metadata
+            )
+
         chunker = SemanticChunker(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -1161,6 +1378,11 @@ class ChunkingService:
         Returns:
             List of Chunk objects with header-aware metadata
         """
+        if self._should_offload(text) and self.markdown_chunker.is_markdown_content(text):
+            return await self.engine.chunk_document(
+                text, document_id, "markdown", max_chunk_size, chunk_overlap, metadata
+            )
+
         config = MarkdownChunkerConfig(
             max_chunk_size=max_chunk_size,
             chunk_overlap=chunk_overlap
@@ -1210,6 +1432,73 @@ class ChunkingService:
             text, document_id, chunk_size, chunk_overlap, False, metadata
         )
 
+    def iter_chunks(
+        self,
+        text: str,
+        document_id: str,
+        chunk_size: int = 1024,
+        chunk_overlap: int = 200,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Chunk]:
+        """
+        Generator variant of auto_chunk, run inline.
+
+        Args:
+            text: Document text
+            document_id: Source document identifier
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Token overlap between chunks
+            metadata: Additional metadata to attach
+
+        Yields:
+            Chunk objects in document order
+        """
+        if self.markdown_chunker.is_markdown_content(text):
+            chunker = MarkdownChunkerStrategy(config=MarkdownChunkerConfig(
+                max_chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            ))
+            return chunker.iter_chunks(text, document_id, metadata)
+
+        chunker = SemanticChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        return chunker.iter_chunks(text, document_id, metadata)
+
+    async def aiter_chunks(
+        self,
+        text: str,
+        document_id: str,
+        chunk_size: int = 1024,
+        chunk_overlap: int = 200,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Chunk]:
+        """
+        Async generator variant of auto_chunk.
+
+        Large texts stream from the chunking engine segment by segment; smaller
+        ones are chunked inline, yielding to the event loop between chunks.
+
+        Args:
+            text: Document text
+            document_id: Source document identifier
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Token overlap between chunks
+            metadata: Additional metadata to attach
+
+        Yields:
+            Chunk objects in document order
+        """
+        if self._should_offload(text):
+            chunks = self.engine.stream_chunks(
+                text, document_id, "auto", chunk_size, chunk_overlap, metadata
+            )
+        else:
+            chunks = aiter_sync(
+                self.iter_chunks(text, document_id, chunk_size, chunk_overlap, metadata)
+            )
+
+        async for chunk in chunks:
+            yield chunk
+
     def get_strategy(self, strategy: ChunkingStrategy) -> Any:
         """
         Get a chunker instance by strategy type.
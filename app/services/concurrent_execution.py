@@ -6,7 +6,7 @@ Uses Celery groups/chords for parallel execution with dependency management.
 
 Features:
 - Dependency graph analysis
-- Wave-based parallel execution
+- Critical-path ready-queue scheduling (wave-based execution as fallback)
 - Configurable concurrency limits
 - Performance metrics and instrumentation
 - Dynamic task dispatching
@@ -16,8 +16,9 @@ Date: 2025-01-10
 """
 
 import asyncio
+import heapq
 import time
-from typing import Dict, Any, Optional, List, Set, Tuple
+from typing import Awaitable, Callable, Dict, Any, Optional, List, Set, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 from enum import Enum
@@ -86,6 +87,13 @@ class ConcurrencyConfig:
     retry_delay_seconds: float = 2.0
     retry_backoff_multiplier: float = 1.5  # Exponential backoff
 
+    # Scheduling
+    # Dispatch each task as soon as its dependencies complete, longest
+    # remaining dependency chain first; False runs strict waves instead
+    use_critical_path_scheduler: bool = True
+    # Relative cost per task_type for critical-path lengths (default 1.0)
+    task_type_weights: Dict[str, float] = field(default_factory=dict)
+
     # Performance
     track_metrics: bool = True
 
@@ -320,6 +328,302 @@ class DynamicConcurrencyController:
         }
 
 
+# ==============================================================================
+# Critical-Path Scheduler
+# ==============================================================================
+
+class CriticalPathScheduler:
+    """
+    Ready-queue scheduler for an execution graph.
+
+    Each task is dispatched as soon as all of its dependencies have finished,
+    instead of waiting for every task in the previous wave. When more tasks
+    are ready than there are free slots, the task with the longest remaining
+    dependency chain (its critical-path length) goes first, so the chain
+    that bounds the job's makespan is not left queued behind short branches.
+
+    Semantics kept from wave execution:
+    - A dependency counts as resolved once it completes or finally fails
+    - Retryable failures are retried with exponential backoff; the retry
+      waits off-slot, so other ready tasks keep running meanwhile
+    - The failure quality gate applies per dependency level (the wave the
+      task would have run in); tripping it stops dispatching, lets running
+      tasks finish and skips the rest
+    - Tasks in dependency cycles run last, after everything else
+
+    Running a task is delegated to run_task, so the same scheduling drives
+    Celery in production and plain coroutines in simulations.
+    """
+
+    def __init__(
+        self,
+        graph: Dict[str, ExecutionNode],
+        run_task: Callable[[ExecutionNode], Awaitable[Optional[Dict[str, Any]]]],
+        controller: DynamicConcurrencyController,
+        config: Optional[ConcurrencyConfig] = None,
+        adjustment_interval: Optional[float] = None,
+        is_retryable: Optional[Callable[[str], bool]] = None,
+        on_task_finished: Optional[Callable[[ExecutionNode], None]] = None,
+        task_cost: Optional[Callable[[ExecutionNode], float]] = None
+    ):
+        """
+        Args:
+            graph: The execution graph (node states are updated in place)
+            run_task: Coroutine running one task, returning its result dict
+            controller: Source of the concurrency limit
+            config: Retry and quality gate settings
+            adjustment_interval: Seconds between controller re-evaluations
+                (None keeps the controller's current level)
+            is_retryable: Decides whether an error message is retryable
+            on_task_finished: Called after each task attempt finishes
+            task_cost: Relative cost of a task (default 1.0 per task)
+        """
+        self.graph = graph
+        self.run_task = run_task
+        self.controller = controller
+        self.config = config or ConcurrencyConfig()
+        self.adjustment_interval = adjustment_interval
+        self.is_retryable = is_retryable or (lambda error: True)
+        self.on_task_finished = on_task_finished
+        task_cost = task_cost or (lambda node: 1.0)
+
+        self._order = {key: index for index, key in enumerate(graph)}
+        self._dependencies = {
+            key: [dep for dep in dict.fromkeys(node.dependencies) if dep in graph]
+            for key, node in graph.items()
+        }
+        self._dependents: Dict[str, List[str]] = {key: [] for key in graph}
+        for key, deps in self._dependencies.items():
+            for dep in deps:
+                self._dependents[dep].append(key)
+
+        # Topological order (Kahn); nodes left over are in dependency cycles
+        indegree = {key: len(deps) for key, deps in self._dependencies.items()}
+        topo = [key for key in graph if indegree[key] == 0]
+        for key in topo:
+            for child in self._dependents[key]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    topo.append(child)
+        resolved = set(topo)
+        self.unresolvable = [key for key in graph if key not in resolved]
+
+        # Dependency level = index of the wave identify_execution_waves() assigns
+        self.levels: Dict[str, int] = {}
+        for key in topo:
+            deps = self._dependencies[key]
+            self.levels[key] = 1 + max(self.levels[d] for d in deps) if deps else 0
+        final_level = max(self.levels.values(), default=-1) + 1
+        for key in self.unresolvable:
+            self.levels[key] = final_level
+
+        # Critical-path length: own cost plus the longest chain of dependents
+        self.priorities: Dict[str, float] = {key: task_cost(graph[key]) for key in self.unresolvable}
+        for key in reversed(topo):
+            self.priorities[key] = task_cost(graph[key]) + max(
+                (self.priorities[child] for child in self._dependents[key]),
+                default=0.0
+            )
+
+        self._level_sizes: Dict[int, int] = {}
+        for level in self.levels.values():
+            self._level_sizes[level] = self._level_sizes.get(level, 0) + 1
+
+    @property
+    def level_count(self) -> int:
+        """Number of waves the graph would run in"""
+        return len(self._level_sizes)
+
+    async def run(self, metrics: ExecutionMetrics) -> Optional[str]:
+        """
+        Execute the graph, updating node states and metrics.
+
+        Args:
+            metrics: Metrics to update (task counts, durations, parallelism)
+
+        Returns:
+            Abort reason if the failure quality gate stopped the job, else None
+        """
+        self._ready: List[Tuple[float, int, str]] = []
+        self._waiting = {}
+        self._retry_counts = {key: 0 for key in self.graph}
+        self._level_failures: Dict[int, int] = {}
+        deferred = set(self.unresolvable)
+
+        for key in self.levels:
+            if key in deferred or self.graph[key].status == ExecutionStatus.COMPLETE:
+                continue
+            self.graph[key].status = ExecutionStatus.PENDING
+            self._waiting[key] = sum(
+                1 for dep in self._dependencies[key]
+                if self.graph[dep].status != ExecutionStatus.COMPLETE
+            )
+            if self._waiting[key] == 0:
+                self._push_ready(key)
+
+        if self.unresolvable:
+            logger.error("Cannot resolve dependencies", remaining=self.unresolvable)
+
+        running: Dict[asyncio.Task, str] = {}
+        backoffs: Dict[asyncio.Task, str] = {}
+        abort_reason: Optional[str] = None
+
+        started = last_tick = time.perf_counter()
+        busy_area = 0.0  # Integral of running task count over time
+        next_adjustment = time.monotonic()
+
+        try:
+            while True:
+                now = time.perf_counter()
+                busy_area += len(running) * (now - last_tick)
+                last_tick = now
+
+                if self.adjustment_interval is not None and time.monotonic() >= next_adjustment:
+                    await self.controller.evaluate_and_adjust()
+                    next_adjustment = time.monotonic() + self.adjustment_interval
+                limit = max(1, self.controller.current_concurrency)
+
+                if abort_reason is None:
+                    if not self._ready and not running and not backoffs and deferred:
+                        for key in sorted(deferred, key=self._order.get):
+                            self.graph[key].status = ExecutionStatus.PENDING
+                            self._push_ready(key)
+                        deferred.clear()
+
+                    while self._ready and len(running) < limit:
+                        _, _, key = heapq.heappop(self._ready)
+                        running[asyncio.create_task(self._run_one(key))] = key
+                    metrics.max_parallel = max(metrics.max_parallel, len(running))
+
+                if not running and not backoffs:
+                    break
+
+                timeout = None
+                if self.adjustment_interval is not None:
+                    timeout = max(0.0, next_adjustment - time.monotonic())
+                done, _ = await asyncio.wait(
+                    set(running) | set(backoffs),
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                now = time.perf_counter()
+                busy_area += len(running) * (now - last_tick)
+                last_tick = now
+
+                for finished in done:
+                    if finished in backoffs:
+                        key = backoffs.pop(finished)
+                        if abort_reason is None:
+                            self._push_ready(key)
+                        continue
+
+                    key = running.pop(finished)
+                    reason = self._handle_result(key, finished.result(), backoffs, metrics)
+                    if reason and abort_reason is None:
+                        abort_reason = reason
+                        for timer in backoffs:
+                            timer.cancel()
+                        backoffs.clear()
+        finally:
+            for task in list(running) + list(backoffs):
+                task.cancel()
+
+        elapsed = time.perf_counter() - started
+        if elapsed > 0:
+            metrics.avg_parallel = busy_area / elapsed
+
+        for node in self.graph.values():
+            if node.status in (ExecutionStatus.PENDING, ExecutionStatus.QUEUED):
+                node.status = ExecutionStatus.SKIPPED
+                metrics.skipped_tasks += 1
+
+        return abort_reason
+
+    def _push_ready(self, key: str):
+        heapq.heappush(self._ready, (-self.priorities[key], self._order[key], key))
+
+    async def _run_one(self, key: str) -> Any:
+        """Run one task attempt; failures are returned, not raised"""
+        node = self.graph[key]
+        node.status = ExecutionStatus.RUNNING
+        node.started_at = datetime.now(timezone.utc)
+        node.completed_at = None
+        try:
+            return await self.run_task(node)
+        except Exception as e:
+            return e
+        finally:
+            node.completed_at = datetime.now(timezone.utc)
+
+    def _handle_result(
+        self,
+        key: str,
+        task_result: Any,
+        backoffs: Dict[asyncio.Task, str],
+        metrics: ExecutionMetrics
+    ) -> Optional[str]:
+        """Record one attempt's outcome; returns an abort reason if the gate trips"""
+        node = self.graph[key]
+        abort_reason = None
+
+        if node.duration is not None:
+            metrics.task_durations.append(node.duration)
+
+        # Handle exception results (raised by run_task or from propagate=False)
+        if isinstance(task_result, Exception):
+            task_result = {"success": False, "error": str(task_result)}
+
+        if task_result and task_result.get("success"):
+            node.status = ExecutionStatus.COMPLETE
+            node.result = task_result
+            node.error = None  # Clear any previous error from retries
+            metrics.completed_tasks += 1
+            self._resolve(key)
+        else:
+            error_msg = task_result.get("error") if task_result else "Unknown error"
+            node.error = error_msg
+
+            if (self.config.enable_partial_retry and
+                    self._retry_counts[key] < self.config.max_retry_attempts and
+                    self.is_retryable(error_msg)):
+                self._retry_counts[key] += 1
+                node.status = ExecutionStatus.PENDING
+                delay = self.config.retry_delay_seconds * (
+                    self.config.retry_backoff_multiplier ** (self._retry_counts[key] - 1)
+                )
+                backoffs[asyncio.create_task(asyncio.sleep(delay))] = key
+                logger.info(
+                    "task_scheduled_for_retry",
+                    task_key=key,
+                    attempt=self._retry_counts[key],
+                    max_attempts=self.config.max_retry_attempts,
+                    delay_seconds=delay
+                )
+            else:
+                node.status = ExecutionStatus.FAILED
+                metrics.failed_tasks += 1
+                self._resolve(key)
+
+                level = self.levels[key]
+                self._level_failures[level] = self._level_failures.get(level, 0) + 1
+                if self._level_failures[level] > self._level_sizes[level] * self.config.max_wave_failures:
+                    abort_reason = f"Too many task failures in wave {level + 1}"
+
+        if self.on_task_finished:
+            self.on_task_finished(node)
+        return abort_reason
+
+    def _resolve(self, key: str):
+        """Mark a finished task's dependents ready once nothing else blocks them"""
+        for child in self._dependents[key]:
+            if child not in self._waiting:
+                continue
+            self._waiting[child] -= 1
+            if self._waiting[child] == 0 and self.graph[child].status == ExecutionStatus.PENDING:
+                self._push_ready(child)
+
+
 # ==============================================================================
 # Concurrent Execution Engine
 # ==============================================================================
@@ -328,8 +632,9 @@ class ConcurrentExecutionEngine:
     """
     Engine for concurrent task execution with dependency management.
 
-    Provides wave-based parallel execution where tasks in the same wave
-    have no dependencies on each other and can run concurrently.
+    Dispatches each task as soon as its dependencies finish, prioritized by
+    critical-path length; wave-based execution (tasks in the same wave have
+    no dependencies on each other) remains available as a fallback.
     """
 
     def __init__(
@@ -478,16 +783,23 @@ class ConcurrentExecutionEngine:
     async def execute_job_concurrent(
         self,
         job_id: int,
-        max_concurrent: Optional[int] = None
+        max_concurrent: Optional[int] = None,
+        enable_dynamic_adjustment: bool = True
     ) -> Dict[str, Any]:
         """
         Execute all tasks for a job with maximum concurrency.
 
-        Uses wave-based execution with Celery groups for parallelism.
+        Tasks are dispatched by the critical-path scheduler as soon as their
+        dependencies finish, within the DynamicConcurrencyController limit.
+        With config.use_critical_path_scheduler=False, waves run strictly one
+        after another using Celery groups.
 
         Args:
             job_id: The research job ID
-            max_concurrent: Override max concurrent tasks
+            max_concurrent: Override max concurrent tasks (initial level
+                for the concurrency controller)
+            enable_dynamic_adjustment: Whether to adjust concurrency from
+                resource usage while the job runs
 
         Returns:
             Dict with execution results and metrics
@@ -499,71 +811,47 @@ class ConcurrentExecutionEngine:
         logger.info(
             "Starting concurrent job execution",
             job_id=job_id,
-            max_concurrent=max_concurrent
+            max_concurrent=max_concurrent,
+            critical_path=self.config.use_critical_path_scheduler
         )
 
         try:
-            # Build graph and waves
             graph = self.build_execution_graph(job_id)
-            waves = self.identify_execution_waves(graph)
-
             metrics.total_tasks = len(graph)
-            metrics.wave_count = len(waves)
 
             # Update job status
             self._update_job_status(job_id, JobStatus.EXECUTING)
 
-            # Execute waves sequentially, tasks within waves in parallel
-            parallel_counts = []
-
-            for wave_num, wave_tasks in enumerate(waves, 1):
-                logger.info(
-                    f"Executing wave {wave_num}/{len(waves)}",
+            if self.config.use_critical_path_scheduler:
+                abort_reason = await self._execute_critical_path(
                     job_id=job_id,
-                    task_count=len(wave_tasks)
+                    graph=graph,
+                    metrics=metrics,
+                    max_concurrent=max_concurrent,
+                    enable_dynamic_adjustment=enable_dynamic_adjustment
                 )
-
-                # Execute wave with concurrency limit
-                wave_result = await self._execute_wave(
+            else:
+                abort_reason = await self._execute_waves(
+                    job_id=job_id,
                     graph=graph,
-                    wave_tasks=wave_tasks,
+                    metrics=metrics,
                     max_concurrent=max_concurrent
                 )
 
-                parallel_counts.append(wave_result["parallel_count"])
-
-                # Update metrics
-                metrics.completed_tasks += wave_result["completed"]
-                metrics.failed_tasks += wave_result["failed"]
-
-                # Check quality gate
-                if wave_result["failed"] > len(wave_tasks) * self.config.max_wave_failures:
-                    logger.error(
-                        "Too many failures in wave, aborting",
-                        job_id=job_id,
-                        wave_num=wave_num,
-                        failed=wave_result["failed"]
-                    )
-                    self._update_job_status(
-                        job_id,
-                        JobStatus.FAILED,
-                        f"Too many task failures in wave {wave_num}"
-                    )
-                    break
-
-                # Update progress
-                self._update_job_progress(job_id, graph)
+            if abort_reason:
+                logger.error(
+                    "Too many failures, aborting",
+                    job_id=job_id,
+                    reason=abort_reason,
+                    failed=metrics.failed_tasks
+                )
+                self._update_job_status(job_id, JobStatus.FAILED, abort_reason)
 
             # Calculate final metrics
             metrics.end_time = datetime.now(timezone.utc)
             metrics.total_duration = (
                 metrics.end_time - metrics.start_time
             ).total_seconds()
-            metrics.max_parallel = max(parallel_counts) if parallel_counts else 0
-            metrics.avg_parallel = (
-                sum(parallel_counts) / len(parallel_counts)
-                if parallel_counts else 0
-            )
 
             # Calculate parallelism ratio
             sequential_time = sum(metrics.task_durations)
@@ -610,6 +898,104 @@ class ConcurrentExecutionEngine:
                 "error": str(e)
             }
 
+    async def _execute_critical_path(
+        self,
+        job_id: int,
+        graph: Dict[str, ExecutionNode],
+        metrics: ExecutionMetrics,
+        max_concurrent: int,
+        enable_dynamic_adjustment: bool
+    ) -> Optional[str]:
+        """
+        Run the graph with the critical-path scheduler.
+
+        Returns:
+            Abort reason if the failure quality gate stopped the job
+        """
+        controller = self._get_concurrency_controller(max_concurrent)
+        scheduler = CriticalPathScheduler(
+            graph,
+            run_task=self._run_celery_task,
+            controller=controller,
+            config=self.config,
+            adjustment_interval=(
+                self.dynamic_config.adjustment_interval_seconds
+                if enable_dynamic_adjustment else None
+            ),
+            is_retryable=self._is_retryable_error,
+            on_task_finished=lambda node: self._update_job_progress(job_id, graph),
+            task_cost=lambda node: self.config.task_type_weights.get(node.task_type, 1.0)
+        )
+        metrics.wave_count = scheduler.level_count
+
+        return await scheduler.run(metrics)
+
+    async def _run_celery_task(self, node: ExecutionNode) -> Optional[Dict[str, Any]]:
+        """Run one task on a Celery worker and wait for its result"""
+        from app.tasks.research_tasks import execute_single_task
+
+        async_result = execute_single_task.delay(node.task_id)
+        # Offload the blocking wait; propagate=False returns task exceptions
+        return await asyncio.to_thread(
+            lambda: async_result.get(
+                timeout=self.config.task_timeout,
+                propagate=False
+            )
+        )
+
+    async def _execute_waves(
+        self,
+        job_id: int,
+        graph: Dict[str, ExecutionNode],
+        metrics: ExecutionMetrics,
+        max_concurrent: int
+    ) -> Optional[str]:
+        """
+        Run the graph wave by wave, tasks within a wave in parallel.
+
+        Returns:
+            Abort reason if the failure quality gate stopped the job
+        """
+        waves = self.identify_execution_waves(graph)
+        metrics.wave_count = len(waves)
+        parallel_counts = []
+        abort_reason = None
+
+        for wave_num, wave_tasks in enumerate(waves, 1):
+            logger.info(
+                f"Executing wave {wave_num}/{len(waves)}",
+                job_id=job_id,
+                task_count=len(wave_tasks)
+            )
+
+            # Execute wave with concurrency limit
+            wave_result = await self._execute_wave(
+                graph=graph,
+                wave_tasks=wave_tasks,
+                max_concurrent=max_concurrent
+            )
+
+            parallel_counts.append(wave_result["parallel_count"])
+
+            # Update metrics
+            metrics.completed_tasks += wave_result["completed"]
+            metrics.failed_tasks += wave_result["failed"]
+
+            # Check quality gate
+            if wave_result["failed"] > len(wave_tasks) * self.config.max_wave_failures:
+                abort_reason = f"Too many task failures in wave {wave_num}"
+                break
+
+            # Update progress
+            self._update_job_progress(job_id, graph)
+
+        metrics.max_parallel = max(parallel_counts) if parallel_counts else 0
+        metrics.avg_parallel = (
+            sum(parallel_counts) / len(parallel_counts)
+            if parallel_counts else 0
+        )
+        return abort_reason
+
     async def _execute_wave(
         self,
         graph: Dict[str, ExecutionNode],
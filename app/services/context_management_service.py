@@ -20,6 +20,7 @@ from enum import Enum
 import math
 import tiktoken
 
+from app.core.token_counter import get_token_counter
 from app.services.conversation_memory_service import (
     ConversationMemoryService,
     MemoryNode
@@ -153,7 +154,8 @@ class ContextManagementService:
             return 0
 
         if self.tokenizer:
-            return len(self.tokenizer.encode(text))
+            # Shared counter memoizes counts for memory nodes re-ranked every turn
+            return get_token_counter().count_tokens(text, record_metrics=False)
         else:
             # Approximate: ~4 characters per token
             return len(text) // 4
@@ -13,7 +13,7 @@ import os
 import logging
 import mimetypes
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, AsyncIterator, Optional, List, Union
 from io import BytesIO
 from enum import Enum
 
@@ -32,7 +32,7 @@ except ImportError:
 
 # Document processing libraries
 try:
-    from pypdf import PdfReader
+    from app.services.pdf_page_extractor import get_pdf_page_extractor
     PDF_SUPPORT = True
 except ImportError:
     PDF_SUPPORT = False
@@ -340,51 +340,28 @@ class DocumentProcessor:
 
         try:
             logger.info(f"Using PyPDF fallback for: {file_path}")
-            reader = PdfReader(file_path)
+            extractor = get_pdf_page_extractor()
+            info = await extractor.read_info(file_path)
             result["extraction_method"] = ExtractionMethod.PYPDF.value
 
             full_text = []
             pages_content = []
 
-            for page_num, page in enumerate(reader.pages, start=1):
-                try:
-                    page_text = page.extract_text() or ""
-
-                    if track_pages:
-                        page_data = {
-                            "page_number": page_num,
-                            "text": page_text,
-                            "markdown": page_text,  # PyPDF doesn't produce markdown
-                            "tables": [],
-                            "images": [],
-                            "metadata": {}
-                        }
-
-                        # Extract images from page if requested
-                        if extract_images and hasattr(page, 'images'):
-                            for img_idx, img in enumerate(page.images):
-                                page_data["images"].append({
-                                    "image_index": img_idx,
-                                    "name": img.name,
-                                    "page": page_num
-                                })
-
-                        pages_content.append(page_data)
+            async for page in self.iter_pdf_pages(
+                file_path,
+                extract_images=extract_images and track_pages,
+                page_count=info["page_count"],
+                errors=result["errors"]
+            ):
+                if track_pages:
+                    pages_content.append(page)
 
-                    full_text.append(page_text)
-
-                except Exception as page_error:
-                    logger.warning(f"Error extracting page {page_num}: {page_error}")
-                    result["errors"].append(f"Page {page_num} extraction failed: {str(page_error)}")
+                full_text.append(page["text"])
 
             result["content"]["text"] = "\n\n".join(full_text)
             result["content"]["pages"] = pages_content
-            result["metadata"]["page_count"] = len(reader.pages)
-            result["metadata"]["pdf_metadata"] = {
-                "author": reader.metadata.author if reader.metadata else None,
-                "title": reader.metadata.title if reader.metadata else None,
-                "producer": reader.metadata.producer if reader.metadata else None
-            }
+            result["metadata"]["page_count"] = info["page_count"]
+            result["metadata"]["pdf_metadata"] = info["pdf_metadata"]
 
             # If no text was extracted, PDF might be scanned - log warning
             if len(result["content"]["text"].strip()) < 50:
@@ -398,6 +375,57 @@ class DocumentProcessor:
             result["errors"].append(f"PDF extraction failed: {str(e)}")
             return result
 
+    @staticmethod
+    def _pdf_page_data(page: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape an extracted PDF page like the other page-tracking processors"""
+        return {
+            "page_number": page["page_number"],
+            "text": page["text"],
+            "markdown": page["text"],  # PyPDF doesn't produce markdown
+            "tables": [],
+            "images": page["images"],
+            "metadata": {}
+        }
+
+    async def iter_pdf_pages(
+        self,
+        file_path: str,
+        extract_images: bool = True,
+        page_count: Optional[int] = None,
+        errors: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream PyPDF-extracted pages in page order
+
+        Large PDFs are extracted in parallel page shards, so callers can start
+        chunking early pages while later ones are still being parsed. Pages
+        that fail to extract are logged and skipped.
+
+        Args:
+            file_path: Path to PDF file
+            extract_images: Include per-page image metadata
+            page_count: Known page count (read from the file if None)
+            errors: Optional list that failed-page messages are appended to
+
+        Yields:
+            Page dicts (page_number, text, markdown, tables, images, metadata)
+        """
+        if not PDF_SUPPORT:
+            raise RuntimeError("PDF processing not available (pypdf)")
+
+        async for page in get_pdf_page_extractor().iter_pages(
+            file_path,
+            extract_images=extract_images,
+            page_count=page_count
+        ):
+            if page["error"]:
+                page_num = page["page_number"]
+                logger.warning(f"Error extracting page {page_num}: {page['error']}")
+                if errors is not None:
+                    errors.append(f"Page {page_num} extraction failed: {page['error']}")
+                continue
+            yield self._pdf_page_data(page)
+
     async def _process_docx(
         self,
         file_path: str,
@@ -13,6 +13,8 @@ import time
 import hashlib
 import logging
 import asyncio
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -113,18 +115,102 @@ class EmbeddingCacheManager:
     Features:
     - Content hash-based caching
     - Cache invalidation on content updates
-    - Efficient batch operations
+    - Efficient batch operations (single IN query per batch)
+    - In-process LRU of recently seen content hashes in front of Supabase
     - Metadata tracking
     """
 
-    def __init__(self, supabase_storage):
+    # Hashes per IN (...) query; keeps the PostgREST URL well under limits
+    BULK_LOOKUP_CHUNK_SIZE = 100
+
+    def __init__(self, supabase_storage, lru_size: int = 10000):
         """
         Initialize cache manager
 
         Args:
             supabase_storage: Supabase storage service for database access
+            lru_size: Max (content_hash, model) entries kept in process memory
         """
         self.storage = supabase_storage
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+
+    def _lru_get(self, content_hash: str, model: str) -> Optional[List[float]]:
+        """Get embedding from the in-process LRU"""
+        if self.lru_size <= 0:
+            return None
+        key = (content_hash, model)
+        with self._lru_lock:
+            embedding = self._lru.get(key)
+            if embedding is not None:
+                self._lru.move_to_end(key)
+            return embedding
+
+    def _lru_put(self, content_hash: str, model: str, embedding: List[float]):
+        """Store embedding in the in-process LRU"""
+        if self.lru_size <= 0 or embedding is None:
+            return
+        key = (content_hash, model)
+        with self._lru_lock:
+            self._lru[key] = embedding
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    async def get_cached_embeddings_bulk(
+        self,
+        hashes: List[str],
+        model: str
+    ) -> Dict[str, List[float]]:
+        """
+        Retrieve cached embeddings for many content hashes at once
+
+        Hashes found in the in-process LRU are served from memory; the rest
+        are fetched with one `.in_("content_hash", ...)` query per chunk of
+        BULK_LOOKUP_CHUNK_SIZE hashes.
+
+        Args:
+            hashes: Content hashes (see hash_content)
+            model: Embedding model name
+
+        Returns:
+            Dict mapping content hash to embedding (misses are absent)
+        """
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+
+        for content_hash in dict.fromkeys(hashes):
+            embedding = self._lru_get(content_hash, model)
+            if embedding is not None:
+                found[content_hash] = embedding
+            else:
+                missing.append(content_hash)
+
+        for start in range(0, len(missing), self.BULK_LOOKUP_CHUNK_SIZE):
+            chunk = missing[start:start + self.BULK_LOOKUP_CHUNK_SIZE]
+            try:
+                result = await self.storage.supabase.table("embeddings_cache")\
+                    .select("content_hash, embedding")\
+                    .in_("content_hash", chunk)\
+                    .eq("model", model)\
+                    .execute()
+
+                for row in result.data or []:
+                    content_hash = row.get("content_hash")
+                    embedding = row.get("embedding")
+                    if content_hash and embedding:
+                        found[content_hash] = embedding
+                        self._lru_put(content_hash, model, embedding)
+
+            except Exception as e:
+                logger.error(f"Error retrieving cached embeddings in bulk: {e}")
+
+        logger.debug(
+            f"Bulk cache lookup: {len(found)}/{len(set(hashes))} hits "
+            f"({len(missing)} queried from Supabase)"
+        )
+        return found
 
     async def get_cached_embedding(
         self,
@@ -145,6 +231,10 @@ class EmbeddingCacheManager:
             # Generate content hash
             content_hash = self._hash_content(content)
 
+            embedding = self._lru_get(content_hash, model)
+            if embedding is not None:
+                return embedding
+
             # Query cache
             result = await self.storage.supabase.table("embeddings_cache")\
                 .select("embedding, model, created_at")\
@@ -155,7 +245,9 @@ class EmbeddingCacheManager:
 
             if result.data and len(result.data) > 0:
                 logger.debug(f"Cache hit for content hash {content_hash[:16]}...")
-                return result.data[0]["embedding"]
+                embedding = result.data[0]["embedding"]
+                self._lru_put(content_hash, model, embedding)
+                return embedding
 
             logger.debug(f"Cache miss for content hash {content_hash[:16]}...")
             return None
@@ -201,6 +293,8 @@ class EmbeddingCacheManager:
                 .upsert(cache_entry, on_conflict="content_hash,model")\
                 .execute()
 
+            self._lru_put(content_hash, model, embedding)
+
             logger.debug(f"Cached embedding for content hash {content_hash[:16]}...")
 
         except Exception as e:
@@ -247,13 +341,22 @@ class EmbeddingCacheManager:
                 .upsert(cache_entries, on_conflict="content_hash,model")\
                 .execute()
 
+            for entry in cache_entries:
+                self._lru_put(entry["content_hash"], model, entry["embedding"])
+
             logger.info(f"Cached {len(cache_entries)} embeddings in batch")
 
         except Exception as e:
             logger.error(f"Error batch caching embeddings: {e}")
 
     async def invalidate_cache(self, chunk_id: str):
-        """Invalidate cached embeddings for a chunk"""
+        """
+        Invalidate cached embeddings for a chunk
+
+        The in-process LRU is content-addressed, so entries cannot go stale
+        when a chunk's content changes (new content has a new hash) and are
+        left in place.
+        """
         try:
             await self.storage.supabase.table("embeddings_cache")\
                 .delete()\
@@ -265,10 +368,12 @@ class EmbeddingCacheManager:
         except Exception as e:
             logger.error(f"Error invalidating cache: {e}")
 
-    def _hash_content(self, content: str) -> str:
-        """Generate SHA-256 hash of content"""
+    def hash_content(self, content: str) -> str:
+        """Generate SHA-256 hash of content (the embeddings_cache key)"""
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
+    _hash_content = hash_content
+
 
 # ============================================================================
 # Embedding Service
@@ -487,11 +592,13 @@ class EmbeddingService:
         cached_embeddings = []
 
         if use_cache and self.cache_manager:
-            for idx, text in enumerate(texts):
-                cached = await self.cache_manager.get_cached_embedding(
-                    text,
-                    self.config.model.value
-                )
+            hashes = [self.cache_manager.hash_content(text) for text in texts]
+            cached_by_hash = await self.cache_manager.get_cached_embeddings_bulk(
+                hashes,
+                self.config.model.value
+            )
+            for idx, content_hash in enumerate(hashes):
+                cached = cached_by_hash.get(content_hash)
                 if cached:
                     cached_embeddings.append((idx, cached))
                 else:
@@ -19,11 +19,23 @@ Pipeline Flow:
 7. Evaluate answer grounding
 8. Validate output format and style
 9. Record metrics for continuous improvement
+
+Stages run as a dependency graph rather than strictly in order:
+- Retrieval starts speculatively while intent analysis and parameter lookup
+  run, with the params of the most common (intent, complexity) seen so far
+  (the adaptive service's fallback defaults before any query). The run is
+  reused when the chosen params match, or when they differ only by a
+  smaller top_k (results are truncated); otherwise it is restarted
+- Agent selection runs alongside parameter lookup, retrieval and evaluation
+- Grounding evaluation and output validation run concurrently
+stage_results keeps the logical stage order; each entry has its own duration.
 """
 
+import asyncio
 import os
 import time
 import structlog
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Optional, Dict, List, Any, Tuple
 from pydantic import BaseModel, Field
@@ -58,7 +70,7 @@ from app.services.answer_grounding_evaluator import (
     AnswerGroundingEvaluator,
     GroundingResult,
     ConfidenceLevel,
-    get_answer_grounding_evaluator
+    get_grounding_evaluator
 )
 from app.services.output_validator_service import (
     OutputValidatorService,
@@ -94,6 +106,9 @@ class PipelineConfig(BaseModel):
     enable_output_validation: bool = True
     enable_metrics_recording: bool = True
 
+    # Start retrieval with default params before adaptive params are known
+    enable_speculative_retrieval: bool = True
+
     # Quality thresholds
     min_retrieval_quality: float = 0.5
     min_grounding_score: float = 0.6
@@ -195,6 +210,10 @@ class EnhancedRAGPipeline:
         self._grounding_evaluator: Optional[AnswerGroundingEvaluator] = None
         self._output_validator: Optional[OutputValidatorService] = None
 
+        # Chosen params per (intent, complexity), to pick speculative params
+        self._intent_counts: Counter = Counter()
+        self._params_by_intent: Dict[Tuple[str, str], RetrievalParams] = {}
+
     @property
     def intent_analyzer(self) -> QueryIntentAnalyzer:
         if self._intent_analyzer is None:
@@ -222,7 +241,7 @@ class EnhancedRAGPipeline:
     @property
     def grounding_evaluator(self) -> AnswerGroundingEvaluator:
         if self._grounding_evaluator is None:
-            self._grounding_evaluator = get_answer_grounding_evaluator()
+            self._grounding_evaluator = get_grounding_evaluator()
         return self._grounding_evaluator
 
     @property
@@ -254,9 +273,22 @@ class EnhancedRAGPipeline:
         context = context or {}
         stage_results: List[StageResult] = []
 
-        result = PipelineResult(query=query)
+        result = PipelineResult(success=False, query=query)
+        pending: List[asyncio.Task] = []
 
         try:
+            # Retrieval does not need the intent unless adaptive params are used,
+            # so start it now: with the likely params (speculative) or with none
+            adaptive = self.config.enable_intent_analysis and self.config.enable_adaptive_retrieval
+            speculative_params: Optional[RetrievalParams] = None
+            retrieval_task: Optional[asyncio.Task] = None
+            if not adaptive or self.config.enable_speculative_retrieval:
+                speculative_params = self._speculative_params() if adaptive else None
+                retrieval_task = self._start(
+                    pending,
+                    self._execute_retrieval(query, speculative_params, context)
+                )
+
             # Stage 1: Intent Analysis
             if self.config.enable_intent_analysis:
                 stage_result, intent = await self._analyze_intent(query)
@@ -265,22 +297,43 @@ class EnhancedRAGPipeline:
                     raise Exception(f"Intent analysis failed: {stage_result.error}")
                 result.intent = intent
 
+            # Stage 5 (early): Agent selection only depends on the intent
+            agent_task: Optional[asyncio.Task] = None
+            if self.config.enable_agent_selection:
+                task_type = self._map_intent_to_task_type(result.intent)
+                agent_task = self._start(pending, self._select_agent(task_type))
+
             # Stage 2: Get Retrieval Parameters
             if self.config.enable_adaptive_retrieval and result.intent:
-                stage_result, params = await self._get_retrieval_params(
-                    result.intent.intent_type.value,
-                    result.intent.complexity_level.value
-                )
+                stage_result, params = await self._get_retrieval_params(result.intent)
                 stage_results.append(stage_result)
                 if stage_result.success:
                     result.retrieval_params = params
-
-            # Stage 3: Execute Retrieval
-            stage_result, retrieval_result = await self._execute_retrieval(
-                query,
-                result.retrieval_params,
-                context
-            )
+                    self._remember_params(result.intent, params)
+
+            # Stage 3: Execute Retrieval (reuse the speculative run if it covers the params)
+            speculative = retrieval_task is not None
+            chosen_params = result.retrieval_params or speculative_params
+            if adaptive and speculative:
+                if not self._covers(speculative_params, chosen_params):
+                    await self._cancel(pending, retrieval_task)
+                    retrieval_task = None
+                    speculative = False
+                    logger.debug("speculative_retrieval_discarded", query=query[:100])
+
+            if retrieval_task is not None:
+                stage_result, retrieval_result = await retrieval_task
+                if adaptive and retrieval_result and chosen_params.top_k < speculative_params.top_k:
+                    retrieval_result.documents = retrieval_result.documents[:chosen_params.top_k]
+                    retrieval_result.scores = retrieval_result.scores[:chosen_params.top_k]
+                    stage_result.data["document_count"] = len(retrieval_result.documents)
+            else:
+                stage_result, retrieval_result = await self._execute_retrieval(
+                    query,
+                    result.retrieval_params,
+                    context
+                )
+            stage_result.data["speculative"] = speculative
             stage_results.append(stage_result)
             if not stage_result.success:
                 raise Exception(f"Retrieval failed: {stage_result.error}")
@@ -310,11 +363,10 @@ class EnhancedRAGPipeline:
                                 result.sources = retrieval_result.documents
                                 result.used_fallback = True
 
-            # Stage 5: Select Agent
+            # Stage 5: Select Agent (started after intent analysis)
             selected_agent = None
-            if self.config.enable_agent_selection:
-                task_type = self._map_intent_to_task_type(result.intent)
-                stage_result, selection = await self._select_agent(task_type)
+            if agent_task is not None:
+                stage_result, selection = await agent_task
                 stage_results.append(stage_result)
                 if stage_result.success:
                     selected_agent = selection
@@ -334,12 +386,27 @@ class EnhancedRAGPipeline:
 
             result.answer = answer
 
-            # Stage 7: Evaluate Grounding
+            # Stages 7 and 8 both read the generated answer; run them together
+            grounding_task: Optional[asyncio.Task] = None
+            validation_task: Optional[asyncio.Task] = None
             if self.config.enable_grounding_evaluation and answer:
-                stage_result, grounding = await self._evaluate_grounding(
-                    answer,
-                    result.sources
+                grounding_task = self._start(
+                    pending,
+                    self._evaluate_grounding(answer, result.sources)
                 )
+            if self.config.enable_output_validation and answer:
+                requirements = OutputRequirements(
+                    format=self.config.output_format,
+                    must_include_citations=self.config.require_citations
+                )
+                validation_task = self._start(
+                    pending,
+                    self._validate_output(answer, requirements)
+                )
+
+            # Stage 7: Evaluate Grounding
+            if grounding_task is not None:
+                stage_result, grounding = await grounding_task
                 stage_results.append(stage_result)
                 if stage_result.success:
                     result.grounding_result = grounding
@@ -358,15 +425,8 @@ class EnhancedRAGPipeline:
                         )
 
             # Stage 8: Validate Output
-            if self.config.enable_output_validation and answer:
-                requirements = OutputRequirements(
-                    format=self.config.output_format,
-                    must_include_citations=self.config.require_citations
-                )
-                stage_result, validation = await self._validate_output(
-                    answer,
-                    requirements
-                )
+            if validation_task is not None:
+                stage_result, validation = await validation_task
                 stage_results.append(stage_result)
                 if stage_result.success:
                     result.validation_result = validation
@@ -393,6 +453,10 @@ class EnhancedRAGPipeline:
             result.success = False
             result.review_reasons.append(f"Pipeline error: {str(e)}")
 
+        finally:
+            # Stop speculative or concurrent stages abandoned by an early failure
+            await self._cancel(pending, *pending)
+
         result.stage_results = stage_results
         result.total_duration_ms = (time.time() - start_time) * 1000
 
@@ -407,6 +471,26 @@ class EnhancedRAGPipeline:
 
         return result
 
+    @staticmethod
+    def _start(pending: List[asyncio.Task], coro) -> asyncio.Task:
+        """Start a stage concurrently, tracking it for cancellation"""
+        task = asyncio.ensure_future(coro)
+        pending.append(task)
+        return task
+
+    @staticmethod
+    async def _cancel(pending: List[asyncio.Task], *tasks: asyncio.Task) -> None:
+        """Cancel stages whose results are no longer needed"""
+        for task in tasks:
+            if task in pending:
+                pending.remove(task)
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
     async def _analyze_intent(
         self,
         query: str
@@ -433,18 +517,37 @@ class EnhancedRAGPipeline:
                 error=str(e)
             ), None
 
+    def _speculative_params(self) -> RetrievalParams:
+        """Params of the most common (intent, complexity) chosen so far"""
+        if self._intent_counts:
+            key, _ = self._intent_counts.most_common(1)[0]
+            return self._params_by_intent[key]
+        # No history yet: the adaptive service's fallback (factual, medium)
+        return self.adaptive_retrieval._get_default_params("factual", "medium")
+
+    def _remember_params(self, intent: QueryIntent, params: RetrievalParams):
+        key = (intent.intent_type.value, intent.complexity_level.value)
+        self._intent_counts[key] += 1
+        self._params_by_intent[key] = params
+
+    @staticmethod
+    def _covers(speculative: RetrievalParams, chosen: RetrievalParams) -> bool:
+        """Whether results for speculative contain the results for chosen"""
+        if speculative == chosen:
+            return True
+        return (
+            speculative.top_k >= chosen.top_k
+            and speculative.model_copy(update={"top_k": chosen.top_k}) == chosen
+        )
+
     async def _get_retrieval_params(
         self,
-        intent_type: str,
-        complexity: str
+        intent: QueryIntent
     ) -> Tuple[StageResult, Optional[RetrievalParams]]:
         """Stage 2: Get adaptive retrieval parameters."""
         start_time = time.time()
         try:
-            params = await self.adaptive_retrieval.get_params(
-                intent_type=intent_type,
-                complexity=complexity
-            )
+            params = await self.adaptive_retrieval.get_retrieval_params(intent)
             return StageResult(
                 stage=PipelineStage.RETRIEVAL_PARAMS,
                 success=True,
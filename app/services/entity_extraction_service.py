@@ -21,6 +21,7 @@ from pydantic import BaseModel, Field, field_validator
 
 from app.services.api_resilience import ResilientAnthropicClient, CircuitOpenError
 from app.services.neo4j_http_client import get_neo4j_http_client, Neo4jHTTPClient
+from app.services.neo4j_bulk_writer import AsyncNeo4jBulkWriter, BulkStatement
 from app.exceptions import (
     EntityExtractionException,
     InvalidExtractionResultException,
@@ -492,98 +493,105 @@ class EntityExtractionService:
             extraction_result: Validated extraction result
         """
         try:
-            # Ensure ResearchTask node exists
-            await self.neo4j.execute_query(
-                """
-                MERGE (rt:ResearchTask {id: $task_id})
-                SET rt.updated_at = datetime()
-                RETURN rt
-                """,
-                {"task_id": task_id}
-            )
-
-            # Store topics
-            for topic in extraction_result.topics:
-                await self.neo4j.execute_query(
+            # One transaction: the ResearchTask node first, then each kind of
+            # node/relationship as UNWIND batches
+            writer = AsyncNeo4jBulkWriter(self.neo4j)
+            await writer.run_many([
+                BulkStatement(
+                    """
+                    UNWIND $rows AS row
+                    MERGE (rt:ResearchTask {id: row.task_id})
+                    SET rt.updated_at = datetime()
+                    """,
+                    [{"task_id": task_id}]
+                ),
+                BulkStatement(
                     """
-                    MERGE (t:Topic {name: $name})
-                    SET t.relevance_score = $relevance_score,
+                    UNWIND $rows AS row
+                    MERGE (t:Topic {name: row.name})
+                    SET t.relevance_score = row.relevance_score,
                         t.updated_at = datetime()
-                    WITH t
-                    MATCH (rt:ResearchTask {id: $task_id})
+                    WITH t, row
+                    MATCH (rt:ResearchTask {id: row.task_id})
                     MERGE (rt)-[:HAS_TOPIC]->(t)
                     """,
-                    {
-                        "name": topic.name,
-                        "relevance_score": topic.relevance_score,
-                        "task_id": task_id
-                    }
-                )
-
-            # Store entities
-            for entity in extraction_result.entities:
-                await self.neo4j.execute_query(
+                    [
+                        {
+                            "name": topic.name,
+                            "relevance_score": topic.relevance_score,
+                            "task_id": task_id
+                        }
+                        for topic in extraction_result.topics
+                    ]
+                ),
+                BulkStatement(
                     """
-                    MERGE (e:Entity {name: $name})
-                    SET e.type = $type,
-                        e.mentions = $mentions,
-                        e.relevance_score = $relevance_score,
+                    UNWIND $rows AS row
+                    MERGE (e:Entity {name: row.name})
+                    SET e.type = row.type,
+                        e.mentions = row.mentions,
+                        e.relevance_score = row.relevance_score,
                         e.updated_at = datetime()
-                    WITH e
-                    MATCH (rt:ResearchTask {id: $task_id})
+                    WITH e, row
+                    MATCH (rt:ResearchTask {id: row.task_id})
                     MERGE (rt)-[:MENTIONS]->(e)
                     """,
-                    {
-                        "name": entity.name,
-                        "type": entity.type.value,
-                        "mentions": entity.mentions,
-                        "relevance_score": entity.relevance_score,
-                        "task_id": task_id
-                    }
-                )
-
-            # Store facts
-            for idx, fact in enumerate(extraction_result.facts):
-                fact_id = f"{task_id}_fact_{idx}"
-                await self.neo4j.execute_query(
+                    [
+                        {
+                            "name": entity.name,
+                            "type": entity.type.value,
+                            "mentions": entity.mentions,
+                            "relevance_score": entity.relevance_score,
+                            "task_id": task_id
+                        }
+                        for entity in extraction_result.entities
+                    ]
+                ),
+                BulkStatement(
                     """
-                    MERGE (f:Fact {id: $fact_id})
-                    SET f.statement = $statement,
-                        f.confidence_score = $confidence_score,
-                        f.source_text = $source_text,
+                    UNWIND $rows AS row
+                    MERGE (f:Fact {id: row.fact_id})
+                    SET f.statement = row.statement,
+                        f.confidence_score = row.confidence_score,
+                        f.source_text = row.source_text,
                         f.updated_at = datetime()
-                    WITH f
-                    MATCH (rt:ResearchTask {id: $task_id})
+                    WITH f, row
+                    MATCH (rt:ResearchTask {id: row.task_id})
                     MERGE (rt)-[:CONTAINS_FACT]->(f)
                     """,
-                    {
-                        "fact_id": fact_id,
-                        "statement": fact.statement,
-                        "confidence_score": fact.confidence_score,
-                        "source_text": fact.source_text,
-                        "task_id": task_id
-                    }
-                )
-
-            # Store relationships
-            for rel in extraction_result.relationships:
-                await self.neo4j.execute_query(
+                    [
+                        {
+                            "fact_id": f"{task_id}_fact_{idx}",
+                            "statement": fact.statement,
+                            "confidence_score": fact.confidence_score,
+                            "source_text": fact.source_text,
+                            "task_id": task_id
+                        }
+                        for idx, fact in enumerate(extraction_result.facts)
+                    ]
+                ),
+                BulkStatement(
                     """
+                    UNWIND $rows AS row
                     MATCH (source)
-                    WHERE (source:Topic OR source:Entity) AND source.name = $source_name
+                    WHERE (source:Topic OR source:Entity) AND source.name = row.source_name
                     MATCH (target)
-                    WHERE (target:Topic OR target:Entity) AND target.name = $target_name
-                    MERGE (source)-[r:RELATED {type: $rel_type}]->(target)
-                    SET r.description = $description,
+                    WHERE (target:Topic OR target:Entity) AND target.name = row.target_name
+                    MERGE (source)-[r:RELATED {type: row.rel_type}]->(target)
+                    SET r.description = row.description,
                         r.updated_at = datetime()
                     """,
-                    {
-                        "source_name": rel.source,
-                        "target_name": rel.target,
-                        "rel_type": rel.type,
-                        "description": rel.description
-                    }
-                )
+                    [
+                        {
+                            "source_name": rel.source,
+                            "target_name": rel.target,
+                            "rel_type": rel.type,
+                            "description": rel.description
+                        }
+                        for rel in extraction_result.relationships
+                    ]
+                ),
+            ])
 
             logger.info(
                 "Stored entities in Neo4j",
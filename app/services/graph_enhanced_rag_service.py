@@ -11,13 +11,26 @@ Augments vector search results with graph context by:
 - Context enrichment for retrieved results
 - Result re-ranking based on graph relevance
 
+Expansion runs in one of two modes:
+- Single round trip (default): neighbor entities, relationships, neighbor
+  chunks, entity-mention chunks and chunk connectivity are fetched as one
+  multi-statement transaction via Neo4jHTTPClient.execute_batch, chunk nodes
+  are kept in a short-TTL in-process LRU, and re-ranking scores all
+  candidates at once with NumPy
+- Sequential (GRAPH_RAG_SINGLE_ROUND_TRIP=false): one query per step and per
+  scored chunk
+
 Reference: AI Automators Graph-Based Context Expansion Blueprint
 """
 
 from typing import Dict, Any, List, Optional, Callable, Tuple
+from collections import OrderedDict
 from datetime import datetime
+import os
 import re
+import threading
 import time
+import numpy as np
 import structlog
 
 from app.services.neo4j_http_client import (
@@ -53,6 +66,75 @@ class EntityExtractionError(Exception):
 # Type alias for entity extractor callable
 EntityExtractor = Callable[[str], List[Dict[str, Any]]]
 
+# Cypher RETURN fields for a chunk node plus its relationship count
+CHUNK_FIELDS = """
+    {c}.id as id,
+    {c}.document_id as document_id,
+    {c}.content as content,
+    {c}.position as position,
+    {c}.embedding_id as embedding_id,
+    {c}.section_id as section_id,
+    size([({c})--() | 1]) as rel_count
+"""
+
+
+class ChunkNodeCache:
+    """
+    Short-TTL in-process LRU of chunk nodes and their relationship counts.
+
+    Saves re-fetching the same chunks across the expansion, re-ranking and
+    follow-up requests for the same documents. Entries expire after ttl
+    seconds so graph edits are picked up quickly.
+    """
+
+    def __init__(self, max_size: int = 5000, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[ChunkNode], Optional[int], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, chunk_ids: List[str]) -> Dict[str, Tuple[Optional[ChunkNode], Optional[int]]]:
+        """Cached (chunk, rel_count) per chunk ID; missing or expired are omitted."""
+        now = time.time()
+        found = {}
+        with self._lock:
+            for chunk_id in chunk_ids:
+                entry = self._entries.get(chunk_id)
+                if entry is None:
+                    continue
+                chunk, rel_count, stored_at = entry
+                if now - stored_at > self.ttl:
+                    del self._entries[chunk_id]
+                    continue
+                self._entries.move_to_end(chunk_id)
+                found[chunk_id] = (chunk, rel_count)
+        return found
+
+    def put(
+        self,
+        chunk_id: str,
+        chunk: Optional[ChunkNode] = None,
+        rel_count: Optional[int] = None,
+    ) -> None:
+        """Store a chunk and/or its relationship count, keeping known fields."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(chunk_id)
+            if entry is not None and now - entry[2] <= self.ttl:
+                chunk = chunk if chunk is not None else entry[0]
+                rel_count = rel_count if rel_count is not None else entry[1]
+            self._entries[chunk_id] = (chunk, rel_count, now)
+            self._entries.move_to_end(chunk_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class GraphEnhancedRAGService:
     """
@@ -82,6 +164,8 @@ class GraphEnhancedRAGService:
         vector_search_service: Optional[Any] = None,
         entity_extractor: Optional[EntityExtractor] = None,
         cache_service: Optional[Any] = None,
+        single_round_trip: Optional[bool] = None,
+        chunk_cache: Optional[ChunkNodeCache] = None,
     ):
         """
         Initialize Graph-Enhanced RAG Service.
@@ -91,13 +175,27 @@ class GraphEnhancedRAGService:
             vector_search_service: Optional vector search service for initial retrieval.
             entity_extractor: Optional callable for entity extraction.
             cache_service: Optional cache service for result caching.
+            single_round_trip: Expand in one multi-statement transaction
+                (defaults to GRAPH_RAG_SINGLE_ROUND_TRIP, true).
+            chunk_cache: Optional chunk node cache.
         """
         self.neo4j = neo4j_client or get_neo4j_http_client()
         self.vector_search = vector_search_service
         self.entity_extractor = entity_extractor or self._default_entity_extractor
         self.cache = cache_service
 
-        logger.info("GraphEnhancedRAGService initialized")
+        if single_round_trip is None:
+            single_round_trip = os.getenv("GRAPH_RAG_SINGLE_ROUND_TRIP", "true").lower() == "true"
+        self.single_round_trip = single_round_trip
+        self.chunk_cache = chunk_cache or ChunkNodeCache(
+            max_size=int(os.getenv("GRAPH_RAG_CHUNK_CACHE_SIZE", "5000")),
+            ttl=float(os.getenv("GRAPH_RAG_CHUNK_CACHE_TTL", "60")),
+        )
+
+        logger.info(
+            "GraphEnhancedRAGService initialized",
+            single_round_trip=self.single_round_trip,
+        )
 
     async def query(
         self, request: GraphEnhancedRAGRequest
@@ -220,6 +318,26 @@ class GraphEnhancedRAGService:
                 unique_entities.append(entity)
         extracted_entities = unique_entities[:config["max_entities"]]
 
+        if self.single_round_trip:
+            related_entities, entity_relationships, expanded_chunks = (
+                await self._expand_in_one_transaction(
+                    chunk_ids=[c.id for c in chunks],
+                    entity_ids=[e.id for e in extracted_entities],
+                    entity_depth=config["entity_depth"],
+                    max_chunks=max_expanded,
+                    include_relationships=include_relationships,
+                )
+            )
+            return GraphExpansionResult(
+                original_chunks=chunks,
+                expanded_chunks=expanded_chunks,
+                extracted_entities=extracted_entities,
+                related_entities=related_entities,
+                entity_relationships=entity_relationships,
+                relationship_paths=self._build_relationship_paths(entity_relationships),
+                expansion_method="entity_neighbor_expansion",
+            )
+
         # Get related entities from graph
         related_entities = []
         entity_relationships = []
@@ -516,6 +634,141 @@ class GraphEnhancedRAGService:
             logger.warning("Failed to expand chunks", error=str(e))
             return []
 
+    async def _expand_in_one_transaction(
+        self,
+        chunk_ids: List[str],
+        entity_ids: List[str],
+        entity_depth: int = 1,
+        max_chunks: int = 10,
+        include_relationships: bool = True,
+    ) -> Tuple[List[EntityNode], List[EntityRelationship], List[ChunkNode]]:
+        """
+        Run every expansion query as one multi-statement transaction.
+
+        Neighbor chunks come first, then chunks mentioning the extracted
+        entities, as in the sequential path; both are fetched with the full
+        limit and merged here since statements in a batch cannot see each
+        other's results. Returned chunks (and the original chunks'
+        relationship counts) go into the chunk cache for re-ranking.
+
+        Returns:
+            (related_entities, entity_relationships, expanded_chunks)
+        """
+        statements: List[Dict[str, Any]] = []
+        slots: Dict[str, int] = {}
+
+        def add(name: str, statement: str, parameters: Dict[str, Any]) -> None:
+            slots[name] = len(statements)
+            statements.append({"statement": statement, "parameters": parameters})
+
+        if entity_ids:
+            add("neighbors", """
+            UNWIND $entity_ids as eid
+            MATCH (e:Entity {id: eid})-[r]-(neighbor:Entity)
+            WHERE neighbor.id NOT IN $entity_ids
+            RETURN DISTINCT
+                neighbor.id as id,
+                neighbor.name as name,
+                neighbor.type as type,
+                neighbor.normalized_name as normalized_name,
+                neighbor.description as description,
+                neighbor.confidence as confidence
+            LIMIT $limit
+            """, {"entity_ids": entity_ids, "limit": entity_depth * 10})
+
+            if include_relationships:
+                add("relationships", """
+                UNWIND $entity_ids as eid
+                MATCH (e:Entity {id: eid})-[r]->(target:Entity)
+                RETURN
+                    e.id as from_id,
+                    target.id as to_id,
+                    type(r) as rel_type,
+                    r.confidence as confidence,
+                    r.source_chunk_id as source_chunk_id
+                LIMIT 50
+                """, {"entity_ids": entity_ids})
+
+        if chunk_ids:
+            add("neighbor_chunks", """
+            UNWIND $chunk_ids as cid
+            MATCH (c:Chunk {id: cid})-[:NEXT_CHUNK|PREV_CHUNK|IN_SECTION]-(neighbor:Chunk)
+            WHERE neighbor.id NOT IN $chunk_ids
+            RETURN DISTINCT""" + CHUNK_FIELDS.format(c="neighbor") + """
+            LIMIT $limit
+            """, {"chunk_ids": chunk_ids, "limit": max_chunks})
+
+            cached = self.chunk_cache.get_many(chunk_ids)
+            uncounted = [cid for cid in chunk_ids if cached.get(cid, (None, None))[1] is None]
+            if uncounted:
+                add("rel_counts", """
+                UNWIND $chunk_ids as cid
+                MATCH (c:Chunk {id: cid})
+                RETURN c.id as id, size([(c)--() | 1]) as rel_count
+                """, {"chunk_ids": uncounted})
+
+        if entity_ids:
+            add("mention_chunks", """
+            UNWIND $entity_ids as eid
+            MATCH (e:Entity {id: eid})<-[:MENTIONS]-(c:Chunk)
+            WHERE NOT c.id IN $chunk_ids
+            RETURN DISTINCT""" + CHUNK_FIELDS.format(c="c") + """
+            LIMIT $limit
+            """, {"entity_ids": entity_ids, "chunk_ids": chunk_ids, "limit": max_chunks})
+
+        if not statements:
+            return [], [], []
+
+        try:
+            results = await self.neo4j.execute_batch(statements)
+        except Exception as e:
+            logger.warning("Failed to expand in one transaction", error=str(e))
+            return [], [], []
+
+        def parse(name: str, build: Callable[[Dict[str, Any]], Any]) -> List[Any]:
+            # A bad record drops that statement's results only, as each
+            # step does on failure in the sequential path
+            try:
+                return [build(r) for r in (results[slots[name]] if name in slots else [])]
+            except Exception as e:
+                logger.warning("Failed to parse graph expansion results", statement=name, error=str(e))
+                return []
+
+        related_entities = parse("neighbors", lambda r: EntityNode(
+            id=r["id"],
+            name=r["name"],
+            type=EntityType(r.get("type", "OTHER")),
+            normalized_name=r.get("normalized_name"),
+            description=r.get("description"),
+            confidence=r.get("confidence", 0.5),
+        ))
+
+        entity_relationships = parse("relationships", lambda r: EntityRelationship(
+            from_entity_id=r["from_id"],
+            to_entity_id=r["to_id"],
+            relationship_type=r["rel_type"],
+            confidence=r.get("confidence", 0.5),
+            source_chunk_id=r.get("source_chunk_id"),
+        ))
+
+        for chunk_id, rel_count in parse("rel_counts", lambda r: (r["id"], r.get("rel_count", 0))):
+            self.chunk_cache.put(chunk_id, rel_count=rel_count)
+
+        expanded: List[ChunkNode] = []
+        seen = set(chunk_ids)
+        candidates = (
+            parse("neighbor_chunks", lambda r: (self._chunk_from_record(r), r.get("rel_count")))
+            + parse("mention_chunks", lambda r: (self._chunk_from_record(r), r.get("rel_count")))
+        )
+        for chunk, rel_count in candidates:
+            if chunk.id in seen or len(expanded) >= max_chunks:
+                continue
+            seen.add(chunk.id)
+            self.chunk_cache.put(chunk.id, chunk, rel_count)
+            expanded.append(chunk)
+
+        return related_entities, entity_relationships, expanded
+
     async def _get_entity_relationships(
         self, entity_ids: List[str]
     ) -> List[EntityRelationship]:
@@ -582,6 +835,9 @@ class GraphEnhancedRAGService:
             return []
 
         try:
+            if self.single_round_trip:
+                return await self._get_chunks_by_ids_cached(chunk_ids)
+
             query = """
             UNWIND $chunk_ids as cid
             MATCH (c:Chunk {id: cid})
@@ -611,6 +867,37 @@ class GraphEnhancedRAGService:
             logger.warning("Failed to get chunks by IDs", error=str(e))
             return []
 
+    async def _get_chunks_by_ids_cached(self, chunk_ids: List[str]) -> List[ChunkNode]:
+        """
+        Get chunks by ID through the chunk cache, fetching only misses
+        (with their relationship counts), in the requested order.
+        """
+        cached = self.chunk_cache.get_many(chunk_ids)
+        missing = [cid for cid in chunk_ids if cached.get(cid, (None, None))[0] is None]
+
+        if missing:
+            query = """
+            UNWIND $chunk_ids as cid
+            MATCH (c:Chunk {id: cid})
+            RETURN""" + CHUNK_FIELDS.format(c="c")
+            for r in await self.neo4j.execute_query(query, {"chunk_ids": missing}):
+                chunk = self._chunk_from_record(r)
+                self.chunk_cache.put(chunk.id, chunk, r.get("rel_count"))
+                cached[chunk.id] = (chunk, r.get("rel_count"))
+
+        return [cached[cid][0] for cid in chunk_ids if cid in cached and cached[cid][0] is not None]
+
+    @staticmethod
+    def _chunk_from_record(r: Dict[str, Any]) -> ChunkNode:
+        return ChunkNode(
+            id=r["id"],
+            document_id=r["document_id"],
+            content=r.get("content") or "",
+            position=r.get("position") or 0,
+            embedding_id=r.get("embedding_id"),
+            section_id=r.get("section_id"),
+        )
+
     async def _search_chunks_by_text(
         self, query: str, limit: int = 10
     ) -> List[ChunkNode]:
@@ -775,6 +1062,13 @@ class GraphEnhancedRAGService:
         query_entities = await self._extract_entities(query)
         query_entity_names = {e.normalized_name for e in query_entities}
 
+        if self.single_round_trip:
+            return await self._rerank_vectorized(
+                all_results,
+                query_entity_names,
+                original_ids={c.id for c in original_results},
+            )
+
         # Score each result
         scored_results = []
         for chunk in all_results:
@@ -790,6 +1084,69 @@ class GraphEnhancedRAGService:
 
         return [chunk for _, chunk in scored_results]
 
+    async def _rerank_vectorized(
+        self,
+        chunks: List[ChunkNode],
+        query_entities: set,
+        original_ids: set,
+    ) -> List[ChunkNode]:
+        """
+        Score all chunks at once (same weights as _calculate_relevance_score).
+
+        Relationship counts come from the chunk cache, filled by the
+        expansion transaction; any still missing are fetched in one query.
+        """
+        if not chunks:
+            return []
+
+        rel_counts = await self._get_chunk_rel_counts([c.id for c in chunks])
+
+        names_by_content: Dict[str, set] = {}
+        overlaps = np.zeros(len(chunks), dtype=np.float64)
+        for i, chunk in enumerate(chunks):
+            names = names_by_content.get(chunk.content)
+            if names is None:
+                names = {e.normalized_name for e in await self._extract_entities(chunk.content)}
+                names_by_content[chunk.content] = names
+            overlaps[i] = len(query_entities & names)
+
+        is_original = np.array([c.id in original_ids for c in chunks], dtype=np.float64)
+        connectivity = np.array([rel_counts.get(c.id, 0) for c in chunks], dtype=np.float64)
+
+        scores = (
+            0.5 * is_original
+            + 0.3 * np.minimum(overlaps / max(len(query_entities), 1), 1.0)
+            + 0.2 * np.minimum(connectivity / 10, 1.0)
+        )
+
+        # Stable, so ties keep their original order (as list.sort does)
+        order = np.argsort(-scores, kind="stable")
+        return [chunks[i] for i in order]
+
+    async def _get_chunk_rel_counts(self, chunk_ids: List[str]) -> Dict[str, int]:
+        """Relationship count per chunk, from the cache or one batched query."""
+        cached = self.chunk_cache.get_many(chunk_ids)
+        counts = {cid: rel for cid, (_, rel) in cached.items() if rel is not None}
+        missing = list(dict.fromkeys(cid for cid in chunk_ids if cid not in counts))
+
+        if missing:
+            try:
+                results = await self.neo4j.execute_query(
+                    """
+                    UNWIND $chunk_ids as cid
+                    MATCH (c:Chunk {id: cid})
+                    RETURN c.id as id, size([(c)--() | 1]) as rel_count
+                    """,
+                    {"chunk_ids": missing},
+                )
+                for r in results:
+                    counts[r["id"]] = r.get("rel_count", 0)
+                    self.chunk_cache.put(r["id"], rel_count=counts[r["id"]])
+            except Exception as e:
+                logger.warning("Failed to get chunk connectivity", error=str(e))
+
+        return counts
+
     async def _calculate_relevance_score(
         self,
         chunk: ChunkNode,
@@ -3,7 +3,9 @@ Empire v7.3 - Hybrid Search Service (Task 27)
 
 Implements hybrid search combining multiple retrieval methods:
 - Dense vector search (pgvector similarity via RPC)
-- Sparse BM25 search (PostgreSQL full-text search with ts_rank_cd)
+- Sparse keyword search: Okapi BM25 over an in-process inverted index, or
+  PostgreSQL full-text ranking (ts_rank_cd, not true BM25) via the
+  search_chunks_bm25 RPC when use_rpc is set or the index is still warming
 - Fuzzy matching (PostgreSQL trigram similarity + ILIKE)
 - Reciprocal Rank Fusion (RRF) for result combination
 
@@ -28,13 +30,15 @@ import json
 
 from rapidfuzz import fuzz, process
 
+from app.services.bm25_index import BM25IndexManager, get_bm25_index_manager
+
 logger = logging.getLogger(__name__)
 
 
 class SearchMethod(Enum):
     """Available search methods"""
     DENSE = "dense"  # Vector similarity (pgvector)
-    SPARSE = "sparse"  # BM25 full-text search (ts_rank_cd)
+    SPARSE = "sparse"  # Keyword search (in-process BM25, or ts_rank_cd via RPC)
     FUZZY = "fuzzy"  # Trigram similarity + ILIKE pattern matching
     ILIKE = "ilike"  # Simple pattern matching only
     HYBRID = "hybrid"  # All methods combined with RRF
@@ -98,7 +102,7 @@ class HybridSearchConfig:
 
     # Minimum scores to include results
     min_dense_score: float = 0.5  # Cosine similarity threshold
-    min_sparse_score: float = 0.0  # BM25 relevance threshold (ts_rank_cd)
+    min_sparse_score: float = 0.0  # Sparse score threshold (BM25 score, or ts_rank_cd rank via RPC)
     min_fuzzy_score: float = 0.3  # Trigram similarity threshold (0-1)
 
     # Search behavior
@@ -136,7 +140,8 @@ class HybridSearchService:
         vector_storage_service,
         embedding_service,
         config: Optional[HybridSearchConfig] = None,
-        monitoring_service=None
+        monitoring_service=None,
+        bm25_index_manager: Optional[BM25IndexManager] = None
     ):
         """
         Initialize hybrid search service
@@ -147,12 +152,14 @@ class HybridSearchService:
             embedding_service: Embedding service to generate query embeddings
             config: Search configuration
             monitoring_service: Optional monitoring service
+            bm25_index_manager: Sparse index manager (defaults to a private one)
         """
         self.storage = supabase_storage
         self.vector_service = vector_storage_service
         self.embedding_service = embedding_service
         self.config = config or HybridSearchConfig()
         self.monitoring = monitoring_service
+        self.bm25 = bm25_index_manager or BM25IndexManager()
 
         self.config.validate()
 
@@ -326,7 +333,14 @@ class HybridSearchService:
         metadata_filter: Optional[Dict[str, Any]]
     ) -> List[SearchResult]:
         """
-        Sparse BM25 full-text search using PostgreSQL
+        Sparse BM25 search using the in-process inverted index
+
+        The index covers the whole chunks table (like the fuzzy and RPC paths)
+        and is kept current in the background from the chunk change log;
+        until the first build finishes the search_chunks_bm25 RPC is used
+        instead of blocking the request. Scoring uses corpus IDF and average
+        document length; WAND pruning keeps top-k retrieval sublinear in the
+        corpus size.
 
         Args:
             query: Search query
@@ -337,59 +351,55 @@ class HybridSearchService:
         Returns:
             List of results from BM25 search
         """
-        # Use PostgreSQL ts_rank for BM25-like scoring
-        # This requires a tsvector column on the chunks table
-
         try:
-            # Build query
-            query_builder = self.storage.supabase.table("chunks")\
-                .select("id, content, metadata, file_id")
-
-            # Apply namespace filter (if chunks table has namespace)
-            # For now, we'll search all chunks
+            index = self.bm25.get_index(self.storage.supabase)
+            if index is None:
+                logger.info("BM25 index is still warming, using the SQL sparse search")
+                return await self._sparse_search_rpc(
+                    query, config, namespace, metadata_filter, fallback=False
+                )
 
-            # Apply metadata filter
+            doc_filter = None
             if metadata_filter:
-                for key, value in metadata_filter.items():
-                    query_builder = query_builder.eq(f"metadata->>{key}", value)
-
-            # Execute query to get all chunks (we'll filter by text match in Python)
-            # In production, use PostgreSQL full-text search with ts_rank
-            result = await query_builder.limit(config.sparse_top_k * 3).execute()
-
-            if not result.data:
+                # Match PostgREST metadata->>key semantics (text comparison)
+                expected = {key: str(value) for key, value in metadata_filter.items()}
+
+                def doc_filter(metadata: Dict[str, Any]) -> bool:
+                    return all(
+                        key in metadata and str(metadata[key]) == value
+                        for key, value in expected.items()
+                    )
+
+            hits = [
+                (chunk_id, score)
+                for chunk_id, score in index.search(query, k=config.sparse_top_k, doc_filter=doc_filter)
+                if score >= config.min_sparse_score
+            ]
+            if not hits:
                 return []
 
-            # Perform BM25-like scoring in Python
-            # In production, this should be done in PostgreSQL with proper indexes
-            scored_results = []
-            for chunk in result.data:
-                content = chunk.get("content", "")
-                score = self._bm25_score(query, content)
-
-                if score >= config.min_sparse_score:
-                    scored_results.append({
-                        "chunk_id": chunk["id"],
-                        "content": content,
-                        "score": score,
-                        "metadata": chunk.get("metadata", {})
-                    })
-
-            # Sort by score and limit
-            scored_results.sort(key=lambda x: x["score"], reverse=True)
-            scored_results = scored_results[:config.sparse_top_k]
+            # Fetch content for the hits in one round trip
+            result = await self.storage.supabase.table("chunks")\
+                .select("id, content, metadata")\
+                .in_("id", [chunk_id for chunk_id, _ in hits])\
+                .execute()
+            rows = {str(row["id"]): row for row in (result.data or [])}
 
-            # Convert to SearchResult
             search_results = []
-            for rank, result in enumerate(scored_results, 1):
+            for chunk_id, score in hits:
+                row = rows.get(chunk_id)
+                if row is None:
+                    # Deleted since the index was built
+                    self.bm25.remove_chunks([chunk_id])
+                    continue
                 search_results.append(SearchResult(
-                    chunk_id=result["chunk_id"],
-                    content=result["content"],
-                    score=result["score"],
-                    rank=rank,
+                    chunk_id=row["id"],
+                    content=row.get("content", ""),
+                    score=score,
+                    rank=len(search_results) + 1,
                     method="sparse",
-                    metadata=result["metadata"],
-                    sparse_score=result["score"]
+                    metadata=row.get("metadata") or {},
+                    sparse_score=score
                 ))
 
             return search_results
@@ -398,6 +408,10 @@ class HybridSearchService:
             logger.error(f"Sparse search failed: {e}")
             return []
 
+    async def warm_sparse_index(self):
+        """Load or build the sparse index ahead of the first query"""
+        await self.bm25.warm(self.storage.supabase)
+
     async def _fuzzy_search(
         self,
         query: str,
@@ -543,50 +557,6 @@ class HybridSearchService:
 
         return list(chunk_scores.values())
 
-    def _bm25_score(self, query: str, document: str) -> float:
-        """
-        Simple BM25 scoring (simplified version)
-
-        In production, use PostgreSQL ts_rank_cd with proper BM25 parameters
-
-        Args:
-            query: Search query
-            document: Document text
-
-        Returns:
-            BM25 relevance score
-        """
-        # Tokenize
-        query_terms = set(query.lower().split())
-        doc_terms = document.lower().split()
-        doc_length = len(doc_terms)
-
-        if doc_length == 0:
-            return 0.0
-
-        # Count term frequencies
-        term_freq = {}
-        for term in doc_terms:
-            term_freq[term] = term_freq.get(term, 0) + 1
-
-        # Simplified BM25 (missing IDF and collection stats)
-        k1 = 1.5  # Term frequency saturation
-        b = 0.75  # Length normalization
-        avg_doc_length = 500  # Assumed average
-
-        score = 0.0
-        for term in query_terms:
-            if term in term_freq:
-                tf = term_freq[term]
-                # Simplified BM25 term score
-                term_score = (tf * (k1 + 1)) / (
-                    tf + k1 * (1 - b + b * (doc_length / avg_doc_length))
-                )
-                score += term_score
-
-        # Normalize by query length
-        return score / max(len(query_terms), 1)
-
     async def _get_chunk_content(self, chunk_id: str) -> str:
         """
         Retrieve chunk content from database
@@ -700,18 +670,21 @@ class HybridSearchService:
         query: str,
         config: HybridSearchConfig,
         namespace: Optional[str],
-        metadata_filter: Optional[Dict[str, Any]]
+        metadata_filter: Optional[Dict[str, Any]],
+        fallback: bool = True
     ) -> List[SearchResult]:
         """
-        BM25 full-text search using PostgreSQL RPC function
+        Full-text search using the search_chunks_bm25 RPC function
 
-        Uses ts_rank_cd for BM25-like scoring with proper document length normalization.
+        Ranks with PostgreSQL ts_rank_cd (cover density, normalized by
+        document length); unlike the in-process index it has no corpus IDF.
 
         Args:
             query: Search query
             config: Search configuration
             namespace: Filter by namespace
             metadata_filter: Filter by metadata
+            fallback: Use the in-process BM25 index if the RPC fails
 
         Returns:
             List of results from BM25 search
@@ -748,6 +721,9 @@ class HybridSearchService:
             return search_results
 
         except Exception as e:
+            if not fallback:
+                logger.error(f"RPC sparse search failed: {e}")
+                return []
             logger.warning(f"RPC sparse search failed, falling back to Python: {e}")
             return await self._sparse_search(query, config, namespace, metadata_filter)
 
@@ -1053,7 +1029,8 @@ def get_hybrid_search_service(
             vector_storage_service,
             embedding_service,
             config,
-            monitoring_service
+            monitoring_service,
+            bm25_index_manager=get_bm25_index_manager()
         )
 
     return _hybrid_search_service
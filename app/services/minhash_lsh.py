@@ -0,0 +1,128 @@
+"""
+Empire v7.5 - MinHash / LSH Signatures
+
+Compact near-duplicate signatures for text, used by AssetDedupService.
+
+A MinHash signature estimates word-level Jaccard similarity; splitting it
+into bands and hashing each band gives LSH bucket keys. Two texts share at
+least one bucket with probability 1 - (1 - J^rows)^bands, so a database
+overlap query on the stored keys returns a small candidate set instead of
+every asset.
+
+With the defaults (20 bands x 6 rows = 120 permutations):
+- J = 0.75 -> candidate with probability ~0.98
+- J = 0.50 -> ~0.27
+- J = 0.30 -> ~0.01
+
+Hashing is deterministic across processes (blake2b word hashes, fixed
+permutation seed), so signatures computed at save time, in backfill jobs and
+at query time are comparable.
+"""
+
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set
+
+import numpy as np
+
+# Permutations h(x) = (a * x + b) mod p, with p = 2^31 - 1 so a * x fits in int64
+_MERSENNE_PRIME = (1 << 31) - 1
+_PERMUTATION_SEED = 7531
+_HASH_BLOCK = 4096  # Words per permutation block
+
+
+def tokenize(text: str) -> Set[str]:
+    """Word set used for similarity (matches AssetDedupService.jaccard_similarity)"""
+    return set(text.lower().split())
+
+
+def _word_hashes(words: Iterable[str]) -> np.ndarray:
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            % _MERSENNE_PRIME
+            for word in words
+        ),
+        dtype=np.int64
+    )
+
+
+@dataclass(frozen=True)
+class LSHParams:
+    """Banding parameters (num_perm = bands * rows)"""
+    bands: int = 20
+    rows: int = 6
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows
+
+
+class MinHasher:
+    """MinHash signatures and LSH band keys for word sets"""
+
+    def __init__(self, params: Optional[LSHParams] = None):
+        self.params = params or LSHParams()
+        rng = random.Random(_PERMUTATION_SEED)
+        num_perm = self.params.num_perm
+        self._a = np.array([rng.randrange(1, _MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.int64)
+        self._b = np.array([rng.randrange(0, _MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.int64)
+
+    def signature(self, text: str) -> List[int]:
+        """
+        MinHash signature of the text's word set
+
+        Returns:
+            num_perm integers (empty list for text without words)
+        """
+        words = tokenize(text)
+        if not words:
+            return []
+
+        hashes = _word_hashes(words)
+        result = np.full(self.params.num_perm, _MERSENNE_PRIME, dtype=np.int64)
+        # (num_perm, block) matrices of permuted hashes, blocked to bound memory
+        for start in range(0, len(hashes), _HASH_BLOCK):
+            block = hashes[start:start + _HASH_BLOCK]
+            permuted = (np.outer(self._a, block) + self._b[:, None]) % _MERSENNE_PRIME
+            np.minimum(result, permuted.min(axis=1), out=result)
+        return result.tolist()
+
+    def band_keys(self, signature: List[int]) -> List[str]:
+        """
+        LSH bucket keys, one per band: "<band>:<hash of the band's rows>"
+
+        The band index is part of the key so equal rows in different bands
+        do not collide.
+        """
+        if not signature:
+            return []
+
+        rows = self.params.rows
+        keys = []
+        for band in range(self.params.bands):
+            values = signature[band * rows:(band + 1) * rows]
+            digest = hashlib.blake2b(
+                ",".join(map(str, values)).encode("ascii"), digest_size=8
+            ).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    @staticmethod
+    def estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity from two signatures"""
+        if not sig_a or not sig_b or len(sig_a) != len(sig_b):
+            return 0.0
+        return float(np.mean(np.asarray(sig_a) == np.asarray(sig_b)))
+
+
+# Singleton
+_min_hasher: Optional[MinHasher] = None
+
+
+def get_min_hasher() -> MinHasher:
+    global _min_hasher
+    if _min_hasher is None:
+        _min_hasher = MinHasher()
+    return _min_hasher
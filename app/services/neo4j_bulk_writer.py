@@ -0,0 +1,263 @@
+"""
+Neo4j Bulk Writer
+
+Batched graph writes using parameterized UNWIND statements.
+
+Features:
+- One Cypher statement per batch of rows (UNWIND $rows AS row ...) instead of
+  one round trip per node or relationship
+- Configurable batch size (NEO4J_BULK_BATCH_SIZE, default 500 rows)
+- Bolt writer: each batch commits in its own managed write transaction, so a
+  failed batch leaves earlier batches committed (GraphWriteError.records
+  carries what they returned); transient errors are retried with exponential
+  backoff and MERGE-based statements make retries idempotent
+- Async variant for the Neo4j HTTP client that sends every batch of a write
+  as statements of one transactional request
+
+Statements must read their input from ``row`` and may return ``row.idx`` (or
+any other column) to report which rows matched.
+
+Usage:
+    from app.services.neo4j_bulk_writer import Neo4jBulkWriter
+
+    writer = Neo4jBulkWriter(connection)
+    records = writer.run(
+        "UNWIND $rows AS row MERGE (e:Entity {entity_id: row.entity_id}) "
+        "RETURN e.entity_id AS id",
+        rows
+    )
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("NEO4J_BULK_BATCH_SIZE", "500"))
+
+# Errors worth retrying; anything else (syntax, constraint, auth) fails at once
+TRANSIENT_ERRORS = (ServiceUnavailable, SessionExpired, TransientError)
+
+
+class GraphWriteError(Exception):
+    """
+    Raised when a batch fails (after retries, for transient errors)
+
+    records holds what the batches committed before the failure returned.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        stats: "GraphWriteStats",
+        records: Optional[List[Dict[str, Any]]] = None
+    ):
+        super().__init__(message)
+        self.stats = stats
+        self.records = records or []
+
+
+@dataclass
+class GraphWriteStats:
+    """Statistics for bulk graph writes"""
+    rows_sent: int = 0
+    batches: int = 0
+    retries: int = 0
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_sent": self.rows_sent,
+            "batches": self.batches,
+            "retries": self.retries,
+            "duration_ms": round(self.duration_ms, 2),
+        }
+
+
+@dataclass
+class BulkStatement:
+    """An UNWIND statement and the rows it should be applied to"""
+    query: str
+    rows: List[Dict[str, Any]]
+
+
+def iter_batches(rows: Sequence[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split rows into lists of at most batch_size"""
+    for start in range(0, len(rows), batch_size):
+        yield list(rows[start:start + batch_size])
+
+
+class Neo4jBulkWriter:
+    """
+    Bulk writer for the Bolt driver connection (Neo4jConnection)
+
+    Commits one transaction per batch: a write is not atomic across batches.
+    Synchronous, like Neo4jConnection; async callers should use
+    asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        connection,
+        batch_size: Optional[int] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5
+    ):
+        """
+        Initialize bulk writer
+
+        Args:
+            connection: Neo4jConnection (must provide execute_write)
+            batch_size: Rows per statement (NEO4J_BULK_BATCH_SIZE, default 500)
+            max_retries: Retries per batch after the first attempt
+            retry_backoff: Base delay in seconds (doubles per retry)
+        """
+        self.connection = connection
+        self.batch_size = max(batch_size or DEFAULT_BATCH_SIZE, 1)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stats = GraphWriteStats()
+
+    def run(self, query: str, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply an UNWIND statement to rows in batches
+
+        Each batch is committed on its own; batches after a failed one are
+        not attempted.
+
+        Returns:
+            Records returned by all batches, in batch order
+
+        Raises:
+            GraphWriteError: If a batch fails; its records are those of the
+                batches committed before it
+        """
+        start = time.time()
+        records: List[Dict[str, Any]] = []
+        try:
+            for batch in iter_batches(rows, self.batch_size):
+                records.extend(self._write_batch(query, batch))
+        except GraphWriteError as e:
+            e.records = records
+            raise
+        finally:
+            self.stats.duration_ms += (time.time() - start) * 1000
+        return records
+
+    def run_many(self, statements: Sequence[BulkStatement]) -> List[List[Dict[str, Any]]]:
+        """Run several statements, returning records per statement"""
+        return [self.run(statement.query, statement.rows) for statement in statements]
+
+    def _write_batch(self, query: str, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write one batch in a single transaction, retrying transient errors"""
+        attempt = 0
+        while True:
+            try:
+                records = self.connection.execute_write(query, {"rows": batch})
+                self.stats.rows_sent += len(batch)
+                self.stats.batches += 1
+                return records or []
+
+            except Exception as e:
+                if not isinstance(e, TRANSIENT_ERRORS):
+                    logger.error(f"Neo4j bulk write failed ({len(batch)} rows): {e}")
+                    raise GraphWriteError(f"Neo4j bulk write failed: {e}", self.stats) from e
+
+                if attempt >= self.max_retries:
+                    logger.error(
+                        f"Neo4j bulk write failed after {attempt + 1} attempts "
+                        f"({len(batch)} rows): {e}"
+                    )
+                    raise GraphWriteError(f"Neo4j bulk write failed: {e}", self.stats) from e
+
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                self.stats.retries += 1
+                logger.warning(
+                    f"Neo4j bulk write failed ({len(batch)} rows), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
+
+
+class AsyncNeo4jBulkWriter:
+    """
+    Bulk writer for the Neo4j HTTP client (Neo4jHTTPClient)
+
+    All batches of a write are sent as statements of one transactional
+    request (execute_batch), so a write is a single round trip and either
+    fully applies or is retried as a whole.
+    """
+
+    def __init__(
+        self,
+        client,
+        batch_size: Optional[int] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5
+    ):
+        self.client = client
+        self.batch_size = max(batch_size or DEFAULT_BATCH_SIZE, 1)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stats = GraphWriteStats()
+
+    async def run_many(self, statements: Sequence[BulkStatement]) -> List[List[Dict[str, Any]]]:
+        """
+        Run statements in one transaction
+
+        Returns:
+            Records per input statement (batches of a statement are merged)
+
+        Raises:
+            GraphWriteError: If the transaction fails after all retries
+        """
+        queries = []
+        owners = []
+        for index, statement in enumerate(statements):
+            for batch in iter_batches(statement.rows, self.batch_size):
+                queries.append({"statement": statement.query, "parameters": {"rows": batch}})
+                owners.append(index)
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in statements]
+        if not queries:
+            return results
+
+        start = time.time()
+        batch_results = await self._execute(queries)
+        for owner, records in zip(owners, batch_results or []):
+            results[owner].extend(records)
+
+        self.stats.rows_sent += sum(len(q["parameters"]["rows"]) for q in queries)
+        self.stats.batches += len(queries)
+        self.stats.duration_ms += (time.time() - start) * 1000
+        return results
+
+    async def _execute(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        attempt = 0
+        while True:
+            try:
+                return await self.client.execute_batch(queries)
+
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(
+                        f"Neo4j bulk transaction failed after {attempt + 1} attempts "
+                        f"({len(queries)} statements): {e}"
+                    )
+                    raise GraphWriteError(f"Neo4j bulk write failed: {e}", self.stats) from e
+
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                self.stats.retries += 1
+                logger.warning(
+                    f"Neo4j bulk transaction failed ({len(queries)} statements), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
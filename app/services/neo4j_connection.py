@@ -148,6 +148,31 @@ class Neo4jConnection:
             logger.error(f"Parameters: {parameters}")
             return []
 
+    def execute_write(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a write query in a managed transaction
+
+        Unlike execute_query, errors are raised so callers can retry.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+
+        Returns:
+            List of result records as dictionaries
+        """
+        if self._closed:
+            raise RuntimeError("Neo4j connection is closed")
+
+        with self.get_session() as session:
+            return session.execute_write(
+                lambda tx: tx.run(query, parameters or {}).data()
+            )
+
     def close(self):
         """
         Close the Neo4j driver and release resources
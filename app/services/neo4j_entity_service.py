@@ -8,23 +8,47 @@ Features:
 - Document node CRUD operations
 - Entity node management
 - Relationship creation with types
-- Batch insert for efficiency
+- Batch insert for efficiency (UNWIND bulk writes via Neo4jBulkWriter)
 - Idempotent operations (MERGE)
 - Query helpers for graph traversal
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
 from app.services.neo4j_connection import Neo4jConnection, get_neo4j_connection
+from app.services.neo4j_bulk_writer import GraphWriteError, Neo4jBulkWriter
 
 logger = logging.getLogger(__name__)
 
 # Security: Allowlists for Cypher injection prevention
 VALID_NODE_TYPES = {"Document", "Entity"}
 VALID_PROPERTY_KEYS = {"weight", "timestamp", "confidence", "source", "type", "created_at", "count"}
+NODE_ID_KEYS = {"Document": "doc_id", "Entity": "entity_id"}
+
+BULK_DOCUMENT_QUERY = """
+UNWIND $rows AS row
+MERGE (d:Document {doc_id: row.doc_id})
+SET d.title = row.title,
+    d.content = row.content,
+    d.doc_type = row.doc_type,
+    d.department = row.department,
+    d.metadata = row.metadata,
+    d.updated_at = timestamp()
+RETURN d.doc_id as id
+"""
+
+BULK_ENTITY_QUERY = """
+UNWIND $rows AS row
+MERGE (e:Entity {entity_id: row.entity_id})
+SET e.name = row.name,
+    e.entity_type = row.entity_type,
+    e.metadata = row.metadata,
+    e.updated_at = timestamp()
+RETURN e.entity_id as id
+"""
 
 
 class RelationshipType(str, Enum):
@@ -65,14 +89,21 @@ class Neo4jEntityService:
     entity nodes, and their relationships.
     """
 
-    def __init__(self, connection: Optional[Neo4jConnection] = None):
+    def __init__(
+        self,
+        connection: Optional[Neo4jConnection] = None,
+        batch_size: Optional[int] = None
+    ):
         """
         Initialize entity service
 
         Args:
             connection: Optional Neo4j connection (uses singleton if not provided)
+            batch_size: Rows per UNWIND statement for batch methods
+                (NEO4J_BULK_BATCH_SIZE, default 500)
         """
         self.connection = connection or get_neo4j_connection()
+        self.bulk_writer = Neo4jBulkWriter(self.connection, batch_size=batch_size)
         logger.info("Initialized Neo4jEntityService")
 
     def create_document_node(self, document: DocumentNode) -> Optional[str]:
@@ -232,19 +263,41 @@ class Neo4jEntityService:
         """
         Create multiple document nodes in batch
 
+        Documents are merged with one UNWIND statement per batch, each batch
+        committed in its own transaction. If a batch fails, the IDs written
+        by the batches before it are still returned.
+
         Args:
             documents: List of DocumentNode instances
 
         Returns:
             List of created document IDs
         """
-        created_ids = []
+        if not documents:
+            return []
 
-        for document in documents:
-            doc_id = self.create_document_node(document)
-            if doc_id:
-                created_ids.append(doc_id)
+        rows = [
+            {
+                "doc_id": document.doc_id,
+                "title": document.title,
+                "content": document.content,
+                "doc_type": document.doc_type,
+                "department": document.department,
+                "metadata": document.metadata
+            }
+            for document in documents
+        ]
+
+        try:
+            records = self.bulk_writer.run(BULK_DOCUMENT_QUERY, rows)
+        except GraphWriteError as e:
+            logger.error(
+                f"Failed to batch create document nodes "
+                f"({len(e.records)} written before the failure): {e}"
+            )
+            records = e.records
 
+        created_ids = [record["id"] for record in records]
         logger.info(f"Batch created {len(created_ids)} document nodes")
         return created_ids
 
@@ -252,19 +305,39 @@ class Neo4jEntityService:
         """
         Create multiple entity nodes in batch
 
+        Entities are merged with one UNWIND statement per batch, each batch
+        committed in its own transaction. If a batch fails, the IDs written
+        by the batches before it are still returned.
+
         Args:
             entities: List of EntityNode instances
 
         Returns:
             List of created entity IDs
         """
-        created_ids = []
+        if not entities:
+            return []
+
+        rows = [
+            {
+                "entity_id": entity.entity_id,
+                "name": entity.name,
+                "entity_type": entity.entity_type,
+                "metadata": entity.metadata
+            }
+            for entity in entities
+        ]
 
-        for entity in entities:
-            entity_id = self.create_entity_node(entity)
-            if entity_id:
-                created_ids.append(entity_id)
+        try:
+            records = self.bulk_writer.run(BULK_ENTITY_QUERY, rows)
+        except GraphWriteError as e:
+            logger.error(
+                f"Failed to batch create entity nodes "
+                f"({len(e.records)} written before the failure): {e}"
+            )
+            records = e.records
 
+        created_ids = [record["id"] for record in records]
         logger.info(f"Batch created {len(created_ids)} entity nodes")
         return created_ids
 
@@ -272,28 +345,78 @@ class Neo4jEntityService:
         """
         Create multiple relationships in batch
 
+        Relationships are grouped by node labels and relationship type (which
+        cannot be query parameters) and each group is merged with one UNWIND
+        statement per batch. Invalid relationships are reported as False.
+
         Args:
             relationships: List of relationship dictionaries
 
         Returns:
-            List of success statuses
-        """
-        results = []
-
-        for rel in relationships:
-            success = self.create_relationship(
-                from_id=rel["from_id"],
-                from_type=rel["from_type"],
-                to_id=rel["to_id"],
-                to_type=rel["to_type"],
-                relationship_type=rel["relationship_type"],
-                properties=rel.get("properties")
-            )
-            results.append(success)
+            List of success statuses, in input order
+        """
+        results = [False] * len(relationships)
+        groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+
+        for idx, rel in enumerate(relationships):
+            try:
+                key, row = self._relationship_row(idx, rel)
+            except (KeyError, ValueError) as e:
+                logger.error(f"Failed to create relationship: {e}")
+                continue
+            groups.setdefault(key, []).append(row)
+
+        for (from_type, to_type, rel_type), rows in groups.items():
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (a:{from_type} {{{NODE_ID_KEYS[from_type]}: row.from_id}})
+            MATCH (b:{to_type} {{{NODE_ID_KEYS[to_type]}: row.to_id}})
+            MERGE (a)-[r:{rel_type}]->(b)
+            SET r += row.properties
+            RETURN row.idx as idx
+            """
+            try:
+                records = self.bulk_writer.run(query, rows)
+            except GraphWriteError as e:
+                logger.error(
+                    f"Failed to batch create {rel_type} relationships "
+                    f"({from_type}->{to_type}): {e}"
+                )
+                records = e.records
+            for record in records:
+                results[record["idx"]] = True
 
         logger.info(f"Batch created {sum(results)} relationships")
         return results
 
+    def _relationship_row(
+        self,
+        idx: int,
+        rel: Dict[str, Any]
+    ) -> Tuple[Tuple[str, str, str], Dict[str, Any]]:
+        """Validate a relationship dict and build its group key and UNWIND row"""
+        from_type = rel["from_type"]
+        to_type = rel["to_type"]
+
+        # Security: Validate node types and property keys against allowlists
+        if from_type not in VALID_NODE_TYPES:
+            raise ValueError(f"Invalid node type: {from_type}")
+        if to_type not in VALID_NODE_TYPES:
+            raise ValueError(f"Invalid node type: {to_type}")
+        relationship_type = RelationshipType(rel["relationship_type"])
+        props = rel.get("properties") or {}
+        for key in props.keys():
+            if key not in VALID_PROPERTY_KEYS:
+                raise ValueError(f"Invalid property key: {key}")
+
+        row = {
+            "idx": idx,
+            "from_id": rel["from_id"],
+            "to_id": rel["to_id"],
+            "properties": props
+        }
+        return (from_type, to_type, relationship_type.value), row
+
     def link_document_to_entities(
         self,
         doc_id: str,
@@ -313,18 +436,17 @@ class Neo4jEntityService:
         Returns:
             Count of successfully created relationships
         """
-        count = 0
-
-        for entity_id in entity_ids:
-            success = self.create_relationship(
-                from_id=doc_id,
-                from_type="Document",
-                to_id=entity_id,
-                to_type="Entity",
-                relationship_type=relationship_type
-            )
-            if success:
-                count += 1
+        results = self.batch_create_relationships([
+            {
+                "from_id": doc_id,
+                "from_type": "Document",
+                "to_id": entity_id,
+                "to_type": "Entity",
+                "relationship_type": relationship_type
+            }
+            for entity_id in entity_ids
+        ])
+        count = sum(results)
 
         logger.info(f"Linked document {doc_id} to {count} entities")
         return count
@@ -15,6 +15,7 @@ from dataclasses import dataclass, field
 
 import structlog
 
+from app.services.principal_cache import get_principal_cache
 from app.services.supabase_storage import get_supabase_storage
 
 logger = structlog.get_logger(__name__)
@@ -278,6 +279,7 @@ class OrganizationService:
         if not result.data:
             return None
 
+        await get_principal_cache().invalidate_membership(org_id, target_user_id)
         logger.info("Member added", org_id=org_id, user_id=target_user_id, role=role)
         return self._row_to_membership(result.data[0])
 
@@ -308,6 +310,7 @@ class OrganizationService:
         )
 
         removed = len(result.data or []) > 0
+        await get_principal_cache().invalidate_membership(org_id, target_user_id)
         if removed:
             logger.info("Member removed", org_id=org_id, user_id=target_user_id)
         return removed
@@ -330,8 +333,16 @@ class OrganizationService:
 
     async def verify_membership(self, org_id: str, user_id: str) -> Optional[str]:
         """Verify user is a member and return their role. Used by middleware."""
+        cache = get_principal_cache()
+        role = cache.get_membership(org_id, user_id)
+        if role is not None:
+            return role
+
         membership = await self._get_membership(org_id, user_id)
-        return membership.role if membership else None
+        if not membership:
+            return None
+        cache.set_membership(org_id, user_id, membership.role)
+        return membership.role
 
     # =========================================================================
     # Export (Acquisition Portability)
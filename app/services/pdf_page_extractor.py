@@ -0,0 +1,290 @@
+"""
+Empire v7.3 - Page-sharded PDF Extraction
+Parallel PyPDF text/image extraction for large PDFs
+
+Features:
+- Page range split into shards, each extracted by a worker that opens its own
+  PdfReader (spawn-started ProcessPoolExecutor, so workers never inherit a
+  forked copy of the API process; recreated if a worker dies)
+- Daemonic processes such as Celery prefork workers cannot start a process
+  pool; there shards are extracted one at a time, since pypdf holds the GIL
+  and threads would only contend (Celery already parallelises across workers)
+- Pages streamed back in page order as shards complete, so chunking can start
+  before the last page is parsed
+- Bounded number of shards in flight; workers return page text and image
+  metadata only, so decoded page images are never held for the whole document
+- Small PDFs are extracted in a single shard on a worker thread, keeping the
+  event loop free either way
+
+Usage:
+    from app.services.pdf_page_extractor import get_pdf_page_extractor
+
+    extractor = get_pdf_page_extractor()
+    async for page in extractor.iter_pages("/tmp/report.pdf"):
+        ...
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PdfExtractionConfig:
+    """Configuration for page-sharded PDF extraction"""
+    max_workers: int = max((os.cpu_count() or 2) - 1, 1)
+    use_processes: bool = True
+    pages_per_shard: int = 25
+    parallel_min_pages: int = 50  # Smaller PDFs are extracted as one shard
+    max_shards_in_flight: int = 0  # 0 = two per worker
+
+    @classmethod
+    def from_env(cls) -> "PdfExtractionConfig":
+        """Create config from environment variables"""
+        default_workers = max((os.cpu_count() or 2) - 1, 1)
+        return cls(
+            max_workers=int(os.getenv("PDF_EXTRACTION_WORKERS", str(default_workers))),
+            use_processes=os.getenv("PDF_EXTRACTION_USE_PROCESSES", "true").lower() == "true",
+            pages_per_shard=int(os.getenv("PDF_SHARD_PAGES", "25")),
+            parallel_min_pages=int(os.getenv("PDF_PARALLEL_MIN_PAGES", "50")),
+            max_shards_in_flight=int(os.getenv("PDF_MAX_SHARDS_IN_FLIGHT", "0")),
+        )
+
+    @property
+    def shards_in_flight(self) -> int:
+        """Maximum shards submitted but not yet consumed"""
+        if self.max_shards_in_flight > 0:
+            return self.max_shards_in_flight
+        return max(self.max_workers * 2, 1)
+
+
+# ============================================================================
+# Worker functions (top-level so they can be pickled)
+# ============================================================================
+
+def read_pdf_info(file_path: str) -> Dict[str, Any]:
+    """Read page count and document metadata"""
+    reader = PdfReader(file_path)
+    metadata = reader.metadata
+    return {
+        "page_count": len(reader.pages),
+        "pdf_metadata": {
+            "author": metadata.author if metadata else None,
+            "title": metadata.title if metadata else None,
+            "producer": metadata.producer if metadata else None
+        }
+    }
+
+
+def extract_page_range(
+    file_path: str,
+    start: int,
+    end: int,
+    extract_images: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Extract pages [start, end) of a PDF (runs inside the executor)
+
+    Returns one dict per page with page_number, text, images (metadata only)
+    and error (None, or the message if that page failed).
+    """
+    reader = PdfReader(file_path)
+    pages = []
+
+    for index in range(start, end):
+        page_num = index + 1
+        try:
+            page = reader.pages[index]
+            images = []
+            if extract_images and hasattr(page, 'images'):
+                for img_idx, img in enumerate(page.images):
+                    images.append({
+                        "image_index": img_idx,
+                        "name": img.name,
+                        "page": page_num
+                    })
+
+            pages.append({
+                "page_number": page_num,
+                "text": page.extract_text() or "",
+                "images": images,
+                "error": None
+            })
+
+        except Exception as e:
+            pages.append({
+                "page_number": page_num,
+                "text": "",
+                "images": [],
+                "error": str(e)
+            })
+
+    return pages
+
+
+def _call(fn, args: Tuple) -> Any:
+    return fn(*args)
+
+
+def _in_daemonic_process() -> bool:
+    """Whether this process is daemonic (and so cannot start child processes)"""
+    if multiprocessing.current_process().daemon:
+        return True
+    try:
+        import billiard
+    except ImportError:
+        return False
+    return bool(billiard.current_process().daemon)
+
+
+# ============================================================================
+# Extractor
+# ============================================================================
+
+class PdfPageExtractor:
+    """Executor-backed, page-sharded PDF extraction"""
+
+    def __init__(self, config: Optional[PdfExtractionConfig] = None):
+        self.config = config or PdfExtractionConfig.from_env()
+        self._executor: Optional[Executor] = None
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def uses_processes(self) -> bool:
+        """Whether shards run in a process pool (False inside daemonic processes)"""
+        return self.config.use_processes and not _in_daemonic_process()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.uses_processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = self._get_thread_executor()
+        return self._executor
+
+    def _get_thread_executor(self) -> ThreadPoolExecutor:
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.config.max_workers,
+                thread_name_prefix="pdf-extract"
+            )
+        return self._thread_executor
+
+    async def _run(self, fn, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, _call, fn, args)
+        except BrokenProcessPool:
+            logger.warning("PDF extraction process pool broke, recreating it")
+            # Other in-flight shards may have already replaced the broken pool
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            return await loop.run_in_executor(self._get_executor(), _call, fn, args)
+
+    def plan_shards(self, page_count: int) -> List[Tuple[int, int]]:
+        """Split [0, page_count) into (start, end) page ranges"""
+        if page_count <= 0:
+            return []
+        if page_count < self.config.parallel_min_pages:
+            return [(0, page_count)]
+        size = max(self.config.pages_per_shard, 1)
+        return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    async def read_info(self, file_path: str) -> Dict[str, Any]:
+        """Page count and document metadata, read off the event loop"""
+        return await asyncio.to_thread(read_pdf_info, file_path)
+
+    async def iter_pages(
+        self,
+        file_path: str,
+        extract_images: bool = True,
+        page_count: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield extracted pages in page order
+
+        At most shards_in_flight shards are submitted ahead of the consumer;
+        the next shard is submitted as soon as one is taken, so workers keep
+        extracting while the caller processes earlier pages.
+
+        Args:
+            file_path: Path to the PDF
+            extract_images: Include per-page image metadata
+            page_count: Known page count (read from the file if None)
+        """
+        if page_count is None:
+            page_count = (await self.read_info(file_path))["page_count"]
+
+        shards = self.plan_shards(page_count)
+        if len(shards) <= 1 or _in_daemonic_process():
+            # Sequential path: small PDFs, and daemonic workers that cannot
+            # start a process pool
+            for start, end in shards:
+                pages = await asyncio.to_thread(extract_page_range, file_path, start, end, extract_images)
+                for page in pages:
+                    yield page
+            return
+
+        logger.info(
+            f"Extracting {page_count} PDF pages in {len(shards)} shards "
+            f"({'processes' if self.uses_processes else 'threads'})"
+        )
+
+        pending = iter(shards)
+        in_flight: Deque[asyncio.Future] = deque()
+
+        def submit_next() -> None:
+            shard = next(pending, None)
+            if shard is not None:
+                in_flight.append(asyncio.ensure_future(
+                    self._run(extract_page_range, file_path, shard[0], shard[1], extract_images)
+                ))
+
+        try:
+            for _ in range(self.config.shards_in_flight):
+                submit_next()
+
+            while in_flight:
+                pages = await in_flight.popleft()
+                submit_next()
+                for page in pages:
+                    yield page
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def shutdown(self) -> None:
+        """Shut down executors"""
+        if self._executor is not None and self._executor is not self._thread_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._thread_executor is not None:
+            self._thread_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._thread_executor = None
+
+
+# Singleton instance
+_pdf_page_extractor: Optional[PdfPageExtractor] = None
+
+
+def get_pdf_page_extractor() -> PdfPageExtractor:
+    """Get or create the PDF page extractor singleton"""
+    global _pdf_page_extractor
+    if _pdf_page_extractor is None:
+        _pdf_page_extractor = PdfPageExtractor()
+    return _pdf_page_extractor
@@ -0,0 +1,376 @@
+"""
+Empire v7.3 - Principal Cache
+Process-wide cache of authenticated principals, roles and org memberships
+
+Authenticating one API-key request used to run bcrypt.checkpw for every
+candidate key with the same prefix, and the same request could be
+authenticated again by the RLS middleware and by the route dependency, each
+followed by a user_roles query. With the cache:
+
+- Principals (API key -> key record, JWT -> user ID) are kept in a short-TTL
+  LRU keyed by the SHA-256 of the credential; the plaintext credential is
+  never stored. TTLs are capped at the API key's expires_at / the JWT's exp.
+  Failed authentications are never cached.
+- Roles (user_roles rows) and org membership roles are cached per user /
+  (org, user) with the same short TTL.
+- RBACService and OrganizationService invalidate entries when they revoke
+  keys or change roles/memberships. Invalidations apply locally at once and
+  are published on a Redis channel so other API pods drop their copies too;
+  the TTL bounds staleness if Redis is unavailable.
+
+Per request, IdentityMiddleware resolves the principal once into
+request.state; this cache makes the remaining lookups (route dependencies,
+WebSocket auth, org checks) in-memory hits.
+
+Usage:
+    from app.services.principal_cache import get_principal_cache
+
+    cache = get_principal_cache()
+    record = cache.get_principal(cache.credential_key(api_key))
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class PrincipalCacheConfig:
+    """Configuration for the principal cache"""
+    enabled: bool = True
+    principal_ttl_seconds: float = 60.0
+    role_ttl_seconds: float = 60.0
+    membership_ttl_seconds: float = 60.0
+    max_entries: int = 10000  # Per cache
+    redis_url: Optional[str] = None
+    channel: str = "empire:principal_cache:invalidate"
+
+    @classmethod
+    def from_env(cls) -> "PrincipalCacheConfig":
+        """Create config from environment variables"""
+        return cls(
+            enabled=os.getenv("PRINCIPAL_CACHE_ENABLED", "true").lower() == "true",
+            principal_ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL", "60")),
+            role_ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_ROLE_TTL", "60")),
+            membership_ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_MEMBERSHIP_TTL", "60")),
+            max_entries=int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000")),
+            redis_url=os.getenv("REDIS_URL"),
+            channel=os.getenv("PRINCIPAL_CACHE_CHANNEL", "empire:principal_cache:invalidate"),
+        )
+
+
+class TTLCache:
+    """Thread-safe LRU with a per-entry expiry time"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if now >= expires_at:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Remove entries matching predicate(key, value); returns the count"""
+        with self._lock:
+            doomed = [key for key, (value, _) in self._entries.items() if predicate(key, value)]
+            for key in doomed:
+                del self._entries[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """exp claim of a JWT (payload read without verification), if present"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+def _seconds_until_iso(timestamp: Optional[str]) -> Optional[float]:
+    """Seconds from now until an ISO timestamp (None if absent or unparseable)"""
+    if not timestamp:
+        return None
+    try:
+        from datetime import datetime
+        from app.services.rbac_service import normalize_iso_timestamp
+
+        expires_at = datetime.fromisoformat(normalize_iso_timestamp(timestamp))
+        return (expires_at - datetime.now(expires_at.tzinfo)).total_seconds()
+    except Exception:
+        return None
+
+
+class PrincipalCache:
+    """
+    Short-TTL caches for principals, roles and org memberships with
+    cross-pod invalidation over Redis Pub/Sub
+    """
+
+    def __init__(self, config: Optional[PrincipalCacheConfig] = None):
+        self.config = config or PrincipalCacheConfig.from_env()
+        self._principals = TTLCache(self.config.max_entries)
+        self._roles = TTLCache(self.config.max_entries)
+        self._memberships = TTLCache(self.config.max_entries)
+
+        self._instance_id = uuid.uuid4().hex
+        self._redis = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "remote_invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    # =========================================================================
+    # PRINCIPALS
+    # =========================================================================
+
+    @staticmethod
+    def credential_key(credential: str) -> str:
+        """Cache key for an API key or token (SHA-256, never the plaintext)"""
+        return hashlib.sha256(credential.encode("utf-8")).hexdigest()
+
+    def get_principal(self, credential_key: str) -> Optional[Dict[str, Any]]:
+        """Cached principal for a credential key, or None"""
+        if not self.enabled:
+            return None
+        record = self._count(self._principals.get(credential_key))
+        return dict(record) if record is not None else None
+
+    def set_api_key_principal(self, credential_key: str, key_record: Dict[str, Any]) -> None:
+        """Cache a validated API key record (until it expires, at most the TTL)"""
+        if not self.enabled:
+            return
+        ttl = self.config.principal_ttl_seconds
+        remaining = _seconds_until_iso(key_record.get("expires_at"))
+        if remaining is not None:
+            ttl = min(ttl, remaining)
+        self._principals.set(credential_key, dict(key_record), ttl)
+
+    def set_token_principal(self, credential_key: str, user_id: str, token: str) -> None:
+        """
+        Cache a verified JWT's user until the token expires (at most the TTL)
+
+        Tokens without a readable exp claim are not cached.
+        """
+        if not self.enabled:
+            return
+        exp = _jwt_expiry(token)
+        if exp is None:
+            return
+        ttl = min(self.config.principal_ttl_seconds, exp - time.time())
+        self._principals.set(credential_key, {"user_id": user_id}, ttl)
+
+    # =========================================================================
+    # ROLES AND MEMBERSHIPS
+    # =========================================================================
+
+    def get_roles(self, user_id: str) -> Optional[list]:
+        """Cached user_roles rows for a user, or None"""
+        if not self.enabled:
+            return None
+        roles = self._count(self._roles.get(user_id))
+        return list(roles) if roles is not None else None
+
+    def set_roles(self, user_id: str, roles: list) -> None:
+        if self.enabled:
+            self._roles.set(user_id, list(roles), self.config.role_ttl_seconds)
+
+    def get_membership(self, org_id: str, user_id: str) -> Optional[str]:
+        """Cached org role for a member, or None (non-members are not cached)"""
+        if not self.enabled:
+            return None
+        return self._count(self._memberships.get((org_id, user_id)))
+
+    def set_membership(self, org_id: str, user_id: str, role: str) -> None:
+        if self.enabled and role:
+            self._memberships.set((org_id, user_id), role, self.config.membership_ttl_seconds)
+
+    def _count(self, value: Any) -> Any:
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    # =========================================================================
+    # INVALIDATION
+    # =========================================================================
+
+    async def invalidate_api_key(self, key_id: str) -> None:
+        """Drop a revoked/rotated API key everywhere"""
+        await self._invalidate({"type": "api_key", "key_id": key_id})
+
+    async def invalidate_user(self, user_id: str) -> None:
+        """Drop a user's cached roles everywhere (role assigned or revoked)"""
+        await self._invalidate({"type": "user", "user_id": user_id})
+
+    async def invalidate_membership(self, org_id: str, user_id: str) -> None:
+        """Drop a cached org membership everywhere"""
+        await self._invalidate({"type": "membership", "org_id": org_id, "user_id": user_id})
+
+    async def _invalidate(self, message: Dict[str, Any]) -> None:
+        self._apply(message)
+        self.stats["invalidations"] += 1
+        await self._publish(message)
+
+    def _apply(self, message: Dict[str, Any]) -> None:
+        """Apply an invalidation message to the local caches"""
+        kind = message.get("type")
+        if kind == "api_key":
+            key_id = message.get("key_id")
+            self._principals.pop_where(lambda _, value: value.get("id") == key_id)
+        elif kind == "user":
+            self._roles.pop(message.get("user_id"))
+        elif kind == "membership":
+            self._memberships.pop((message.get("org_id"), message.get("user_id")))
+        elif kind == "all":
+            self.clear()
+
+    def clear(self) -> None:
+        self._principals.clear()
+        self._roles.clear()
+        self._memberships.clear()
+
+    # =========================================================================
+    # REDIS PUB/SUB
+    # =========================================================================
+
+    async def start(self) -> bool:
+        """
+        Connect to Redis and listen for invalidations from other pods
+
+        Returns:
+            True if listening; without Redis only local invalidation applies
+        """
+        if not self.enabled or not self.config.redis_url or self._listener_task is not None:
+            return self._listener_task is not None
+
+        try:
+            from redis import asyncio as aioredis
+
+            self._redis = aioredis.from_url(self.config.redis_url, decode_responses=True)
+            pubsub = self._redis.pubsub()
+            await pubsub.subscribe(self.config.channel)
+        except Exception as e:
+            logger.warning("principal_cache_pubsub_unavailable", error=str(e))
+            self._redis = None
+            return False
+
+        self._listener_task = asyncio.create_task(self._listen(pubsub), name="principal-cache-invalidation")
+        logger.info("principal_cache_pubsub_started", channel=self.config.channel)
+        return True
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception:
+                pass
+            self._redis = None
+
+    async def _publish(self, message: Dict[str, Any]) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.publish(
+                self.config.channel,
+                json.dumps({**message, "origin": self._instance_id})
+            )
+        except Exception as e:
+            logger.warning("principal_cache_publish_failed", error=str(e), **message)
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for raw in pubsub.listen():
+                if raw.get("type") != "message":
+                    continue
+                try:
+                    message = json.loads(raw["data"])
+                except (TypeError, ValueError):
+                    continue
+                if message.get("origin") == self._instance_id:
+                    continue
+                self._apply(message)
+                self.stats["remote_invalidations"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Lost the subscription: entries still expire by TTL
+            logger.warning("principal_cache_listener_stopped", error=str(e))
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "principals": len(self._principals),
+            "roles": len(self._roles),
+            "memberships": len(self._memberships),
+            "pubsub": self._listener_task is not None and not self._listener_task.done(),
+        }
+
+
+# Singleton
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
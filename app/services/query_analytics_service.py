@@ -9,6 +9,8 @@ Features:
 - Calculate click-through rates (CTR)
 - Aggregate metrics and statistics
 - Support for date-range queries
+- Minute/hour rollups maintained as queries and clicks are logged, used for
+  latency percentiles and the analytics dashboard (see query_rollup_service)
 
 Usage:
     from app.services.query_analytics_service import get_query_analytics_service
@@ -42,6 +44,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+from app.services.query_rollup_service import (
+    EMPTY_LATENCY_STATS,
+    QueryRollupService,
+    RollupConfig,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,9 +65,11 @@ class AnalyticsConfig:
     # CTR calculation settings
     min_impressions_for_ctr: int = 1
 
-    # Batch processing
+    # Batch processing (rollup deltas are flushed after batch_size events
+    # or flush_interval_seconds)
     batch_size: int = 100
     flush_interval_seconds: int = 60
+    enable_rollups: bool = True
 
 
 @dataclass
@@ -155,7 +165,8 @@ class QueryAnalyticsService:
     def __init__(
         self,
         storage,
-        config: Optional[AnalyticsConfig] = None
+        config: Optional[AnalyticsConfig] = None,
+        rollups: Optional[QueryRollupService] = None
     ):
         """
         Initialize query analytics service
@@ -163,9 +174,17 @@ class QueryAnalyticsService:
         Args:
             storage: Supabase storage client
             config: Analytics configuration
+            rollups: Rollup service (created from the config if omitted)
         """
         self.storage = storage
         self.config = config or AnalyticsConfig()
+        self.rollups = rollups or QueryRollupService(
+            storage,
+            RollupConfig(
+                batch_size=self.config.batch_size,
+                flush_interval_seconds=self.config.flush_interval_seconds
+            )
+        )
 
         logger.info("Initialized QueryAnalyticsService")
 
@@ -222,6 +241,10 @@ class QueryAnalyticsService:
             except Exception as e:
                 logger.error(f"Failed to store query log: {e}")
                 # Don't fail the query if logging fails
+            else:
+                if self.config.enable_rollups:
+                    self.rollups.record_query(query_log)
+                    await self._flush_rollups_if_due()
 
         return query_log
 
@@ -272,6 +295,10 @@ class QueryAnalyticsService:
             except Exception as e:
                 logger.error(f"Failed to store click event: {e}")
                 # Don't fail the request if logging fails
+            else:
+                if self.config.enable_rollups:
+                    await self.rollups.record_click(click_event)
+                    await self._flush_rollups_if_due()
 
         return click_event
 
@@ -436,42 +463,56 @@ class QueryAnalyticsService:
     async def get_latency_statistics(
         self,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        search_type: Optional[str] = None,
+        department: Optional[str] = None
     ) -> Dict[str, float]:
         """
-        Get latency statistics (avg, p50, p95, p99)
+        Get latency statistics (avg, p50, p95, p99, max) from rollups
+
+        Percentiles come from the merged latency histograms of the range.
 
         Args:
-            start_date: Optional start date filter
-            end_date: Optional end date filter
+            start_date: Optional start date filter (default: retention_days ago)
+            end_date: Optional end date filter (default: now)
+            search_type: Optional search type filter
+            department: Optional department filter
 
         Returns:
             Dictionary with latency statistics
         """
-        try:
-            # Call Supabase RPC function for percentile calculation
-            result = await self.storage.rpc("get_latency_stats").execute()
-
-            if not result.data or len(result.data) == 0:
-                return {
-                    "avg_latency": 0.0,
-                    "p50_latency": 0.0,
-                    "p95_latency": 0.0,
-                    "p99_latency": 0.0,
-                    "max_latency": 0.0
-                }
+        end_date = end_date or datetime.now(timezone.utc)
+        start_date = start_date or end_date - timedelta(days=self.config.retention_days)
 
-            return result.data[0]
+        try:
+            summary = await self.rollups.summarize(start_date, end_date, search_type, department)
+            return summary.latency_stats()
 
         except Exception as e:
             logger.error(f"Failed to get latency statistics: {e}")
-            return {
-                "avg_latency": 0.0,
-                "p50_latency": 0.0,
-                "p95_latency": 0.0,
-                "p99_latency": 0.0,
-                "max_latency": 0.0
-            }
+            return dict(EMPTY_LATENCY_STATS)
+
+    def start_rollup_flusher(self) -> None:
+        """Flush due rollup deltas in the background (called on startup)"""
+        self.rollups.start()
+
+    async def stop_rollup_flusher(self) -> int:
+        """
+        Stop the background flush and write pending rollup deltas
+
+        Returns:
+            Number of rollup rows written
+        """
+        return await self.rollups.stop()
+
+    async def flush_rollups(self) -> int:
+        """
+        Write pending rollup deltas (called on shutdown)
+
+        Returns:
+            Number of rollup rows written
+        """
+        return await self.rollups.flush()
 
     async def get_queries_by_date_range(
         self,
@@ -501,6 +542,12 @@ class QueryAnalyticsService:
             logger.error(f"Failed to get queries by date range: {e}")
             return []
 
+    async def _flush_rollups_if_due(self) -> None:
+        try:
+            await self.rollups.maybe_flush()
+        except Exception as e:
+            logger.error(f"Failed to flush query rollups: {e}")
+
     async def _store_query_log(self, query_log: QueryLog) -> None:
         """
         Store query log in Supabase
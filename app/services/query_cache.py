@@ -13,6 +13,8 @@ Features:
 - Configurable similarity threshold
 - TTL management
 - Cache hit/miss tracking
+- Semantic lookups served from an in-process embedding index
+  (query_embedding_index) warmed from Redis, instead of scanning the namespace
 
 Usage:
     from app.services.query_cache import cached_query
@@ -42,9 +44,12 @@ class QueryCacheService:
         # Lazy import to avoid circular dependencies
         from app.services.tiered_cache_service import get_tiered_cache_service
 
+        from app.services.query_embedding_index import get_query_embedding_index
+
         self.cache = get_tiered_cache_service()
         self.similarity_threshold = 0.95  # High threshold for cache hits
         self.embedding_service = None  # Lazy loaded
+        self.embedding_index = get_query_embedding_index()
 
         logger.info("Initialized QueryCacheService with similarity threshold 0.95")
 
@@ -181,7 +186,9 @@ class QueryCacheService:
             if embedding:
                 cache_data["embedding"] = embedding
 
-            await self.cache.set(cache_key, cache_data, ttl=ttl)
+            cached = await self.cache.set(cache_key, cache_data, ttl=ttl)
+            if cached and embedding and self.embedding_index.config.enabled:
+                self.embedding_index.add(cache_namespace, cache_key, embedding, ttl=ttl)
 
             logger.info(
                 f"Cached query result: {query[:50]} (TTL: {ttl}s, has_embedding: {embedding is not None})"
@@ -190,6 +197,9 @@ class QueryCacheService:
         except Exception as e:
             logger.error(f"Failed to cache result: {e}", exc_info=True)
 
+    def _redis_cache(self):
+        return getattr(self.cache, 'redis_cache', None)
+
     async def _find_similar_cached_query(
         self,
         query_embedding: np.ndarray,
@@ -199,62 +209,109 @@ class QueryCacheService:
         """
         Find cached query with similar embedding
 
+        Searches the namespace's embedding index (warming it from Redis on
+        first use) and confirms hits best-first by reading the cached result;
+        hits whose result is gone are dropped from the index.
+
         Args:
             query_embedding: Query embedding vector
             cache_namespace: Cache namespace to search
-            max_candidates: Maximum cached queries to compare
+            max_candidates: Maximum index hits to confirm against the cache
 
         Returns:
             Similar cached result if found, else None
         """
         try:
-            # Get all cached queries in namespace (limited to max_candidates)
-            pattern = f"{cache_namespace}:*"
-
-            # Use Redis SCAN to get keys (if Redis available)
-            if hasattr(self.cache, 'redis_cache') and self.cache.redis_cache:
-                cached_keys = await self.cache.redis_cache.scan_keys(
-                    pattern,
-                    count=max_candidates
-                )
-            else:
+            redis_cache = self._redis_cache()
+            if not redis_cache:
                 # Fallback: no semantic search without Redis
                 return None
 
-            best_match = None
-            best_similarity = 0.0
+            if not self.embedding_index.config.enabled:
+                return await self._scan_similar_cached_query(
+                    query_embedding, cache_namespace, max_candidates
+                )
 
-            for key in cached_keys[:max_candidates]:  # Limit comparisons
-                cached_data = await self.cache.get(key)
+            if not self.embedding_index.is_warm(cache_namespace):
+                await self.embedding_index.warm(cache_namespace, redis_cache)
+            elif self.embedding_index.needs_refresh(cache_namespace):
+                self.embedding_index.schedule_refresh(cache_namespace, redis_cache)
 
-                if not cached_data or 'embedding' not in cached_data:
-                    continue
+            hits = self.embedding_index.search(
+                cache_namespace,
+                query_embedding,
+                threshold=self.similarity_threshold,
+                k=max_candidates
+            )
 
-                # Calculate cosine similarity
-                cached_embedding = np.array(cached_data['embedding'])
-                similarity = self._cosine_similarity(query_embedding, cached_embedding)
-
-                if similarity > best_similarity and similarity >= self.similarity_threshold:
-                    best_similarity = similarity
-                    best_match = {
-                        'result': cached_data['result'],
-                        'similarity': similarity,
-                        'original_query': cached_data['query'],
-                        'cached_at': cached_data.get('cached_at')
-                    }
+            for key, similarity in hits:
+                cached_data = await self.cache.get(key)
+                if not cached_data or 'result' not in cached_data:
+                    self.embedding_index.remove(cache_namespace, key)
+                    continue
 
-            if best_match:
                 logger.info(
-                    f"Found similar query (similarity: {best_similarity:.3f}): "
-                    f"{best_match['original_query'][:50]}"
+                    f"Found similar query (similarity: {similarity:.3f}): "
+                    f"{cached_data.get('query', '')[:50]}"
                 )
+                return {
+                    'result': cached_data['result'],
+                    'similarity': similarity,
+                    'original_query': cached_data.get('query'),
+                    'cached_at': cached_data.get('cached_at')
+                }
 
-            return best_match
+            return None
 
         except Exception as e:
             logger.error(f"Failed to find similar query: {e}", exc_info=True)
             return None
 
+    async def _scan_similar_cached_query(
+        self,
+        query_embedding: np.ndarray,
+        cache_namespace: str,
+        max_candidates: int = 100
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a similar cached query by scanning the namespace
+        (used when the embedding index is disabled)
+        """
+        cached_keys = await self._redis_cache().scan_keys(
+            f"{cache_namespace}:*",
+            count=max_candidates
+        )
+
+        best_match = None
+        best_similarity = 0.0
+
+        for key in cached_keys[:max_candidates]:  # Limit comparisons
+            cached_data = await self.cache.get(key)
+
+            if not cached_data or 'embedding' not in cached_data:
+                continue
+
+            # Calculate cosine similarity
+            cached_embedding = np.array(cached_data['embedding'])
+            similarity = self._cosine_similarity(query_embedding, cached_embedding)
+
+            if similarity > best_similarity and similarity >= self.similarity_threshold:
+                best_similarity = similarity
+                best_match = {
+                    'result': cached_data['result'],
+                    'similarity': similarity,
+                    'original_query': cached_data['query'],
+                    'cached_at': cached_data.get('cached_at')
+                }
+
+        if best_match:
+            logger.info(
+                f"Found similar query (similarity: {best_similarity:.3f}): "
+                f"{best_match['original_query'][:50]}"
+            )
+
+        return best_match
+
     def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """
         Calculate cosine similarity between two vectors
@@ -307,9 +364,11 @@ class QueryCacheService:
                 pattern = "query:*"
                 logger.info("Invalidating all query cache")
 
+            self.embedding_index.clear(cache_namespace or "query")
+
             # Use Redis SCAN and delete if available
-            if hasattr(self.cache, 'redis_cache') and self.cache.redis_cache:
-                keys = await self.cache.redis_cache.scan_keys(pattern, count=1000)
+            if self._redis_cache():
+                keys = await self._redis_cache().scan_keys(pattern, count=1000)
                 for key in keys:
                     await self.cache.delete(key)
 
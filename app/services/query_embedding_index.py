@@ -0,0 +1,374 @@
+"""
+Empire v7.3 - Query Embedding Index
+In-process vector index for the semantic query cache
+
+Replaces the per-miss SCAN + GET + pairwise cosine loop in QueryCacheService
+with a namespace-scoped index of cached query embeddings.
+
+Features:
+- One VectorIndex per cache namespace (unit-normalized float32 matrix,
+  optional HNSW graph once a namespace grows past ann_min_entries)
+- Entry expiry mirrors the Redis TTL of the cached result; expired entries are
+  skipped at search time and purged periodically, and the soonest-to-expire
+  entry is evicted when a namespace is full
+- Warm-up from Redis: SCAN the namespace, then GET + PTTL every key through a
+  non-transactional pipeline, so a restarted pod rebuilds its index in one
+  pipelined pass; later refreshes only fetch keys the index has not seen
+  (entries cached by other pods)
+
+Redis stays the source of truth: the index only stores keys, vectors and
+expiry times, and every hit is confirmed by reading the cached result.
+
+Usage:
+    from app.services.query_embedding_index import get_query_embedding_index
+
+    index = get_query_embedding_index()
+    index.add("adaptive", "adaptive:<hash>", embedding, ttl=1800)
+    hits = index.search("adaptive", query_embedding, threshold=0.95)
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.vector_index import HNSW_SUPPORT as HNSWLIB_AVAILABLE
+from app.services.vector_index import VectorIndex, VectorIndexConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryEmbeddingIndexConfig:
+    """Configuration for the query embedding index"""
+    enabled: bool = True
+    max_entries: int = 5000  # Per namespace
+    ann_min_entries: int = 2000  # Build an HNSW graph above this size (hnswlib only)
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    warm_max_keys: int = 10000  # Keys scanned per namespace when warming
+    warm_batch_size: int = 500  # Keys per pipeline round trip
+    refresh_seconds: int = 300  # Re-scan for entries cached by other pods
+    purge_interval_seconds: int = 60
+
+    @classmethod
+    def from_env(cls) -> "QueryEmbeddingIndexConfig":
+        """Create config from environment variables"""
+        return cls(
+            enabled=os.getenv("QUERY_CACHE_VECTOR_INDEX", "true").lower() == "true",
+            max_entries=int(os.getenv("QUERY_CACHE_INDEX_MAX_ENTRIES", "5000")),
+            ann_min_entries=int(os.getenv("QUERY_CACHE_ANN_MIN_ENTRIES", "2000")),
+            hnsw_m=int(os.getenv("QUERY_CACHE_HNSW_M", "16")),
+            hnsw_ef_construction=int(os.getenv("QUERY_CACHE_HNSW_EF_CONSTRUCTION", "200")),
+            hnsw_ef_search=int(os.getenv("QUERY_CACHE_HNSW_EF_SEARCH", "64")),
+            warm_max_keys=int(os.getenv("QUERY_CACHE_INDEX_WARM_MAX_KEYS", "10000")),
+            warm_batch_size=int(os.getenv("QUERY_CACHE_INDEX_WARM_BATCH", "500")),
+            refresh_seconds=int(os.getenv("QUERY_CACHE_INDEX_REFRESH_SECONDS", "300")),
+            purge_interval_seconds=int(os.getenv("QUERY_CACHE_INDEX_PURGE_SECONDS", "60")),
+        )
+
+
+def _expires_at(ttl: Optional[float], now: float) -> float:
+    if ttl is None or ttl < 0:
+        return float("inf")
+    return now + ttl
+
+
+class NamespaceVectorIndex:
+    """
+    Vector index for one cache namespace with per-entry expiry
+
+    Vectors, similarity search and the optional HNSW graph are handled by
+    VectorIndex; this layer adds the namespace's capacity and the expiry
+    of each entry (a heap of expiry times, invalidated lazily on replace).
+    """
+
+    def __init__(self, config: QueryEmbeddingIndexConfig):
+        self.config = config
+        self._vectors = VectorIndex(config=VectorIndexConfig(
+            initial_capacity=min(config.max_entries, 1024),
+            ann_min_size=config.ann_min_entries,
+            hnsw_m=config.hnsw_m,
+            hnsw_ef_construction=config.hnsw_ef_construction,
+            hnsw_ef_search=config.hnsw_ef_search,
+        ))
+        self._expires: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._next_purge = 0.0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._expires
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._vectors.dimension
+
+    @property
+    def ann_enabled(self) -> bool:
+        return self._vectors.ann_enabled
+
+    def add(self, key: str, embedding: Sequence[float], ttl: Optional[float] = None,
+            now: Optional[float] = None) -> bool:
+        """
+        Insert or replace an entry
+
+        Args:
+            key: Cache key of the cached result
+            embedding: Query embedding
+            ttl: Seconds until the cached result expires (None = no expiry)
+
+        Returns:
+            False if the embedding is empty or its dimension does not match
+        """
+        now = time.time() if now is None else now
+        size = np.asarray(embedding).size
+        if self.dim is not None and size != self.dim:
+            logger.warning(
+                f"Embedding dimension {size} does not match index dimension {self.dim}, "
+                f"not indexing {key[:50]}"
+            )
+            return False
+
+        if key not in self and len(self) >= self.config.max_entries:
+            self.purge_expired(now)
+            if len(self) >= self.config.max_entries:
+                self._evict_soonest()
+
+        if not self._vectors.add(key, embedding):
+            return False
+
+        expires = _expires_at(ttl, now)
+        self._expires[key] = expires
+        heapq.heappush(self._expiry_heap, (expires, key))
+        if len(self._expiry_heap) > 2 * max(len(self), self.config.max_entries):
+            self._expiry_heap = [(expires, key) for key, expires in self._expires.items()]
+            heapq.heapify(self._expiry_heap)
+        return True
+
+    def remove(self, key: str) -> bool:
+        """Remove an entry; returns False if the key was not indexed"""
+        if self._expires.pop(key, None) is None:
+            return False
+        self._vectors.remove(key)
+        return True
+
+    def _pop_soonest(self) -> Optional[Tuple[float, str]]:
+        """Pop the live entry that expires first (skipping replaced ones)"""
+        while self._expiry_heap:
+            expires, key = heapq.heappop(self._expiry_heap)
+            if self._expires.get(key) == expires:
+                return expires, key
+        return None
+
+    def _evict_soonest(self) -> None:
+        soonest = self._pop_soonest()
+        if soonest is not None:
+            self.remove(soonest[1])
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Drop entries whose cached result has expired; returns count removed"""
+        now = time.time() if now is None else now
+        self._next_purge = now + self.config.purge_interval_seconds
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            soonest = self._pop_soonest()
+            if soonest is None:
+                break
+            if soonest[0] > now:
+                heapq.heappush(self._expiry_heap, soonest)
+                break
+            self.remove(soonest[1])
+            removed += 1
+        return removed
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        threshold: float,
+        k: int = 5,
+        now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Live entries with cosine similarity >= threshold, best first
+
+        Args:
+            embedding: Query embedding
+            threshold: Minimum cosine similarity
+            k: Maximum hits returned
+
+        Returns:
+            (cache_key, similarity) pairs
+        """
+        now = time.time() if now is None else now
+        if not self._expires:
+            return []
+
+        if now >= self._next_purge:
+            self.purge_expired(now)
+
+        hits = self._vectors.search(embedding, k=k, min_similarity=threshold)
+        if any(self._expires.get(key, -np.inf) <= now for key, _ in hits):
+            # Expired since the last purge; drop them and search again
+            self.purge_expired(now)
+            hits = self._vectors.search(embedding, k=k, min_similarity=threshold)
+        return hits
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        self.__init__(self.config)
+
+
+class QueryEmbeddingIndex:
+    """Namespace-scoped embedding indexes shared by all cached_query endpoints"""
+
+    def __init__(self, config: Optional[QueryEmbeddingIndexConfig] = None):
+        self.config = config or QueryEmbeddingIndexConfig.from_env()
+        self._namespaces: Dict[str, NamespaceVectorIndex] = {}
+        self._warmed_at: Dict[str, float] = {}
+        self._warm_locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+
+    def _namespace(self, namespace: str) -> NamespaceVectorIndex:
+        index = self._namespaces.get(namespace)
+        if index is None:
+            index = self._namespaces[namespace] = NamespaceVectorIndex(self.config)
+        return index
+
+    def add(self, namespace: str, key: str, embedding: Sequence[float], ttl: Optional[float] = None) -> bool:
+        """Index a cached query's embedding (ttl mirrors the cached result's TTL)"""
+        return self._namespace(namespace).add(key, embedding, ttl=ttl)
+
+    def remove(self, namespace: str, key: str) -> bool:
+        """Remove a cache key from the namespace index"""
+        index = self._namespaces.get(namespace)
+        return index.remove(key) if index is not None else False
+
+    def search(
+        self,
+        namespace: str,
+        embedding: Sequence[float],
+        threshold: float,
+        k: int = 5
+    ) -> List[Tuple[str, float]]:
+        """(cache_key, similarity) hits above threshold, best first"""
+        index = self._namespaces.get(namespace)
+        return index.search(embedding, threshold, k=k) if index is not None else []
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop one namespace (or all) and mark it cold"""
+        names = [namespace] if namespace is not None else list(self._namespaces)
+        for name in names:
+            self._namespaces.pop(name, None)
+            self._warmed_at.pop(name, None)
+
+    def is_warm(self, namespace: str) -> bool:
+        return namespace in self._warmed_at
+
+    def needs_refresh(self, namespace: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        warmed_at = self._warmed_at.get(namespace)
+        return warmed_at is None or now - warmed_at >= self.config.refresh_seconds
+
+    async def warm(self, namespace: str, redis_cache: Any, only_new: bool = False) -> int:
+        """
+        Load a namespace's cached embeddings from Redis
+
+        SCANs "{namespace}:*" and fetches each key's value and PTTL through a
+        non-transactional pipeline, warm_batch_size keys per round trip.
+
+        Args:
+            namespace: Cache namespace
+            redis_cache: AsyncRedisCacheService (or anything exposing
+                scan_keys() and redis_client)
+            only_new: Skip keys already in the index (periodic refresh)
+
+        Returns:
+            Number of entries indexed
+        """
+        lock = self._warm_locks.setdefault(namespace, asyncio.Lock())
+        async with lock:
+            if not only_new and self.is_warm(namespace):
+                return 0
+
+            started = time.time()
+            index = self._namespace(namespace)
+            keys = await redis_cache.scan_keys(f"{namespace}:*", count=self.config.warm_max_keys)
+            if only_new:
+                keys = [key for key in keys if key not in index]
+
+            indexed = 0
+            for start in range(0, len(keys), self.config.warm_batch_size):
+                batch = keys[start:start + self.config.warm_batch_size]
+                try:
+                    async with redis_cache.redis_client.pipeline(transaction=False) as pipe:
+                        for key in batch:
+                            pipe.get(key)
+                            pipe.pttl(key)
+                        replies = await pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Query embedding index warm-up failed for {namespace}: {e}")
+                    break
+
+                now = time.time()
+                for key, raw, pttl in zip(batch, replies[0::2], replies[1::2]):
+                    if raw is None or pttl == -2:
+                        continue  # Expired between SCAN and GET
+                    try:
+                        data = json.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if not isinstance(data, dict) or not data.get("embedding"):
+                        continue
+                    ttl = None if pttl is None or pttl < 0 else pttl / 1000.0
+                    if index.add(key, data["embedding"], ttl=ttl, now=now):
+                        indexed += 1
+
+            self._warmed_at[namespace] = time.time()
+            logger.info(
+                f"Warmed query embedding index '{namespace}': {indexed} entries from "
+                f"{len(keys)} keys in {(time.time() - started) * 1000:.0f}ms"
+            )
+            return indexed
+
+    def schedule_refresh(self, namespace: str, redis_cache: Any) -> None:
+        """Pick up entries cached by other pods in the background"""
+        task = self._refresh_tasks.get(namespace)
+        if task is not None and not task.done():
+            return
+        self._warmed_at[namespace] = time.time()  # Do not reschedule while running
+        self._refresh_tasks[namespace] = asyncio.ensure_future(
+            self.warm(namespace, redis_cache, only_new=True)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts per namespace"""
+        return {
+            "enabled": self.config.enabled,
+            "ann_available": HNSWLIB_AVAILABLE,
+            "namespaces": {
+                name: {"entries": len(index), "ann": index.ann_enabled}
+                for name, index in self._namespaces.items()
+            }
+        }
+
+
+# Singleton instance
+_query_embedding_index: Optional[QueryEmbeddingIndex] = None
+
+
+def get_query_embedding_index() -> QueryEmbeddingIndex:
+    """Get or create the query embedding index singleton"""
+    global _query_embedding_index
+    if _query_embedding_index is None:
+        _query_embedding_index = QueryEmbeddingIndex()
+    return _query_embedding_index
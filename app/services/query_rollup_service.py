@@ -0,0 +1,648 @@
+"""
+Query Rollup Service
+
+Incrementally maintained per-minute and per-hour rollups of search analytics,
+so dashboards and percentile queries never scan raw query_logs rows.
+
+Each rollup row is keyed by (granularity, bucket_start, search_type,
+department) and holds:
+- query_count, result_count_sum
+- latency_sum_ms, latency_max_ms and a latency histogram over fixed
+  log-spaced buckets (mergeable by addition; percentiles are interpolated
+  within a bucket, so they are accurate to about 5%)
+- impressions (queries that returned results) and clicks, the CTR
+  numerator and denominator
+
+QueryAnalyticsService feeds every logged query and click into an in-process
+accumulator; accumulated deltas are written in one RPC call
+(apply_query_rollup_deltas) once batch_size events are pending or
+flush_interval_seconds have passed, and on shutdown. A background task
+started with start() applies the time limit when no new events arrive.
+
+Reads combine hour rows for the whole hours of a range with minute rows for
+the partial hours at its edges. Minute rows are kept for minute_retention_hours
+(default 8 days, so the default 7-day dashboard is exact to the minute);
+older ranges fall back to whole hours.
+
+Historic data is loaded with backfill(), which recomputes complete hours
+from query_logs and click_events and replaces the stored rows, so it can be
+re-run safely. Live processes may still hold deltas for recent hours, so
+backfill only touches hours that ended at least flush_interval_seconds +
+backfill_margin_seconds ago. Deltas held longer than that (a process whose
+flushes keep failing, or a click on an older query still pending) are
+applied on top of the backfilled hour and counted twice.
+
+Usage:
+    from app.services.query_rollup_service import QueryRollupService
+
+    rollups = QueryRollupService(storage)
+    rollups.record_query(query_log)
+    await rollups.maybe_flush()
+
+    summary = await rollups.summarize(start_date, end_date)
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MINUTE = "minute"
+HOUR = "hour"
+
+# Upper bounds (ms) of the latency histogram buckets: 1ms growing by 10% per
+# bucket up to ~2 minutes; the last bucket counts everything slower
+LATENCY_BUCKET_GROWTH = 1.1
+LATENCY_BUCKET_BOUNDS_MS: List[float] = [
+    round(LATENCY_BUCKET_GROWTH ** i, 4)
+    for i in range(int(math.log(120_000) / math.log(LATENCY_BUCKET_GROWTH)) + 2)
+]
+LATENCY_BUCKET_COUNT = len(LATENCY_BUCKET_BOUNDS_MS) + 1
+
+# Dimension value for queries without a department / clicks on unknown queries
+NO_DEPARTMENT = ""
+UNKNOWN_SEARCH_TYPE = "unknown"
+
+EMPTY_LATENCY_STATS = {
+    "avg_latency": 0.0,
+    "p50_latency": 0.0,
+    "p95_latency": 0.0,
+    "p99_latency": 0.0,
+    "max_latency": 0.0
+}
+
+
+@dataclass
+class RollupConfig:
+    """Configuration for query rollups"""
+    batch_size: int = 100  # Flush after this many pending events
+    flush_interval_seconds: float = 60  # ...or when the oldest pending event is this old
+    backfill_margin_seconds: float = 900  # Extra age (beyond the flush interval) before backfill touches an hour
+    minute_retention_hours: int = 192
+    page_size: int = 1000  # Rows per read page (PostgREST caps responses)
+    recent_queries: int = 10000  # query_id -> bucket entries kept for click attribution
+
+
+def latency_bucket(latency_ms: float) -> int:
+    """Index of the histogram bucket for a latency"""
+    return bisect.bisect_left(LATENCY_BUCKET_BOUNDS_MS, latency_ms)
+
+
+def floor_time(moment: datetime, granularity: str) -> datetime:
+    """Start of the minute / hour containing moment (UTC)"""
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    if granularity == HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """datetime from a stored ISO timestamp (or a datetime)"""
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class RollupBucket:
+    """Aggregates for one rollup key (or a merge of several)"""
+    granularity: str
+    bucket_start: datetime
+    search_type: str = UNKNOWN_SEARCH_TYPE
+    department: str = NO_DEPARTMENT
+    query_count: int = 0
+    result_count_sum: int = 0
+    latency_sum_ms: float = 0.0
+    latency_max_ms: float = 0.0
+    latency_histogram: List[int] = field(default_factory=lambda: [0] * LATENCY_BUCKET_COUNT)
+    impressions: int = 0
+    clicks: int = 0
+
+    def add_query(self, latency_ms: float, result_count: int) -> None:
+        self.query_count += 1
+        self.result_count_sum += result_count
+        self.latency_sum_ms += latency_ms
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+        self.latency_histogram[latency_bucket(latency_ms)] += 1
+        if result_count > 0:
+            self.impressions += 1
+
+    def merge(self, other: "RollupBucket") -> None:
+        self.query_count += other.query_count
+        self.result_count_sum += other.result_count_sum
+        self.latency_sum_ms += other.latency_sum_ms
+        self.latency_max_ms = max(self.latency_max_ms, other.latency_max_ms)
+        self.latency_histogram = [a + b for a, b in zip(self.latency_histogram, other.latency_histogram)]
+        self.impressions += other.impressions
+        self.clicks += other.clicks
+
+    @property
+    def avg_latency(self) -> float:
+        return self.latency_sum_ms / self.query_count if self.query_count else 0.0
+
+    @property
+    def ctr(self) -> float:
+        return self.clicks / self.impressions if self.impressions else 0.0
+
+    def percentile(self, quantile: float) -> float:
+        """Latency at quantile (0-1), interpolated within its histogram bucket"""
+        total = sum(self.latency_histogram)
+        if total == 0:
+            return 0.0
+
+        rank = quantile * total
+        seen = 0
+        for index, count in enumerate(self.latency_histogram):
+            if count == 0 or seen + count < rank:
+                seen += count
+                continue
+            lower = LATENCY_BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0.0
+            upper = (
+                LATENCY_BUCKET_BOUNDS_MS[index]
+                if index < len(LATENCY_BUCKET_BOUNDS_MS) else max(self.latency_max_ms, lower)
+            )
+            value = lower + (upper - lower) * (rank - seen) / count
+            return min(value, self.latency_max_ms)
+        return self.latency_max_ms
+
+    def latency_stats(self) -> Dict[str, float]:
+        if self.query_count == 0:
+            return dict(EMPTY_LATENCY_STATS)
+        return {
+            "avg_latency": round(self.avg_latency, 2),
+            "p50_latency": round(self.percentile(0.50), 2),
+            "p95_latency": round(self.percentile(0.95), 2),
+            "p99_latency": round(self.percentile(0.99), 2),
+            "max_latency": round(self.latency_max_ms, 2)
+        }
+
+    def to_row(self) -> Dict[str, Any]:
+        """Row / delta for apply_query_rollup_deltas"""
+        return {
+            "granularity": self.granularity,
+            "bucket_start": self.bucket_start.isoformat(),
+            "search_type": self.search_type,
+            "department": self.department,
+            "query_count": self.query_count,
+            "result_count_sum": self.result_count_sum,
+            "latency_sum_ms": self.latency_sum_ms,
+            "latency_max_ms": self.latency_max_ms,
+            "latency_histogram": self.latency_histogram,
+            "impressions": self.impressions,
+            "clicks": self.clicks
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "RollupBucket":
+        histogram = list(row.get("latency_histogram") or [])
+        histogram = (histogram + [0] * LATENCY_BUCKET_COUNT)[:LATENCY_BUCKET_COUNT]
+        return cls(
+            granularity=row.get("granularity", HOUR),
+            bucket_start=parse_timestamp(row["bucket_start"]),
+            search_type=row.get("search_type") or UNKNOWN_SEARCH_TYPE,
+            department=row.get("department") or NO_DEPARTMENT,
+            query_count=int(row.get("query_count") or 0),
+            result_count_sum=int(row.get("result_count_sum") or 0),
+            latency_sum_ms=float(row.get("latency_sum_ms") or 0.0),
+            latency_max_ms=float(row.get("latency_max_ms") or 0.0),
+            latency_histogram=[int(count) for count in histogram],
+            impressions=int(row.get("impressions") or 0),
+            clicks=int(row.get("clicks") or 0)
+        )
+
+
+def merge_buckets(buckets: Iterable[RollupBucket], bucket_start: datetime) -> RollupBucket:
+    """Merge rollup buckets (any dimensions) into one"""
+    merged = RollupBucket(granularity=HOUR, bucket_start=bucket_start)
+    for bucket in buckets:
+        merged.merge(bucket)
+    return merged
+
+
+def query_dimensions(search_type: Optional[str], metadata: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """(search_type, department) rollup dimensions of a query"""
+    department = (metadata or {}).get("department")
+    return (search_type or UNKNOWN_SEARCH_TYPE, str(department) if department else NO_DEPARTMENT)
+
+
+class QueryRollupService:
+    """
+    Maintains and reads pre-aggregated query analytics
+
+    Provides:
+    - Incremental minute/hour rollups of logged queries and clicks
+    - Batched writes of accumulated deltas
+    - Range summaries and time series read from rollups only
+    - Backfill from raw logs and purge of expired minute rows
+    """
+
+    def __init__(self, storage, config: Optional[RollupConfig] = None):
+        """
+        Initialize query rollup service
+
+        Args:
+            storage: Supabase storage client
+            config: Rollup configuration
+        """
+        self.storage = storage
+        self.config = config or RollupConfig()
+
+        self._pending: Dict[Tuple[str, datetime, str, str], RollupBucket] = {}
+        self._pending_events = 0
+        self._oldest_pending: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # query_id -> (created_at, search_type, department) for click attribution
+        self._recent_queries: "OrderedDict[str, Tuple[datetime, str, str]]" = OrderedDict()
+
+    # =========================================================================
+    # WRITE PATH
+    # =========================================================================
+
+    def record_query(self, query_log) -> None:
+        """Add a logged query to the pending minute and hour rollups"""
+        search_type, department = query_dimensions(query_log.search_type, query_log.metadata)
+        created_at = parse_timestamp(query_log.created_at)
+
+        for granularity in (MINUTE, HOUR):
+            self._pending_bucket(granularity, created_at, search_type, department).add_query(
+                query_log.latency_ms, query_log.result_count
+            )
+        self._remember_query(query_log.query_id, created_at, search_type, department)
+        self._mark_pending()
+
+    async def record_click(self, click_event) -> None:
+        """
+        Add a click to the pending rollups of the query it belongs to
+
+        Clicks count towards the bucket and dimensions of their query so CTR
+        per bucket is clicks / impressions of the same queries. Queries not
+        seen by this process are looked up in query_logs; clicks on unknown
+        queries are attributed to the click time with unknown dimensions.
+        """
+        query = await self._lookup_query(click_event.query_id)
+        if query is None:
+            query = (parse_timestamp(click_event.clicked_at), UNKNOWN_SEARCH_TYPE, NO_DEPARTMENT)
+        created_at, search_type, department = query
+
+        for granularity in (MINUTE, HOUR):
+            self._pending_bucket(granularity, created_at, search_type, department).clicks += 1
+        self._mark_pending()
+
+    async def maybe_flush(self) -> int:
+        """Flush if batch_size events are pending or the oldest is flush_interval_seconds old"""
+        if self._pending_events == 0:
+            return 0
+        if (
+            self._pending_events >= self.config.batch_size
+            or time.monotonic() - self._oldest_pending >= self.config.flush_interval_seconds
+        ):
+            return await self.flush()
+        return 0
+
+    def start(self) -> None:
+        """Start a task that flushes due deltas even when no new events arrive"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically(), name="query-rollup-flush")
+
+    async def stop(self) -> int:
+        """Stop the flush task and write pending deltas"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._flush_task = None
+        return await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        # Checking twice per interval keeps deltas at most 1.5 intervals old
+        while True:
+            await asyncio.sleep(self.config.flush_interval_seconds / 2)
+            try:
+                await self.maybe_flush()
+            except Exception as e:
+                logger.error(f"Periodic query rollup flush failed: {e}")
+
+    async def flush(self) -> int:
+        """
+        Write pending deltas in one RPC call
+
+        Returns:
+            Number of rollup rows written (0 if nothing was pending or the
+            write failed; failed deltas stay pending for the next flush)
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, events = self._pending, self._pending_events
+            self._pending, self._pending_events, self._oldest_pending = {}, 0, None
+
+            try:
+                await self._apply([bucket.to_row() for bucket in pending.values()])
+            except Exception as e:
+                logger.error(f"Failed to write query rollups ({len(pending)} rows): {e}")
+                for key, bucket in pending.items():
+                    if key in self._pending:
+                        self._pending[key].merge(bucket)
+                    else:
+                        self._pending[key] = bucket
+                self._pending_events += events
+                self._oldest_pending = self._oldest_pending or time.monotonic()
+                return 0
+
+            logger.debug(f"Flushed {len(pending)} query rollup rows ({events} events)")
+            return len(pending)
+
+    def _pending_bucket(self, granularity: str, moment: datetime, search_type: str, department: str) -> RollupBucket:
+        key = (granularity, floor_time(moment, granularity), search_type, department)
+        bucket = self._pending.get(key)
+        if bucket is None:
+            bucket = self._pending[key] = RollupBucket(*key)
+        return bucket
+
+    def _mark_pending(self) -> None:
+        self._pending_events += 1
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+
+    def _remember_query(self, query_id: str, created_at: datetime, search_type: str, department: str) -> None:
+        self._recent_queries[query_id] = (created_at, search_type, department)
+        self._recent_queries.move_to_end(query_id)
+        while len(self._recent_queries) > self.config.recent_queries:
+            self._recent_queries.popitem(last=False)
+
+    async def _lookup_query(self, query_id: str) -> Optional[Tuple[datetime, str, str]]:
+        query = self._recent_queries.get(query_id)
+        if query is not None:
+            return query
+
+        try:
+            result = await self.storage.table("query_logs")\
+                .select("created_at, search_type, metadata")\
+                .eq("query_id", query_id)\
+                .execute()
+        except Exception as e:
+            logger.warning(f"Failed to look up query {query_id} for click rollup: {e}")
+            return None
+
+        if not result.data:
+            return None
+        row = result.data[0]
+        search_type, department = query_dimensions(row.get("search_type"), row.get("metadata"))
+        query = (parse_timestamp(row["created_at"]), search_type, department)
+        self._remember_query(query_id, *query)
+        return query
+
+    async def _apply(self, rows: List[Dict[str, Any]]) -> None:
+        await self.storage.rpc("apply_query_rollup_deltas", {"p_deltas": rows}).execute()
+
+    # =========================================================================
+    # READ PATH
+    # =========================================================================
+
+    async def read_rollups(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        search_type: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> List[RollupBucket]:
+        """
+        Rollup rows covering [start_date, end_date]
+
+        Whole hours are read from hour rows and the partial hours at either
+        end from minute rows (the range is resolved to whole minutes). Where
+        minute rows have expired the containing hour row is used instead.
+
+        Args:
+            start_date: Start of range (inclusive)
+            end_date: End of range (inclusive)
+            search_type: Only rows for this search type
+            department: Only rows for this department
+
+        Returns:
+            List of RollupBucket rows (not merged)
+        """
+        start = floor_time(start_date, MINUTE)
+        end = floor_time(end_date, MINUTE) + timedelta(minutes=1)  # Exclusive
+        minute_cutoff = self._minute_cutoff()
+
+        # Partial edge hours come from minute rows unless those have expired
+        hours_start = floor_time(start, HOUR)
+        if hours_start < start and start >= minute_cutoff:
+            hours_start += timedelta(hours=1)
+        hours_end = floor_time(end, HOUR)
+        if hours_end < end and hours_end < minute_cutoff:
+            hours_end += timedelta(hours=1)
+
+        if hours_start >= hours_end:
+            return await self._select(MINUTE, start, end, search_type, department)
+
+        rows = await self._select(HOUR, hours_start, hours_end, search_type, department)
+        if start < hours_start:
+            rows += await self._select(MINUTE, start, hours_start, search_type, department)
+        if hours_end < end:
+            rows += await self._select(MINUTE, hours_end, end, search_type, department)
+        return rows
+
+    async def summarize(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        search_type: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> RollupBucket:
+        """All rollups in range merged into one bucket"""
+        rows = await self.read_rollups(start_date, end_date, search_type, department)
+        return merge_buckets(rows, floor_time(start_date, MINUTE))
+
+    async def time_series(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        interval: timedelta,
+        search_type: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> List[Tuple[datetime, RollupBucket]]:
+        """
+        Rollups merged into interval buckets starting at start_date
+
+        Buckets are start_date, start_date + interval, ... up to end_date,
+        the last one running to end_date + interval. Rows are assigned by
+        their bucket_start.
+        """
+        timestamps = []
+        current = start_date
+        while current <= end_date:
+            timestamps.append(current)
+            current += interval
+
+        series = [(ts, RollupBucket(granularity=HOUR, bucket_start=ts)) for ts in timestamps]
+        if not series:
+            return series
+
+        for row in await self.read_rollups(start_date, end_date, search_type, department):
+            index = int((row.bucket_start - start_date) / interval)
+            series[min(max(index, 0), len(series) - 1)][1].merge(row)
+        return series
+
+    async def _select(
+        self,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        search_type: Optional[str],
+        department: Optional[str]
+    ) -> List[RollupBucket]:
+        """Rollup rows with start <= bucket_start < end"""
+        def build_query():
+            query = self.storage.table("query_rollups")\
+                .select("*")\
+                .eq("granularity", granularity)\
+                .gte("bucket_start", start.isoformat())\
+                .lt("bucket_start", end.isoformat())
+            if search_type:
+                query = query.eq("search_type", search_type)
+            if department:
+                query = query.eq("department", department)
+            # Order by the whole key so .range() pages are stable
+            return query.order("bucket_start").order("search_type").order("department")
+
+        return [RollupBucket.from_row(row) for row in await self._select_pages(build_query)]
+
+    # =========================================================================
+    # BACKFILL AND RETENTION
+    # =========================================================================
+
+    async def backfill(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Recompute rollups for the complete hours in [start_date, end_date)
+        from query_logs and click_events
+
+        Each hour's rows (hour rows, plus minute rows within minute
+        retention) are replaced in one transaction rather than incremented,
+        so re-running a range is safe. Clicks count towards their query.
+
+        end_date is capped at backfill_horizon() so hours whose deltas live
+        processes may still hold are never replaced.
+
+        Returns:
+            Dict with hours, queries, clicks and rows written
+        """
+        hour = floor_time(start_date, HOUR)
+        if hour < parse_timestamp(start_date):
+            hour += timedelta(hours=1)
+        end = floor_time(min(parse_timestamp(end_date), self.backfill_horizon()), HOUR)
+        minute_cutoff = self._minute_cutoff()
+
+        totals = {"hours": 0, "queries": 0, "clicks": 0, "rows": 0}
+        while hour < end:
+            next_hour = hour + timedelta(hours=1)
+            granularities = (MINUTE, HOUR) if hour >= minute_cutoff else (HOUR,)
+            buckets: Dict[Tuple[str, datetime, str, str], RollupBucket] = {}
+            query_keys: Dict[str, List[Tuple[str, datetime, str, str]]] = {}
+
+            queries = await self._select_pages(
+                lambda: self.storage.table("query_logs")
+                .select("query_id, created_at, latency_ms, result_count, search_type, metadata")
+                .gte("created_at", hour.isoformat())
+                .lt("created_at", next_hour.isoformat())
+                .order("created_at")
+                .order("query_id")
+            )
+            for row in queries:
+                search_type, department = query_dimensions(row.get("search_type"), row.get("metadata"))
+                created_at = parse_timestamp(row["created_at"])
+                keys = [(g, floor_time(created_at, g), search_type, department) for g in granularities]
+                query_keys[row["query_id"]] = keys
+                for key in keys:
+                    if key not in buckets:
+                        buckets[key] = RollupBucket(*key)
+                    buckets[key].add_query(float(row.get("latency_ms") or 0.0), int(row.get("result_count") or 0))
+
+            clicks = await self._select_clicks(list(query_keys))
+            for click in clicks:
+                for key in query_keys.get(click["query_id"], []):
+                    buckets[key].clicks += 1
+
+            # Also clears the hour when its queries have since been deleted
+            await self.storage.rpc(
+                "replace_query_rollups",
+                {
+                    "p_start": hour.isoformat(),
+                    "p_end": next_hour.isoformat(),
+                    "p_rows": [bucket.to_row() for bucket in buckets.values()]
+                }
+            ).execute()
+
+            totals["hours"] += 1
+            totals["queries"] += len(queries)
+            totals["clicks"] += len(clicks)
+            totals["rows"] += len(buckets)
+            hour = next_hour
+
+        logger.info(
+            f"Backfilled query rollups {start_date.isoformat()} - {end_date.isoformat()}: "
+            f"{totals['hours']} hours, {totals['queries']} queries, {totals['clicks']} clicks"
+        )
+        return totals
+
+    async def purge_expired_minutes(self) -> None:
+        """Delete minute rows older than minute_retention_hours"""
+        await self.storage.table("query_rollups")\
+            .delete()\
+            .eq("granularity", MINUTE)\
+            .lt("bucket_start", self._minute_cutoff().isoformat())\
+            .execute()
+
+    def backfill_horizon(self) -> datetime:
+        """Latest time backfill may cover: older than any unflushed delta"""
+        return datetime.now(timezone.utc) - timedelta(
+            seconds=self.config.flush_interval_seconds + self.config.backfill_margin_seconds
+        )
+
+    def _minute_cutoff(self) -> datetime:
+        """Minute rows are kept for bucket_start >= this"""
+        return floor_time(datetime.now(timezone.utc), HOUR) - timedelta(
+            hours=self.config.minute_retention_hours
+        )
+
+    async def _select_pages(self, build_query) -> List[Dict[str, Any]]:
+        """All rows of an ordered query, read with .range() pages"""
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            result = await build_query()\
+                .range(offset, offset + self.config.page_size - 1)\
+                .execute()
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.config.page_size:
+                return rows
+            offset += self.config.page_size
+
+    async def _select_clicks(self, query_ids: List[str]) -> List[Dict[str, Any]]:
+        clicks: List[Dict[str, Any]] = []
+        # Bounded id lists keep the request URL short
+        for i in range(0, len(query_ids), 200):
+            ids = query_ids[i:i + 200]
+            clicks.extend(await self._select_pages(
+                lambda: self.storage.table("click_events")
+                .select("click_id, query_id")
+                .in_("query_id", ids)
+                .order("click_id")
+            ))
+        return clicks
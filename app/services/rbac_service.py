@@ -17,6 +17,7 @@ from uuid import uuid4
 import structlog
 
 from app.core.supabase_client import get_supabase_client
+from app.services.principal_cache import get_principal_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -189,12 +190,21 @@ class RBACService:
         """
         Validate an API key by checking bcrypt hash.
 
+        Recently validated keys are served from the principal cache, skipping
+        the lookup, bcrypt and usage update; revocation invalidates them.
+
         Args:
             api_key: Full API key to validate (emp_xxx...)
 
         Returns:
             dict: Key metadata if valid, None if invalid
         """
+        cache = get_principal_cache()
+        cache_key = cache.credential_key(api_key)
+        cached = cache.get_principal(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Extract prefix for faster lookup
             key_prefix = api_key[:12]
@@ -242,6 +252,7 @@ class RBACService:
                     )
 
                     logger.debug("api_key_validated", key_id=key_id)
+                    cache.set_api_key_principal(cache_key, key_record)
                     return key_record
 
             # No matching hash found
@@ -414,6 +425,7 @@ class RBACService:
                 "revoked_by": user_id,
                 "revoke_reason": revoke_reason
             }).eq("id", key_id).execute()
+            await get_principal_cache().invalidate_api_key(key_id)
 
             # Log revocation
             await self._log_audit_event(
@@ -511,6 +523,8 @@ class RBACService:
             if not user_role.data:
                 raise Exception("Failed to fetch user role with role details")
 
+            await get_principal_cache().invalidate_user(user_id)
+
             # Log event
             await self._log_audit_event(
                 event_type="role_assigned",
@@ -575,6 +589,7 @@ class RBACService:
                 "is_active": False,
                 "updated_at": datetime.utcnow().isoformat()
             }).eq("user_id", user_id).eq("role_id", role_id).execute()
+            await get_principal_cache().invalidate_user(user_id)
 
             # Log event
             await self._log_audit_event(
@@ -611,12 +626,19 @@ class RBACService:
         Returns:
             List of user role dictionaries with nested role info
         """
+        cache = get_principal_cache()
+        cached = cache.get_roles(user_id)
+        if cached is not None:
+            return cached
+
         try:
             result = self.supabase.table("user_roles").select(
                 "*, role:roles(*)"
             ).eq("user_id", user_id).eq("is_active", True).execute()
 
-            return result.data if result.data else []
+            roles = result.data if result.data else []
+            cache.set_roles(user_id, roles)
+            return roles
 
         except Exception as e:
             logger.error("get_user_roles_failed", error=str(e), user_id=user_id)
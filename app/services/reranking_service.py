@@ -7,6 +7,11 @@ Improves precision by +15-25% with <200ms latency locally.
 Supports:
 - Ollama BGE-Reranker-v2-M3 (local, primary) - <200ms latency
 - Local Qwen 3.5 LLM for reranking (fallback) - ~1-2s latency
+- Batched cross-encoder /rerank endpoint (TEI, Infinity, llama.cpp server) -
+  all (query, doc) pairs scored in a single request
+- Score cache keyed on (query hash, chunk_id, content hash) shared across
+  service instances
+- Early exit: only rerank the top-N candidates by RRF score
 - Score thresholding and Top-K selection
 - Comprehensive metrics and NDCG calculation
 """
@@ -14,9 +19,13 @@ Supports:
 import re
 import time
 import json
+import hashlib
 import logging
 import asyncio
-from typing import List, Optional, Dict, Any
+import math
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -37,6 +46,19 @@ from app.services.circuit_breaker import (
 
 logger = logging.getLogger(__name__)
 
+# Reranker models whose /rerank servers return raw logits; their scores are
+# always mapped through a sigmoid, scores of other models are used as-is
+LOGIT_SCORE_MODELS = frozenset({"bge-reranker-v2-m3", "bge-reranker-large", "bge-reranker-base"})
+
+
+def _sigmoid(x: float) -> float:
+    """Logistic function that does not overflow for large negative logits"""
+    if x >= 0:
+        return 1.0 / (1.0 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1.0 + z)
+
+
 # Circuit breaker for Ollama service
 _ollama_circuit_breaker: Optional[CircuitBreaker] = None
 
@@ -55,10 +77,29 @@ def get_ollama_circuit_breaker() -> CircuitBreaker:
     return _ollama_circuit_breaker
 
 
+# Circuit breaker for the batched /rerank server
+_batch_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_batch_reranker_circuit_breaker() -> CircuitBreaker:
+    """Get or create circuit breaker for the batched rerank endpoint"""
+    global _batch_circuit_breaker
+    if _batch_circuit_breaker is None:
+        config = CircuitBreakerConfig(
+            failure_threshold=5,
+            recovery_timeout=30.0,
+            half_open_max_calls=2,
+            success_threshold=2,
+        )
+        _batch_circuit_breaker = get_circuit_breaker_sync("batch_reranker", config)
+    return _batch_circuit_breaker
+
+
 class RerankingProvider(str, Enum):
     """Reranking provider options"""
     OLLAMA = "ollama"  # Primary - local BGE-Reranker-v2
     LLM = "llm"  # Fallback - local Qwen 3.5 via Ollama
+    BATCH = "batch"  # Local cross-encoder server with a batched /rerank endpoint
 
 
 @dataclass
@@ -74,13 +115,19 @@ class RerankingConfig:
     enable_metrics: bool = True
     timeout: int = 30
     batch_size: int = 10  # For parallel Ollama requests
+    rerank_url: Optional[str] = None  # Batched rerank server (defaults to base_url)
+    rerank_endpoint: str = "/rerank"
+    cache_scores: bool = True  # Reuse scores for (query, chunk_id) pairs
+    score_cache_ttl: int = 3600  # Seconds
+    rerank_top_n: Optional[int] = None  # Early exit: only rerank the top-N by RRF score
+    logit_scores: Optional[bool] = None  # Batch scores are raw logits (None: by model)
 
     @property
     def resolved_model(self) -> str:
         """Return the actual model name based on provider"""
         if self.model:
             return self.model
-        if self.provider == RerankingProvider.OLLAMA:
+        if self.provider in (RerankingProvider.OLLAMA, RerankingProvider.BATCH):
             return "bge-reranker-v2-m3"
         if self.llm_provider == "ollama_vlm":
             return "qwen3.5:35b"
@@ -89,6 +136,119 @@ class RerankingConfig:
             "and llm_provider is not ollama_vlm"
         )
 
+    @property
+    def applies_sigmoid(self) -> bool:
+        """Whether batch reranker scores are mapped through a sigmoid"""
+        if self.logit_scores is not None:
+            return self.logit_scores
+        return self.resolved_model in LOGIT_SCORE_MODELS
+
+    @property
+    def score_scale(self) -> str:
+        """
+        Identifies the scale reranker scores are on, for the score cache
+
+        Providers can share a model name (Ollama and batch both default to
+        bge-reranker-v2-m3) while returning scores on different scales, so
+        the provider and the sigmoid mapping are part of the identity.
+        """
+        scale = self.provider.value
+        if self.provider == RerankingProvider.BATCH and self.applies_sigmoid:
+            scale += "+sigmoid"
+        return f"{scale}:{self.resolved_model}"
+
+
+class RerankScoreCache:
+    """
+    In-process LRU of reranker scores keyed on
+    (score scale, query hash, chunk_id, content hash)
+
+    Services are created per request, so the cache is module-level and
+    shared. The score scale (RerankingConfig.score_scale) keeps scores of
+    providers that share a model name apart. The content hash ties a score to the text that was scored:
+    chunk ids can come from clients (/rerank), and re-indexed chunks must
+    not reuse stale scores. Entries also expire after the configured TTL.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str, str, str], Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_query(query: str) -> str:
+        return hashlib.sha256(query.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    def get_many(
+        self,
+        scale: str,
+        query: str,
+        documents: Dict[str, str],
+        ttl: int
+    ) -> Dict[str, float]:
+        """
+        Cached scores for the given chunks (missing or expired are omitted)
+
+        Args:
+            documents: chunk_id -> content that would be scored
+        """
+        query_hash = self.hash_query(query)
+        now = time.time()
+        found = {}
+        with self._lock:
+            for chunk_id, content in documents.items():
+                key = (scale, query_hash, chunk_id, self.hash_content(content))
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                score, stored_at = entry
+                if now - stored_at > ttl:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[chunk_id] = score
+        return found
+
+    def put_many(
+        self,
+        scale: str,
+        query: str,
+        documents: Dict[str, str],
+        scores: Dict[str, float]
+    ):
+        """Store scores for chunks; documents maps chunk_id -> scored content"""
+        query_hash = self.hash_query(query)
+        now = time.time()
+        with self._lock:
+            for chunk_id, score in scores.items():
+                key = (scale, query_hash, chunk_id, self.hash_content(documents[chunk_id]))
+                self._entries[key] = (score, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_score_cache: Optional[RerankScoreCache] = None
+
+
+def get_rerank_score_cache() -> RerankScoreCache:
+    """Get or create the shared reranker score cache"""
+    global _score_cache
+    if _score_cache is None:
+        _score_cache = RerankScoreCache()
+    return _score_cache
+
 
 @dataclass
 class RerankingMetrics:
@@ -96,6 +256,8 @@ class RerankingMetrics:
     total_input_results: int = 0
     total_output_results: int = 0
     reranking_time_ms: float = 0
+    cache_hits: int = 0
+    reranked_count: int = 0  # Pairs actually sent to the reranker
     provider: Optional[RerankingProvider] = None
     model: Optional[str] = None
     ndcg: Optional[float] = None
@@ -116,6 +278,7 @@ class RerankingService:
     Supports multiple providers:
     - Ollama (local BGE-Reranker-v2-M3) - <200ms latency (primary)
     - Local Qwen 3.5 LLM via Ollama (fallback) - ~1-2s latency
+    - Batched cross-encoder server (/rerank) - one request per query
     """
 
     def __init__(
@@ -123,7 +286,8 @@ class RerankingService:
         config: Optional[RerankingConfig] = None,
         ollama_client: Optional[Any] = None,
         llm_client: Optional[Any] = None,
-        http_client: Optional[httpx.AsyncClient] = None
+        http_client: Optional[httpx.AsyncClient] = None,
+        score_cache: Optional[RerankScoreCache] = None
     ):
         """
         Initialize reranking service
@@ -133,8 +297,10 @@ class RerankingService:
             ollama_client: Optional mock Ollama client for testing
             llm_client: Optional LLM client for LLM-based reranking fallback
             http_client: Optional httpx async client for Ollama API calls
+            score_cache: Optional score cache (defaults to the shared cache)
         """
         self.config = config or RerankingConfig()
+        self.score_cache = score_cache or get_rerank_score_cache()
         self._http_client = http_client
         self._owns_http_client = False
         self.ollama_client = ollama_client
@@ -189,16 +355,61 @@ class RerankingService:
 
         # Limit input results to max_input_results
         input_results = results[:self.config.max_input_results]
+
+        # Early exit: candidates far down the fused ranking rarely reach top_k
+        if self.config.rerank_top_n and len(input_results) > self.config.rerank_top_n:
+            input_results = sorted(
+                input_results,
+                key=lambda r: r.rrf_score if r.rrf_score is not None else r.score,
+                reverse=True
+            )[:self.config.rerank_top_n]
         metrics.total_input_results = len(input_results)
 
         try:
+            # Reuse scores already computed for this query
+            cached_scores: Dict[str, float] = {}
+            if self.config.cache_scores:
+                cached_scores = self.score_cache.get_many(
+                    self.config.score_scale,
+                    query,
+                    {r.chunk_id: r.content for r in input_results},
+                    self.config.score_cache_ttl
+                )
+            metrics.cache_hits = len(cached_scores)
+            pending = [r for r in input_results if r.chunk_id not in cached_scores]
+            metrics.reranked_count = len(pending)
+
             # Rerank based on provider
-            if self.config.provider == RerankingProvider.OLLAMA:
-                reranked = await self._rerank_with_ollama(query, input_results)
-            elif self.config.provider == RerankingProvider.LLM:
-                reranked = await self._rerank_with_llm(query, input_results)
-            else:
-                raise ValueError(f"Unsupported provider: {self.config.provider}")
+            scored: List[SearchResult] = []
+            if pending:
+                if self.config.provider == RerankingProvider.OLLAMA:
+                    scored = await self._rerank_with_ollama(query, pending)
+                elif self.config.provider == RerankingProvider.LLM:
+                    scored = await self._rerank_with_llm(query, pending)
+                elif self.config.provider == RerankingProvider.BATCH:
+                    scored = await self._rerank_with_batch(query, pending)
+                else:
+                    raise ValueError(f"Unsupported provider: {self.config.provider}")
+
+                if self.config.cache_scores:
+                    # Results the provider could not score come back unchanged
+                    self.score_cache.put_many(
+                        self.config.score_scale,
+                        query,
+                        {r.chunk_id: r.content for r in pending},
+                        {
+                            new.chunk_id: new.score
+                            for old, new in zip(pending, scored)
+                            if new is not old
+                        }
+                    )
+
+            scored_by_id = {r.chunk_id: r for r in scored}
+            reranked = [
+                scored_by_id[r.chunk_id] if r.chunk_id in scored_by_id
+                else self._with_score(r, cached_scores[r.chunk_id])
+                for r in input_results
+            ]
 
             # Filter by score threshold
             filtered = [r for r in reranked if r.score >= self.config.score_threshold]
@@ -232,6 +443,84 @@ class RerankingService:
                 metrics=metrics
             )
 
+    @staticmethod
+    def _with_score(result: SearchResult, score: float) -> SearchResult:
+        """Copy of a search result carrying a reranker score"""
+        return SearchResult(
+            chunk_id=result.chunk_id,
+            content=result.content,
+            score=score,
+            rank=result.rank,
+            method=result.method,
+            metadata=result.metadata,
+            dense_score=getattr(result, 'dense_score', None),
+            sparse_score=getattr(result, 'sparse_score', None),
+            fuzzy_score=getattr(result, 'fuzzy_score', None)
+        )
+
+    async def _rerank_with_batch(
+        self,
+        query: str,
+        results: List[SearchResult]
+    ) -> List[SearchResult]:
+        """
+        Rerank all candidates with one call to a cross-encoder /rerank endpoint
+
+        Accepts both common response shapes:
+        - {"results": [{"index": i, "relevance_score": s}, ...]} (Jina/Cohere
+          style, llama.cpp server, Infinity)
+        - [{"index": i, "score": s}, ...] (text-embeddings-inference)
+
+        Scores of logit models (config.applies_sigmoid) are always mapped
+        through a sigmoid so every score of a model shares one scale.
+
+        Args:
+            query: Search query
+            results: Results to rerank
+
+        Returns:
+            List of results with updated scores, in input order
+        """
+        client = await self._get_http_client()
+        base_url = (self.config.rerank_url or self.config.base_url).rstrip("/")
+        documents = [r.content[:2000] for r in results]
+
+        async def rerank_call():
+            response = await client.post(
+                f"{base_url}{self.config.rerank_endpoint}",
+                json={
+                    "model": self.config.resolved_model,
+                    "query": query,
+                    # "documents" for Jina/Cohere-style servers, "texts" for TEI
+                    "documents": documents,
+                    "texts": documents,
+                    "top_n": len(documents),
+                    "return_documents": False
+                }
+            )
+            response.raise_for_status()
+            return response.json()
+
+        data = await get_batch_reranker_circuit_breaker().call(rerank_call, operation="rerank")
+
+        items = data.get("results", []) if isinstance(data, dict) else data
+        scores: Dict[int, float] = {}
+        for item in items:
+            score = item.get("relevance_score", item.get("score"))
+            if score is not None:
+                scores[int(item["index"])] = float(score)
+
+        if not scores:
+            raise ValueError("Rerank endpoint returned no scores")
+
+        if self.config.applies_sigmoid:
+            scores = {i: _sigmoid(s) for i, s in scores.items()}
+
+        return [
+            self._with_score(result, scores[i]) if i in scores else result
+            for i, result in enumerate(results)
+        ]
+
     async def _rerank_single_ollama(
         self,
         client: httpx.AsyncClient,
@@ -436,14 +725,22 @@ Return ONLY a JSON object with a single key "relevance_scores" containing a list
             scores_data = json.loads(cleaned)
             relevance_scores = scores_data.get("relevance_scores", [])
 
+            # Documents the model did not score come back unchanged, so the
+            # caller does not cache their original scores as LLM scores
             reranked = []
             for i, result in enumerate(results):
-                raw_score = relevance_scores[i] if i < len(relevance_scores) else result.score
+                if i >= len(relevance_scores):
+                    reranked.append(result)
+                    continue
+                raw_score = relevance_scores[i]
                 try:
                     score = float(raw_score)
                 except (ValueError, TypeError):
                     numbers = re.findall(r"[-+]?\d*\.?\d+", str(raw_score))
-                    score = float(numbers[0]) if numbers else result.score
+                    if not numbers:
+                        reranked.append(result)
+                        continue
+                    score = float(numbers[0])
                 score = max(0.0, min(1.0, score))
 
                 reranked_result = SearchResult(
@@ -526,3 +823,9 @@ def get_reranking_service(config: Optional[RerankingConfig] = None) -> Reranking
         _reranking_service = RerankingService(config=config)
 
     return _reranking_service
+
+
+def reset_rerank_score_cache():
+    """Reset shared score cache (for testing)"""
+    global _score_cache
+    _score_cache = None
@@ -12,6 +12,9 @@ Features:
 - Embedding caching to avoid recomputation
 - Search result caching with 5-minute TTL
 - Cache hit/miss metrics with tier tracking
+- In-process vector index per namespace (one matrix-vector product per lookup),
+  re-synced from Redis when the namespace's version counter shows writes from
+  other processes
 - Target: 60-80% cache hit rate
 
 Usage:
@@ -35,8 +38,16 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 import numpy as np
 
+from app.services.vector_index import VectorIndex, VectorIndexConfig
+
 logger = logging.getLogger(__name__)
 
+# Keys fetched per MGET when warming a namespace index
+WARM_BATCH_SIZE = 500
+
+# Candidate payloads fetched per MGET during a lookup
+CANDIDATE_BATCH_SIZE = 8
+
 
 class CacheMatchTier(str, Enum):
     """Cache match quality tiers based on semantic similarity"""
@@ -61,7 +72,10 @@ class SemanticCacheConfig:
     query_metadata_ttl: int = 1800     # 30 minutes for query metadata
 
     # Performance settings
-    max_candidates: int = 100          # Max cached queries to compare
+    max_candidates: int = 100          # Top-k candidates pulled from the vector index
+    index_warm_limit: int = 10000      # Max sem keys loaded from Redis into a cold index
+    index_refresh_seconds: int = 30    # How often a warm index checks for other pods' writes
+    use_ann_index: bool = True         # Use HNSW for large indexes if hnswlib is installed
     enable_metrics: bool = True
 
     # Cache behavior
@@ -79,6 +93,9 @@ class SemanticCacheConfig:
             search_result_ttl=int(os.getenv("SEMANTIC_CACHE_RESULT_TTL", "300")),
             embedding_ttl=int(os.getenv("SEMANTIC_CACHE_EMBEDDING_TTL", "3600")),
             max_candidates=int(os.getenv("SEMANTIC_CACHE_MAX_CANDIDATES", "100")),
+            index_warm_limit=int(os.getenv("SEMANTIC_CACHE_INDEX_WARM_LIMIT", "10000")),
+            index_refresh_seconds=int(os.getenv("SEMANTIC_CACHE_INDEX_REFRESH_SECONDS", "30")),
+            use_ann_index=os.getenv("SEMANTIC_CACHE_USE_ANN", "true").lower() == "true",
             enable_metrics=os.getenv("SEMANTIC_CACHE_METRICS", "true").lower() == "true"
         )
 
@@ -176,6 +193,12 @@ class SemanticCacheService:
         self._embedding_service = embedding_service
         self.metrics = SemanticCacheMetrics() if self.config.enable_metrics else None
 
+        # Per-namespace vector indexes, kept in sync with Redis sem:* keys
+        self._indexes: Dict[str, VectorIndex] = {}
+        # Namespace version each index reflects, and when it was last checked
+        self._index_versions: Dict[str, int] = {}
+        self._index_checked_at: Dict[str, float] = {}
+
         logger.info(
             f"Initialized SemanticCacheService with thresholds: "
             f"exact={self.config.exact_threshold}, "
@@ -186,8 +209,8 @@ class SemanticCacheService:
     async def _get_redis_client(self):
         """Lazy load Redis client"""
         if self._redis_client is None:
-            from app.services.redis_cache_service import get_redis_cache_service
-            self._redis_client = get_redis_cache_service()
+            from app.services.redis_cache_service import get_async_redis_cache_service
+            self._redis_client = get_async_redis_cache_service()
         return self._redis_client
 
     async def _get_embedding_service(self):
@@ -197,6 +220,120 @@ class SemanticCacheService:
             self._embedding_service = get_embedding_service()
         return self._embedding_service
 
+    async def _get_index(self, namespace: str, redis: Any) -> VectorIndex:
+        """
+        Get the vector index for a namespace, warming it from Redis on first use
+
+        Every index_refresh_seconds the namespace's version counter is read;
+        if another process has cached or invalidated entries since, the index
+        is re-synced with the sem:* keys in Redis.
+
+        Args:
+            namespace: Cache namespace
+            redis: Async Redis cache service
+
+        Returns:
+            VectorIndex for the namespace
+        """
+        index = self._indexes.get(namespace)
+        now = time.time()
+        if index is not None:
+            if now - self._index_checked_at.get(namespace, 0.0) < self.config.index_refresh_seconds:
+                return index
+            self._index_checked_at[namespace] = now
+            version = await self._read_version(namespace, redis)
+            if version == self._index_versions.get(namespace):
+                return index
+        else:
+            index = VectorIndex(config=VectorIndexConfig(use_ann=self.config.use_ann_index))
+            self._indexes[namespace] = index
+            self._index_checked_at[namespace] = now
+            version = await self._read_version(namespace, redis)
+
+        # Version is read before the scan, so writes during it show up next check
+        self._index_versions[namespace] = version
+        await self._sync_index(namespace, redis, index)
+        return index
+
+    async def _sync_index(self, namespace: str, redis: Any, index: VectorIndex):
+        """
+        Add sem keys the index is missing and drop keys gone from Redis
+
+        The scan is capped at index_warm_limit keys, so an indexed key that
+        was not scanned is only dropped once EXISTS confirms it is gone.
+        """
+        keys = await redis.scan_keys(
+            f"{namespace}:sem:*", count=self.config.index_warm_limit
+        )
+        scanned = set(keys)
+        unseen = [key for key in index.keys() if key not in scanned]
+        if len(keys) < self.config.index_warm_limit:
+            gone = unseen  # The scan covered the whole namespace
+        else:
+            gone = await self._missing_keys(redis, unseen)
+        for key in gone:
+            index.remove(key)
+
+        new_keys = [key for key in keys if key not in index]
+        for start in range(0, len(new_keys), WARM_BATCH_SIZE):
+            batch = new_keys[start:start + WARM_BATCH_SIZE]
+            for key, cached_data in zip(batch, await redis.mget(batch)):
+                try:
+                    if cached_data and 'embedding' in cached_data:
+                        index.add(key, cached_data['embedding'])
+                except Exception as e:
+                    logger.warning(f"Error warming semantic index from {key}: {e}")
+
+        logger.info(
+            f"Synced semantic index for '{namespace}': {len(index)} entries "
+            f"({len(new_keys)} loaded, {len(gone)} removed)"
+        )
+
+    async def _missing_keys(self, redis: Any, keys: List[str]) -> List[str]:
+        """Keys that EXISTS reports absent (pipelined); none if the check fails"""
+        missing = []
+        try:
+            for start in range(0, len(keys), WARM_BATCH_SIZE):
+                batch = keys[start:start + WARM_BATCH_SIZE]
+                async with redis.redis_client.pipeline(transaction=False) as pipe:
+                    for key in batch:
+                        pipe.exists(key)
+                    found = await pipe.execute()
+                missing.extend(key for key, exists in zip(batch, found) if not exists)
+        except Exception as e:
+            logger.warning(f"Error checking semantic index keys: {e}")
+            return []
+        return missing
+
+    @staticmethod
+    def _version_key(namespace: str) -> str:
+        return f"{namespace}:sem_version"
+
+    async def _read_version(self, namespace: str, redis: Any) -> int:
+        """Current write counter of a namespace (0 if never written)"""
+        try:
+            version = await redis.redis_client.get(self._version_key(namespace))
+            return int(version) if version is not None else 0
+        except Exception as e:
+            logger.warning(f"Error reading semantic index version for '{namespace}': {e}")
+            return -1  # Unknown; forces a re-sync on the next check
+
+    async def _bump_version(self, namespace: str, redis: Any):
+        """
+        Record a write to the namespace so other processes re-sync
+
+        If no other process wrote since this index was synced, the index
+        already reflects the new version; otherwise it stays behind and is
+        re-synced on its next check.
+        """
+        try:
+            version = await redis.redis_client.incr(self._version_key(namespace))
+        except Exception as e:
+            logger.warning(f"Error bumping semantic index version for '{namespace}': {e}")
+            return
+        if self._index_versions.get(namespace) == version - 1:
+            self._index_versions[namespace] = version
+
     def _hash_query(self, query: str) -> str:
         """Generate hash for exact match lookup"""
         return hashlib.sha256(query.lower().strip().encode('utf-8')).hexdigest()[:16]
@@ -241,7 +378,7 @@ class SemanticCacheService:
             redis = await self._get_redis_client()
             cache_key = f"emb:{self._hash_query(text)}"
 
-            cached = redis.get_cached_embedding(text)
+            cached = await redis.get_cached_embedding(text)
 
             if cached:
                 if self.metrics:
@@ -270,7 +407,7 @@ class SemanticCacheService:
         """
         try:
             redis = await self._get_redis_client()
-            return redis.cache_embedding(text, embedding)
+            return await redis.cache_embedding(text, embedding)
         except Exception as e:
             logger.error(f"Error caching embedding: {e}")
             return False
@@ -331,7 +468,7 @@ class SemanticCacheService:
 
             # Step 1: Try exact hash match first (fastest)
             exact_key = f"{namespace}:exact:{self._hash_query(query)}"
-            exact_match = redis.get_cached_query_result(query)
+            exact_match = await redis.get_cached_query_result(query)
 
             if exact_match:
                 lookup_time = (time.time() - start_time) * 1000
@@ -351,31 +488,34 @@ class SemanticCacheService:
             if query_embedding is None:
                 query_embedding, from_cache = await self.get_or_create_embedding(query)
 
-            query_vec = np.array(query_embedding)
-
-            # Get cached queries with embeddings
-            pattern = f"{namespace}:sem:*"
-            cached_keys = await redis.scan_keys(pattern, count=self.config.max_candidates)
+            # Single matrix-vector product over all cached embeddings
+            index = await self._get_index(namespace, redis)
+            candidates = index.search(query_embedding, k=self.config.max_candidates)
 
             best_match = None
             best_similarity = 0.0
 
-            for key in cached_keys:
+            # Candidates are sorted by similarity; fetch payloads a batch at a
+            # time until one is live
+            for start in range(0, len(candidates), CANDIDATE_BATCH_SIZE):
+                batch = candidates[start:start + CANDIDATE_BATCH_SIZE]
                 try:
-                    cached_data = redis.get(key)
-                    if not cached_data or 'embedding' not in cached_data:
-                        continue
-
-                    cached_embedding = np.array(cached_data['embedding'])
-                    similarity = self._cosine_similarity(query_vec, cached_embedding)
-
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = cached_data
+                    payloads = await redis.mget([key for key, _ in batch])
                 except Exception as e:
-                    logger.warning(f"Error comparing cached query: {e}")
+                    logger.warning(f"Error loading cached queries: {e}")
                     continue
 
+                for (key, similarity), cached_data in zip(batch, payloads):
+                    if not cached_data:
+                        # Expired or evicted in Redis
+                        index.remove(key)
+                        continue
+                    best_similarity = similarity
+                    best_match = cached_data
+                    break
+                if best_match is not None:
+                    break
+
             lookup_time = (time.time() - start_time) * 1000
 
             if best_match is None:
@@ -464,11 +604,14 @@ class SemanticCacheService:
 
             # Store for exact match lookup
             exact_key = f"{namespace}:exact:{self._hash_query(query)}"
-            redis.cache_query_result(query, result)
+            await redis.cache_query_result(query, result)
 
             # Store for semantic search
             sem_key = f"{namespace}:sem:{self._hash_query(query)}"
-            redis.set(sem_key, cache_data, ttl=self.config.search_result_ttl)
+            if await redis.set(sem_key, cache_data, ttl=self.config.search_result_ttl):
+                index = await self._get_index(namespace, redis)
+                index.add(sem_key, embedding)
+                await self._bump_version(namespace, redis)
 
             logger.info(f"Cached search result for query: {query[:50]}")
             return True
@@ -494,7 +637,13 @@ class SemanticCacheService:
             exact_key = f"{namespace}:exact:{self._hash_query(query)}"
             sem_key = f"{namespace}:sem:{self._hash_query(query)}"
 
-            redis.invalidate_cache(query, key_type="query")
+            await redis.invalidate_cache(query, key_type="query")
+            await redis.delete(sem_key)
+
+            index = self._indexes.get(namespace)
+            if index is not None:
+                index.remove(sem_key)
+            await self._bump_version(namespace, redis)
 
             logger.info(f"Invalidated cache for query: {query[:50]}")
             return True
@@ -519,8 +668,11 @@ class SemanticCacheService:
             pattern = f"{namespace}:*"
             keys = await redis.scan_keys(pattern, count=10000)
 
-            for key in keys:
-                redis.redis_client.delete(key)
+            await redis.delete_many(keys)
+
+            self._indexes.pop(namespace, None)
+            self._index_versions.pop(namespace, None)
+            self._index_checked_at.pop(namespace, None)
 
             logger.info(f"Cleared {len(keys)} entries from namespace: {namespace}")
             return len(keys)
@@ -0,0 +1,478 @@
+"""
+Empire v7.3 - Source Embedding Pipeline
+Batched, concurrent embedding generation for project sources
+
+Replaces the one-request-per-chunk Ollama loop in source processing with:
+- Ollama /api/embed batch input (many chunks per request)
+- Pooled, keep-alive HTTP session shared across tasks in the worker
+- Bounded concurrency across batches
+- Dedup by chunk_hash: within the document, against the Redis embedding
+  cache, and against embeddings already stored in source_embeddings
+- Throughput stats (embeddings/sec) for the performance profiler
+
+Usage:
+    from app.services.source_embedding_pipeline import get_source_embedding_pipeline
+
+    pipeline = get_source_embedding_pipeline()
+    embeddings, stats = await pipeline.embed_chunks(chunks, supabase=supabase, project_id=pid)
+
+    # Overlap chunking, embedding and storage; each group is handed to
+    # on_group(start_index, chunks, embeddings) as soon as it is embedded
+    stats = await pipeline.embed_chunk_stream(chunk_iter, on_group=store_group, supabase=supabase)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import requests
+import structlog
+from requests.adapters import HTTPAdapter
+
+logger = structlog.get_logger(__name__)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+@dataclass
+class SourceEmbeddingConfig:
+    """Configuration for the source embedding pipeline"""
+    ollama_base_url: str = "http://localhost:11434"
+    model: str = "bge-m3"
+    batch_size: int = 32            # Chunks per /api/embed request
+    max_concurrency: int = 4        # Concurrent /api/embed requests
+    request_timeout: int = 120      # Seconds per batch request
+    lookup_batch_size: int = 100    # chunk_hashes per source_embeddings IN query
+    stream_max_pending: int = 2     # Streamed groups queued per stage (bounds memory)
+
+    @classmethod
+    def from_env(cls) -> "SourceEmbeddingConfig":
+        """Create config from environment variables"""
+        return cls(
+            ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            model=os.getenv("SOURCE_EMBEDDING_MODEL", "bge-m3"),
+            batch_size=int(os.getenv("SOURCE_EMBEDDING_BATCH_SIZE", "32")),
+            max_concurrency=int(os.getenv("SOURCE_EMBEDDING_CONCURRENCY", "4")),
+            request_timeout=int(os.getenv("SOURCE_EMBEDDING_TIMEOUT", "120")),
+            stream_max_pending=int(os.getenv("SOURCE_EMBEDDING_STREAM_PENDING", "2")),
+        )
+
+
+@dataclass
+class EmbeddingPipelineStats:
+    """Throughput and dedup statistics for one embed_chunks call"""
+    total_chunks: int = 0
+    unique_chunks: int = 0
+    cache_hits: int = 0
+    stored_hits: int = 0
+    generated: int = 0
+    batches: int = 0
+    duration_ms: float = 0.0
+    generation_ms: float = 0.0
+
+    @property
+    def embeddings_per_second(self) -> float:
+        """Chunks embedded per second (all sources, end to end)"""
+        if self.duration_ms <= 0:
+            return 0.0
+        return self.total_chunks / (self.duration_ms / 1000)
+
+    @property
+    def generated_per_second(self) -> float:
+        """Model throughput for chunks that had to be generated"""
+        if self.generation_ms <= 0:
+            return 0.0
+        return self.generated / (self.generation_ms / 1000)
+
+    def merge(self, other: "EmbeddingPipelineStats"):
+        """Add the counters of another call (duration is not summed)"""
+        self.total_chunks += other.total_chunks
+        self.unique_chunks += other.unique_chunks
+        self.cache_hits += other.cache_hits
+        self.stored_hits += other.stored_hits
+        self.generated += other.generated
+        self.batches += other.batches
+        self.generation_ms += other.generation_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for profiler metadata"""
+        return {
+            "total_chunks": self.total_chunks,
+            "unique_chunks": self.unique_chunks,
+            "cache_hits": self.cache_hits,
+            "stored_hits": self.stored_hits,
+            "generated": self.generated,
+            "batches": self.batches,
+            "duration_ms": round(self.duration_ms, 2),
+            "embeddings_per_second": round(self.embeddings_per_second, 2),
+            "generated_per_second": round(self.generated_per_second, 2),
+        }
+
+
+def compute_chunk_hash(chunk: str) -> str:
+    """MD5 hash of chunk text (matches source_embeddings.chunk_hash)"""
+    return hashlib.md5(chunk.encode()).hexdigest()
+
+
+# ============================================================================
+# Pooled Ollama Client
+# ============================================================================
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_ollama_session(pool_size: int = 8) -> requests.Session:
+    """Get the process-wide keep-alive session for Ollama requests"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+class OllamaBatchEmbedder:
+    """Ollama embedding client using the /api/embed batch endpoint"""
+
+    def __init__(
+        self,
+        config: Optional[SourceEmbeddingConfig] = None,
+        session: Optional[requests.Session] = None
+    ):
+        self.config = config or SourceEmbeddingConfig.from_env()
+        self.session = session or get_ollama_session(
+            pool_size=max(self.config.max_concurrency, 1) * 2
+        )
+        self._batch_endpoint_supported = True
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed one batch of texts (blocking)
+
+        Falls back to the legacy per-prompt /api/embeddings endpoint when the
+        Ollama server predates /api/embed.
+        """
+        if not texts:
+            return []
+
+        base_url = self.config.ollama_base_url.rstrip("/")
+
+        if self._batch_endpoint_supported:
+            response = self.session.post(
+                f"{base_url}/api/embed",
+                json={"model": self.config.model, "input": texts},
+                timeout=self.config.request_timeout
+            )
+            if not self._is_missing_route(response):
+                response.raise_for_status()
+                embeddings = response.json().get("embeddings", [])
+                if len(embeddings) != len(texts):
+                    raise ValueError(
+                        f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+                    )
+                return embeddings
+
+            logger.warning("Ollama /api/embed not available, using /api/embeddings")
+            self._batch_endpoint_supported = False
+
+        embeddings = []
+        for text in texts:
+            response = self.session.post(
+                f"{base_url}/api/embeddings",
+                json={"model": self.config.model, "prompt": text},
+                timeout=self.config.request_timeout
+            )
+            response.raise_for_status()
+            embeddings.append(response.json().get("embedding", []))
+        return embeddings
+
+    @staticmethod
+    def _is_missing_route(response: requests.Response) -> bool:
+        """
+        Whether a response means the server has no /api/embed route
+
+        Ollama answers unknown routes with a plain-text 404 ("404 page not
+        found"), but also uses 404 with a JSON error body for a missing model,
+        which must surface as an error rather than disable the batch endpoint.
+        """
+        if response.status_code != 404:
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return True
+        return not (isinstance(body, dict) and body.get("error"))
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts batch by batch (blocking, sequential)"""
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), self.config.batch_size):
+            embeddings.extend(self.embed_batch(texts[start:start + self.config.batch_size]))
+        return embeddings
+
+    async def aembed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """
+        Embed texts with bounded concurrency across batches
+
+        Returns:
+            Tuple of (embeddings in input order, number of batches)
+        """
+        batches = [
+            texts[start:start + self.config.batch_size]
+            for start in range(0, len(texts), self.config.batch_size)
+        ]
+        semaphore = asyncio.Semaphore(max(self.config.max_concurrency, 1))
+
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.embed_batch, batch)
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [embedding for batch in results for embedding in batch], len(batches)
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+class SourceEmbeddingPipeline:
+    """
+    Embedding pipeline for project source chunks
+
+    Resolution order per unique chunk_hash:
+    1. Redis embedding cache (SourceContentCache)
+    2. Embeddings already stored in source_embeddings for the project
+    3. Ollama /api/embed, batched and concurrent
+    """
+
+    def __init__(
+        self,
+        config: Optional[SourceEmbeddingConfig] = None,
+        embedder: Optional[OllamaBatchEmbedder] = None,
+        cache: Optional[Any] = None
+    ):
+        self.config = config or SourceEmbeddingConfig.from_env()
+        self.embedder = embedder or OllamaBatchEmbedder(self.config)
+        self._cache = cache
+
+    def _get_cache(self):
+        """Lazy load source content cache"""
+        if self._cache is None:
+            from app.services.source_content_cache import get_source_content_cache
+            self._cache = get_source_content_cache()
+        return self._cache
+
+    async def _lookup_stored_embeddings(
+        self,
+        supabase,
+        chunk_hashes: List[str],
+        project_id: Optional[str]
+    ) -> Dict[str, List[float]]:
+        """Fetch embeddings already stored in source_embeddings by chunk_hash"""
+        found: Dict[str, List[float]] = {}
+
+        def query(batch: List[str]):
+            builder = supabase.table("source_embeddings")\
+                .select("chunk_hash, embedding")\
+                .in_("chunk_hash", batch)
+            if project_id:
+                builder = builder.eq("project_id", project_id)
+            return builder.execute()
+
+        for start in range(0, len(chunk_hashes), self.config.lookup_batch_size):
+            batch = chunk_hashes[start:start + self.config.lookup_batch_size]
+            try:
+                result = await asyncio.to_thread(query, batch)
+            except Exception as e:
+                logger.warning("Stored embedding lookup failed", error=str(e))
+                continue
+
+            for row in result.data or []:
+                embedding = row.get("embedding")
+                # pgvector columns come back from PostgREST as "[0.1,0.2,...]"
+                if isinstance(embedding, str):
+                    try:
+                        embedding = json.loads(embedding)
+                    except ValueError:
+                        continue
+                if embedding:
+                    found.setdefault(row.get("chunk_hash"), embedding)
+
+        return found
+
+    async def embed_chunks(
+        self,
+        chunks: List[str],
+        chunk_hashes: Optional[List[str]] = None,
+        supabase: Optional[Any] = None,
+        project_id: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Tuple[List[List[float]], EmbeddingPipelineStats]:
+        """
+        Embed chunks, reusing any embedding already known for the same text
+
+        Args:
+            chunks: Chunk texts
+            chunk_hashes: Optional precomputed MD5 hashes (see compute_chunk_hash)
+            supabase: Optional Supabase client for source_embeddings dedup
+            project_id: Scope for the source_embeddings dedup lookup
+            use_cache: Whether to use the Redis embedding cache
+
+        Returns:
+            Tuple of (embeddings aligned with chunks, pipeline stats)
+        """
+        start = time.time()
+        stats = EmbeddingPipelineStats(total_chunks=len(chunks))
+
+        if chunk_hashes is None:
+            chunk_hashes = [compute_chunk_hash(chunk) for chunk in chunks]
+
+        # Unique chunks only: repeated boilerplate is embedded once
+        unique: Dict[str, str] = {}
+        for chunk, chunk_hash in zip(chunks, chunk_hashes):
+            unique.setdefault(chunk_hash, chunk)
+        stats.unique_chunks = len(unique)
+
+        resolved: Dict[str, List[float]] = {}
+
+        if use_cache and unique:
+            cache = self._get_cache()
+            cached = await cache.get_cached_embeddings_batch(list(unique))
+            for chunk_hash, embedding in cached.items():
+                if embedding is not None:
+                    resolved[chunk_hash] = embedding
+            stats.cache_hits = len(resolved)
+
+        stored: Dict[str, List[float]] = {}
+        if supabase is not None:
+            pending = [h for h in unique if h not in resolved]
+            if pending:
+                stored = await self._lookup_stored_embeddings(supabase, pending, project_id)
+                resolved.update(stored)
+                stats.stored_hits = len(stored)
+
+        to_generate = [h for h in unique if h not in resolved]
+        new_embeddings: Dict[str, List[float]] = {}
+        if to_generate:
+            gen_start = time.time()
+            embeddings, stats.batches = await self.embedder.aembed(
+                [unique[h] for h in to_generate]
+            )
+            stats.generation_ms = (time.time() - gen_start) * 1000
+            new_embeddings = dict(zip(to_generate, embeddings))
+            resolved.update(new_embeddings)
+            stats.generated = len(new_embeddings)
+
+        # Stored hits are cached too so the next re-upload skips Supabase
+        to_cache = {**stored, **new_embeddings}
+        if use_cache and to_cache:
+            await self._get_cache().cache_embeddings_batch(to_cache)
+
+        stats.duration_ms = (time.time() - start) * 1000
+
+        logger.info(
+            "Source embeddings resolved",
+            **stats.to_dict()
+        )
+
+        return [resolved[h] for h in chunk_hashes], stats
+
+    async def embed_chunk_stream(
+        self,
+        chunks: AsyncIterator[str],
+        on_group: Callable[[int, List[str], List[List[float]]], Awaitable[None]],
+        group_size: Optional[int] = None,
+        supabase: Optional[Any] = None,
+        project_id: Optional[str] = None,
+        use_cache: bool = True
+    ) -> EmbeddingPipelineStats:
+        """
+        Embed chunks as they are produced by an async iterator
+
+        Three stages run concurrently, connected by queues of at most
+        stream_max_pending groups: collecting chunks into groups of
+        group_size (default: one round of concurrent batches), embedding a
+        group with embed_chunks, and handing it to on_group for storage. So
+        chunking, embedding and storage overlap, and only a few groups are
+        held in memory whatever the document size.
+
+        Args:
+            chunks: Async iterator of chunk texts
+            on_group: Awaited with (index of the group's first chunk, chunk
+                texts, embeddings) for each group, in document order
+            group_size: Chunks per embed_chunks call
+            supabase: Optional Supabase client for source_embeddings dedup
+            project_id: Scope for the source_embeddings dedup lookup
+            use_cache: Whether to use the Redis embedding cache
+
+        Returns:
+            Combined stats (total_chunks is the number of chunks streamed)
+        """
+        start = time.time()
+        group_size = group_size or self.config.batch_size * max(self.config.max_concurrency, 1)
+        max_pending = max(self.config.stream_max_pending, 1)
+        to_embed: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        to_store: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        stats = EmbeddingPipelineStats()
+
+        async def collect():
+            group: List[str] = []
+            async for chunk in chunks:
+                group.append(chunk)
+                if len(group) >= group_size:
+                    await to_embed.put(group)
+                    group = []
+            if group:
+                await to_embed.put(group)
+            await to_embed.put(None)
+
+        async def embed():
+            index = 0
+            while (group := await to_embed.get()) is not None:
+                embeddings, group_stats = await self.embed_chunks(
+                    group, supabase=supabase, project_id=project_id, use_cache=use_cache
+                )
+                stats.merge(group_stats)
+                await to_store.put((index, group, embeddings))
+                index += len(group)
+            await to_store.put(None)
+
+        async def store():
+            while (item := await to_store.get()) is not None:
+                await on_group(*item)
+
+        stages = [asyncio.ensure_future(stage()) for stage in (collect, embed, store)]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            # A failed stage would leave the others blocked on their queues
+            for stage in stages:
+                stage.cancel()
+            raise
+
+        stats.duration_ms = (time.time() - start) * 1000
+        return stats
+
+
+# Singleton instance
+_pipeline: Optional[SourceEmbeddingPipeline] = None
+
+
+def get_source_embedding_pipeline() -> SourceEmbeddingPipeline:
+    """Get or create singleton source embedding pipeline"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = SourceEmbeddingPipeline()
+    return _pipeline
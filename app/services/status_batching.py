@@ -0,0 +1,394 @@
+"""
+Empire v7.3 - Batched Status Broadcasting
+Building blocks for StatusBroadcaster's batched mode
+
+Features:
+- Per-task progress coalescing: at most N progress events per second per
+  task, the newest pending update is published when its slot opens
+- Write-behind buffer for status persistence: rows coalesced per task and
+  per document, flushed in bulk on an interval or when the buffer fills
+- Long-lived background event loop (one per process, fork-aware) so sync
+  callers such as Celery signal handlers never create a loop per call
+
+Usage:
+    config = StatusBatchConfig.from_env()
+    coalescer = ProgressCoalescer(config.max_progress_per_second)
+    ready = coalescer.offer(status_message)   # messages to publish now
+    later = coalescer.due()                   # pending messages whose slot opened
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+from app.models.task_status import TaskState, TaskStatusMessage
+
+logger = structlog.get_logger(__name__)
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+STATUS_PROGRESS_COALESCED = Counter(
+    'empire_status_progress_coalesced_total',
+    'Progress updates replaced by a newer update before being published'
+)
+
+STATUS_WRITE_BUFFER_ROWS = Gauge(
+    'empire_status_write_buffer_rows',
+    'Status rows waiting in the write-behind buffer',
+    ['table']
+)
+
+STATUS_BULK_FLUSHES = Counter(
+    'empire_status_bulk_flushes_total',
+    'Write-behind buffer flushes',
+    ['result']  # result: success, error
+)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# States after which a task will not publish again
+TERMINAL_STATES: FrozenSet[TaskState] = frozenset({
+    TaskState.SUCCESS,
+    TaskState.FAILURE,
+    TaskState.REVOKED,
+    TaskState.COMPLETED,
+    TaskState.CANCELLED,
+})
+
+
+@dataclass
+class StatusBatchConfig:
+    """Configuration for batched status broadcasting"""
+    enabled: bool = False
+    max_progress_per_second: float = 2.0  # Per task; 0 disables coalescing
+    flush_interval: float = 1.0  # Seconds between write-behind flushes
+    max_buffered_rows: int = 200  # Flush early when this many rows are waiting
+    sync_timeout: float = 10.0  # Seconds a sync caller waits in immediate mode
+
+    @classmethod
+    def from_env(cls) -> "StatusBatchConfig":
+        """Create config from environment variables"""
+        return cls(
+            enabled=os.getenv("STATUS_BROADCAST_BATCHING", "false").lower() == "true",
+            max_progress_per_second=float(os.getenv("STATUS_PROGRESS_MAX_PER_SECOND", "2.0")),
+            flush_interval=float(os.getenv("STATUS_DB_FLUSH_INTERVAL", "1.0")),
+            max_buffered_rows=int(os.getenv("STATUS_DB_FLUSH_MAX_ROWS", "200")),
+            sync_timeout=float(os.getenv("STATUS_BROADCAST_SYNC_TIMEOUT", "10.0")),
+        )
+
+    @property
+    def progress_interval(self) -> float:
+        """Minimum seconds between published progress events for one task"""
+        if self.max_progress_per_second <= 0:
+            return 0.0
+        return 1.0 / self.max_progress_per_second
+
+
+# ============================================================================
+# Progress coalescing
+# ============================================================================
+
+class ProgressCoalescer:
+    """
+    Rate-limit progress events per task, keeping only the newest
+
+    Non-progress states (started, success, failure, retry, ...) always pass
+    through immediately and supersede any pending progress for that task.
+    Not thread-safe; use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_per_second: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.interval = 1.0 / max_per_second if max_per_second > 0 else 0.0
+        self._clock = clock
+        self._last_emit: Dict[str, float] = {}
+        self._pending: Dict[str, TaskStatusMessage] = {}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def offer(self, message: TaskStatusMessage) -> List[TaskStatusMessage]:
+        """
+        Submit a status message
+
+        Returns:
+            Messages to publish now (empty if the update was held back)
+        """
+        task_id = message.task_id
+        now = self._clock()
+
+        if message.status != TaskState.PROGRESS:
+            if self._pending.pop(task_id, None) is not None:
+                STATUS_PROGRESS_COALESCED.inc()
+            if message.status in TERMINAL_STATES:
+                self._last_emit.pop(task_id, None)
+            else:
+                self._last_emit[task_id] = now
+            return [message]
+
+        last = self._last_emit.get(task_id)
+        if last is None or now - last >= self.interval:
+            self._pending.pop(task_id, None)
+            self._last_emit[task_id] = now
+            return [message]
+
+        if task_id in self._pending:
+            STATUS_PROGRESS_COALESCED.inc()
+        self._pending[task_id] = message
+        return []
+
+    def due(self) -> List[TaskStatusMessage]:
+        """Pop pending progress messages whose rate-limit slot has opened"""
+        now = self._clock()
+        ready = []
+        for task_id, message in list(self._pending.items()):
+            if now - self._last_emit.get(task_id, 0.0) >= self.interval:
+                del self._pending[task_id]
+                self._last_emit[task_id] = now
+                ready.append(message)
+
+        # Forget idle tasks so the map stays bounded for long-lived workers
+        horizon = max(self.interval * 10, 60.0)
+        for task_id, last in list(self._last_emit.items()):
+            if now - last > horizon and task_id not in self._pending:
+                del self._last_emit[task_id]
+
+        return ready
+
+    def drain(self) -> List[TaskStatusMessage]:
+        """Pop every pending message regardless of rate limit"""
+        ready = list(self._pending.values())
+        self._pending.clear()
+        return ready
+
+
+# ============================================================================
+# Write-behind buffer
+# ============================================================================
+
+class StatusWriteBuffer:
+    """
+    Write-behind buffer for processing_tasks and documents status rows
+
+    Rows are coalesced by task_id / document_id (latest wins, matching the
+    per-message upsert/update semantics) and written by flush(). processing_tasks
+    rows are bulk-upserted in groups sharing the same column set, so a partial
+    row never nulls columns a per-row upsert would have left alone.
+
+    Rows that fail to write are re-queued unless a newer row for the same
+    task/document arrived meanwhile, so a database error never drops a
+    status (terminal ones included).
+    """
+
+    def __init__(self, max_rows: int = 200):
+        self.max_rows = max_rows
+        self._task_rows: Dict[str, Dict[str, Any]] = {}
+        self._document_rows: Dict[str, Dict[str, Any]] = {}
+        # write() runs in a worker thread and re-queues from there
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.rows_requeued = 0
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._task_rows) + len(self._document_rows)
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.max_rows
+
+    def add_task_row(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._task_rows[row["task_id"]] = row
+            STATUS_WRITE_BUFFER_ROWS.labels(table="processing_tasks").set(len(self._task_rows))
+
+    def add_document_update(self, document_id: str, update: Dict[str, Any]) -> None:
+        with self._lock:
+            self._document_rows[document_id] = update
+            STATUS_WRITE_BUFFER_ROWS.labels(table="documents").set(len(self._document_rows))
+
+    def take(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Detach buffered rows for writing"""
+        with self._lock:
+            task_rows = list(self._task_rows.values())
+            document_rows = self._document_rows
+            self._task_rows = {}
+            self._document_rows = {}
+            STATUS_WRITE_BUFFER_ROWS.labels(table="processing_tasks").set(0)
+            STATUS_WRITE_BUFFER_ROWS.labels(table="documents").set(0)
+        return task_rows, document_rows
+
+    def requeue(
+        self,
+        task_rows: List[Dict[str, Any]],
+        document_rows: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Put unwritten rows back, keeping any newer row buffered since take()"""
+        with self._lock:
+            for row in task_rows:
+                self._task_rows.setdefault(row["task_id"], row)
+            for document_id, update in document_rows.items():
+                self._document_rows.setdefault(document_id, update)
+            self.rows_requeued += len(task_rows) + len(document_rows)
+            STATUS_WRITE_BUFFER_ROWS.labels(table="processing_tasks").set(len(self._task_rows))
+            STATUS_WRITE_BUFFER_ROWS.labels(table="documents").set(len(self._document_rows))
+
+    def is_pending(self, task_row: Dict[str, Any]) -> bool:
+        """Whether this exact task row is (still or again) waiting to be written"""
+        with self._lock:
+            return self._task_rows.get(task_row["task_id"]) is task_row
+
+    def write(
+        self,
+        client,
+        task_rows: List[Dict[str, Any]],
+        document_rows: Dict[str, Dict[str, Any]]
+    ) -> int:
+        """
+        Write detached rows with the synchronous Supabase client
+
+        Run in a thread (asyncio.to_thread) from async code. When a bulk
+        upsert fails its rows are retried one by one; rows that still fail
+        are re-queued for the next flush.
+
+        Returns:
+            Number of rows written
+        """
+        from app.services.supabase_bulk_writer import SupabaseBulkWriter
+
+        written = 0
+        failed_tasks: List[Dict[str, Any]] = []
+        failed_documents: Dict[str, Dict[str, Any]] = {}
+
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in task_rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        for rows in groups.values():
+            writer = SupabaseBulkWriter(
+                client,
+                "processing_tasks",
+                batch_fn=lambda batch: _upsert_task_rows(client, batch)
+            )
+            try:
+                writer.write(rows)
+                written += len(rows)
+                continue
+            except Exception as e:
+                logger.warning("status_bulk_upsert_failed", rows=len(rows), error=str(e))
+
+            # Upserts are idempotent, so rows of batches that did land are
+            # simply written again
+            for row in rows:
+                try:
+                    _upsert_task_rows(client, [row])
+                    written += 1
+                except Exception as e:
+                    logger.warning("status_row_upsert_failed", task_id=row["task_id"], error=str(e))
+                    failed_tasks.append(row)
+
+        for document_id, update in document_rows.items():
+            try:
+                client.table("documents").update(update).eq("id", document_id).execute()
+                written += 1
+            except Exception as e:
+                logger.warning("document_status_update_failed", document_id=document_id, error=str(e))
+                failed_documents[document_id] = update
+
+        if failed_tasks or failed_documents:
+            self.requeue(failed_tasks, failed_documents)
+
+        self.rows_written += written
+        self.flushes += 1
+        return written
+
+
+def _upsert_task_rows(client, batch: List[Dict[str, Any]]) -> int:
+    client.table("processing_tasks").upsert(batch, on_conflict="task_id").execute()
+    return len(batch)
+
+
+# ============================================================================
+# Background event loop
+# ============================================================================
+
+class BackgroundLoop:
+    """
+    A long-lived event loop running on a daemon thread
+
+    One loop per process: after a fork (Celery prefork children) the parent's
+    thread no longer exists, so a fresh loop is started on first use.
+    """
+
+    def __init__(self, name: str = "status-broadcaster"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if not self.running:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run, name=self.name, daemon=True)
+                thread.start()
+                started.wait()
+
+                self._loop = loop
+                self._thread = thread
+                self._pid = os.getpid()
+                logger.debug("status_background_loop_started", pid=self._pid)
+            return self._loop
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the loop and join its thread"""
+        with self._lock:
+            if not self.running:
+                self._loop = None
+                self._thread = None
+                return
+            loop, thread = self._loop, self._thread
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = None
+            self._thread = None
@@ -6,11 +6,18 @@ Unified service for broadcasting Celery task status updates via:
 - WebSocket notifications (for real-time UI updates)
 
 Uses the standardized TaskStatusMessage schema from app/models/task_status.py
+
+Batched mode (STATUS_BROADCAST_BATCHING=true) coalesces progress updates per
+task, publishes through a Redis pipeline and persists through a write-behind
+buffer; see app/services/status_batching.py.
 """
 
 import asyncio
+import atexit
 import json
 import os
+import threading
+import time
 import traceback
 from datetime import datetime
 from typing import Optional, Dict, Any, List
@@ -34,6 +41,12 @@ from app.models.task_status import (
     create_failure_status,
     create_retry_status
 )
+from app.services.status_batching import (
+    BackgroundLoop,
+    ProgressCoalescer,
+    StatusBatchConfig,
+    StatusWriteBuffer,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -72,10 +85,17 @@ class StatusBroadcaster:
     - Database status persistence
     - WebSocket notification integration
     - Standardized message format
+    - Optional batched mode: per-task progress coalescing, pipelined
+      publishing and write-behind database persistence
     """
 
-    def __init__(self):
-        """Initialize the Status Broadcaster"""
+    def __init__(self, batch_config: Optional[StatusBatchConfig] = None):
+        """
+        Initialize the Status Broadcaster
+
+        Args:
+            batch_config: Batched-mode configuration (defaults to environment)
+        """
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         # Clean URL to remove invalid SSL parameters
         self.redis_url = self.redis_url.split("?")[0] if "?" in self.redis_url else self.redis_url
@@ -87,11 +107,23 @@ class StatusBroadcaster:
         # Supabase client (lazy loaded)
         self._supabase = None
 
+        # Batched mode state
+        self.batch_config = batch_config or StatusBatchConfig.from_env()
+        self._coalescer = ProgressCoalescer(self.batch_config.max_progress_per_second)
+        self._write_buffer = StatusWriteBuffer(self.batch_config.max_buffered_rows)
+        self._flusher: Optional[asyncio.Task] = None
+        self._last_db_flush = time.monotonic()
+
         logger.info(
             "status_broadcaster_initialized",
-            redis_url=self.redis_url.split("@")[-1] if "@" in self.redis_url else self.redis_url
+            redis_url=self.redis_url.split("@")[-1] if "@" in self.redis_url else self.redis_url,
+            batched=self.batch_config.enabled
         )
 
+    @property
+    def batched(self) -> bool:
+        return self.batch_config.enabled
+
     async def connect(self):
         """Connect to Redis for Pub/Sub publishing"""
         if self._connected:
@@ -112,7 +144,8 @@ class StatusBroadcaster:
             self._connected = False
 
     async def disconnect(self):
-        """Disconnect from Redis"""
+        """Disconnect from Redis, flushing any batched updates first"""
+        await self.aclose_batching()
         if self.redis_client:
             await self.redis_client.close()
             self._connected = False
@@ -140,6 +173,10 @@ class StatusBroadcaster:
             status_message: The TaskStatusMessage to broadcast
             persist_to_db: Whether to persist to database (default True)
         """
+        if self.batched:
+            await self._broadcast_batched(status_message, persist_to_db)
+            return
+
         with STATUS_BROADCAST_DURATION.labels(operation="broadcast").time():
             try:
                 # Serialize message
@@ -147,39 +184,10 @@ class StatusBroadcaster:
                 message_json = json.dumps(message_dict, default=str)
 
                 # Publish to Redis channels in parallel
-                publish_tasks = []
-
-                # 1. Task-specific channel
-                task_channel = self.channels.get_task_channel(status_message.task_id)
-                publish_tasks.append(self._publish_to_channel(
-                    task_channel, message_json, "task"
-                ))
-
-                # 2. Document-specific channel (if document_id present)
-                if status_message.document_id:
-                    doc_channel = self.channels.get_document_channel(status_message.document_id)
-                    publish_tasks.append(self._publish_to_channel(
-                        doc_channel, message_json, "document"
-                    ))
-
-                # 3. Query-specific channel (if query_id present)
-                if status_message.query_id:
-                    query_channel = self.channels.get_query_channel(status_message.query_id)
-                    publish_tasks.append(self._publish_to_channel(
-                        query_channel, message_json, "query"
-                    ))
-
-                # 4. User-specific channel (if user_id present)
-                if status_message.user_id:
-                    user_channel = self.channels.get_user_channel(status_message.user_id)
-                    publish_tasks.append(self._publish_to_channel(
-                        user_channel, message_json, "user"
-                    ))
-
-                # 5. Global channel for monitoring
-                publish_tasks.append(self._publish_to_channel(
-                    self.channels.global_channel, message_json, "global"
-                ))
+                publish_tasks = [
+                    self._publish_to_channel(channel, message_json, channel_type)
+                    for channel, channel_type in self._channels_for(status_message)
+                ]
 
                 # Execute all publishes in parallel
                 await asyncio.gather(*publish_tasks, return_exceptions=True)
@@ -213,6 +221,19 @@ class StatusBroadcaster:
                     channel_type="all"
                 ).inc()
 
+    def _channels_for(self, status_message: TaskStatusMessage) -> List[tuple]:
+        """(channel, channel_type) pairs a status message is published to"""
+        channels = [(self.channels.get_task_channel(status_message.task_id), "task")]
+        if status_message.document_id:
+            channels.append((self.channels.get_document_channel(status_message.document_id), "document"))
+        if status_message.query_id:
+            channels.append((self.channels.get_query_channel(status_message.query_id), "query"))
+        if status_message.user_id:
+            channels.append((self.channels.get_user_channel(status_message.user_id), "user"))
+        # Global channel for monitoring
+        channels.append((self.channels.global_channel, "global"))
+        return channels
+
     async def _publish_to_channel(
         self,
         channel: str,
@@ -279,6 +300,38 @@ class StatusBroadcaster:
                     channel_type="database"
                 ).inc()
 
+    def _build_document_update(self, status_message: TaskStatusMessage) -> Dict[str, Any]:
+        """Build the documents table update for a status message"""
+        # Build processing status entry
+        status_entry = {
+            "task_id": status_message.task_id,
+            "status": status_message.status.value,
+            "message": status_message.status_message,
+            "timestamp": status_message.updated_at.isoformat(),
+        }
+
+        if status_message.progress:
+            status_entry["progress"] = {
+                "current": status_message.progress.current,
+                "total": status_message.progress.total,
+                "percentage": status_message.progress.percentage,
+                "stage": status_message.progress.stage.value if status_message.progress.stage else None
+            }
+
+        if status_message.error:
+            status_entry["error"] = {
+                "type": status_message.error.error_type,
+                "message": status_message.error.error_message,
+                "retry_count": status_message.error.retry_count
+            }
+
+        # The processing_status column stores current status and brief history
+        return {
+            "processing_status": status_message.status.value,
+            "processing_details": status_entry,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+
     async def _update_document_status(self, status_message: TaskStatusMessage):
         """Update document's processing_status in documents table"""
         try:
@@ -286,36 +339,10 @@ class StatusBroadcaster:
             if not supabase or not status_message.document_id:
                 return
 
-            # Build processing status entry
-            status_entry = {
-                "task_id": status_message.task_id,
-                "status": status_message.status.value,
-                "message": status_message.status_message,
-                "timestamp": status_message.updated_at.isoformat(),
-            }
-
-            if status_message.progress:
-                status_entry["progress"] = {
-                    "current": status_message.progress.current,
-                    "total": status_message.progress.total,
-                    "percentage": status_message.progress.percentage,
-                    "stage": status_message.progress.stage.value if status_message.progress.stage else None
-                }
-
-            if status_message.error:
-                status_entry["error"] = {
-                    "type": status_message.error.error_type,
-                    "message": status_message.error.error_message,
-                    "retry_count": status_message.error.retry_count
-                }
-
             # Update documents table
-            # The processing_status column stores current status and brief history
-            result = supabase.client.table("documents").update({
-                "processing_status": status_message.status.value,
-                "processing_details": status_entry,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", status_message.document_id).execute()
+            result = supabase.client.table("documents").update(
+                self._build_document_update(status_message)
+            ).eq("id", status_message.document_id).execute()
 
             logger.debug(
                 "document_status_updated",
@@ -330,6 +357,53 @@ class StatusBroadcaster:
                 error=str(e)
             )
 
+    def _build_task_record(self, status_message: TaskStatusMessage) -> Dict[str, Any]:
+        """Build the processing_tasks row for a status message"""
+        # Build the full status record
+        task_record = {
+            "task_id": status_message.task_id,
+            "task_name": status_message.task_name,
+            "task_type": status_message.task_type.value,
+            "status": status_message.status.value,
+            "status_message": status_message.status_message,
+            "document_id": status_message.document_id,
+            "query_id": status_message.query_id,
+            "user_id": status_message.user_id,
+            "session_id": status_message.session_id,
+            "batch_id": status_message.batch_id,
+            "worker_id": status_message.worker_id,
+            "queue_name": status_message.queue_name,
+            "priority": status_message.priority,
+            "created_at": status_message.created_at.isoformat(),
+            "updated_at": status_message.updated_at.isoformat(),
+        }
+
+        # Add optional fields
+        if status_message.started_at:
+            task_record["started_at"] = status_message.started_at.isoformat()
+        if status_message.completed_at:
+            task_record["completed_at"] = status_message.completed_at.isoformat()
+        if status_message.runtime_seconds:
+            task_record["runtime_seconds"] = status_message.runtime_seconds
+
+        # Add progress as JSONB
+        if status_message.progress:
+            task_record["progress"] = status_message.progress.model_dump(mode='json')
+
+        # Add error as JSONB
+        if status_message.error:
+            task_record["error"] = status_message.error.model_dump(mode='json')
+
+        # Add result as JSONB
+        if status_message.result:
+            task_record["result"] = status_message.result
+
+        # Add metadata as JSONB
+        if status_message.metadata:
+            task_record["metadata"] = status_message.metadata
+
+        return task_record
+
     async def _update_processing_task(self, status_message: TaskStatusMessage):
         """Update or insert into processing_tasks table with full history"""
         try:
@@ -337,52 +411,9 @@ class StatusBroadcaster:
             if not supabase:
                 return
 
-            # Build the full status record
-            task_record = {
-                "task_id": status_message.task_id,
-                "task_name": status_message.task_name,
-                "task_type": status_message.task_type.value,
-                "status": status_message.status.value,
-                "status_message": status_message.status_message,
-                "document_id": status_message.document_id,
-                "query_id": status_message.query_id,
-                "user_id": status_message.user_id,
-                "session_id": status_message.session_id,
-                "batch_id": status_message.batch_id,
-                "worker_id": status_message.worker_id,
-                "queue_name": status_message.queue_name,
-                "priority": status_message.priority,
-                "created_at": status_message.created_at.isoformat(),
-                "updated_at": status_message.updated_at.isoformat(),
-            }
-
-            # Add optional fields
-            if status_message.started_at:
-                task_record["started_at"] = status_message.started_at.isoformat()
-            if status_message.completed_at:
-                task_record["completed_at"] = status_message.completed_at.isoformat()
-            if status_message.runtime_seconds:
-                task_record["runtime_seconds"] = status_message.runtime_seconds
-
-            # Add progress as JSONB
-            if status_message.progress:
-                task_record["progress"] = status_message.progress.model_dump(mode='json')
-
-            # Add error as JSONB
-            if status_message.error:
-                task_record["error"] = status_message.error.model_dump(mode='json')
-
-            # Add result as JSONB
-            if status_message.result:
-                task_record["result"] = status_message.result
-
-            # Add metadata as JSONB
-            if status_message.metadata:
-                task_record["metadata"] = status_message.metadata
-
             # Upsert to processing_tasks table
             result = supabase.client.table("processing_tasks").upsert(
-                task_record,
+                self._build_task_record(status_message),
                 on_conflict="task_id"
             ).execute()
 
@@ -399,6 +430,174 @@ class StatusBroadcaster:
                 error=str(e)
             )
 
+    # Batched mode
+
+    async def _broadcast_batched(
+        self,
+        status_message: TaskStatusMessage,
+        persist_to_db: bool
+    ):
+        """
+        Batched broadcast: coalesce progress, pipeline the publish and
+        buffer the database write.
+
+        Every message reaches the write-behind buffer (latest per task wins),
+        so a progress update held back by the rate limit is still persisted.
+        """
+        with STATUS_BROADCAST_DURATION.labels(operation="broadcast_batched").time():
+            try:
+                self._ensure_flusher()
+
+                ready = self._coalescer.offer(status_message)
+                if ready:
+                    await self._publish_pipelined(ready)
+
+                if persist_to_db:
+                    self._buffer_for_database(status_message)
+                    if self._write_buffer.full:
+                        await self._flush_database()
+
+            except Exception as e:
+                logger.error(
+                    "status_broadcast_failed",
+                    task_id=status_message.task_id,
+                    error=str(e)
+                )
+                STATUS_BROADCAST_ERRORS.labels(
+                    error_type="broadcast_error",
+                    channel_type="all"
+                ).inc()
+
+    async def _publish_pipelined(self, messages: List[TaskStatusMessage]):
+        """Publish messages to all of their channels in one Redis round trip"""
+        try:
+            if not self._connected or not self.redis_client:
+                await self.connect()
+            if not self.redis_client:
+                return
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for status_message in messages:
+                message_json = json.dumps(status_message.model_dump(mode='json'), default=str)
+                for channel, _ in self._channels_for(status_message):
+                    pipe.publish(channel, message_json)
+            await pipe.execute()
+
+            for status_message in messages:
+                STATUS_BROADCASTS.labels(
+                    status=status_message.status.value,
+                    channel_type="all",
+                    task_type=status_message.task_type.value
+                ).inc()
+
+        except Exception as e:
+            logger.error(
+                "redis_pipeline_publish_failed",
+                messages=len(messages),
+                error=str(e)
+            )
+            STATUS_BROADCAST_ERRORS.labels(
+                error_type="redis_publish",
+                channel_type="pipeline"
+            ).inc()
+
+    def _buffer_for_database(self, status_message: TaskStatusMessage):
+        """Queue the database writes for a status message"""
+        self._write_buffer.add_task_row(self._build_task_record(status_message))
+        if status_message.document_id:
+            self._write_buffer.add_document_update(
+                status_message.document_id,
+                self._build_document_update(status_message)
+            )
+
+    async def _flush_database(self) -> int:
+        """Write the buffered status rows in bulk"""
+        self._last_db_flush = time.monotonic()
+        if not len(self._write_buffer):
+            return 0
+
+        task_rows, document_rows = self._write_buffer.take()
+        with STATUS_BROADCAST_DURATION.labels(operation="database_bulk_flush").time():
+            try:
+                supabase = self._get_supabase()
+                if not supabase:
+                    logger.warning("supabase_not_available_for_status_persist")
+                    self._write_buffer.requeue(task_rows, document_rows)
+                    return 0
+
+                written = await asyncio.to_thread(
+                    self._write_buffer.write, supabase.client, task_rows, document_rows
+                )
+                for row in task_rows:
+                    if self._write_buffer.is_pending(row):
+                        continue  # Failed and re-queued
+                    DATABASE_STATUS_UPDATES.labels(
+                        status=row["status"],
+                        operation="bulk_persist"
+                    ).inc()
+                return written
+
+            except Exception as e:
+                logger.error(
+                    "database_status_bulk_flush_failed",
+                    task_rows=len(task_rows),
+                    document_rows=len(document_rows),
+                    error=str(e)
+                )
+                STATUS_BROADCAST_ERRORS.labels(
+                    error_type="database_persist",
+                    channel_type="database"
+                ).inc()
+                # Keep the rows for the next flush; newer rows win
+                self._write_buffer.requeue(task_rows, document_rows)
+                return 0
+
+    def _ensure_flusher(self):
+        """Start the background flush task on the current loop"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Publish due progress updates and flush the write-behind buffer"""
+        tick = self.batch_config.flush_interval
+        if self._coalescer.interval:
+            tick = min(tick, self._coalescer.interval)
+        tick = max(tick, 0.01)
+
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                due = self._coalescer.due()
+                if due:
+                    await self._publish_pipelined(due)
+
+                elapsed = time.monotonic() - self._last_db_flush
+                if elapsed >= self.batch_config.flush_interval or self._write_buffer.full:
+                    await self._flush_database()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("status_flush_loop_error", error=str(e))
+
+    async def flush(self):
+        """Publish all pending progress updates and flush buffered writes now"""
+        pending = self._coalescer.drain()
+        if pending:
+            await self._publish_pipelined(pending)
+        await self._flush_database()
+
+    async def aclose_batching(self):
+        """Stop the flush task and write out everything still buffered"""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+        if self.batched:
+            await self.flush()
+
     # Convenience methods for creating and broadcasting status messages
 
     async def broadcast_started(
@@ -556,31 +755,74 @@ class SyncStatusBroadcaster:
     """
     Synchronous wrapper for StatusBroadcaster.
     Used in Celery signal handlers which run in sync context.
+
+    Coroutines run on one long-lived background loop per process, so the
+    Redis connection is reused across calls. In batched mode calls return
+    as soon as the update is queued; otherwise they wait for completion.
     """
 
     def __init__(self):
         self._async_broadcaster: Optional[StatusBroadcaster] = None
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background = BackgroundLoop()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
 
     def _get_broadcaster(self) -> StatusBroadcaster:
         """Get or create the async broadcaster"""
-        if self._async_broadcaster is None:
-            self._async_broadcaster = StatusBroadcaster()
-        return self._async_broadcaster
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's Redis connection and loop are unusable
+                self._async_broadcaster = None
+                self._pid = os.getpid()
+            if self._async_broadcaster is None:
+                self._async_broadcaster = StatusBroadcaster()
+            return self._async_broadcaster
 
     def _run_async(self, coro):
         """Run an async coroutine from sync context"""
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # We're in an async context, create a task
-                asyncio.create_task(coro)
-            else:
-                # We're in a sync context, run the coroutine
-                loop.run_until_complete(coro)
+            asyncio.get_running_loop()
         except RuntimeError:
-            # No event loop, create a new one
-            asyncio.run(coro)
+            pass
+        else:
+            # We're in an async context, create a task
+            return asyncio.ensure_future(coro)
+
+        future = self._background.submit(coro)
+        broadcaster = self._get_broadcaster()
+        if broadcaster.batched:
+            future.add_done_callback(_log_background_error)
+            return future
+
+        try:
+            return future.result(timeout=broadcaster.batch_config.sync_timeout)
+        except Exception as e:
+            future.cancel()
+            logger.warning("sync_status_broadcast_failed", error=str(e))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until pending progress and buffered writes are written"""
+        if self._async_broadcaster is None or not self._background.running:
+            return
+        broadcaster = self._async_broadcaster
+        try:
+            self._background.submit(broadcaster.flush()).result(
+                timeout=timeout or broadcaster.batch_config.sync_timeout
+            )
+        except Exception as e:
+            logger.warning("sync_status_flush_failed", error=str(e))
+
+    def close(self, timeout: float = 5.0):
+        """Flush batched updates and stop the background loop"""
+        if not self._background.running:
+            return
+        if self._async_broadcaster is not None:
+            try:
+                self._background.submit(self._async_broadcaster.disconnect()).result(timeout=timeout)
+            except Exception as e:
+                logger.warning("sync_status_close_failed", error=str(e))
+        self._background.stop(timeout)
 
     def broadcast_started(
         self,
@@ -816,6 +1058,12 @@ class SyncStatusBroadcaster:
             )
 
 
+def _log_background_error(future):
+    """Log failures of fire-and-forget broadcasts"""
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("background_status_broadcast_failed", error=str(future.exception()))
+
+
 # Global singleton instances
 _status_broadcaster: Optional[StatusBroadcaster] = None
 _sync_status_broadcaster: Optional[SyncStatusBroadcaster] = None
@@ -0,0 +1,217 @@
+"""
+Empire v7.3 - Supabase Bulk Writer
+Batched, retrying writes for high-volume tables (source_embeddings, chunks)
+
+Features:
+- Configurable batch size (default 500 rows per request)
+- Per-batch retry with exponential backoff
+- Idempotent retries: rows that already landed (matched on idempotency keys)
+  are skipped, so a timeout after a successful insert never duplicates rows
+- Streaming mode: add() rows as they are produced, flushed every batch_size,
+  so callers never have to materialize the full row list
+- Pluggable batch function for writes that are not plain inserts (e.g. RPC)
+
+Usage:
+    from app.services.supabase_bulk_writer import SupabaseBulkWriter
+
+    with SupabaseBulkWriter(
+        supabase, "source_embeddings",
+        idempotency_keys=("chunk_hash", "chunk_index"),
+        scope={"source_id": source_id}
+    ) as writer:
+        for row in rows:
+            writer.add(row)
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("SUPABASE_BULK_BATCH_SIZE", "500"))
+
+
+class BulkWriteError(Exception):
+    """Raised when a batch still fails after all retries"""
+
+    def __init__(self, message: str, stats: "BulkWriteStats"):
+        super().__init__(message)
+        self.stats = stats
+
+
+@dataclass
+class BulkWriteStats:
+    """Statistics for a bulk write"""
+    rows_written: int = 0
+    rows_skipped: int = 0
+    batches: int = 0
+    retries: int = 0
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_written": self.rows_written,
+            "rows_skipped": self.rows_skipped,
+            "batches": self.batches,
+            "retries": self.retries,
+            "duration_ms": round(self.duration_ms, 2),
+        }
+
+
+class SupabaseBulkWriter:
+    """
+    Buffered bulk writer for a single Supabase table
+
+    Uses the synchronous Supabase client; async callers should run write()
+    or flush() in a thread (asyncio.to_thread).
+    """
+
+    def __init__(
+        self,
+        supabase,
+        table: str,
+        batch_size: Optional[int] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        idempotency_keys: Optional[Sequence[str]] = None,
+        scope: Optional[Dict[str, Any]] = None,
+        batch_fn: Optional[Callable[[List[Dict[str, Any]]], int]] = None
+    ):
+        """
+        Initialize bulk writer
+
+        Args:
+            supabase: Supabase client
+            table: Target table name
+            batch_size: Rows per request (SUPABASE_BULK_BATCH_SIZE, default 500)
+            max_retries: Retries per batch after the first attempt
+            retry_backoff: Base delay in seconds (doubles per retry)
+            idempotency_keys: Columns identifying a row; on retry, rows whose
+                keys already exist (within scope) are skipped. The first key
+                is used for the IN filter.
+            scope: Equality filters narrowing the idempotency lookup
+                (e.g. {"source_id": ...})
+            batch_fn: Custom writer for one batch returning rows written;
+                defaults to a plain insert
+        """
+        self.supabase = supabase
+        self.table = table
+        self.batch_size = max(batch_size or DEFAULT_BATCH_SIZE, 1)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idempotency_keys = tuple(idempotency_keys or ())
+        self.scope = scope or {}
+        self.batch_fn = batch_fn or self._insert_batch
+
+        self.stats = BulkWriteStats()
+        self._buffer: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> "SupabaseBulkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def add(self, row: Dict[str, Any]):
+        """Buffer a row, flushing when the buffer reaches batch_size"""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, rows: Iterable[Dict[str, Any]]):
+        """Buffer rows from any iterable (consumed lazily)"""
+        for row in rows:
+            self.add(row)
+
+    def flush(self) -> int:
+        """Write all buffered rows"""
+        written = 0
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            self._buffer = self._buffer[self.batch_size:]
+            written += self._write_batch(batch)
+        return written
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> BulkWriteStats:
+        """Write rows in batches and return statistics"""
+        self.add_many(rows)
+        self.flush()
+        return self.stats
+
+    def _insert_batch(self, batch: List[Dict[str, Any]]) -> int:
+        result = self.supabase.table(self.table).insert(batch).execute()
+        data = getattr(result, "data", None)
+        return len(data) if data else len(batch)
+
+    def _existing_keys(self, batch: List[Dict[str, Any]]) -> set:
+        """Keys of rows in this batch that are already stored"""
+        first = self.idempotency_keys[0]
+        values = list({row.get(first) for row in batch if row.get(first) is not None})
+        if not values:
+            return set()
+
+        query = self.supabase.table(self.table)\
+            .select(",".join(self.idempotency_keys))\
+            .in_(first, values)
+        for column, value in self.scope.items():
+            query = query.eq(column, value)
+        result = query.execute()
+
+        return {
+            tuple(row.get(key) for key in self.idempotency_keys)
+            for row in (result.data or [])
+        }
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Write one batch with idempotent retries, timed into stats.duration_ms"""
+        start = time.time()
+        try:
+            return self._write_batch_with_retries(batch)
+        finally:
+            self.stats.duration_ms += (time.time() - start) * 1000
+
+    def _write_batch_with_retries(self, batch: List[Dict[str, Any]]) -> int:
+        attempt = 0
+        pending = batch
+
+        while True:
+            try:
+                if attempt > 0 and self.idempotency_keys:
+                    existing = self._existing_keys(pending)
+                    remaining = [
+                        row for row in pending
+                        if tuple(row.get(key) for key in self.idempotency_keys) not in existing
+                    ]
+                    self.stats.rows_skipped += len(pending) - len(remaining)
+                    pending = remaining
+                    if not pending:
+                        self.stats.batches += 1
+                        return 0
+
+                written = self.batch_fn(pending)
+                self.stats.rows_written += written
+                self.stats.batches += 1
+                return written
+
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(
+                        f"Bulk write to {self.table} failed after {attempt + 1} attempts: {e}"
+                    )
+                    raise BulkWriteError(
+                        f"Bulk write to {self.table} failed: {e}", self.stats
+                    ) from e
+
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                self.stats.retries += 1
+                logger.warning(
+                    f"Bulk write to {self.table} failed ({len(pending)} rows), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
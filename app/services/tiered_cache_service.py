@@ -4,7 +4,7 @@ Tiered Cache Service (L1: Redis, L2: PostgreSQL)
 Implements cache-aside pattern with fallback from Redis to PostgreSQL.
 
 Features:
-- L1 (Redis): Fast, volatile cache with 5-minute TTL
+- L1 (Redis): Fast, volatile cache with 5-minute TTL (non-blocking redis.asyncio client)
 - L2 (PostgreSQL): Persistent cache with 60-minute TTL
 - Automatic promotion from L2 to L1 on L2 hits
 - Graceful fallback on L1 failures
@@ -31,8 +31,8 @@ from dataclasses import dataclass
 from enum import Enum
 
 from app.services.redis_cache_service import (
-    RedisCacheService,
-    get_redis_cache_service
+    AsyncRedisCacheService,
+    get_async_redis_cache_service
 )
 from app.services.postgres_cache_service import (
     PostgresCacheService,
@@ -99,7 +99,7 @@ class TieredCacheService:
     def __init__(
         self,
         config: Optional[TieredCacheConfig] = None,
-        redis_cache: Optional[RedisCacheService] = None,
+        redis_cache: Optional[AsyncRedisCacheService] = None,
         postgres_cache: Optional[PostgresCacheService] = None
     ):
         """
@@ -107,14 +107,14 @@ class TieredCacheService:
 
         Args:
             config: Cache configuration
-            redis_cache: Optional Redis cache instance
+            redis_cache: Optional async Redis cache instance
             postgres_cache: Optional PostgreSQL cache instance
         """
         self.config = config or TieredCacheConfig.from_env()
 
         # Initialize cache layers
         self.redis_cache = redis_cache or (
-            get_redis_cache_service() if self.config.l1_enabled else None
+            get_async_redis_cache_service() if self.config.l1_enabled else None
         )
         self.postgres_cache = postgres_cache or (
             get_postgres_cache_service() if self.config.l2_enabled else None
@@ -141,7 +141,7 @@ class TieredCacheService:
         # Check L1 (Redis)
         if self.config.l1_enabled and self.redis_cache:
             try:
-                l1_result = self.redis_cache.get_cached_query_result(query)
+                l1_result = await self.redis_cache.get_cached_query_result(query)
                 if l1_result is not None:
                     logger.debug(f"L1 cache hit for query: {query[:50]}")
                     return CacheLookupResult(
@@ -161,7 +161,7 @@ class TieredCacheService:
                     # Promote to L1 if enabled
                     if self.config.promote_to_l1 and self.redis_cache:
                         try:
-                            self.redis_cache.cache_query_result(query, l2_result)
+                            await self.redis_cache.cache_query_result(query, l2_result)
                             logger.debug(f"Promoted L2 hit to L1: {query[:50]}")
                         except Exception as e:
                             logger.warning(f"Failed to promote to L1: {e}")
@@ -197,7 +197,7 @@ class TieredCacheService:
         # Cache in L1 (Redis)
         if self.config.l1_enabled and self.redis_cache:
             try:
-                if self.redis_cache.cache_query_result(query, result):
+                if await self.redis_cache.cache_query_result(query, result):
                     success = True
                     logger.debug(f"Cached in L1: {query[:50]}")
             except Exception as e:
@@ -260,7 +260,7 @@ class TieredCacheService:
         # Check L1 (Redis)
         if self.config.l1_enabled and self.redis_cache:
             try:
-                l1_embedding = self.redis_cache.get_cached_embedding(text)
+                l1_embedding = await self.redis_cache.get_cached_embedding(text)
                 if l1_embedding is not None:
                     return CacheLookupResult(
                         data=l1_embedding,
@@ -277,7 +277,7 @@ class TieredCacheService:
                     # Promote to L1
                     if self.config.promote_to_l1 and self.redis_cache:
                         try:
-                            self.redis_cache.cache_embedding(text, l2_embedding)
+                            await self.redis_cache.cache_embedding(text, l2_embedding)
                         except Exception as e:
                             logger.warning(f"Failed to promote embedding to L1: {e}")
 
@@ -306,7 +306,7 @@ class TieredCacheService:
         # Cache in L1
         if self.config.l1_enabled and self.redis_cache:
             try:
-                if self.redis_cache.cache_embedding(text, embedding):
+                if await self.redis_cache.cache_embedding(text, embedding):
                     success = True
             except Exception as e:
                 logger.warning(f"Failed to cache embedding in L1: {e}")
@@ -383,7 +383,7 @@ class TieredCacheService:
             # Try L1 (Redis) first
             if self.config.l1_enabled and self.redis_cache:
                 try:
-                    result = self.redis_cache.get(key)
+                    result = await self.redis_cache.get(key)
                     if result is not None:
                         logger.debug(f"L1 get hit for key: {key[:50]}")
                         return result
@@ -400,7 +400,7 @@ class TieredCacheService:
                         # Promote to L1 if enabled
                         if self.config.promote_to_l1 and self.redis_cache:
                             try:
-                                self.redis_cache.set(key, result, ttl=self.config.l1_ttl)
+                                await self.redis_cache.set(key, result, ttl=self.config.l1_ttl)
                                 logger.debug(f"Promoted L2 hit to L1: {key[:50]}")
                             except Exception as e:
                                 logger.warning(f"Failed to promote to L1: {e}")
@@ -443,7 +443,7 @@ class TieredCacheService:
             # Cache in L1 (Redis)
             if self.config.l1_enabled and self.redis_cache:
                 try:
-                    if self.redis_cache.set(key, value, ttl=l1_ttl):
+                    if await self.redis_cache.set(key, value, ttl=l1_ttl):
                         success = True
                         logger.debug(f"Cached in L1: {key[:50]} (TTL: {l1_ttl}s)")
                 except Exception as e:
@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Optional
 import structlog
 
 from app.core.supabase_client import get_supabase_client
+from app.services.principal_cache import get_principal_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -308,10 +309,16 @@ class UserService:
                 raise ValueError(f"User {user_id} not found")
 
             username = existing.data[0]["username"]
+            keys_result = self.supabase.table("api_keys").select("id").eq("user_id", user_id).execute()
 
             # Delete user (cascades to admin_sessions via foreign key)
             self.supabase.table("admin_users").delete().eq("id", user_id).execute()
 
+            # Cached API key principals and roles must not outlive the user
+            for key in keys_result.data or []:
+                await get_principal_cache().invalidate_api_key(key["id"])
+            await get_principal_cache().invalidate_user(user_id)
+
             # Log activity
             await self._log_activity(
                 admin_user_id=deleted_by,
@@ -704,6 +711,8 @@ class UserService:
             if keys_result.data:
                 self.supabase.table("api_keys").delete().eq("user_id", user_id).execute()
                 items_deleted["api_keys"] = len(keys_result.data)
+                for key in keys_result.data:
+                    await get_principal_cache().invalidate_api_key(key["id"])
 
             # 2. Delete all sessions
             sessions_result = self.supabase.table("admin_sessions").select("id").eq("admin_user_id", user_id).execute()
@@ -716,6 +725,7 @@ class UserService:
             if roles_result.data:
                 self.supabase.table("user_roles").delete().eq("user_id", user_id).execute()
                 items_deleted["user_roles"] = len(roles_result.data)
+            await get_principal_cache().invalidate_user(user_id)
 
             # 4. Anonymize activity logs (preserve audit trail but remove PII)
             # Update logs where user was the actor
@@ -0,0 +1,337 @@
+"""
+In-Process Vector Index for Embedding Caches
+
+Keeps cached query embeddings in a contiguous, pre-normalized float32 matrix so
+that a similarity lookup is a single matrix-vector product instead of one Redis
+round trip per cached key.
+
+Features:
+- Contiguous float32 storage with amortized O(1) add and O(1) swap-remove
+- Rows are L2-normalized on insert, so cosine similarity is a dot product
+- Top-k selection with argpartition (no full sort)
+- Optional HNSW approximate index (hnswlib) once the index grows past a threshold
+- Thread-safe; safe to share between the event loop and worker threads
+
+Usage:
+    from app.services.vector_index import VectorIndex
+
+    index = VectorIndex()
+    index.add("search:sem:abc123", embedding)
+
+    for key, similarity in index.search(query_embedding, k=5):
+        ...
+
+    index.remove("search:sem:abc123")
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Optional: hnswlib for approximate nearest neighbour search on large indexes
+try:
+    import hnswlib
+    HNSW_SUPPORT = True
+except ImportError:
+    hnswlib = None
+    HNSW_SUPPORT = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VectorIndexConfig:
+    """Configuration for the in-process vector index"""
+    initial_capacity: int = 1024
+    use_ann: bool = True               # Use HNSW when hnswlib is installed
+    ann_min_size: int = 5000           # Below this, exact search is faster
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+
+
+class VectorIndex:
+    """
+    Exact (optionally HNSW-accelerated) cosine similarity index keyed by string
+
+    The exact matrix is always maintained and is the source of truth; the HNSW
+    graph is a derived structure used to shortlist candidates, which are then
+    re-scored exactly against the matrix.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        config: Optional[VectorIndexConfig] = None
+    ):
+        """
+        Initialize vector index
+
+        Args:
+            dimension: Embedding dimension (inferred from first add if None)
+            config: Index configuration
+        """
+        self.config = config or VectorIndexConfig()
+        self.dimension = dimension
+
+        self._lock = threading.RLock()
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        # HNSW state: labels are stable integers, independent of matrix rows
+        self._ann = None
+        self._ann_labels: Dict[str, int] = {}
+        self._ann_keys: Dict[int, str] = {}
+        self._next_label = 0
+
+        if dimension is not None:
+            self._allocate(dimension, self.config.initial_capacity)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    @property
+    def ann_enabled(self) -> bool:
+        """Whether the HNSW index is currently built and in use"""
+        return self._ann is not None
+
+    def _allocate(self, dimension: int, capacity: int):
+        """Allocate an empty matrix for the given dimension"""
+        self.dimension = dimension
+        self._matrix = np.zeros((max(capacity, 1), dimension), dtype=np.float32)
+
+    def _ensure_capacity(self, size: int):
+        """Grow the matrix geometrically so appends stay amortized O(1)"""
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = capacity
+        while new_capacity < size:
+            new_capacity *= 2
+        grown = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        grown[:len(self._keys)] = self._matrix[:len(self._keys)]
+        self._matrix = grown
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+        """Convert to a unit-length float32 vector (None for zero vectors)"""
+        vec = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0 or not np.isfinite(norm):
+            return None
+        return vec / norm
+
+    def add(self, key: str, vector: Sequence[float]) -> bool:
+        """
+        Add or replace a vector
+
+        Args:
+            key: Cache key the vector belongs to
+            vector: Embedding vector
+
+        Returns:
+            True if the vector was indexed
+        """
+        vec = self._normalize(vector)
+        if vec is None:
+            return False
+
+        with self._lock:
+            if self._matrix is None:
+                self._allocate(vec.shape[0], self.config.initial_capacity)
+            elif vec.shape[0] != self.dimension:
+                # Embedding model changed; old vectors are not comparable
+                logger.warning(
+                    f"Vector index dimension changed {self.dimension} -> "
+                    f"{vec.shape[0]}, resetting index"
+                )
+                self._reset(vec.shape[0])
+
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._keys)
+                self._ensure_capacity(row + 1)
+                self._keys.append(key)
+                self._rows[key] = row
+            self._matrix[row] = vec
+
+            self._ann_add(key, vec)
+            return True
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a vector, moving the last row into its slot
+
+        Args:
+            key: Cache key to remove
+
+        Returns:
+            True if the key was present
+        """
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+
+            last = len(self._keys) - 1
+            if row != last:
+                moved_key = self._keys[last]
+                self._matrix[row] = self._matrix[last]
+                self._keys[row] = moved_key
+                self._rows[moved_key] = row
+            self._keys.pop()
+
+            self._ann_remove(key)
+            return True
+
+    def clear(self):
+        """Remove all vectors"""
+        with self._lock:
+            self._reset(self.dimension)
+
+    def _reset(self, dimension: Optional[int]):
+        self._keys = []
+        self._rows = {}
+        self._ann = None
+        self._ann_labels = {}
+        self._ann_keys = {}
+        self._next_label = 0
+        if dimension is not None:
+            self._allocate(dimension, self.config.initial_capacity)
+        else:
+            self._matrix = None
+            self.dimension = None
+
+    def keys(self) -> List[str]:
+        """Snapshot of indexed keys"""
+        with self._lock:
+            return list(self._keys)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int = 5,
+        min_similarity: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the k most similar vectors
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            min_similarity: Optional similarity floor
+
+        Returns:
+            List of (key, cosine_similarity) sorted by similarity descending
+        """
+        query = self._normalize(vector)
+        if query is None or k <= 0:
+            return []
+
+        with self._lock:
+            size = len(self._keys)
+            if size == 0 or query.shape[0] != self.dimension:
+                return []
+
+            if self._ann is not None:
+                rows = self._ann_candidates(query, k)
+                scores = self._matrix[rows] @ query
+            else:
+                rows = None
+                scores = self._matrix[:size] @ query
+
+            if scores.shape[0] == 0:
+                return []
+
+            top_n = min(k, scores.shape[0])
+            if top_n < scores.shape[0]:
+                top = np.argpartition(-scores, top_n - 1)[:top_n]
+            else:
+                top = np.arange(scores.shape[0])
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            for i in top:
+                score = float(scores[i])
+                if min_similarity is not None and score < min_similarity:
+                    break
+                row = int(rows[i]) if rows is not None else int(i)
+                results.append((self._keys[row], score))
+            return results
+
+    # =========================================================================
+    # HNSW (optional)
+    # =========================================================================
+
+    def _ann_add(self, key: str, vec: np.ndarray):
+        if not (self.config.use_ann and HNSW_SUPPORT):
+            return
+        if self._ann is None:
+            if len(self._keys) >= self.config.ann_min_size:
+                self._build_ann()
+            return
+
+        old_label = self._ann_labels.pop(key, None)
+        if old_label is not None:
+            self._ann.mark_deleted(old_label)
+            self._ann_keys.pop(old_label, None)
+
+        if self._next_label >= self._ann.get_max_elements():
+            self._ann.resize_index(self._ann.get_max_elements() * 2)
+
+        label = self._next_label
+        self._next_label += 1
+        self._ann.add_items(vec.reshape(1, -1), np.array([label]))
+        self._ann_labels[key] = label
+        self._ann_keys[label] = key
+
+    def _ann_remove(self, key: str):
+        if self._ann is None:
+            return
+        label = self._ann_labels.pop(key, None)
+        if label is not None:
+            self._ann.mark_deleted(label)
+            self._ann_keys.pop(label, None)
+        if len(self._keys) < self.config.ann_min_size // 2:
+            # Small again; exact search is cheaper than a stale graph
+            self._ann = None
+            self._ann_labels = {}
+            self._ann_keys = {}
+            self._next_label = 0
+
+    def _build_ann(self):
+        """Build the HNSW graph from the current matrix"""
+        size = len(self._keys)
+        index = hnswlib.Index(space="ip", dim=self.dimension)
+        index.init_index(
+            max_elements=max(size * 2, self.config.ann_min_size),
+            ef_construction=self.config.hnsw_ef_construction,
+            M=self.config.hnsw_m
+        )
+        index.set_ef(self.config.hnsw_ef_search)
+        labels = np.arange(size)
+        index.add_items(self._matrix[:size], labels)
+
+        self._ann = index
+        self._ann_labels = {key: i for i, key in enumerate(self._keys)}
+        self._ann_keys = {i: key for i, key in enumerate(self._keys)}
+        self._next_label = size
+        logger.info(f"Built HNSW index over {size} vectors (dim={self.dimension})")
+
+    def _ann_candidates(self, query: np.ndarray, k: int) -> np.ndarray:
+        """Shortlist candidate rows from the HNSW graph"""
+        fetch = min(max(k * 4, self.config.hnsw_ef_search), len(self._ann_keys))
+        labels, _ = self._ann.knn_query(query.reshape(1, -1), k=fetch)
+        rows = [
+            self._rows[self._ann_keys[int(label)]]
+            for label in labels[0]
+            if int(label) in self._ann_keys
+        ]
+        return np.asarray(rows, dtype=np.int64)
@@ -0,0 +1,393 @@
+"""
+Empire v7.3 - WebSocket Fan-out Engine
+Per-connection outbound queues for ConnectionManager
+
+Features:
+- Each message serialized once, shared by every recipient
+- Bounded outbound queue per connection, drained by its own writer task,
+  so one slow client never delays the others
+- Slow-consumer policy when a queue is full: drop oldest, coalesce progress
+  events (dropping only progress/low-priority frames), or disconnect
+- Queued messages are drained, within a short timeout, before a connection
+  is closed
+- Per-connection queue depth and send-latency stats, plus aggregate
+  Prometheus metrics
+
+Usage:
+    sender = ConnectionSender(connection_id, websocket, config, on_failure=...)
+    sender.start()
+    sender.enqueue(OutboundMessage.from_message(message))
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = structlog.get_logger(__name__)
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+WS_QUEUED_MESSAGES = Gauge(
+    'empire_websocket_queued_messages',
+    'Messages waiting in WebSocket outbound queues (all connections)'
+)
+
+WS_MESSAGES_DROPPED = Counter(
+    'empire_websocket_messages_dropped_total',
+    'Messages dropped or replaced by the slow-consumer policy',
+    ['reason']  # reason: drop_oldest, coalesced, disconnect, closed
+)
+
+WS_QUEUE_LATENCY = Histogram(
+    'empire_websocket_queue_latency_seconds',
+    'Time from enqueue to completed send on the socket',
+    ['message_type'],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+
+WS_SLOW_CONSUMER_DISCONNECTS = Counter(
+    'empire_websocket_slow_consumer_disconnects_total',
+    'Connections closed because their outbound queue overflowed'
+)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's outbound queue is full"""
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+# Message types where only the latest event per task/resource matters
+COALESCIBLE_MESSAGE_TYPES = frozenset({
+    "progress_update",
+    "source_status",
+    "task_progress",
+    "status_update",
+})
+
+# Message types the COALESCE policy may drop when a queue is full; anything
+# else is delivered or the connection is closed
+DROPPABLE_MESSAGE_TYPES = COALESCIBLE_MESSAGE_TYPES | frozenset({"pong"})
+
+
+@dataclass
+class FanoutConfig:
+    """Configuration for WebSocket fan-out"""
+    queue_size: int = 256
+    policy: SlowConsumerPolicy = SlowConsumerPolicy.COALESCE
+    send_timeout: float = 10.0  # Seconds before a single send counts as failed
+    close_drain_timeout: float = 1.0  # Seconds to deliver queued messages on close
+
+    @classmethod
+    def from_env(cls) -> "FanoutConfig":
+        """Create config from environment variables"""
+        return cls(
+            queue_size=int(os.getenv("WS_QUEUE_SIZE", "256")),
+            policy=SlowConsumerPolicy(os.getenv("WS_SLOW_CONSUMER_POLICY", "coalesce").lower()),
+            send_timeout=float(os.getenv("WS_SEND_TIMEOUT", "10.0")),
+            close_drain_timeout=float(os.getenv("WS_CLOSE_DRAIN_TIMEOUT", "1.0")),
+        )
+
+
+def serialize_message(message: dict) -> str:
+    """Serialize a message the way WebSocket.send_json does"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+@dataclass
+class OutboundMessage:
+    """A serialized message shared by every recipient"""
+    text: str
+    message_type: str
+    coalesce_key: Optional[str] = None
+    droppable: bool = False
+    enqueued_at: float = 0.0
+
+    @classmethod
+    def from_message(cls, message: dict) -> "OutboundMessage":
+        """Serialize a message dict once"""
+        message_type = message.get("type", "unknown")
+        coalesce_key = None
+        if message_type in COALESCIBLE_MESSAGE_TYPES:
+            resource = (
+                message.get("task_id")
+                or message.get("source_id")
+                or message.get("document_id")
+                or message.get("query_id")
+            )
+            if resource:
+                coalesce_key = f"{message_type}:{resource}"
+        return cls(
+            text=serialize_message(message),
+            message_type=message_type,
+            coalesce_key=coalesce_key,
+            droppable=message_type in DROPPABLE_MESSAGE_TYPES
+        )
+
+
+# ============================================================================
+# Per-connection sender
+# ============================================================================
+
+class ConnectionSender:
+    """
+    Bounded outbound queue and writer task for one WebSocket connection
+
+    enqueue() never blocks; the writer task sends queued messages in order.
+    A failed send or a DISCONNECT-policy overflow calls on_failure(connection_id,
+    error_type) in a separate task and stops the writer.
+    """
+
+    def __init__(
+        self,
+        connection_id: str,
+        websocket: Any,
+        config: FanoutConfig,
+        on_failure: Optional[Callable[[str, str], Awaitable[None]]] = None,
+        on_sent: Optional[Callable[[str, float], None]] = None
+    ):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.config = config
+        self._on_failure = on_failure
+        self._on_sent = on_sent
+
+        self._queue: Deque[OutboundMessage] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._closing = False
+
+        # Stats
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_send_latency_ms = 0.0
+        self._total_send_latency_ms = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Messages waiting to be sent"""
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        """Start the writer task"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def enqueue(self, message: OutboundMessage) -> bool:
+        """
+        Queue a message for sending, applying the slow-consumer policy
+
+        Returns:
+            False if the message was not queued (connection closed or
+            closing, dropped by the slow-consumer policy, or disconnected
+            as a slow consumer)
+        """
+        if self._closed or self._closing:
+            WS_MESSAGES_DROPPED.labels(reason="closed").inc()
+            return False
+
+        message.enqueued_at = time.perf_counter()
+
+        if self.config.policy == SlowConsumerPolicy.COALESCE and message.coalesce_key:
+            for index, queued in enumerate(self._queue):
+                if queued.coalesce_key == message.coalesce_key:
+                    # Replace the older state; the newest goes to the back so
+                    # it is never delivered ahead of messages queued before it
+                    del self._queue[index]
+                    self._queue.append(message)
+                    self.coalesced += 1
+                    WS_MESSAGES_DROPPED.labels(reason="coalesced").inc()
+                    return True
+
+        if len(self._queue) >= self.config.queue_size:
+            if self.config.policy == SlowConsumerPolicy.DISCONNECT:
+                self._disconnect_slow_consumer()
+                return False
+
+            if not self._drop_one():
+                if message.droppable:
+                    self.dropped += 1
+                    WS_MESSAGES_DROPPED.labels(reason="drop_oldest").inc()
+                    return False
+                # Only messages that must be delivered are queued
+                self._disconnect_slow_consumer()
+                return False
+
+        self._queue.append(message)
+        WS_QUEUED_MESSAGES.inc()
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def _drop_one(self) -> bool:
+        """
+        Drop the oldest droppable message (COALESCE) or the oldest message
+
+        Returns:
+            False if nothing in the queue may be dropped
+        """
+        victim: Optional[int] = 0
+        if self.config.policy == SlowConsumerPolicy.COALESCE:
+            victim = next(
+                (index for index, queued in enumerate(self._queue) if queued.droppable),
+                None
+            )
+            if victim is None:
+                return False
+        del self._queue[victim]
+        WS_QUEUED_MESSAGES.dec()
+        self.dropped += 1
+        WS_MESSAGES_DROPPED.labels(reason="drop_oldest").inc()
+        return True
+
+    def _disconnect_slow_consumer(self) -> None:
+        WS_SLOW_CONSUMER_DISCONNECTS.inc()
+        WS_MESSAGES_DROPPED.labels(reason="disconnect").inc()
+        logger.warning(
+            "websocket_slow_consumer_disconnect",
+            connection_id=self.connection_id,
+            queue_depth=len(self._queue)
+        )
+        self._fail("slow_consumer")
+
+    async def _run(self) -> None:
+        while not self._closed:
+            if not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            message = self._queue.popleft()
+            WS_QUEUED_MESSAGES.dec()
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(message.text),
+                    timeout=self.config.send_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self._fail("send_timeout")
+                return
+            except Exception as e:
+                logger.info(
+                    "websocket_send_failed",
+                    connection_id=self.connection_id,
+                    message_type=message.message_type,
+                    error=str(e)
+                )
+                self._fail(_error_type(e))
+                return
+
+            latency = time.perf_counter() - message.enqueued_at
+            self.sent += 1
+            self.last_send_latency_ms = latency * 1000
+            self._total_send_latency_ms += latency * 1000
+            WS_QUEUE_LATENCY.labels(message_type=message.message_type).observe(latency)
+            if self._on_sent:
+                self._on_sent(message.message_type, latency)
+
+        self._idle.set()
+
+    def _fail(self, error_type: str) -> None:
+        """Stop sending and report the failure from a separate task"""
+        self._discard_queue()
+        self._closed = True
+        self._idle.set()
+        self._wakeup.set()
+        if self._on_failure:
+            asyncio.ensure_future(self._on_failure(self.connection_id, error_type))
+
+    def _discard_queue(self) -> None:
+        if self._queue:
+            WS_QUEUED_MESSAGES.dec(len(self._queue))
+            self._queue.clear()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message has been sent
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self, drain_timeout: Optional[float] = None) -> None:
+        """
+        Stop the writer task once queued messages are sent
+
+        New messages are refused right away. Messages still queued after
+        drain_timeout (default: config.close_drain_timeout) are discarded.
+        """
+        self._closing = True
+        if drain_timeout is None:
+            drain_timeout = self.config.close_drain_timeout
+        task = self._task
+        if (
+            not self._closed and drain_timeout > 0
+            and task is not None and task is not asyncio.current_task() and not task.done()
+        ):
+            await self.drain(drain_timeout)
+
+        self._closed = True
+        self._discard_queue()
+        self._idle.set()
+        self._wakeup.set()
+        task = self._task
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and send-latency stats for this connection"""
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_send_latency_ms": round(self.last_send_latency_ms, 2),
+            "avg_send_latency_ms": round(self._total_send_latency_ms / self.sent, 2) if self.sent else 0.0,
+        }
+
+
+def _error_type(error: Exception) -> str:
+    """Map a send exception to a metrics error_type"""
+    name = type(error).__name__
+    if name in ("WebSocketDisconnect", "ConnectionClosed", "ConnectionClosedOK", "ConnectionClosedError"):
+        return "disconnect"
+    return "send_error"
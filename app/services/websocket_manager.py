@@ -7,12 +7,18 @@ Enhanced with resource subscriptions, Prometheus metrics, and Redis pub/sub
 import asyncio
 import json
 import logging
-from typing import Dict, Set, Optional, Any
+from typing import Dict, Iterable, Set, Optional, Any
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 from prometheus_client import Counter, Gauge, Histogram
 import structlog
 
+from app.services.websocket_fanout import (
+    ConnectionSender,
+    FanoutConfig,
+    OutboundMessage,
+)
+
 # Use structured logging
 logger = structlog.get_logger(__name__)
 
@@ -65,12 +71,21 @@ class ConnectionManager:
     - Automatic cleanup on disconnect
     - Prometheus metrics integration - Task 10
     - Thread-safe async operations - Task 10
+    - Per-connection outbound queues with slow-consumer policy (websocket_fanout)
+
+    Sends are non-blocking: each message is serialized once and queued for
+    every recipient; per-connection writer tasks do the socket I/O. Use
+    flush() to wait for delivery.
     """
 
-    def __init__(self):
+    def __init__(self, fanout_config: Optional[FanoutConfig] = None):
         # Active WebSocket connections
         self.active_connections: Dict[str, WebSocket] = {}
 
+        # Outbound queue and writer task per connection
+        self.fanout_config = fanout_config or FanoutConfig.from_env()
+        self.senders: Dict[str, ConnectionSender] = {}
+
         # Session to connection mapping
         self.session_connections: Dict[str, Set[str]] = {}
 
@@ -140,6 +155,15 @@ class ConnectionManager:
             async with self.lock:
                 # Register connection
                 self.active_connections[connection_id] = websocket
+                sender = ConnectionSender(
+                    connection_id,
+                    websocket,
+                    self.fanout_config,
+                    on_failure=self._handle_send_failure,
+                    on_sent=self._record_sent
+                )
+                self.senders[connection_id] = sender
+                sender.start()
 
                 # Register session mapping
                 if session_id:
@@ -245,6 +269,7 @@ class ConnectionManager:
             # Remove from active connections
             if connection_id in self.active_connections:
                 del self.active_connections[connection_id]
+            sender = self.senders.pop(connection_id, None)
 
             # Cleanup session mapping
             if session_id and session_id in self.session_connections:
@@ -284,6 +309,9 @@ class ConnectionManager:
             if connection_id in self.connection_metadata:
                 del self.connection_metadata[connection_id]
 
+        if sender is not None:
+            await sender.close()
+
         # Update metrics - Task 10.1
         WS_ACTIVE_CONNECTIONS.labels(connection_type=connection_type).dec()
 
@@ -296,13 +324,13 @@ class ConnectionManager:
 
     async def send_personal_message(self, message: dict, connection_id: str):
         """
-        Send a message to a specific connection with metrics tracking - Task 10.1
+        Queue a message for a specific connection - Task 10.1
 
         Args:
             message: Message dictionary to send
             connection_id: Target connection ID
         """
-        if connection_id not in self.active_connections:
+        if connection_id not in self.senders:
             logger.warning(
                 "connection_not_found",
                 connection_id=connection_id,
@@ -311,45 +339,61 @@ class ConnectionManager:
             WS_MESSAGES_FAILED.labels(error_type="connection_not_found").inc()
             return
 
-        # Track latency - Task 10.1
-        import time
-        start_time = time.time()
+        self._fan_out(message, [connection_id])
 
-        try:
-            websocket = self.active_connections[connection_id]
-            await websocket.send_json(message)
-
-            # Record successful send with metrics
-            latency = time.time() - start_time
-            message_type = message.get("type", "unknown")
+    def _fan_out(self, message: dict, connection_ids: Iterable[str]) -> int:
+        """
+        Serialize a message once and queue it for every connection
 
-            WS_MESSAGE_LATENCY.labels(message_type=message_type).observe(latency)
-            WS_MESSAGES_SENT.labels(message_type=message_type).inc()
+        Args:
+            message: Message dictionary to send
+            connection_ids: Target connection IDs (unknown IDs are skipped)
 
-            logger.debug(
-                "message_sent",
-                connection_id=connection_id,
-                message_type=message_type,
-                latency_ms=round(latency * 1000, 2)
-            )
+        Returns:
+            Number of connections the message was queued for
+        """
+        outbound = OutboundMessage.from_message(message)
+        queued = 0
+        for connection_id in connection_ids:
+            sender = self.senders.get(connection_id)
+            if sender is not None and sender.enqueue(outbound):
+                queued += 1
+        return queued
+
+    def _record_sent(self, message_type: str, latency: float):
+        """Record a completed send (called by connection writer tasks)"""
+        WS_MESSAGE_LATENCY.labels(message_type=message_type).observe(latency)
+        WS_MESSAGES_SENT.labels(message_type=message_type).inc()
+
+    async def _handle_send_failure(self, connection_id: str, error_type: str):
+        """Drop a connection whose writer failed or fell too far behind"""
+        logger.info(
+            "websocket_send_failed_disconnecting",
+            connection_id=connection_id,
+            error_type=error_type
+        )
+        WS_MESSAGES_FAILED.labels(error_type=error_type).inc()
+        websocket = self.active_connections.get(connection_id)
+        await self.disconnect(connection_id)
+        if error_type == "slow_consumer" and websocket is not None:
+            try:
+                await websocket.close(code=1013)  # Try again later
+            except Exception:
+                pass
 
-        except WebSocketDisconnect:
-            logger.info(
-                "websocket_disconnected_during_send",
-                connection_id=connection_id
-            )
-            await self.disconnect(connection_id)
-            WS_MESSAGES_FAILED.labels(error_type="disconnect").inc()
+    async def flush(self, connection_ids: Optional[Iterable[str]] = None, timeout: Optional[float] = None):
+        """
+        Wait until queued messages have been sent
 
-        except Exception as e:
-            logger.error(
-                "message_send_failed",
-                connection_id=connection_id,
-                error=str(e),
-                message_type=message.get("type")
-            )
-            await self.disconnect(connection_id)
-            WS_MESSAGES_FAILED.labels(error_type="send_error").inc()
+        Args:
+            connection_ids: Connections to wait for (default: all)
+            timeout: Optional per-connection timeout in seconds
+        """
+        if connection_ids is None:
+            senders = list(self.senders.values())
+        else:
+            senders = [self.senders[c] for c in connection_ids if c in self.senders]
+        await asyncio.gather(*(sender.drain(timeout) for sender in senders))
 
     async def send_to_session(self, message: dict, session_id: str):
         """
@@ -361,8 +405,7 @@ class ConnectionManager:
         """
         if session_id in self.session_connections:
             connection_ids = self.session_connections[session_id].copy()
-            for connection_id in connection_ids:
-                await self.send_personal_message(message, connection_id)
+            self._fan_out(message, connection_ids)
             logger.info(f"Sent message to {len(connection_ids)} connections in session {session_id}")
         else:
             logger.warning(f"Session {session_id} not found")
@@ -377,8 +420,7 @@ class ConnectionManager:
         """
         if user_id in self.user_connections:
             connection_ids = self.user_connections[user_id].copy()
-            for connection_id in connection_ids:
-                await self.send_personal_message(message, connection_id)
+            self._fan_out(message, connection_ids)
             logger.info(f"Sent message to {len(connection_ids)} connections for user {user_id}")
         else:
             logger.warning(f"User {user_id} not found")
@@ -393,7 +435,6 @@ class ConnectionManager:
             publish_to_redis: Whether to publish to Redis for distributed broadcasting
         """
         exclude = exclude or set()
-        disconnected = []
 
         # Publish to Redis first for distributed broadcasting - Task 10.3
         if publish_to_redis and self.redis_enabled:
@@ -407,20 +448,11 @@ class ConnectionManager:
                 channel_type="general"
             )
 
-        # Send to local connections
-        for connection_id, websocket in self.active_connections.items():
-            if connection_id not in exclude:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {connection_id}: {e}")
-                    disconnected.append(connection_id)
-
-        # Cleanup disconnected connections
-        for connection_id in disconnected:
-            await self.disconnect(connection_id)
-
-        recipients = len(self.active_connections) - len(exclude) - len(disconnected)
+        # Queue for local connections; writer tasks disconnect failed sockets
+        recipients = self._fan_out(
+            message,
+            [connection_id for connection_id in self.senders if connection_id not in exclude]
+        )
         logger.info(f"Broadcasted message to {recipients} connections")
 
     async def send_task_notification(
@@ -519,8 +551,7 @@ class ConnectionManager:
             return
 
         connection_ids = self.document_connections[document_id].copy()
-        for connection_id in connection_ids:
-            await self.send_personal_message(message, connection_id)
+        self._fan_out(message, connection_ids)
 
         logger.info(
             "message_sent_to_document_subscribers",
@@ -546,8 +577,7 @@ class ConnectionManager:
             return
 
         connection_ids = self.query_connections[query_id].copy()
-        for connection_id in connection_ids:
-            await self.send_personal_message(message, connection_id)
+        self._fan_out(message, connection_ids)
 
         logger.info(
             "message_sent_to_query_subscribers",
@@ -573,8 +603,7 @@ class ConnectionManager:
             return
 
         connection_ids = self.source_connections[source_id].copy()
-        for connection_id in connection_ids:
-            await self.send_personal_message(message, connection_id)
+        self._fan_out(message, connection_ids)
 
         logger.info(
             "message_sent_to_source_subscribers",
@@ -600,8 +629,7 @@ class ConnectionManager:
             return
 
         connection_ids = self.project_source_connections[project_id].copy()
-        for connection_id in connection_ids:
-            await self.send_personal_message(message, connection_id)
+        self._fan_out(message, connection_ids)
 
         logger.info(
             "message_sent_to_project_source_subscribers",
@@ -802,12 +830,21 @@ class ConnectionManager:
         """Get total number of connected users"""
         return len(self.user_connections)
 
+    def get_queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get outbound queue depth and send-latency stats per connection"""
+        return {
+            connection_id: sender.get_stats()
+            for connection_id, sender in self.senders.items()
+        }
+
     def get_stats(self) -> dict:
         """Get connection statistics"""
         return {
             "active_connections": self.get_connection_count(),
             "active_sessions": self.get_session_count(),
             "connected_users": self.get_user_count(),
+            "queued_messages": sum(sender.queue_depth for sender in self.senders.values()),
+            "slow_consumer_policy": self.fanout_config.policy.value,
             "redis_enabled": self.redis_enabled,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -6,6 +6,8 @@ Comprehensive workflow management with:
 - Graceful Shutdown: Signal handling and cleanup
 - Cancellation Tokens: Task cancellation support
 - Metrics Collection: Prometheus metrics and logging
+- Indexed listing: Redis sorted sets / on-disk SQLite index by status, type
+  and updated_at, with cursor pagination
 
 Author: Claude Code
 Date: 2025-01-15
@@ -16,14 +18,15 @@ import sys
 import json
 import time
 import signal
+import sqlite3
 import asyncio
 import hashlib
 from pathlib import Path
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import (
     Dict, Any, List, Optional, Callable, TypeVar, Generic,
-    Awaitable, Set, Union
+    Awaitable, Set, Tuple, Union
 )
 from dataclasses import dataclass, field, asdict
 from contextlib import asynccontextmanager
@@ -316,6 +319,51 @@ class CancellationError(Exception):
 # WORKFLOW STATE MANAGER
 # =============================================================================
 
+# Workflow listing indexes
+STATE_KEY_PREFIX = "workflow:state:"
+STATE_TTL_SECONDS = 86400 * 7
+INDEX_KEY_PREFIX = "workflow:index"
+INDEX_VERSION = "1"
+FILE_INDEX_NAME = "_index.sqlite3"
+LIST_PAGE_SIZE = 200
+
+
+def _updated_score(state_dict: Dict[str, Any]) -> float:
+    """Sort key for listing: updated_at as epoch seconds"""
+    updated_at = state_dict.get("updated_at") or state_dict.get("started_at")
+    if not updated_at:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(updated_at)
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def encode_list_cursor(score: float, workflow_id: str) -> str:
+    """Opaque cursor for the position after (score, workflow_id)"""
+    return f"{score!r}|{workflow_id}"
+
+
+def decode_list_cursor(cursor: Optional[str]) -> Optional[Tuple[float, str]]:
+    """Inverse of encode_list_cursor; raises ValueError for malformed cursors"""
+    if not cursor:
+        return None
+    score, _, workflow_id = cursor.partition("|")
+    if not workflow_id:
+        raise ValueError(f"Invalid workflow list cursor: {cursor}")
+    return float(score), workflow_id
+
+
+def _after_cursor(score: float, workflow_id: str, after: Optional[Tuple[float, str]]) -> bool:
+    """Whether an entry comes after the cursor in (score desc, id desc) order"""
+    if after is None:
+        return True
+    return score < after[0] or (score == after[0] and workflow_id < after[1])
+
+
 class WorkflowStateManager:
     """
     Manages workflow state persistence with multiple storage backends.
@@ -362,6 +410,7 @@ class WorkflowStateManager:
 
         self._redis: Optional[Any] = None
         self._memory_store: Dict[str, Dict[str, Any]] = {}
+        self._file_index: Optional[sqlite3.Connection] = None
         self._initialized = False
 
         # Create storage directory for file backend
@@ -390,6 +439,12 @@ class WorkflowStateManager:
             )
             logger.info("Redis connection established for workflow state")
 
+            if await self._redis.get(f"{INDEX_KEY_PREFIX}:version") != INDEX_VERSION:
+                await self.rebuild_indexes()
+
+        elif self.backend == StorageBackend.FILE:
+            self._open_file_index()
+
         self._initialized = True
 
     async def save_state(self, state: WorkflowState) -> None:
@@ -559,56 +614,111 @@ class WorkflowStateManager:
     async def list_workflows(
         self,
         status: Optional[WorkflowStatus] = None,
-        workflow_type: Optional[str] = None
+        workflow_type: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[WorkflowState]:
-        """List all workflows, optionally filtered by status or type"""
-        await self.initialize()
+        """
+        List workflows, most recently updated first
 
-        workflows = []
+        Args:
+            status: Only workflows in this status
+            workflow_type: Only workflows of this type
+            limit: Maximum results (None for all)
+        """
+        workflows: List[WorkflowState] = []
+        cursor = None
+
+        while True:
+            page_size = LIST_PAGE_SIZE if limit is None else min(limit - len(workflows), LIST_PAGE_SIZE)
+            page, cursor = await self.list_workflows_page(
+                status=status,
+                workflow_type=workflow_type,
+                limit=page_size,
+                cursor=cursor
+            )
+            workflows.extend(page)
+            if cursor is None or (limit is not None and len(workflows) >= limit):
+                return workflows
+
+    async def list_workflows_page(
+        self,
+        status: Optional[WorkflowStatus] = None,
+        workflow_type: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[WorkflowState], Optional[str]]:
+        """
+        One page of workflows, most recently updated first
+
+        Served from the status / type / updated_at indexes, so the cost
+        depends on the page size rather than on how many workflows exist.
+
+        Args:
+            status: Only workflows in this status
+            workflow_type: Only workflows of this type
+            limit: Page size
+            cursor: next_cursor from the previous page
+
+        Returns:
+            (workflows, next_cursor); next_cursor is None after the last page
+        """
+        await self.initialize()
+        after = decode_list_cursor(cursor)
+        limit = max(limit, 1)
 
         if self.backend == StorageBackend.FILE:
-            for state_file in self.storage_path.glob("*.json"):
-                if state_file.name.startswith("checkpoint"):
-                    continue
-                try:
-                    with open(state_file) as f:
-                        state = WorkflowState.from_dict(json.load(f))
-                        if status and state.status != status:
-                            continue
-                        if workflow_type and state.workflow_type != workflow_type:
-                            continue
-                        workflows.append(state)
-                except Exception:
-                    pass
+            return self._file_index_page(status, workflow_type, limit, after)
         elif self.backend == StorageBackend.REDIS:
-            keys = await self._redis.keys("workflow:state:*")
-            for key in keys:
-                try:
-                    data = await self._redis.get(key)
-                    if data:
-                        state = WorkflowState.from_dict(json.loads(data))
-                        if status and state.status != status:
-                            continue
-                        if workflow_type and state.workflow_type != workflow_type:
-                            continue
-                        workflows.append(state)
-                except Exception:
-                    pass
-        else:
-            for wf_id, data in self._memory_store.items():
-                if wf_id == "checkpoints":
-                    continue
-                try:
-                    state = WorkflowState.from_dict(data)
-                    if status and state.status != status:
-                        continue
-                    if workflow_type and state.workflow_type != workflow_type:
-                        continue
-                    workflows.append(state)
-                except Exception:
-                    pass
+            return await self._redis_index_page(status, workflow_type, limit, after)
+
+        entries = []
+        for wf_id, data in self._memory_store.items():
+            if wf_id == "checkpoints":
+                continue
+            if status and data.get("status") != status.value:
+                continue
+            if workflow_type and data.get("workflow_type") != workflow_type:
+                continue
+            score = _updated_score(data)
+            if _after_cursor(score, wf_id, after):
+                entries.append((score, wf_id, data))
+
+        entries.sort(key=lambda e: (e[0], e[1]), reverse=True)
+        page = entries[:limit]
+        workflows = [WorkflowState.from_dict(data) for _, _, data in page]
+        next_cursor = encode_list_cursor(page[-1][0], page[-1][1]) if len(entries) > limit else None
+        return workflows, next_cursor
+
+    async def rebuild_indexes(self) -> int:
+        """
+        Rebuild the listing indexes from stored states
+
+        Redis: SCAN (never KEYS) over state keys in batches, loading each
+        batch with MGET. File: one pass over the state files. Runs
+        automatically the first time a store without indexes is opened.
+
+        Returns:
+            Number of workflows indexed
+        """
+        indexed = 0
 
-        return workflows
+        if self.backend == StorageBackend.REDIS:
+            batch: List[str] = []
+            async for key in self._redis.scan_iter(match=f"{STATE_KEY_PREFIX}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    indexed += await self._index_redis_keys(batch)
+                    batch = []
+            if batch:
+                indexed += await self._index_redis_keys(batch)
+            await self._redis.set(f"{INDEX_KEY_PREFIX}:version", INDEX_VERSION)
+
+        elif self.backend == StorageBackend.FILE:
+            self._open_file_index(rebuild=False)
+            indexed = self._rebuild_file_index()
+
+        logger.info("Workflow indexes rebuilt", backend=self.backend.value, indexed=indexed)
+        return indexed
 
     async def delete_state(self, workflow_id: str) -> bool:
         """Delete workflow state"""
@@ -619,8 +729,10 @@ class WorkflowStateManager:
                 state_file = self.storage_path / f"{workflow_id}.json"
                 if state_file.exists():
                     state_file.unlink()
+                with self._file_index:
+                    self._file_index.execute("DELETE FROM workflows WHERE workflow_id = ?", (workflow_id,))
             elif self.backend == StorageBackend.REDIS:
-                await self._redis.delete(f"workflow:state:{workflow_id}")
+                await self._delete_from_redis(workflow_id)
             else:
                 self._memory_store.pop(workflow_id, None)
 
@@ -634,6 +746,112 @@ class WorkflowStateManager:
         state_file = self.storage_path / f"{workflow_id}.json"
         with open(state_file, "w") as f:
             json.dump(state_dict, f, indent=2)
+        with self._file_index:
+            self._index_file_state(state_dict)
+
+    def _open_file_index(self, rebuild: bool = True) -> sqlite3.Connection:
+        """
+        Open the on-disk listing index (SQLite next to the state files)
+
+        A missing index is created and, when rebuild is set, filled from the
+        existing state files once.
+        """
+        if self._file_index is None:
+            index_path = self.storage_path / FILE_INDEX_NAME
+            is_new = not index_path.exists()
+            self._file_index = sqlite3.connect(str(index_path), check_same_thread=False)
+            self._file_index.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS workflows (
+                    workflow_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    workflow_type TEXT NOT NULL,
+                    updated_score REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_workflows_updated
+                    ON workflows(updated_score DESC, workflow_id DESC);
+                CREATE INDEX IF NOT EXISTS idx_workflows_status
+                    ON workflows(status, updated_score DESC, workflow_id DESC);
+                CREATE INDEX IF NOT EXISTS idx_workflows_type
+                    ON workflows(workflow_type, updated_score DESC, workflow_id DESC);
+                """
+            )
+            if is_new and rebuild:
+                self._rebuild_file_index()
+        return self._file_index
+
+    def _rebuild_file_index(self) -> int:
+        indexed = 0
+        with self._file_index:
+            self._file_index.execute("DELETE FROM workflows")
+            for state_file in self.storage_path.glob("*.json"):
+                try:
+                    with open(state_file) as f:
+                        self._index_file_state(json.load(f))
+                    indexed += 1
+                except Exception:
+                    pass
+        return indexed
+
+    def _index_file_state(self, state_dict: Dict) -> None:
+        self._file_index.execute(
+            "INSERT OR REPLACE INTO workflows (workflow_id, status, workflow_type, updated_score) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                state_dict["workflow_id"],
+                state_dict["status"],
+                state_dict["workflow_type"],
+                _updated_score(state_dict),
+            )
+        )
+
+    def _file_index_page(
+        self,
+        status: Optional[WorkflowStatus],
+        workflow_type: Optional[str],
+        limit: int,
+        after: Optional[Tuple[float, str]]
+    ) -> Tuple[List[WorkflowState], Optional[str]]:
+        clauses = []
+        params: List[Any] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if workflow_type:
+            clauses.append("workflow_type = ?")
+            params.append(workflow_type)
+        if after:
+            clauses.append("(updated_score < ? OR (updated_score = ? AND workflow_id < ?))")
+            params.extend([after[0], after[0], after[1]])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._file_index.execute(
+            f"SELECT workflow_id, updated_score FROM workflows {where} "
+            "ORDER BY updated_score DESC, workflow_id DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+
+        workflows = []
+        stale = []
+        for workflow_id, _ in rows[:limit]:
+            state_file = self.storage_path / f"{workflow_id}.json"
+            try:
+                with open(state_file) as f:
+                    workflows.append(WorkflowState.from_dict(json.load(f)))
+            except FileNotFoundError:
+                stale.append((workflow_id,))
+            except Exception:
+                pass
+
+        if stale:
+            with self._file_index:
+                self._file_index.executemany("DELETE FROM workflows WHERE workflow_id = ?", stale)
+
+        next_cursor = None
+        if len(rows) > limit:
+            last_id, last_score = rows[limit - 1]
+            next_cursor = encode_list_cursor(last_score, last_id)
+        return workflows, next_cursor
 
     async def _load_from_file(self, workflow_id: str) -> Optional[Dict]:
         state_file = self.storage_path / f"{workflow_id}.json"
@@ -644,14 +862,150 @@ class WorkflowStateManager:
 
     # Private methods for Redis storage
     async def _save_to_redis(self, workflow_id: str, state_dict: Dict) -> None:
-        await self._redis.set(
-            f"workflow:state:{workflow_id}",
+        """Write the state and its index entries in one MULTI/EXEC"""
+        score = _updated_score(state_dict)
+        status = state_dict["status"]
+
+        pipe = self._redis.pipeline()
+        pipe.set(
+            f"{STATE_KEY_PREFIX}{workflow_id}",
             json.dumps(state_dict),
-            ex=86400 * 7  # 7 day TTL
+            ex=STATE_TTL_SECONDS  # 7 day TTL
         )
+        self._add_index_entries(pipe, workflow_id, status, state_dict["workflow_type"], score)
+        self._trim_index_entries(pipe, state_dict["workflow_type"], score - STATE_TTL_SECONDS)
+        await pipe.execute()
+
+    @staticmethod
+    def _trim_index_entries(pipe, workflow_type: str, min_score: float) -> None:
+        """
+        Drop entries older than the state TTL, which point at expired states
+
+        Covers the updated and status indexes and the saved workflow's type
+        index; a type that is no longer saved is pruned as it is listed.
+        """
+        index_keys = [f"{INDEX_KEY_PREFIX}:updated", f"{INDEX_KEY_PREFIX}:type:{workflow_type}"]
+        index_keys += [f"{INDEX_KEY_PREFIX}:status:{status.value}" for status in WorkflowStatus]
+        for index_key in index_keys:
+            pipe.zremrangebyscore(index_key, "-inf", min_score)
+
+    @staticmethod
+    def _add_index_entries(pipe, workflow_id: str, status: str, workflow_type: str, score: float) -> None:
+        for other in WorkflowStatus:
+            if other.value != status:
+                pipe.zrem(f"{INDEX_KEY_PREFIX}:status:{other.value}", workflow_id)
+        pipe.zadd(f"{INDEX_KEY_PREFIX}:updated", {workflow_id: score})
+        pipe.zadd(f"{INDEX_KEY_PREFIX}:status:{status}", {workflow_id: score})
+        pipe.zadd(f"{INDEX_KEY_PREFIX}:type:{workflow_type}", {workflow_id: score})
+
+    async def _delete_from_redis(self, workflow_id: str) -> None:
+        state_dict = await self._load_from_redis(workflow_id)
+
+        pipe = self._redis.pipeline()
+        pipe.delete(f"{STATE_KEY_PREFIX}{workflow_id}")
+        pipe.zrem(f"{INDEX_KEY_PREFIX}:updated", workflow_id)
+        for status in WorkflowStatus:
+            pipe.zrem(f"{INDEX_KEY_PREFIX}:status:{status.value}", workflow_id)
+        if state_dict:
+            pipe.zrem(f"{INDEX_KEY_PREFIX}:type:{state_dict['workflow_type']}", workflow_id)
+        await pipe.execute()
+
+    async def _index_redis_keys(self, keys: List[str]) -> int:
+        """Add index entries for a batch of state keys (used by rebuild)"""
+        values = await self._redis.mget(keys)
+        pipe = self._redis.pipeline(transaction=False)
+        indexed = 0
+        for key, data in zip(keys, values):
+            if not data:
+                continue
+            try:
+                state_dict = json.loads(data)
+                self._add_index_entries(
+                    pipe,
+                    key[len(STATE_KEY_PREFIX):],
+                    state_dict["status"],
+                    state_dict["workflow_type"],
+                    _updated_score(state_dict)
+                )
+                indexed += 1
+            except Exception:
+                pass
+        await pipe.execute()
+        return indexed
+
+    async def _redis_index_page(
+        self,
+        status: Optional[WorkflowStatus],
+        workflow_type: Optional[str],
+        limit: int,
+        after: Optional[Tuple[float, str]]
+    ) -> Tuple[List[WorkflowState], Optional[str]]:
+        """
+        Walk the most selective index newest-first, loading states with MGET
+
+        Index entries whose state expired, or which no longer match the
+        index they are in, are pruned as they are encountered.
+        """
+        if status:
+            index_key = f"{INDEX_KEY_PREFIX}:status:{status.value}"
+        elif workflow_type:
+            index_key = f"{INDEX_KEY_PREFIX}:type:{workflow_type}"
+        else:
+            index_key = f"{INDEX_KEY_PREFIX}:updated"
+
+        max_score = after[0] if after else "+inf"
+        batch_size = max(limit, 50)
+        offset = 0
+        workflows: List[WorkflowState] = []
+        last: Optional[Tuple[float, str]] = None
+        exhausted = False
+
+        while len(workflows) < limit:
+            entries = await self._redis.zrevrangebyscore(
+                index_key, max_score, "-inf", start=offset, num=batch_size, withscores=True
+            )
+            if not entries:
+                exhausted = True
+                break
+            offset += len(entries)
+
+            entries = [(member, score) for member, score in entries if _after_cursor(score, member, after)]
+            if not entries:
+                continue
+
+            values = await self._redis.mget([f"{STATE_KEY_PREFIX}{member}" for member, _ in entries])
+            stale = []
+            for (member, score), data in zip(entries, values):
+                if not data:
+                    stale.append(member)
+                    continue
+                try:
+                    state = WorkflowState.from_dict(json.loads(data))
+                except Exception:
+                    continue
+                if status and state.status != status:
+                    stale.append(member)
+                    continue
+                if workflow_type and state.workflow_type != workflow_type:
+                    if not status:
+                        stale.append(member)
+                    continue
+                workflows.append(state)
+                last = (score, member)
+                if len(workflows) == limit:
+                    break
+
+            if stale:
+                await self._redis.zrem(index_key, *stale)
+                offset -= len(stale)
+
+        next_cursor = None
+        if not exhausted and last is not None and len(workflows) == limit:
+            next_cursor = encode_list_cursor(*last)
+        return workflows, next_cursor
 
     async def _load_from_redis(self, workflow_id: str) -> Optional[Dict]:
-        data = await self._redis.get(f"workflow:state:{workflow_id}")
+        data = await self._redis.get(f"{STATE_KEY_PREFIX}{workflow_id}")
         if data:
             return json.loads(data)
         return None
@@ -1360,10 +1714,21 @@ class WorkflowManager:
     async def list_workflows(
         self,
         status: Optional[WorkflowStatus] = None,
-        workflow_type: Optional[str] = None
+        workflow_type: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[WorkflowState]:
-        """List workflows"""
-        return await self.state_manager.list_workflows(status, workflow_type)
+        """List workflows, most recently updated first"""
+        return await self.state_manager.list_workflows(status, workflow_type, limit)
+
+    async def list_workflows_page(
+        self,
+        status: Optional[WorkflowStatus] = None,
+        workflow_type: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[WorkflowState], Optional[str]]:
+        """One page of workflows and the cursor for the next page"""
+        return await self.state_manager.list_workflows_page(status, workflow_type, limit, cursor)
 
     async def recover_workflow(self, workflow_id: str) -> Optional[WorkflowState]:
         """Recover a workflow from checkpoint"""
@@ -0,0 +1,94 @@
+"""
+Empire v7.5 - Asset Dedup Maintenance Tasks
+
+Celery tasks for the studio asset near-duplicate index:
+- Backfill of MinHash/LSH signatures for assets saved before indexing
+"""
+
+import asyncio
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger(__name__)
+
+
+def run_async(coro):
+    """Helper to run async code in sync Celery tasks"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+# ==============================================================================
+# Task: Backfill Asset LSH Signatures
+# ==============================================================================
+
+@celery_app.task(
+    name='app.tasks.asset_dedup_tasks.backfill_asset_lsh_signatures',
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60
+)
+def backfill_asset_lsh_signatures(
+    self,
+    batch_size: int = 200,
+    max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compute and store LSH signatures for studio assets that lack them.
+
+    Re-runnable: already indexed assets are skipped, so a retry or a second
+    run continues where the previous one stopped.
+
+    Args:
+        batch_size: Assets per page (one bulk update per page)
+        max_batches: Stop after this many pages (None = until done)
+
+    Returns:
+        Dict with backfill results
+    """
+    try:
+        logger.info(
+            "Starting asset LSH backfill",
+            task_id=self.request.id,
+            batch_size=batch_size
+        )
+
+        from app.services.asset_dedup_service import get_asset_dedup_service
+
+        result = run_async(
+            get_asset_dedup_service().backfill_lsh_signatures(
+                batch_size=batch_size,
+                max_batches=max_batches
+            )
+        )
+
+        return {
+            "success": True,
+            "task_id": self.request.id,
+            "timestamp": datetime.utcnow().isoformat(),
+            **result
+        }
+
+    except Exception as e:
+        logger.error(
+            "Asset LSH backfill failed",
+            error=str(e),
+            task_id=self.request.id
+        )
+
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+
+        return {
+            "success": False,
+            "task_id": self.request.id,
+            "error": str(e)
+        }
@@ -384,30 +384,94 @@ async def _store_embeddings_in_chunks(
     supabase_storage,
     results: List
 ) -> int:
-    """Store embeddings in chunks table"""
+    """
+    Store embeddings in chunks table
+
+    Writes in batches through SupabaseBulkWriter using the
+    bulk_update_chunk_embeddings RPC (one request per batch). Ids not found
+    in chunks are retried against document_chunks. If the RPC is not
+    deployed, falls back to per-row updates; other RPC errors are retried.
+    """
+    from app.services.supabase_bulk_writer import SupabaseBulkWriter, BulkWriteError
+
+    supabase = supabase_storage.supabase
+    rpc_available = True
+
+    def update_batch(batch: List[Dict[str, Any]]) -> int:
+        nonlocal rpc_available
+        if rpc_available:
+            try:
+                updated = _bulk_update_embeddings(supabase, "chunks", batch)
+                remaining = [row for row in batch if row["id"] not in updated]
+                if remaining:
+                    updated |= _bulk_update_embeddings(supabase, "document_chunks", remaining)
+                return len(updated)
+            except Exception as e:
+                if not _is_missing_function_error(e):
+                    raise  # Transient; SupabaseBulkWriter retries the batch
+                logger.warning(f"Bulk embedding RPC unavailable, using per-row updates: {e}")
+                rpc_available = False
+
+        return _update_embeddings_per_row(supabase, batch)
+
+    writer = SupabaseBulkWriter(supabase, "chunks", batch_fn=update_batch)
+    rows = (
+        {"id": result.chunk_id, "embedding": result.embedding}
+        for result in results
+    )
+
+    try:
+        stats = await asyncio.to_thread(writer.write, rows)
+    except BulkWriteError as e:
+        logger.error(f"Failed to store embeddings: {e}")
+        return e.stats.rows_written
+
+    return stats.rows_written
+
+
+def _is_missing_function_error(error: Exception) -> bool:
+    """Whether an RPC error means the function is not deployed"""
+    code = getattr(error, "code", None)
+    if code in ("PGRST202", "42883"):  # PostgREST schema cache miss / undefined_function
+        return True
+    message = str(error)
+    return "PGRST202" in message or "undefined_function" in message
+
+
+def _bulk_update_embeddings(supabase, table: str, batch: List[Dict[str, Any]]) -> set:
+    """Update embeddings for a batch in one RPC call; returns updated ids"""
+    result = supabase.rpc(
+        "bulk_update_chunk_embeddings",
+        {"p_table": table, "p_rows": batch}
+    ).execute()
+
+    updated = set()
+    for row in result.data or []:
+        updated.add(row if isinstance(row, str) else next(iter(row.values())))
+    return updated
+
+
+def _update_embeddings_per_row(supabase, batch: List[Dict[str, Any]]) -> int:
+    """Legacy path: one UPDATE per chunk"""
     stored_count = 0
 
-    for result in results:
+    for row in batch:
         try:
-            await asyncio.to_thread(
-                lambda r=result: supabase_storage.supabase.table("chunks")
-                .update({"embedding": r.embedding})
-                .eq("id", r.chunk_id)
+            supabase.table("chunks")\
+                .update({"embedding": row["embedding"]})\
+                .eq("id", row["id"])\
                 .execute()
-            )
             stored_count += 1
-        except Exception as e:
+        except Exception:
             # Try document_chunks table
             try:
-                await asyncio.to_thread(
-                    lambda r=result: supabase_storage.supabase.table("document_chunks")
-                    .update({"embedding": r.embedding})
-                    .eq("id", r.chunk_id)
+                supabase.table("document_chunks")\
+                    .update({"embedding": row["embedding"]})\
+                    .eq("id", row["id"])\
                     .execute()
-                )
                 stored_count += 1
             except Exception as e2:
-                logger.error(f"Failed to store embedding for {result.chunk_id}: {e2}")
+                logger.error(f"Failed to store embedding for {row['id']}: {e2}")
 
     return stored_count
 
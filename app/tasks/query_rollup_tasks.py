@@ -0,0 +1,167 @@
+"""
+Empire v7.3 - Query Analytics Rollup Tasks
+
+Celery tasks for the minute/hour query analytics rollups:
+- Backfill of rollups from query_logs / click_events (history, repairs)
+- Hourly purge of minute rows past their retention
+"""
+
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Any, Optional, TypeVar
+from datetime import datetime, timedelta, timezone
+
+import structlog
+
+from app.celery_app import celery_app
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def run_async(coro):
+    """Helper to run async code in sync Celery tasks"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _with_rollup_service(operation: Callable[..., Awaitable[T]]) -> T:
+    """
+    Run operation(rollups) against a QueryRollupService over a service-key
+    Supabase client
+
+    The rollup service awaits its queries, so the async client is created
+    inside the task's event loop (run_async uses a fresh loop per task).
+    """
+    from supabase import acreate_client
+
+    from app.services.query_analytics_service import AnalyticsConfig
+    from app.services.query_rollup_service import QueryRollupService, RollupConfig
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_KEY")
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+
+    analytics_config = AnalyticsConfig()
+    client = await acreate_client(url, key)
+    rollups = QueryRollupService(
+        client,
+        RollupConfig(
+            batch_size=analytics_config.batch_size,
+            flush_interval_seconds=analytics_config.flush_interval_seconds
+        )
+    )
+    return await operation(rollups)
+
+
+# ==============================================================================
+# Task: Backfill Query Rollups
+# ==============================================================================
+
+@celery_app.task(
+    name='app.tasks.query_rollup_tasks.backfill_query_rollups',
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60
+)
+def backfill_query_rollups(
+    self,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Recompute query rollups for the complete hours of a range from raw logs.
+
+    Re-runnable: each hour's rollup rows are replaced, not incremented, so a
+    retry or an overlapping run gives the same result.
+
+    Args:
+        start_date: ISO start of range (default: retention_days ago)
+        end_date: ISO end of range (default: now); capped at the backfill
+            horizon so hours with possibly unflushed deltas are skipped
+
+    Returns:
+        Dict with backfill results
+    """
+    try:
+        from app.services.query_analytics_service import AnalyticsConfig
+
+        end = datetime.fromisoformat(end_date) if end_date else datetime.now(timezone.utc)
+        start = (
+            datetime.fromisoformat(start_date) if start_date
+            else end - timedelta(days=AnalyticsConfig().retention_days)
+        )
+
+        logger.info(
+            "Starting query rollup backfill",
+            task_id=self.request.id,
+            start_date=start.isoformat(),
+            end_date=end.isoformat()
+        )
+
+        result = run_async(_with_rollup_service(lambda rollups: rollups.backfill(start, end)))
+
+        return {
+            "success": True,
+            "task_id": self.request.id,
+            "timestamp": datetime.utcnow().isoformat(),
+            **result
+        }
+
+    except Exception as e:
+        logger.error(
+            "Query rollup backfill failed",
+            error=str(e),
+            task_id=self.request.id
+        )
+
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+
+        return {
+            "success": False,
+            "task_id": self.request.id,
+            "error": str(e)
+        }
+
+
+# ==============================================================================
+# Task: Purge Expired Minute Rollups
+# ==============================================================================
+
+@celery_app.task(
+    name='app.tasks.query_rollup_tasks.purge_query_rollup_minutes',
+    bind=True
+)
+def purge_query_rollup_minutes(self) -> Dict[str, Any]:
+    """
+    Delete minute-level rollups older than their retention; hour rows are kept.
+
+    Returns:
+        Dict with purge result
+    """
+    try:
+        run_async(_with_rollup_service(lambda rollups: rollups.purge_expired_minutes()))
+        return {
+            "success": True,
+            "task_id": self.request.id,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(
+            "Query rollup purge failed",
+            error=str(e),
+            task_id=self.request.id
+        )
+        return {
+            "success": False,
+            "task_id": self.request.id,
+            "error": str(e)
+        }
@@ -14,7 +14,7 @@ import re
 import tempfile
 import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from uuid import uuid4
 
 from app.celery_app import celery_app, get_source_priority
@@ -22,13 +22,16 @@ from app.celery_app import celery_app, get_source_priority
 # Task 69: Performance profiling and caching imports
 from app.utils.performance_profiler import get_performance_profiler, Benchmark
 from app.services.source_content_cache import get_source_content_cache
+from app.services.source_embedding_pipeline import get_source_embedding_pipeline
+from app.services.supabase_bulk_writer import SupabaseBulkWriter, BulkWriteError
 
 # Feature 006: Markdown-aware chunking
 from app.services.chunking_service import (
     MarkdownChunkerStrategy,
     MarkdownChunkerConfig,
-    HEADER_PATTERN
+    resolve_auto_strategy
 )
+from app.services.chunking_engine import get_chunking_engine
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +59,7 @@ def _get_cache():
 CHUNK_SIZE = 512  # tokens per chunk
 MAX_SUMMARY_LENGTH = 2000  # characters
 MAX_RETRIES = 3
+EMBEDDING_WRITE_BATCH_SIZE = int(os.getenv("SOURCE_EMBEDDING_WRITE_BATCH_SIZE", "500"))
 
 
 def run_async(coro):
@@ -284,57 +288,52 @@ def process_source(
             file_name=file_name
         )
 
-        # Task 69: Chunk and embed with caching
-        async def chunk_and_embed_with_cache():
-            # Chunk content with profiling
-            async with profiler.profile_stage(source_id, "chunking"):
-                chunks = _chunk_content(content, CHUNK_SIZE)
-                logger.info(f"Created {len(chunks)} chunks for embedding")
-
-            # Compute chunk hashes for cache lookup
-            chunk_hashes = [hashlib.md5(chunk.encode()).hexdigest() for chunk in chunks]
-
-            # Check cache for existing embeddings
-            cached_embeddings = await cache.get_cached_embeddings_batch(chunk_hashes)
+        # Task 69: Chunk, embed and store with caching
+        # Feature 007: Pass content set context for relationship creation
+        store = _SourceEmbeddingStore(
+            supabase,
+            source_id=source_id,
+            project_id=project_id,
+            user_id=user_id,
+            content_set_context=content_set_context
+        )
 
-            # Identify chunks that need embedding generation
-            chunks_to_embed = []
-            chunks_to_embed_indices = []
-            for i, (chunk, chunk_hash) in enumerate(zip(chunks, chunk_hashes)):
-                if cached_embeddings.get(chunk_hash) is None:
-                    chunks_to_embed.append(chunk)
-                    chunks_to_embed_indices.append(i)
+        async def chunk_embed_and_store():
+            # Chunking streams into batched, concurrent embedding with
+            # chunk_hash dedup against the Redis cache and already-stored
+            # source_embeddings; each embedded group is written right away,
+            # so the three stages overlap and memory stays bounded
+            pipeline = get_source_embedding_pipeline()
+
+            async def store_group(start_index, group, group_embeddings):
+                await asyncio.to_thread(store.add, start_index, group, group_embeddings)
+
+            async with profiler.profile_stage(source_id, "chunking_and_embedding") as stage:
+                try:
+                    stats = await pipeline.embed_chunk_stream(
+                        _aiter_chunk_content(content, CHUNK_SIZE, document_id=source_id),
+                        on_group=store_group,
+                        supabase=supabase,
+                        project_id=project_id
+                    )
+                except BaseException:
+                    await asyncio.to_thread(store.rollback)
+                    raise
+                stage.metadata.update(stats.to_dict())
+            logger.info(f"Created and embedded {stats.total_chunks} chunks")
 
             logger.info(
-                f"Embedding cache: {len(chunks) - len(chunks_to_embed)}/{len(chunks)} hits"
+                f"Embedding cache: {stats.cache_hits + stats.stored_hits}/{stats.unique_chunks} "
+                f"unique chunks reused, {stats.generated} generated "
+                f"({stats.embeddings_per_second:.1f} embeddings/sec)"
             )
 
-            # Generate embeddings for uncached chunks
-            embeddings = [None] * len(chunks)
-
-            # Fill in cached embeddings
-            for i, chunk_hash in enumerate(chunk_hashes):
-                if cached_embeddings.get(chunk_hash) is not None:
-                    embeddings[i] = cached_embeddings[chunk_hash]
-
-            # Generate new embeddings if needed
-            if chunks_to_embed:
-                async with profiler.profile_stage(source_id, "embedding_generation"):
-                    logger.info(f"Generating embeddings for {len(chunks_to_embed)} chunks")
-                    new_embeddings = _generate_embeddings(chunks_to_embed)
-
-                # Fill in new embeddings and cache them
-                new_embeddings_to_cache = {}
-                for idx, embedding in zip(chunks_to_embed_indices, new_embeddings):
-                    embeddings[idx] = embedding
-                    new_embeddings_to_cache[chunk_hashes[idx]] = embedding
-
-                # Cache the new embeddings
-                await cache.cache_embeddings_batch(new_embeddings_to_cache)
+            async with profiler.profile_stage(source_id, "embedding_storage"):
+                await asyncio.to_thread(store.finish)
 
-            return chunks, embeddings
+            return stats.total_chunks
 
-        chunks, embeddings = run_async(chunk_and_embed_with_cache())
+        chunk_count = run_async(chunk_embed_and_store())
 
         _update_status(supabase, source_id, "processing", progress=80)
         broadcaster.broadcast_progress(
@@ -342,10 +341,10 @@ def process_source(
             task_name=task_name,
             current=80,
             total=100,
-            message=f"Generated {len(chunks)} embeddings, storing in database",
+            message=f"Generated and stored {chunk_count} embeddings",
             stage=ProcessingStage.EMBEDDING,
             task_type=TaskType.SOURCE_PROCESSING,
-            metadata={"source_id": source_id, "stage": "embeddings_generated", "chunk_count": len(chunks)}
+            metadata={"source_id": source_id, "stage": "embeddings_generated", "chunk_count": chunk_count}
         )
         # Task 62: WebSocket source status notification
         broadcaster.broadcast_source_status(
@@ -353,28 +352,12 @@ def process_source(
             project_id=project_id,
             status="processing",
             progress=80,
-            message=f"Generated {len(chunks)} embeddings, storing in database",
+            message=f"Generated and stored {chunk_count} embeddings",
             source_type=source_type,
             file_name=file_name,
-            metadata={"chunk_count": len(chunks)}
+            metadata={"chunk_count": chunk_count}
         )
 
-        # Task 69: Store embeddings with profiling
-        # Feature 007: Pass content set context for relationship creation
-        async def store_with_profiling():
-            async with profiler.profile_stage(source_id, "embedding_storage"):
-                _store_embeddings(
-                    supabase=supabase,
-                    source_id=source_id,
-                    project_id=project_id,
-                    user_id=user_id,
-                    chunks=chunks,
-                    embeddings=embeddings,
-                    content_set_context=content_set_context  # Feature 007
-                )
-
-        run_async(store_with_profiling())
-
         # Update source with content, summary, and metadata
         # Feature 007: Include content set context in metadata
         if content_set_context:
@@ -405,7 +388,7 @@ def process_source(
             task_name=task_name,
             result={
                 "source_id": source_id,
-                "chunks_created": len(chunks),
+                "chunks_created": chunk_count,
                 "content_length": len(content),
                 "has_summary": bool(summary)
             },
@@ -421,7 +404,7 @@ def process_source(
             message="Source processed successfully",
             source_type=source_type,
             file_name=file_name,
-            metadata={"chunks_created": len(chunks), "content_length": len(content)}
+            metadata={"chunks_created": chunk_count, "content_length": len(content)}
         )
 
         logger.info(f"Source processing completed: {source_id}")
@@ -430,7 +413,7 @@ def process_source(
         result = {
             "status": "success",
             "source_id": source_id,
-            "chunks_created": len(chunks),
+            "chunks_created": chunk_count,
             "content_length": len(content),
             "has_summary": bool(summary)
         }
@@ -1063,8 +1046,7 @@ def _is_markdown_content(content: str, min_headers: int = 2) -> bool:
     Returns:
         True if content has sufficient markdown structure
     """
-    headers = HEADER_PATTERN.findall(content)
-    return len(headers) >= min_headers
+    return resolve_auto_strategy(content, min_headers) == "markdown"
 
 
 def _chunk_content(content: str, chunk_size: int = 512, document_id: str = None) -> List[str]:
@@ -1122,6 +1104,67 @@ def _chunk_content(content: str, chunk_size: int = 512, document_id: str = None)
         "Using sentence-aware chunking",
         extra={"document_id": document_id, "strategy": "sentence"}
     )
+    return _sentence_chunks(content, chunk_size)
+
+
+async def _aiter_chunk_content(
+    content: str,
+    chunk_size: int = 512,
+    document_id: str = None
+) -> AsyncIterator[str]:
+    """
+    Stream chunk strings from the chunking engine in document order.
+
+    Lets embedding start on the first chunks while the rest are still being
+    chunked (see SourceEmbeddingPipeline.embed_chunk_stream).
+
+    Args:
+        content: Document text to chunk
+        chunk_size: Target size for chunks in tokens
+        document_id: Optional document identifier for logging
+
+    Yields:
+        Chunk strings
+    """
+    engine = get_chunking_engine()
+
+    if _is_markdown_content(content):
+        logger.info(
+            "Using markdown-aware chunking",
+            extra={"document_id": document_id, "strategy": "markdown"}
+        )
+        produced = 0
+        try:
+            async for chunk in engine.stream_chunks(
+                content,
+                document_id or "unknown",
+                strategy="markdown",
+                chunk_size=chunk_size,
+                chunk_overlap=int(chunk_size * 0.2)  # 20% overlap
+            ):
+                produced += 1
+                yield chunk.content
+            return
+
+        except Exception as e:
+            # Chunks already handed out cannot be taken back
+            if produced:
+                raise
+            logger.warning(
+                f"Markdown chunking failed, falling back to sentence chunking: {e}",
+                extra={"document_id": document_id, "error": str(e)}
+            )
+
+    logger.debug(
+        "Using sentence-aware chunking",
+        extra={"document_id": document_id, "strategy": "sentence"}
+    )
+    for chunk in await engine.map_segments(_sentence_chunks, content, chunk_size):
+        yield chunk
+
+
+def _sentence_chunks(content: str, chunk_size: int = 512) -> List[str]:
+    """Split content at sentence boundaries into chunks of about chunk_size words"""
     sentences = re.split(r'(?<=[.!?])\s+', content)
     chunks = []
     current_chunk = []
@@ -1143,87 +1186,139 @@ def _chunk_content(content: str, chunk_size: int = 512, document_id: str = None)
     return chunks
 
 
-def _generate_embeddings(chunks: List[str]) -> List[List[float]]:
-    """Generate embeddings using BGE-M3 via Ollama"""
-    try:
-        import requests
-
-        ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        embeddings = []
-
-        for chunk in chunks:
-            response = requests.post(
-                f"{ollama_url}/api/embeddings",
-                json={"model": "bge-m3", "prompt": chunk},
-                timeout=30
-            )
-            response.raise_for_status()
-            embedding = response.json().get("embedding", [])
-            embeddings.append(embedding)
-
-        return embeddings
-
-    except Exception as e:
-        logger.error(f"Embedding generation failed: {e}")
-        raise
-
-
-def _store_embeddings(
-    supabase,
-    source_id: str,
-    project_id: str,
-    user_id: str,
-    chunks: List[str],
-    embeddings: List[List[float]],
-    content_set_context: Optional[Dict[str, Any]] = None  # Feature 007
-):
+class _SourceEmbeddingStore:
     """
-    Store embeddings in source_embeddings table.
+    Streams source_embeddings rows to Supabase as embedding groups arrive
 
     Feature 007: Enhanced with content set context metadata.
+
+    Rows are written in batches by SupabaseBulkWriter; retries skip rows
+    already stored (same chunk_hash and chunk_index). If a batch still
+    fails, or the caller calls rollback(), rows written so far are removed
+    so a task retry starts clean.
     """
-    try:
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            embedding_id = str(uuid4())
-            chunk_hash = hashlib.md5(chunk.encode()).hexdigest()
 
+    def __init__(
+        self,
+        supabase,
+        source_id: str,
+        project_id: str,
+        user_id: str,
+        content_set_context: Optional[Dict[str, Any]] = None  # Feature 007
+    ):
+        self.supabase = supabase
+        self.source_id = source_id
+        self.project_id = project_id
+        self.user_id = user_id
+        self.content_set_context = content_set_context
+        self.row_ids: List[str] = []
+        self.content_set_metadata = None
+        if content_set_context:
+            self.content_set_metadata = {
+                "content_set_id": content_set_context.get("content_set_id"),
+                "content_set_name": content_set_context.get("content_set_name"),
+                "sequence_number": content_set_context.get("sequence_number"),
+                "is_part_of_sequence": True
+            }
+        self.writer = SupabaseBulkWriter(
+            supabase,
+            "source_embeddings",
+            batch_size=EMBEDDING_WRITE_BATCH_SIZE,
+            idempotency_keys=("chunk_hash", "chunk_index"),
+            scope={"source_id": source_id}
+        )
+
+    def _rows(self, start_index: int, chunks: List[str], embeddings: List[List[float]]):
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings), start=start_index):
+            embedding_id = str(uuid4())
+            self.row_ids.append(embedding_id)
             embedding_data = {
                 "id": embedding_id,
-                "source_id": source_id,
-                "project_id": project_id,
-                "user_id": user_id,
+                "source_id": self.source_id,
+                "project_id": self.project_id,
+                "user_id": self.user_id,
                 "chunk_index": i,
                 "chunk_text": chunk[:5000],  # Limit text length
-                "chunk_hash": chunk_hash,
+                "chunk_hash": hashlib.md5(chunk.encode()).hexdigest(),
                 "embedding": embedding,
                 "created_at": datetime.utcnow().isoformat(),
             }
 
             # Feature 007: Add content set metadata if available
-            if content_set_context:
-                embedding_data["metadata"] = {
-                    "content_set_id": content_set_context.get("content_set_id"),
-                    "content_set_name": content_set_context.get("content_set_name"),
-                    "sequence_number": content_set_context.get("sequence_number"),
-                    "is_part_of_sequence": True
-                }
+            if self.content_set_metadata:
+                embedding_data["metadata"] = self.content_set_metadata
+
+            yield embedding_data
 
-            supabase.table("source_embeddings").insert(embedding_data).execute()
+    def add(self, start_index: int, chunks: List[str], embeddings: List[List[float]]):
+        """Buffer one group of embeddings, writing every full batch"""
+        try:
+            self.writer.add_many(self._rows(start_index, chunks, embeddings))
+        except BulkWriteError:
+            self.rollback()
+            raise
 
-        logger.info(f"Stored {len(embeddings)} embeddings for source {source_id}")
+    def finish(self):
+        """Write the remaining rows and create content set relationships"""
+        try:
+            self.writer.flush()
+        except BulkWriteError:
+            self.rollback()
+            raise
+
+        stats = self.writer.stats
+        logger.info(
+            f"Bulk write: {stats.rows_written} rows in {stats.batches} batches "
+            f"({stats.retries} retries, {stats.duration_ms:.0f}ms)"
+        )
+        logger.info(f"Stored {len(self.row_ids)} embeddings for source {self.source_id}")
 
         # Feature 007: Create Neo4j relationships if content set context provided
-        if content_set_context:
+        if self.content_set_context:
             _create_content_set_relationships(
-                source_id=source_id,
-                content_set_context=content_set_context
+                source_id=self.source_id,
+                content_set_context=self.content_set_context
             )
 
+    def rollback(self):
+        """Remove rows written by this store"""
+        _delete_source_embeddings(self.supabase, self.source_id, self.row_ids)
+
+
+def _store_embeddings(
+    supabase,
+    source_id: str,
+    project_id: str,
+    user_id: str,
+    chunks: List[str],
+    embeddings: List[List[float]],
+    content_set_context: Optional[Dict[str, Any]] = None  # Feature 007
+):
+    """
+    Store embeddings in source_embeddings table (see _SourceEmbeddingStore).
+    """
+    try:
+        store = _SourceEmbeddingStore(supabase, source_id, project_id, user_id, content_set_context)
+        store.add(0, chunks, embeddings)
+        store.finish()
     except Exception as e:
         logger.error(f"Failed to store embeddings: {e}")
         raise
 
 
+def _delete_source_embeddings(supabase, source_id: str, row_ids: List[str]):
+    """Remove partially written embeddings for a source"""
+    try:
+        for start in range(0, len(row_ids), EMBEDDING_WRITE_BATCH_SIZE):
+            supabase.table("source_embeddings")\
+                .delete()\
+                .in_("id", row_ids[start:start + EMBEDDING_WRITE_BATCH_SIZE])\
+                .execute()
+        logger.info(f"Rolled back {len(row_ids)} partial embeddings for source {source_id}")
+    except Exception as e:
+        logger.error(f"Failed to roll back embeddings for source {source_id}: {e}")
+
+
 def _create_content_set_relationships(
     source_id: str,
     content_set_context: Dict[str, Any]
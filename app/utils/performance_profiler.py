@@ -158,7 +158,8 @@ class SourceProcessingProfile:
                     "duration_ms": s.duration_ms,
                     "memory_delta_mb": s.memory_delta_mb,
                     "success": s.success,
-                    "error": s.error
+                    "error": s.error,
+                    "metadata": s.metadata
                 }
                 for s in self.stages
             ],
@@ -0,0 +1,43 @@
+-- Empire v7.3 - Asset Near-Duplicate LSH Index Migration
+-- Stores a MinHash signature and LSH band keys with each studio asset so
+-- near-duplicate checks fetch only assets sharing a band bucket, plus a
+-- set-based update used by the backfill job.
+
+-- ============================================================================
+-- STEP 1: Signature columns
+-- ============================================================================
+
+ALTER TABLE studio_assets ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE studio_assets ADD COLUMN IF NOT EXISTS minhash_signature INTEGER[];
+ALTER TABLE studio_assets ADD COLUMN IF NOT EXISTS lsh_bands TEXT[];
+
+-- ============================================================================
+-- STEP 2: Indexes
+-- ============================================================================
+
+-- Backs the lsh_bands && ARRAY[...] overlap query
+CREATE INDEX IF NOT EXISTS idx_assets_lsh_bands
+    ON studio_assets USING gin(lsh_bands);
+
+CREATE INDEX IF NOT EXISTS idx_assets_user_content_hash
+    ON studio_assets(user_id, content_hash);
+
+-- Lets the backfill find unindexed assets without a full scan
+CREATE INDEX IF NOT EXISTS idx_assets_lsh_pending
+    ON studio_assets(id) WHERE lsh_bands IS NULL;
+
+-- ============================================================================
+-- STEP 3: Bulk update of LSH fields
+-- ============================================================================
+
+-- p_rows: JSON array of {"id": "<uuid>", "minhash_signature": [..ints..], "lsh_bands": [..text..]}
+-- Returns the ids that were updated
+CREATE OR REPLACE FUNCTION bulk_update_asset_lsh(p_rows JSONB)
+RETURNS SETOF UUID AS $$
+    UPDATE studio_assets AS t
+       SET minhash_signature = ARRAY(SELECT jsonb_array_elements_text(r.minhash_signature))::INTEGER[],
+           lsh_bands = ARRAY(SELECT jsonb_array_elements_text(r.lsh_bands))
+      FROM jsonb_to_recordset(p_rows) AS r(id UUID, minhash_signature JSONB, lsh_bands JSONB)
+     WHERE t.id = r.id
+ RETURNING t.id;
+$$ LANGUAGE sql;
@@ -0,0 +1,42 @@
+-- Empire v7.3 - Bulk Embedding Writes Migration
+-- Adds a set-based embedding update for chunks/document_chunks so embedding
+-- generation can store a whole batch in one request instead of one UPDATE
+-- per chunk, plus an index backing chunk_hash dedup on source_embeddings.
+
+-- ============================================================================
+-- STEP 1: Bulk update of chunk embeddings
+-- ============================================================================
+
+-- p_rows: JSON array of {"id": "<uuid>", "embedding": [..floats..]}
+-- Returns the ids that were updated (missing ids are simply not returned,
+-- so callers can retry them against another table)
+CREATE OR REPLACE FUNCTION bulk_update_chunk_embeddings(
+    p_table TEXT,
+    p_rows JSONB
+)
+RETURNS SETOF UUID AS $$
+BEGIN
+    IF p_table NOT IN ('chunks', 'document_chunks') THEN
+        RAISE EXCEPTION 'bulk_update_chunk_embeddings: unsupported table %', p_table;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'UPDATE %I AS t
+            SET embedding = r.embedding::vector
+           FROM jsonb_to_recordset($1) AS r(id UUID, embedding TEXT)
+          WHERE t.id = r.id
+      RETURNING t.id',
+        p_table
+    ) USING p_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- STEP 2: Index for chunk_hash dedup and idempotent retries
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_source_embeddings_source_chunk_hash
+    ON source_embeddings(source_id, chunk_hash);
+
+CREATE INDEX IF NOT EXISTS idx_source_embeddings_project_chunk_hash
+    ON source_embeddings(project_id, chunk_hash);
@@ -0,0 +1,114 @@
+-- Empire v7.3 - Chunk Changes Migration
+-- Row-level change log for the chunks table. The in-process BM25 index
+-- (app/services/bm25_index.py) reads the changes after the last sequence
+-- number it applied and adds, replaces or removes just those documents,
+-- whichever process or pipeline wrote the rows. A full rebuild is only
+-- needed on a cold start without a snapshot, after TRUNCATE, or when the
+-- log has been pruned past the index (drift repair).
+
+-- ============================================================================
+-- STEP 1: Change log table
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS chunk_changes (
+    seq BIGSERIAL PRIMARY KEY,
+    chunk_id TEXT,                                   -- NULL for TRUNCATE
+    op CHAR(1) NOT NULL CHECK (op IN ('U', 'D', 'T')),  -- Upsert / Delete / Truncate
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_changes_changed_at ON chunk_changes(changed_at);
+
+-- ============================================================================
+-- STEP 2: Triggers
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION log_chunk_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO chunk_changes (chunk_id, op) VALUES (OLD.id::text, 'D');
+    ELSE
+        INSERT INTO chunk_changes (chunk_id, op) VALUES (NEW.id::text, 'U');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION log_chunks_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO chunk_changes (chunk_id, op) VALUES (NULL, 'T');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Embedding-only updates do not change the sparse index and are not logged
+DROP TRIGGER IF EXISTS chunk_changes_trigger ON chunks;
+CREATE TRIGGER chunk_changes_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF content, metadata, file_id ON chunks
+    FOR EACH ROW
+    EXECUTE FUNCTION log_chunk_change();
+
+DROP TRIGGER IF EXISTS chunk_changes_truncate_trigger ON chunks;
+CREATE TRIGGER chunk_changes_truncate_trigger
+    AFTER TRUNCATE ON chunks
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION log_chunks_truncate();
+
+-- ============================================================================
+-- STEP 3: Readers
+-- ============================================================================
+
+-- Oldest retained and newest sequence numbers (0 when the log is empty)
+CREATE OR REPLACE FUNCTION get_chunk_changes_head()
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'first_seq', COALESCE(MIN(seq), 0),
+        'last_seq', COALESCE(MAX(seq), 0)
+    )
+    FROM chunk_changes;
+$$ LANGUAGE sql STABLE;
+
+-- Changes after p_after_seq with the chunk's current content. A row whose
+-- chunk no longer exists comes back with op 'D', whatever was logged.
+CREATE OR REPLACE FUNCTION get_chunk_changes(
+    p_after_seq BIGINT,
+    p_limit INTEGER DEFAULT 1000
+)
+RETURNS TABLE (
+    seq BIGINT,
+    chunk_id TEXT,
+    op CHAR(1),
+    content TEXT,
+    metadata JSONB,
+    file_id TEXT
+) AS $$
+    SELECT
+        cc.seq,
+        cc.chunk_id,
+        CASE WHEN cc.op = 'U' AND c.id IS NULL THEN 'D' ELSE cc.op END::CHAR(1),
+        c.content,
+        c.metadata,
+        c.file_id::text
+    FROM chunk_changes cc
+    LEFT JOIN chunks c ON cc.op = 'U' AND c.id::text = cc.chunk_id
+    WHERE cc.seq > p_after_seq
+    ORDER BY cc.seq
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- STEP 4: Retention
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION prune_chunk_changes(p_keep INTERVAL DEFAULT INTERVAL '7 days')
+RETURNS BIGINT AS $$
+DECLARE
+    removed BIGINT;
+BEGIN
+    DELETE FROM chunk_changes WHERE changed_at < NOW() - p_keep;
+    GET DIAGNOSTICS removed = ROW_COUNT;
+    RETURN removed;
+END;
+$$ LANGUAGE plpgsql;
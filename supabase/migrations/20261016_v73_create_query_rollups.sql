@@ -0,0 +1,122 @@
+-- Empire v7.3 - Query Analytics Rollups Migration
+-- Per-minute and per-hour pre-aggregates of query_logs / click_events so the
+-- analytics dashboard and latency percentiles read rollups instead of raw
+-- rows. Rows are incremented by the API (batched deltas) and recomputed per
+-- hour by the backfill job.
+
+-- ============================================================================
+-- STEP 1: Rollup table
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS query_rollups (
+    granularity TEXT NOT NULL CHECK (granularity IN ('minute', 'hour')),
+    bucket_start TIMESTAMPTZ NOT NULL,
+    search_type TEXT NOT NULL DEFAULT 'unknown',
+    department TEXT NOT NULL DEFAULT '',  -- '' = no department
+    query_count BIGINT NOT NULL DEFAULT 0,
+    result_count_sum BIGINT NOT NULL DEFAULT 0,
+    latency_sum_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+    latency_max_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+    -- Counts per fixed log-spaced latency bucket (see query_rollup_service.py)
+    latency_histogram BIGINT[] NOT NULL DEFAULT '{}',
+    impressions BIGINT NOT NULL DEFAULT 0,  -- Queries that returned results (CTR denominator)
+    clicks BIGINT NOT NULL DEFAULT 0,       -- CTR numerator
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (granularity, bucket_start, search_type, department)
+);
+
+-- ============================================================================
+-- STEP 2: Indexes
+-- ============================================================================
+
+-- The primary key serves unfiltered range reads; these back the filters
+CREATE INDEX IF NOT EXISTS idx_query_rollups_search_type
+    ON query_rollups(granularity, search_type, bucket_start);
+
+CREATE INDEX IF NOT EXISTS idx_query_rollups_department
+    ON query_rollups(granularity, department, bucket_start);
+
+-- ============================================================================
+-- STEP 3: Functions
+-- ============================================================================
+
+-- Element-wise sum of two histograms (the shorter one is zero-padded)
+CREATE OR REPLACE FUNCTION add_query_rollup_histograms(a BIGINT[], b BIGINT[])
+RETURNS BIGINT[] AS $$
+    SELECT COALESCE(array_agg(COALESCE(x, 0) + COALESCE(y, 0) ORDER BY i), '{}')
+      FROM unnest(a, b) WITH ORDINALITY AS h(x, y, i);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- p_deltas: JSON array of rollup rows; each is added to the stored row for
+-- its key (created if missing). Keys must be unique within one call.
+-- Returns the number of rows written
+CREATE OR REPLACE FUNCTION apply_query_rollup_deltas(p_deltas JSONB)
+RETURNS INTEGER AS $$
+    WITH applied AS (
+        INSERT INTO query_rollups AS t (
+            granularity, bucket_start, search_type, department,
+            query_count, result_count_sum, latency_sum_ms, latency_max_ms,
+            latency_histogram, impressions, clicks
+        )
+        SELECT r.granularity, r.bucket_start, r.search_type, r.department,
+               r.query_count, r.result_count_sum, r.latency_sum_ms, r.latency_max_ms,
+               ARRAY(SELECT jsonb_array_elements_text(r.latency_histogram))::BIGINT[],
+               r.impressions, r.clicks
+          FROM jsonb_to_recordset(p_deltas) AS r(
+               granularity TEXT, bucket_start TIMESTAMPTZ, search_type TEXT, department TEXT,
+               query_count BIGINT, result_count_sum BIGINT, latency_sum_ms DOUBLE PRECISION,
+               latency_max_ms DOUBLE PRECISION, latency_histogram JSONB, impressions BIGINT, clicks BIGINT)
+        ON CONFLICT (granularity, bucket_start, search_type, department) DO UPDATE SET
+            query_count = t.query_count + EXCLUDED.query_count,
+            result_count_sum = t.result_count_sum + EXCLUDED.result_count_sum,
+            latency_sum_ms = t.latency_sum_ms + EXCLUDED.latency_sum_ms,
+            latency_max_ms = GREATEST(t.latency_max_ms, EXCLUDED.latency_max_ms),
+            latency_histogram = add_query_rollup_histograms(t.latency_histogram, EXCLUDED.latency_histogram),
+            impressions = t.impressions + EXCLUDED.impressions,
+            clicks = t.clicks + EXCLUDED.clicks,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM applied;
+$$ LANGUAGE sql;
+
+-- Backfill: replace every rollup row with p_start <= bucket_start < p_end by
+-- p_rows (recomputed from raw logs) in one transaction, so re-runs are
+-- idempotent. Returns the number of rows written
+CREATE OR REPLACE FUNCTION replace_query_rollups(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ, p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    DELETE FROM query_rollups
+     WHERE bucket_start >= p_start
+       AND bucket_start < p_end;
+
+    INSERT INTO query_rollups AS t (
+        granularity, bucket_start, search_type, department,
+        query_count, result_count_sum, latency_sum_ms, latency_max_ms,
+        latency_histogram, impressions, clicks
+    )
+    SELECT r.granularity, r.bucket_start, r.search_type, r.department,
+           r.query_count, r.result_count_sum, r.latency_sum_ms, r.latency_max_ms,
+           ARRAY(SELECT jsonb_array_elements_text(r.latency_histogram))::BIGINT[],
+           r.impressions, r.clicks
+      FROM jsonb_to_recordset(p_rows) AS r(
+           granularity TEXT, bucket_start TIMESTAMPTZ, search_type TEXT, department TEXT,
+           query_count BIGINT, result_count_sum BIGINT, latency_sum_ms DOUBLE PRECISION,
+           latency_max_ms DOUBLE PRECISION, latency_histogram JSONB, impressions BIGINT, clicks BIGINT)
+    -- A live flush may have re-created a key since the DELETE
+    ON CONFLICT (granularity, bucket_start, search_type, department) DO UPDATE SET
+        query_count = EXCLUDED.query_count,
+        result_count_sum = EXCLUDED.result_count_sum,
+        latency_sum_ms = EXCLUDED.latency_sum_ms,
+        latency_max_ms = EXCLUDED.latency_max_ms,
+        latency_histogram = EXCLUDED.latency_histogram,
+        impressions = EXCLUDED.impressions,
+        clicks = EXCLUDED.clicks,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,10 @@
+-- Empire v7.3 - Rollback Asset Near-Duplicate LSH Index Migration
+
+DROP FUNCTION IF EXISTS bulk_update_asset_lsh(JSONB);
+
+DROP INDEX IF EXISTS idx_assets_lsh_pending;
+DROP INDEX IF EXISTS idx_assets_user_content_hash;
+DROP INDEX IF EXISTS idx_assets_lsh_bands;
+
+ALTER TABLE studio_assets DROP COLUMN IF EXISTS lsh_bands;
+ALTER TABLE studio_assets DROP COLUMN IF EXISTS minhash_signature;
@@ -0,0 +1,6 @@
+-- Empire v7.3 - Rollback Bulk Embedding Writes Migration
+
+DROP INDEX IF EXISTS idx_source_embeddings_project_chunk_hash;
+DROP INDEX IF EXISTS idx_source_embeddings_source_chunk_hash;
+
+DROP FUNCTION IF EXISTS bulk_update_chunk_embeddings(TEXT, JSONB);
@@ -0,0 +1,12 @@
+-- Empire v7.3 - Rollback Chunk Changes Migration
+
+DROP FUNCTION IF EXISTS prune_chunk_changes(INTERVAL);
+DROP FUNCTION IF EXISTS get_chunk_changes(BIGINT, INTEGER);
+DROP FUNCTION IF EXISTS get_chunk_changes_head();
+
+DROP TRIGGER IF EXISTS chunk_changes_truncate_trigger ON chunks;
+DROP TRIGGER IF EXISTS chunk_changes_trigger ON chunks;
+DROP FUNCTION IF EXISTS log_chunks_truncate();
+DROP FUNCTION IF EXISTS log_chunk_change();
+
+DROP TABLE IF EXISTS chunk_changes;
@@ -0,0 +1,10 @@
+-- Empire v7.3 - Rollback Query Analytics Rollups Migration
+
+DROP FUNCTION IF EXISTS replace_query_rollups(TIMESTAMPTZ, TIMESTAMPTZ, JSONB);
+DROP FUNCTION IF EXISTS apply_query_rollup_deltas(JSONB);
+DROP FUNCTION IF EXISTS add_query_rollup_histograms(BIGINT[], BIGINT[]);
+
+DROP INDEX IF EXISTS idx_query_rollups_department;
+DROP INDEX IF EXISTS idx_query_rollups_search_type;
+
+DROP TABLE IF EXISTS query_rollups;
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+DAG Scheduler Benchmark - Critical Path vs Waves
+
+Simulates research jobs on synthetic task graphs and compares makespan of:
+
+- waves:          identify_execution_waves() + the batching of _execute_wave()
+                  (each wave, and each batch of max_concurrent tasks within it,
+                  waits for its slowest task)
+- critical-path:  CriticalPathScheduler with unit task costs (the default)
+- cp-weighted:    CriticalPathScheduler with per-task-type cost estimates
+                  (ConcurrencyConfig.task_type_weights)
+
+Tasks are asyncio sleeps with durations drawn per task type, with a share of
+stragglers, so no Celery worker or database is needed. Times are scaled down
+(1 simulated second = --scale real seconds).
+
+Usage:
+    python tests/load_testing/dag_scheduler_benchmark.py [--graphs 10] [--tasks 30]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import structlog
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from app.services.concurrent_execution import (  # noqa: E402
+    ConcurrencyConfig,
+    ConcurrentExecutionEngine,
+    CriticalPathScheduler,
+    DynamicConcurrencyConfig,
+    DynamicConcurrencyController,
+    ExecutionMetrics,
+    ExecutionNode,
+)
+
+# Mean simulated seconds per task type
+TASK_TYPE_MEANS = {
+    "retrieval_rag": 4.0,
+    "retrieval_graph": 6.0,
+    "retrieval_api": 8.0,
+    "synthesis": 12.0,
+    "fact_check": 5.0,
+    "write_section": 10.0,
+}
+STRAGGLER_RATE = 0.1
+STRAGGLER_FACTOR = 4.0
+
+
+def make_graph(rng: random.Random, num_tasks: int, layers: int, max_deps: int):
+    """Layered random DAG; returns (graph, simulated duration per task_key)"""
+    layer_of = sorted(rng.randrange(layers) for _ in range(num_tasks))
+    graph = {}
+    durations = {}
+
+    for i, layer in enumerate(layer_of):
+        key = f"t{i:03d}"
+        earlier = [f"t{j:03d}" for j in range(i) if layer_of[j] < layer]
+        deps = rng.sample(earlier, min(len(earlier), rng.randint(1, max_deps))) if earlier else []
+        task_type = rng.choice(list(TASK_TYPE_MEANS))
+
+        duration = rng.expovariate(1.0 / TASK_TYPE_MEANS[task_type]) * 0.5 + TASK_TYPE_MEANS[task_type] * 0.5
+        if rng.random() < STRAGGLER_RATE:
+            duration *= STRAGGLER_FACTOR
+
+        graph[key] = ExecutionNode(task_id=i, task_key=key, task_type=task_type, dependencies=deps)
+        durations[key] = duration
+
+    for key, node in graph.items():
+        for dep in node.dependencies:
+            graph[dep].dependents.append(key)
+    return graph, durations
+
+
+def copy_graph(graph):
+    return {
+        key: ExecutionNode(
+            task_id=node.task_id,
+            task_key=key,
+            task_type=node.task_type,
+            dependencies=list(node.dependencies),
+            dependents=list(node.dependents),
+        )
+        for key, node in graph.items()
+    }
+
+
+def lower_bound(graph, durations, concurrency: int) -> float:
+    """max(longest chain, total work / concurrency) in simulated seconds"""
+    finish = {}
+    for wave in ConcurrentExecutionEngine(supabase=None).identify_execution_waves(graph):
+        for key in wave:
+            finish[key] = durations[key] + max(
+                (finish[dep] for dep in graph[key].dependencies if dep in finish), default=0.0
+            )
+    return max(max(finish.values()), sum(durations.values()) / concurrency)
+
+
+async def run_waves(graph, durations, concurrency: int, scale: float) -> float:
+    engine = ConcurrentExecutionEngine(supabase=None)
+    start = time.perf_counter()
+    for wave in engine.identify_execution_waves(graph):
+        for i in range(0, len(wave), concurrency):
+            batch = wave[i:i + concurrency]
+            await asyncio.gather(*(asyncio.sleep(durations[k] * scale) for k in batch))
+    return (time.perf_counter() - start) / scale
+
+
+async def run_critical_path(graph, durations, concurrency: int, scale: float, weighted: bool) -> float:
+    async def run_task(node):
+        await asyncio.sleep(durations[node.task_key] * scale)
+        return {"success": True}
+
+    controller = DynamicConcurrencyController(
+        initial_concurrency=concurrency,
+        config=DynamicConcurrencyConfig(enabled=False, max_concurrency=concurrency)
+    )
+    scheduler = CriticalPathScheduler(
+        graph,
+        run_task=run_task,
+        controller=controller,
+        config=ConcurrencyConfig(),
+        task_cost=(lambda node: TASK_TYPE_MEANS[node.task_type]) if weighted else None,
+    )
+    start = time.perf_counter()
+    await scheduler.run(ExecutionMetrics(job_id=0))
+    return (time.perf_counter() - start) / scale
+
+
+async def benchmark(args) -> None:
+    rng = random.Random(args.seed)
+    results = {"waves": [], "critical-path": [], "cp-weighted": [], "lower-bound": []}
+
+    for _ in range(args.graphs):
+        graph, durations = make_graph(rng, args.tasks, args.layers, args.max_deps)
+        results["lower-bound"].append(lower_bound(graph, durations, args.concurrency))
+        results["waves"].append(await run_waves(copy_graph(graph), durations, args.concurrency, args.scale))
+        results["critical-path"].append(
+            await run_critical_path(copy_graph(graph), durations, args.concurrency, args.scale, weighted=False)
+        )
+        results["cp-weighted"].append(
+            await run_critical_path(copy_graph(graph), durations, args.concurrency, args.scale, weighted=True)
+        )
+
+    waves_mean = statistics.mean(results["waves"])
+    print(
+        f"\nMakespan over {args.graphs} graphs ({args.tasks} tasks, {args.layers} layers, "
+        f"concurrency {args.concurrency}), simulated seconds"
+    )
+    for name, makespans in results.items():
+        mean = statistics.mean(makespans)
+        print(
+            f"  {name:14s} mean {mean:7.1f}  p50 {statistics.median(makespans):7.1f}  "
+            f"max {max(makespans):7.1f}  vs waves {(mean / waves_mean - 1) * 100:+6.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graphs", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=30)
+    parser.add_argument("--layers", type=int, default=5)
+    parser.add_argument("--max-deps", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=0.002, help="Real seconds per simulated second")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Per-task logs would dominate the output
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Benchmark - Request Pipeline
+
+Measures per-request middleware overhead and SSE time-to-first-byte (TTFB)
+in-process, by driving the ASGI app directly (no server, no network):
+
+- bare:     no middleware
+- legacy:   the same number of layers as BaseHTTPMiddleware pass-throughs
+            (the structure the request middlewares used before the pipeline)
+- pipeline: the real RequestPipelineMiddleware stack
+
+The audit sink, Supabase (RLS RPC) and authentication are patched out inside
+this script so only middleware cost is measured.
+
+Usage:
+    python tests/load_testing/middleware_benchmark.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import structlog
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+SSE_EVENTS = 5
+SSE_INTERVAL = 0.01  # Seconds between events after the first
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    """BaseHTTPMiddleware layer that only forwards the request"""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    from app.middleware.pipeline import configure_request_pipeline
+
+    app = FastAPI()
+
+    if stack == "legacy":
+        for _ in range(7):
+            app.add_middleware(PassThroughMiddleware)
+    elif stack == "pipeline":
+        configure_request_pipeline(app, request_latency=MagicMock(), request_count=MagicMock())
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/events")
+    async def events():
+        async def stream():
+            for i in range(SSE_EVENTS):
+                if i:
+                    await asyncio.sleep(SSE_INTERVAL)
+                yield f"data: {i}\n\n".encode()
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def make_scope(path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"",
+        "headers": [(b"authorization", b"Bearer benchmark")],
+        "client": ("127.0.0.1", 50000), "server": ("benchmark", 80),
+    }
+
+
+async def run_request(app, path: str) -> tuple:
+    """Returns (total seconds, seconds to first body chunk)"""
+    first_body = None
+    done = asyncio.Event()
+    request_sent = False
+    start = time.perf_counter()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a server: block until the response is complete
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_body
+        if message["type"] == "http.response.body":
+            if message.get("body") and first_body is None:
+                first_body = time.perf_counter()
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(make_scope(path), receive, send)
+    end = time.perf_counter()
+    return end - start, (first_body or end) - start
+
+
+def summarize(samples: list) -> str:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered) * 1e6
+    p95 = ordered[int(len(ordered) * 0.95)] * 1e6
+    return f"p50 {p50:8.1f}us  p95 {p95:8.1f}us"
+
+
+async def benchmark(num_requests: int) -> None:
+    results = {}
+    for stack in ("bare", "legacy", "pipeline"):
+        app = build_app(stack)
+
+        # Warm up
+        for _ in range(50):
+            await run_request(app, "/api/ping")
+
+        totals = [(await run_request(app, "/api/ping"))[0] for _ in range(num_requests)]
+        ttfbs = [(await run_request(app, "/api/events"))[1] for _ in range(max(num_requests // 20, 20))]
+        results[stack] = (totals, ttfbs)
+
+    bare_p50 = statistics.median(results["bare"][0])
+    print(f"\nPer-request latency ({num_requests} requests, JSON endpoint)")
+    for stack, (totals, _) in results.items():
+        overhead = (statistics.median(totals) - bare_p50) * 1e6
+        print(f"  {stack:9s} {summarize(totals)}  overhead {overhead:7.1f}us")
+
+    print(f"\nSSE time to first byte ({SSE_EVENTS} events, {SSE_INTERVAL * 1000:.0f}ms apart)")
+    for stack, (_, ttfbs) in results.items():
+        print(f"  {stack:9s} {summarize(ttfbs)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from app.middleware.rls_context import RLSContextMiddleware
+
+    # Per-request logs would dominate the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with patch("app.middleware.audit.get_audit_log_sink", return_value=MagicMock()), \
+            patch.object(RLSContextMiddleware, "_set_rls_context", new_callable=AsyncMock), \
+            patch("app.middleware.identity.get_user_from_authorization",
+                  new_callable=AsyncMock, return_value="benchmark-user"), \
+            patch("app.middleware.identity.get_primary_role",
+                  new_callable=AsyncMock, return_value="viewer"):
+        asyncio.run(benchmark(args.requests))
+
+
+if __name__ == "__main__":
+    main()
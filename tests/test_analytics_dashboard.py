@@ -13,7 +13,6 @@ import pytest
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
 
 from app.services.analytics_dashboard_service import (
     AnalyticsDashboardService,
@@ -23,6 +22,16 @@ from app.services.analytics_dashboard_service import (
     WidgetConfig,
     WidgetType
 )
+from app.services.query_rollup_service import HOUR, QueryRollupService, RollupBucket, floor_time
+
+
+def _rollup(moment, latencies=(), clicks=0, search_type="hybrid"):
+    """Hour rollup row holding one query per latency"""
+    bucket = RollupBucket(granularity=HOUR, bucket_start=floor_time(moment, HOUR), search_type=search_type)
+    for latency in latencies:
+        bucket.add_query(latency_ms=latency, result_count=10)
+    bucket.clicks = clicks
+    return bucket
 
 
 @pytest.fixture
@@ -41,11 +50,20 @@ def mock_storage():
 
 
 @pytest.fixture
-def dashboard_service(mock_storage, mock_analytics_service):
+def mock_rollups(mock_storage):
+    """Rollup reader returning no rows unless a test sets them"""
+    rollups = QueryRollupService(mock_storage)
+    rollups.read_rollups = AsyncMock(return_value=[])
+    return rollups
+
+
+@pytest.fixture
+def dashboard_service(mock_storage, mock_analytics_service, mock_rollups):
     """Dashboard service instance"""
     return AnalyticsDashboardService(
         storage=mock_storage,
-        analytics_service=mock_analytics_service
+        analytics_service=mock_analytics_service,
+        rollups=mock_rollups
     )
 
 
@@ -53,14 +71,14 @@ class TestDashboardMetrics:
     """Test dashboard metrics aggregation"""
 
     @pytest.mark.asyncio
-    async def test_get_query_volume_metrics(self, dashboard_service, mock_analytics_service):
+    async def test_get_query_volume_metrics(self, dashboard_service, mock_rollups):
         """Test retrieving query volume metrics"""
-        # Mock query data
+        # Mock rollup data
         start_date = datetime.now(timezone.utc) - timedelta(days=7)
         end_date = datetime.now(timezone.utc)
 
-        mock_analytics_service.get_queries_by_date_range.return_value = [
-            {"query_id": str(uuid4()), "created_at": (start_date + timedelta(days=i)).isoformat()}
+        mock_rollups.read_rollups.return_value = [
+            _rollup(start_date + timedelta(days=i), latencies=[100.0])
             for i in range(7)
         ]
 
@@ -72,6 +90,7 @@ class TestDashboardMetrics:
         assert metrics["total_queries"] == 7
         assert metrics["avg_queries_per_day"] > 0
         assert "time_series" in metrics
+        assert sum(point["count"] for point in metrics["time_series"]) == 7
 
     @pytest.mark.asyncio
     async def test_get_latency_metrics(self, dashboard_service, mock_analytics_service):
@@ -132,15 +151,15 @@ class TestTimeSeriesData:
     """Test time-series data generation"""
 
     @pytest.mark.asyncio
-    async def test_generate_query_volume_time_series(self, dashboard_service, mock_analytics_service):
+    async def test_generate_query_volume_time_series(self, dashboard_service, mock_rollups):
         """Test generating time-series data for query volume"""
         start_date = datetime.now(timezone.utc) - timedelta(days=7)
         end_date = datetime.now(timezone.utc)
 
-        # Mock queries spread across 7 days - use Z suffix for timezone
-        mock_analytics_service.get_queries_by_date_range.return_value = [
-            {"query_id": str(uuid4()), "created_at": (start_date + timedelta(days=i % 7)).isoformat().replace("+00:00", "Z")}
-            for i in range(70)  # 10 queries per day
+        # Rollups spread across 7 days, 10 queries per day
+        mock_rollups.read_rollups.return_value = [
+            _rollup(start_date + timedelta(days=i, hours=1), latencies=[100.0] * 10)
+            for i in range(7)
         ]
 
         time_series = await dashboard_service.get_query_volume_time_series(
@@ -156,23 +175,17 @@ class TestTimeSeriesData:
         assert sum(time_series.values) == 70
 
     @pytest.mark.asyncio
-    async def test_generate_latency_time_series(self, dashboard_service, mock_storage):
+    async def test_generate_latency_time_series(self, dashboard_service, mock_rollups):
         """Test generating time-series data for latency"""
         start_date = datetime.now(timezone.utc) - timedelta(days=7)
         end_date = datetime.now(timezone.utc)
 
-        # Mock latency data
-        mock_result = MagicMock()
-        mock_result.data = [
-            {
-                "date": (start_date + timedelta(days=i)).isoformat(),
-                "avg_latency": 100 + (i * 10)
-            }
+        # Rollups with one latency level per day
+        mock_rollups.read_rollups.return_value = [
+            _rollup(start_date + timedelta(days=i, hours=1), latencies=[100 + (i * 10)] * 4)
             for i in range(7)
         ]
 
-        mock_storage.table.return_value.select.return_value.gte.return_value.lte.return_value.execute = AsyncMock(return_value=mock_result)
-
         time_series = await dashboard_service.get_latency_time_series(
             start_date=start_date,
             end_date=end_date,
@@ -180,28 +193,24 @@ class TestTimeSeriesData:
         )
 
         assert isinstance(time_series, TimeSeriesData)
-        assert len(time_series.timestamps) == 7
+        assert len(time_series.timestamps) == 8
         assert time_series.values[0] == 100
         assert time_series.values[6] == 160
+        assert time_series.values[7] == 0
+        assert time_series.metadata["query_count"][:7] == [4] * 7
 
     @pytest.mark.asyncio
-    async def test_generate_ctr_time_series(self, dashboard_service, mock_storage):
+    async def test_generate_ctr_time_series(self, dashboard_service, mock_rollups):
         """Test generating time-series data for CTR"""
         start_date = datetime.now(timezone.utc) - timedelta(days=7)
         end_date = datetime.now(timezone.utc)
 
-        # Mock CTR data over time
-        mock_result = MagicMock()
-        mock_result.data = [
-            {
-                "date": (start_date + timedelta(days=i)).isoformat(),
-                "ctr": 0.3 + (i * 0.01)
-            }
+        # 100 impressions per day, CTR rising by 1% a day
+        mock_rollups.read_rollups.return_value = [
+            _rollup(start_date + timedelta(days=i, hours=1), latencies=[100.0] * 100, clicks=30 + i)
             for i in range(7)
         ]
 
-        mock_storage.table.return_value.select.return_value.gte.return_value.lte.return_value.execute = AsyncMock(return_value=mock_result)
-
         time_series = await dashboard_service.get_ctr_time_series(
             start_date=start_date,
             end_date=end_date,
@@ -209,22 +218,23 @@ class TestTimeSeriesData:
         )
 
         assert isinstance(time_series, TimeSeriesData)
-        assert len(time_series.timestamps) == 7
+        assert len(time_series.timestamps) == 8
         assert time_series.values[0] == pytest.approx(0.3)
         assert time_series.values[6] == pytest.approx(0.36)
+        assert time_series.metadata["impressions"][0] == 100
 
 
 class TestFiltering:
     """Test dashboard filtering capabilities"""
 
     @pytest.mark.asyncio
-    async def test_filter_by_date_range(self, dashboard_service, mock_analytics_service):
+    async def test_filter_by_date_range(self, dashboard_service, mock_rollups):
         """Test filtering metrics by date range"""
         start_date = datetime.now(timezone.utc) - timedelta(days=30)
         end_date = datetime.now(timezone.utc) - timedelta(days=7)
 
-        mock_analytics_service.get_queries_by_date_range.return_value = [
-            {"query_id": str(uuid4()), "created_at": (start_date + timedelta(days=i)).isoformat()}
+        mock_rollups.read_rollups.return_value = [
+            _rollup(start_date + timedelta(days=i), latencies=[100.0])
             for i in range(23)  # 23 days of data
         ]
 
@@ -234,54 +244,67 @@ class TestFiltering:
         )
 
         # Verify date range was applied
-        mock_analytics_service.get_queries_by_date_range.assert_called_with(
+        mock_rollups.read_rollups.assert_called_with(
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            search_type=None,
+            department=None
         )
         assert metrics["total_queries"] == 23
 
     @pytest.mark.asyncio
-    async def test_filter_by_search_type(self, dashboard_service, mock_storage):
+    async def test_filter_by_search_type(self, dashboard_service, mock_rollups):
         """Test filtering metrics by search type (algorithm version)"""
         start_date = datetime.now(timezone.utc) - timedelta(days=7)
         end_date = datetime.now(timezone.utc)
 
-        # Mock filtered query data
-        mock_result = MagicMock()
-        mock_result.data = [
-            {"query_id": str(uuid4()), "search_type": "hybrid"}
-            for _ in range(10)
+        mock_rollups.read_rollups.return_value = [
+            _rollup(start_date + timedelta(hours=i), latencies=[100.0] * 2)
+            for i in range(5)
         ]
 
-        mock_storage.table.return_value.select.return_value.eq.return_value.gte.return_value.lte.return_value.execute = AsyncMock(return_value=mock_result)
-
         metrics = await dashboard_service.get_query_volume_metrics(
             start_date=start_date,
             end_date=end_date,
             search_type="hybrid"
         )
 
+        assert mock_rollups.read_rollups.call_args.kwargs["search_type"] == "hybrid"
         assert metrics["total_queries"] == 10
 
     @pytest.mark.asyncio
-    async def test_filter_by_department(self, dashboard_service, mock_storage):
+    async def test_filter_by_department(self, dashboard_service, mock_rollups):
         """Test filtering metrics by department"""
-        # Mock queries filtered by department
-        mock_result = MagicMock()
-        mock_result.data = [
-            {"query_id": str(uuid4()), "department": "Legal", "created_at": datetime.now(timezone.utc).isoformat()}
-            for _ in range(5)
+        mock_rollups.read_rollups.return_value = [
+            _rollup(datetime.now(timezone.utc), latencies=[100.0] * 5)
         ]
 
-        # Need to mock the full chain: table().select().eq().gte().lte().execute()
-        mock_storage.table.return_value.select.return_value.eq.return_value.gte.return_value.lte.return_value.execute = AsyncMock(return_value=mock_result)
-
         metrics = await dashboard_service.get_query_volume_metrics(
             department="Legal"
         )
 
+        assert mock_rollups.read_rollups.call_args.kwargs["department"] == "Legal"
         assert metrics["total_queries"] == 5
 
+    @pytest.mark.asyncio
+    async def test_latency_metrics_use_dashboard_filters(self, dashboard_service, mock_analytics_service):
+        """Latency stats are computed for the dashboard's range and filters"""
+        start_date = datetime.now(timezone.utc) - timedelta(days=7)
+        end_date = datetime.now(timezone.utc)
+
+        await dashboard_service.get_dashboard_metrics(
+            start_date=start_date,
+            end_date=end_date,
+            search_type="hybrid"
+        )
+
+        mock_analytics_service.get_latency_statistics.assert_called_with(
+            start_date=start_date,
+            end_date=end_date,
+            search_type="hybrid",
+            department=None
+        )
+
 
 class TestWidgetConfiguration:
     """Test dashboard widget configuration"""
@@ -417,13 +440,11 @@ class TestEdgeCases:
     """Test edge cases and error handling"""
 
     @pytest.mark.asyncio
-    async def test_empty_date_range(self, dashboard_service, mock_analytics_service):
+    async def test_empty_date_range(self, dashboard_service):
         """Test handling empty date range"""
         start_date = datetime.now(timezone.utc)
         end_date = datetime.now(timezone.utc)
 
-        mock_analytics_service.get_queries_by_date_range.return_value = []
-
         metrics = await dashboard_service.get_query_volume_metrics(
             start_date=start_date,
             end_date=end_date
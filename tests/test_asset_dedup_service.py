@@ -87,6 +87,8 @@ def mock_supabase_client():
     mock.neq.return_value = mock
     mock.order.return_value = mock
     mock.limit.return_value = mock
+    mock.overlaps.return_value = mock
+    mock.is_.return_value = mock
     mock.execute.return_value = Mock(data=[])
     return mock
 
@@ -116,6 +118,7 @@ async def test_check_duplicates_finds_exact_match(dedup_service, mock_supabase_c
     mock_supabase_client.execute.side_effect = [
         Mock(data=[exact_row]),
         Mock(data=[]),
+        Mock(data=[]),  # Unindexed candidates
     ]
 
     result = await dedup_service.check_duplicates("some content", "user-1")
@@ -151,6 +154,7 @@ async def test_check_duplicates_finds_near_match(dedup_service, mock_supabase_cl
     mock_supabase_client.execute.side_effect = [
         Mock(data=[]),  # No exact matches
         Mock(data=[near_row]),  # Near candidate
+        Mock(data=[]),  # Unindexed candidates
     ]
 
     result = await dedup_service.check_duplicates(content, "user-1")
@@ -176,6 +180,7 @@ async def test_check_duplicates_ignores_below_threshold(dedup_service, mock_supa
     mock_supabase_client.execute.side_effect = [
         Mock(data=[]),
         Mock(data=[unrelated_row]),
+        Mock(data=[]),  # Unindexed candidates
     ]
 
     result = await dedup_service.check_duplicates("hello world greetings", "user-1")
@@ -190,6 +195,7 @@ async def test_check_duplicates_excludes_specified_id(dedup_service, mock_supaba
     mock_supabase_client.execute.side_effect = [
         Mock(data=[]),
         Mock(data=[]),
+        Mock(data=[]),  # Unindexed candidates
     ]
 
     result = await dedup_service.check_duplicates(
@@ -216,6 +222,7 @@ async def test_check_duplicates_cross_department(dedup_service, mock_supabase_cl
     mock_supabase_client.execute.side_effect = [
         Mock(data=[exact_row]),
         Mock(data=[]),
+        Mock(data=[]),  # Unindexed candidates
     ]
 
     result = await dedup_service.check_duplicates(
@@ -233,3 +240,115 @@ async def test_find_duplicates_for_asset_raises_not_found(dedup_service, mock_su
 
     with pytest.raises(AssetDedupAssetNotFoundError, match="not found"):
         await dedup_service.find_duplicates_for_asset("nonexistent", "user-1")
+
+
+# =============================================================================
+# MinHash / LSH Index Tests
+# =============================================================================
+
+class TestMinHashLSH:
+    """Tests for signatures and band keys"""
+
+    def test_signature_deterministic_and_word_based(self):
+        from app.services.minhash_lsh import MinHasher
+
+        a = MinHasher().signature("The quick brown fox")
+        b = MinHasher().signature("fox brown   quick the")
+
+        assert a == b
+        assert len(a) == MinHasher().params.num_perm
+
+    def test_estimate_tracks_jaccard(self):
+        from app.services.minhash_lsh import MinHasher
+
+        hasher = MinHasher()
+        a = " ".join(f"word{i}" for i in range(400))
+        b = " ".join(f"word{i}" for i in range(100, 500))
+        estimate = hasher.estimate_similarity(hasher.signature(a), hasher.signature(b))
+
+        assert abs(estimate - AssetDedupService.jaccard_similarity(a, b)) < 0.15
+
+    def test_near_duplicates_share_a_band_and_unrelated_do_not(self):
+        base = " ".join(f"term{i}" for i in range(200))
+        near = base.replace("term7 ", "changed ").replace("term42 ", "edited ")
+        unrelated = " ".join(f"other{i}" for i in range(200))
+
+        bands = set(AssetDedupService.compute_lsh_fields(base)["lsh_bands"])
+
+        assert bands & set(AssetDedupService.compute_lsh_fields(near)["lsh_bands"])
+        assert not bands & set(AssetDedupService.compute_lsh_fields(unrelated)["lsh_bands"])
+
+    def test_empty_content_has_no_bands(self):
+        assert AssetDedupService.compute_lsh_fields("   ") == {"minhash_signature": [], "lsh_bands": []}
+
+
+@pytest.mark.asyncio
+async def test_near_match_candidates_queried_by_lsh_bucket(dedup_service, mock_supabase_client):
+    content = "the quick brown fox jumps over the lazy dog"
+    mock_supabase_client.execute.side_effect = [Mock(data=[]), Mock(data=[]), Mock(data=[])]
+
+    await dedup_service.check_duplicates(content, "user-1")
+
+    column, bands = mock_supabase_client.overlaps.call_args.args
+    assert column == "lsh_bands"
+    assert bands == AssetDedupService.compute_lsh_fields(content)["lsh_bands"]
+    mock_supabase_client.limit.assert_any_call(AssetDedupService.MAX_LSH_CANDIDATES)
+
+
+@pytest.mark.asyncio
+async def test_unindexed_assets_are_near_match_candidates(dedup_service, mock_supabase_client):
+    """Assets created without lsh_bands are compared until the backfill indexes them."""
+    content = "the quick brown fox jumps over the lazy dog"
+    unindexed_row = {
+        "id": "asset-9",
+        "title": "Imported Skill",
+        "name": "imported",
+        "asset_type": "skill",
+        "department": "consulting",
+        "content": "the quick brown fox leaps over the lazy dog",
+    }
+    mock_supabase_client.execute.side_effect = [Mock(data=[]), Mock(data=[]), Mock(data=[unindexed_row])]
+
+    result = await dedup_service.check_duplicates(content, "user-1")
+
+    mock_supabase_client.is_.assert_called_with("lsh_bands", "null")
+    assert [m["id"] for m in result["near_matches"]] == ["asset-9"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_scan_when_lsh_disabled(mock_supabase_client):
+    svc = AssetDedupService(use_lsh=False)
+    svc._supabase = Mock(client=mock_supabase_client)
+    mock_supabase_client.execute.side_effect = [Mock(data=[]), Mock(data=[])]
+
+    await svc.check_duplicates("some content here", "user-1")
+
+    mock_supabase_client.overlaps.assert_not_called()
+    mock_supabase_client.limit.assert_called_with(AssetDedupService.LEGACY_SCAN_LIMIT)
+
+
+@pytest.mark.asyncio
+async def test_backfill_writes_pages_through_rpc(dedup_service, mock_supabase_client):
+    mock_supabase_client.execute.side_effect = [
+        Mock(data=[{"id": "a1", "content": "alpha beta"}, {"id": "a2", "content": ""}]),
+        Mock(data=None),  # rpc result
+    ]
+
+    result = await dedup_service.backfill_lsh_signatures(batch_size=5)
+
+    assert result == {"updated": 2, "batches": 1}
+    mock_supabase_client.is_.assert_called_with("lsh_bands", "null")
+    name, params = mock_supabase_client.rpc.call_args.args
+    assert name == "bulk_update_asset_lsh"
+    assert [row["id"] for row in params["p_rows"]] == ["a1", "a2"]
+    assert params["p_rows"][1]["lsh_bands"] == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_stops_when_a_page_makes_no_progress(dedup_service, mock_supabase_client):
+    page = Mock(data=[{"id": f"a{i}", "content": "alpha beta"} for i in range(2)])
+    mock_supabase_client.execute.side_effect = [page, Mock(data=None), page, Mock(data=None)]
+
+    result = await dedup_service.backfill_lsh_signatures(batch_size=2)
+
+    assert result == {"updated": 2, "batches": 1}
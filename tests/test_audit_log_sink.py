@@ -0,0 +1,208 @@
+"""
+Tests for the audit log sink: size/time batching, spill to disk when
+Supabase is unavailable, replay on recovery and shutdown flush
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.audit_log_sink import AuditLogSink, AuditLogSinkConfig
+
+
+def _supabase(fail_times=0):
+    """Supabase mock whose first fail_times inserts raise"""
+    supabase = MagicMock()
+    batches = []
+    calls = {"count": 0}
+
+    def insert(rows):
+        calls["count"] += 1
+        query = MagicMock()
+        if calls["count"] <= fail_times:
+            query.execute.side_effect = ConnectionError("supabase down")
+        else:
+            query.execute.side_effect = lambda: batches.append(list(rows))
+        return query
+
+    supabase.table.return_value.insert.side_effect = insert
+    return supabase, batches
+
+
+def _sink(tmp_path, supabase, **overrides):
+    config = AuditLogSinkConfig(**{
+        "batch_size": 3,
+        "flush_interval_seconds": 0.05,
+        "spill_path": str(tmp_path / "audit_spill.jsonl"),
+        "replay_interval_seconds": 0.0,
+        **overrides,
+    })
+    return AuditLogSink(config, supabase=supabase)
+
+
+def _rows(n, start=0):
+    return [{"event_type": "data_access", "action": f"GET /api/{i}"} for i in range(start, start + n)]
+
+
+async def _settle(seconds=0.2):
+    await asyncio.sleep(seconds)
+
+
+class TestBatching:
+    """Tests for size and time thresholds"""
+
+    @pytest.mark.asyncio
+    async def test_full_batches_written_by_size(self, tmp_path):
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase, flush_interval_seconds=5.0)
+
+        for row in _rows(6):
+            assert sink.enqueue(row)
+        await _settle()
+
+        assert [len(batch) for batch in batches] == [3, 3]
+        await sink.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_written_after_interval(self, tmp_path):
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase, batch_size=100)
+
+        for row in _rows(2):
+            sink.enqueue(row)
+        await _settle()
+
+        assert batches == [_rows(2)]
+        assert sink.get_stats()["written"] == 2
+        await sink.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_rows_not_yet_written(self, tmp_path):
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase, batch_size=100, flush_interval_seconds=60.0)
+
+        for row in _rows(4):
+            sink.enqueue(row)
+        await asyncio.sleep(0)  # Worker takes the first row into its batch
+        await sink.stop()
+
+        assert sum(len(batch) for batch in batches) == 4
+        assert not sink.enqueue(_rows(1)[0])  # After stop rows go to disk
+        assert (tmp_path / "audit_spill.jsonl").exists()
+
+
+class TestSpillAndReplay:
+    """Tests for the local spill file"""
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_spilled_then_replayed(self, tmp_path):
+        supabase, batches = _supabase(fail_times=1)
+        sink = _sink(tmp_path, supabase)
+        spill = tmp_path / "audit_spill.jsonl"
+
+        for row in _rows(3):
+            sink.enqueue(row)
+        await _settle()
+
+        assert batches == []
+        assert [json.loads(line) for line in spill.read_text().splitlines()] == _rows(3)
+
+        # Next successful write replays the spilled rows
+        sink.enqueue(_rows(1, start=3)[0])
+        await _settle()
+
+        assert batches == [_rows(1, start=3), _rows(3)]
+        assert not spill.exists()
+        assert sink.get_stats()["replayed"] == 3
+        await sink.stop()
+
+    @pytest.mark.asyncio
+    async def test_queue_full_spills_instead_of_blocking(self, tmp_path):
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase, queue_size=2, flush_interval_seconds=60.0, batch_size=100)
+
+        results = [sink.enqueue(row) for row in _rows(4)]
+
+        assert results == [True, True, False, False]
+        assert len((tmp_path / "audit_spill.jsonl").read_text().splitlines()) == 2
+        await sink.stop()
+        # Queued rows written on stop, spilled rows replayed after that write
+        assert batches == [_rows(2), _rows(2, start=2)]
+        assert sink.get_stats()["replayed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_interrupted_replay_file_picked_up(self, tmp_path):
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase)
+        leftover = tmp_path / "audit_spill.jsonl.replaying"
+        leftover.write_text("".join(json.dumps(row) + "\n" for row in _rows(2)))
+
+        assert await sink.replay() == 2
+        assert batches == [_rows(2)]
+        assert not leftover.exists()
+
+    @pytest.mark.asyncio
+    async def test_replay_failure_keeps_rows(self, tmp_path):
+        supabase, batches = _supabase(fail_times=1)
+        sink = _sink(tmp_path, supabase)
+        spill = tmp_path / "audit_spill.jsonl"
+        spill.write_text("".join(json.dumps(row) + "\n" for row in _rows(2)))
+
+        assert await sink.replay() == 0
+        assert len(spill.read_text().splitlines()) == 2
+        assert await sink.replay() == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_skipped_while_another_process_replays(self, tmp_path):
+        """Processes share the spill file; only the replay lock holder inserts it"""
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase)
+        other_process = _sink(tmp_path, MagicMock())
+        spill = tmp_path / "audit_spill.jsonl"
+        spill.write_text("".join(json.dumps(row) + "\n" for row in _rows(2)))
+
+        with other_process._file_lock(other_process._replay_lock_path, blocking=False) as acquired:
+            assert acquired
+            assert await sink.replay() == 0
+        assert batches == []
+        assert spill.exists()
+
+        assert await sink.replay() == 2
+        assert batches == [_rows(2)]
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_replay_error(self, tmp_path):
+        supabase, batches = _supabase()
+        sink = _sink(tmp_path, supabase)
+        (tmp_path / "audit_spill.jsonl").write_text(json.dumps(_rows(1)[0]) + "\n")
+
+        with patch.object(sink, "_replay_file", side_effect=FileNotFoundError("gone")):
+            for row in _rows(3):
+                sink.enqueue(row)
+            await _settle()
+
+        for row in _rows(3, start=3):
+            sink.enqueue(row)
+        await _settle()
+
+        assert batches[0] == _rows(3)
+        assert _rows(3, start=3) in batches
+        await sink.stop()
+
+
+class TestShutdown:
+    """Graceful shutdown flushes the sink"""
+
+    @pytest.mark.asyncio
+    async def test_flush_data_flushes_audit_sink(self):
+        from app.core.graceful_shutdown import GracefulShutdown
+
+        sink = MagicMock()
+        sink.flush = AsyncMock(return_value=5)
+
+        with patch("app.services.audit_log_sink.get_audit_log_sink", return_value=sink):
+            assert await GracefulShutdown().flush_data()
+
+        sink.flush.assert_awaited_once()
@@ -25,6 +25,8 @@ from b2sdk.v2.exception import B2Error, B2ConnectionError, B2RequestTimeout
 from app.services.b2_resilient_storage import (
     ResilientB2StorageService,
     B2DeadLetterQueue,
+    B2StreamingConfig,
+    spool_with_sha1,
     calculate_sha1,
     calculate_sha1_file,
     _verify_checksums_match,
@@ -422,6 +424,85 @@ class TestCeleryTasks:
         assert result["succeeded"] == 3
 
 
+# =============================================================================
+# STREAMING UPLOAD TESTS
+# =============================================================================
+
+class TestStreamingUpload:
+    """Tests for the constant-memory upload path"""
+
+    def test_small_stream_kept_in_memory(self, sample_file_content):
+        spooled = spool_with_sha1(BytesIO(sample_file_content), memory_threshold=1024, chunk_size=8)
+
+        assert spooled.data == sample_file_content
+        assert spooled.path is None
+        assert spooled.sha1 == calculate_sha1(sample_file_content)
+
+    def test_large_stream_spooled_to_disk(self, tmp_path):
+        content = b"x" * 5000 + b"y" * 5000
+
+        spooled = spool_with_sha1(BytesIO(content), memory_threshold=1000, chunk_size=512,
+                                  spool_dir=str(tmp_path))
+
+        assert spooled.data is None
+        assert spooled.size == len(content)
+        assert spooled.sha1 == calculate_sha1(content)
+        with open(spooled.path, "rb") as f:
+            assert f.read() == content
+        spooled.cleanup()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_file_on_disk_hashed_in_place(self, tmp_path):
+        source = tmp_path / "video.bin"
+        source.write_bytes(b"z" * 4096)
+
+        with open(source, "rb") as f:
+            spooled = spool_with_sha1(f, memory_threshold=10)
+        spooled.cleanup()
+
+        assert spooled.sha1 == calculate_sha1(b"z" * 4096)
+        assert source.exists()
+
+    @pytest.mark.asyncio
+    async def test_large_upload_sent_from_disk(self, resilient_service, mock_b2_service, tmp_path):
+        content = b"a" * 4096
+        resilient_service.streaming_config = B2StreamingConfig(
+            memory_threshold=1024, chunk_size=512, spool_dir=str(tmp_path)
+        )
+        uploaded = {}
+
+        async def upload_local_file(local_path, **kwargs):
+            with open(local_path, "rb") as f:
+                uploaded["content"] = f.read()
+            return {"file_id": "file123", "content_sha1": kwargs["sha1_sum"]}
+
+        mock_b2_service.upload_local_file = AsyncMock(side_effect=upload_local_file)
+
+        result = await resilient_service.upload_file(file_data=BytesIO(content), filename="big.bin")
+
+        assert uploaded["content"] == content
+        assert result["checksum_verified"] is True
+        mock_b2_service.upload_file.assert_not_called()
+        assert resilient_service._stats["uploads_streamed"] == 1
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_encrypted_upload_uses_in_memory_path(self, resilient_service, mock_b2_service,
+                                                        sample_file_content):
+        resilient_service.streaming_config = B2StreamingConfig(memory_threshold=1)
+        mock_b2_service.upload_file.return_value = {"file_id": "file123", "content_sha1": "ciphertext"}
+
+        result = await resilient_service.upload_file(
+            file_data=BytesIO(sample_file_content),
+            filename="secret.txt",
+            encrypt=True,
+            encryption_password="pw"
+        )
+
+        assert result["file_id"] == "file123"
+        assert mock_b2_service.upload_file.call_args.kwargs["encrypt"] is True
+
+
 # =============================================================================
 # INTEGRATION TESTS (MOCK-BASED)
 # =============================================================================
@@ -0,0 +1,279 @@
+"""
+Tests for the in-process BM25 sparse index
+"""
+
+import math
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.services.bm25_index import (
+    BM25Config,
+    BM25Index,
+    BM25IndexManager,
+    tokenize,
+)
+
+
+DOCS = [
+    ("d1", "California insurance policy terms and conditions", {"department": "legal"}),
+    ("d2", "Employee benefits overview document", {"department": "hr"}),
+    ("d3", "Insurance claims process for employee health insurance", {"department": "hr"}),
+    ("d4", "Quarterly revenue report", {"department": "finance"}),
+]
+
+
+def _brute_force(index: BM25Index, query: str):
+    """Exhaustive BM25 over every document for comparison with WAND"""
+    k1, b = index.config.k1, index.config.b
+    scores = {}
+    for doc_id, text, _ in DOCS:
+        if doc_id not in index:
+            continue
+        tokens = tokenize(text)
+        score = 0.0
+        for term in set(tokenize(query)):
+            tf = tokens.count(term)
+            if tf:
+                norm = k1 * (1 - b + b * len(tokens) / index.avg_doc_length)
+                score += index.idf(term) * tf * (k1 + 1) / (tf + norm)
+        if score > 0:
+            scores[doc_id] = score
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+@pytest.fixture
+def index():
+    index = BM25Index()
+    index.add_documents(DOCS)
+    return index
+
+
+class TestBM25Index:
+    """Tests for scoring, updates and snapshots"""
+
+    def test_idf_uses_corpus_statistics(self, index):
+        """Rare terms get higher IDF than common ones"""
+        assert index.idf("revenue") > index.idf("insurance")
+        assert index.idf("revenue") == pytest.approx(math.log(1 + (4 - 1 + 0.5) / 1.5))
+        assert index.idf("missing") == 0.0
+
+    def test_wand_matches_exhaustive_scoring(self, index):
+        """WAND top-k returns the same ranking as scoring every document"""
+        for query in ["insurance policy", "employee insurance", "revenue"]:
+            expected = _brute_force(index, query)
+            results = index.search(query, k=10)
+            assert [doc for doc, _ in results] == [doc for doc, _ in expected]
+            for (_, got), (_, want) in zip(results, expected):
+                assert got == pytest.approx(want)
+
+    def test_top_k_limit(self, index):
+        """Only k results are returned, best first"""
+        results = index.search("insurance employee", k=1)
+
+        assert len(results) == 1
+        assert results[0][0] == "d3"
+
+    def test_doc_filter(self, index):
+        """Metadata predicate excludes documents during retrieval"""
+        results = index.search("insurance", doc_filter=lambda m: m.get("department") == "legal")
+
+        assert [doc for doc, _ in results] == ["d1"]
+
+    def test_remove_and_replace(self, index):
+        """Removed documents disappear; re-adding replaces the old postings"""
+        assert index.remove_document("d3") is True
+        assert index.remove_document("d3") is False
+        assert "d3" not in [doc for doc, _ in index.search("insurance")]
+
+        index.add_document("d1", "Quarterly budget", {})
+        assert index.search("insurance") == []
+        assert len(index) == 3
+
+    def test_idf_counts_live_documents_only(self, index):
+        """Tombstoned documents do not count towards document frequency"""
+        index.config.compact_ratio = 10.0  # Keep tombstones around
+        index.remove_document("d3")
+
+        fresh = BM25Index()
+        fresh.add_documents([doc for doc in DOCS if doc[0] != "d3"])
+
+        assert index._tombstones
+        for term in ["insurance", "employee", "revenue", "claims"]:
+            assert index.idf(term) == pytest.approx(fresh.idf(term))
+
+    def test_snapshot_round_trip(self, index, tmp_path):
+        """Saved snapshots restore identical search results"""
+        index.remove_document("d2")
+        path = str(tmp_path / "bm25.json.gz")
+
+        index.save(path)
+        restored = BM25Index.load(path)
+
+        assert len(restored) == len(index)
+        assert restored.search("employee insurance") == index.search("employee insurance")
+
+
+class TestBM25IndexManager:
+    """Tests for the chunks index built from Supabase and the change log"""
+
+    @staticmethod
+    def _supabase(pages, log=None):
+        """
+        Fake client: keyset pages for full builds and, if log is a list,
+        the chunk_changes RPCs over it (None = RPCs not deployed)
+        """
+        supabase = Mock()
+        chain = supabase.table.return_value.select.return_value
+        chain.gt.return_value = chain
+        chain.order.return_value.limit.return_value.execute = AsyncMock(
+            side_effect=[Mock(data=page) for page in pages]
+        )
+
+        def rpc(name, params=None):
+            call = Mock()
+            if log is None:
+                call.execute = AsyncMock(side_effect=Exception("PGRST202"))
+            elif name == "get_chunk_changes_head":
+                seqs = [change["seq"] for change in log]
+                call.execute = AsyncMock(return_value=Mock(
+                    data={"first_seq": min(seqs, default=0), "last_seq": max(seqs, default=0)}
+                ))
+            elif name == "get_chunk_changes":
+                rows = [change for change in log if change["seq"] > params["p_after_seq"]]
+                call.execute = AsyncMock(return_value=Mock(data=rows[:params["p_limit"]]))
+            else:
+                call.execute = AsyncMock(return_value=Mock(data=0))
+            return call
+
+        supabase.rpc.side_effect = rpc
+        return supabase, chain
+
+    @pytest.mark.asyncio
+    async def test_build_paginates_whole_corpus(self):
+        """The index is built with keyset pages over all chunks"""
+        rows = [{"id": doc_id, "content": text, "metadata": meta} for doc_id, text, meta in DOCS]
+        supabase, chain = self._supabase([rows[:3], rows[3:]])
+        manager = BM25IndexManager(BM25Config(build_page_size=3))
+
+        index = await manager.warm(supabase)
+
+        assert len(index) == 4
+        chain.eq.assert_not_called()
+        chain.gt.assert_called_once_with("id", "d3")
+        assert manager.get_index(supabase) is index
+
+    @pytest.mark.asyncio
+    async def test_get_index_does_not_block_on_build(self):
+        """Searches before the first build get None and trigger a background build"""
+        rows = [{"id": "c1", "content": "insurance policy", "metadata": {}}]
+        supabase, _ = self._supabase([rows])
+        manager = BM25IndexManager(BM25Config())
+
+        assert manager.get_index(supabase) is None
+        await manager._refresh_task
+
+        assert "c1" in manager.get_index(supabase)
+
+    @pytest.mark.asyncio
+    async def test_changes_applied_incrementally(self):
+        """Logged inserts, updates and deletes are applied without rescanning chunks"""
+        log = [{"seq": 1, "chunk_id": "c1", "op": "U", "content": "insurance policy", "metadata": {}}]
+        supabase, chain = self._supabase(
+            [[{"id": "c1", "content": "insurance policy", "metadata": {}}]], log=log
+        )
+        manager = BM25IndexManager(BM25Config())
+        index = await manager.warm(supabase)
+        assert index.change_seq == 1
+        assert await manager.refresh(supabase) is False
+
+        log += [
+            {"seq": 2, "chunk_id": "c2", "op": "U", "content": "travel policy", "metadata": {}},
+            {"seq": 3, "chunk_id": "c1", "op": "D", "content": None, "metadata": None},
+        ]
+        assert await manager.refresh(supabase) is True
+
+        assert manager.peek() is index
+        assert "c2" in index and "c1" not in index
+        assert index.change_seq == 3
+        assert chain.order.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_truncate_triggers_rebuild(self):
+        """A logged TRUNCATE rebuilds the index from the table"""
+        log = []
+        supabase, chain = self._supabase(
+            [[{"id": "c1", "content": "insurance policy", "metadata": {}}], []], log=log
+        )
+        manager = BM25IndexManager(BM25Config())
+        await manager.warm(supabase)
+
+        log.append({"seq": 1, "chunk_id": None, "op": "T", "content": None, "metadata": None})
+        assert await manager.refresh(supabase) is True
+
+        assert len(manager.peek()) == 0
+        assert manager.peek().change_seq == 1
+        assert chain.order.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_when_log_pruned_past_index(self):
+        """If changes the index has not seen were pruned, it is rebuilt (drift repair)"""
+        log = [{"seq": 1, "chunk_id": "c1", "op": "U", "content": "insurance policy", "metadata": {}}]
+        supabase, chain = self._supabase(
+            [[{"id": "c1", "content": "insurance policy", "metadata": {}}],
+             [{"id": "c2", "content": "travel policy", "metadata": {}}]],
+            log=log,
+        )
+        manager = BM25IndexManager(BM25Config())
+        await manager.warm(supabase)
+
+        log[:] = [{"seq": 9, "chunk_id": "c2", "op": "U", "content": "travel policy", "metadata": {}}]
+        assert await manager.refresh(supabase) is True
+
+        assert "c2" in manager.peek() and "c1" not in manager.peek()
+        assert chain.order.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_repair_rebuild_after_repair_seconds(self):
+        """Even with a current change log the index is rebuilt once it is old"""
+        supabase, chain = self._supabase([[], []], log=[])
+        manager = BM25IndexManager(BM25Config(repair_seconds=60))
+
+        index = await manager.warm(supabase)
+        assert await manager.refresh(supabase) is False
+
+        index.built_at -= 120
+        assert await manager.refresh(supabase) is True
+        assert chain.order.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_max_age_without_change_log(self):
+        """Without the change log RPCs the index is rebuilt once it is too old"""
+        supabase, _ = self._supabase([[], []])
+        manager = BM25IndexManager(BM25Config(max_age_seconds=60))
+
+        index = await manager.warm(supabase)
+        assert await manager.refresh(supabase) is False
+
+        index.built_at -= 120
+        assert await manager.refresh(supabase) is True
+
+    @pytest.mark.asyncio
+    async def test_snapshot_caught_up_from_change_log(self, tmp_path):
+        """A new manager loads the snapshot and applies only later changes"""
+        log = [{"seq": 5, "chunk_id": "c1", "op": "U", "content": "insurance policy", "metadata": {}}]
+        rows = [{"id": "c1", "content": "insurance policy", "metadata": {}}]
+        supabase, _ = self._supabase([rows], log=log)
+        config = BM25Config(snapshot_dir=str(tmp_path))
+        await BM25IndexManager(config).warm(supabase)
+
+        log.append({"seq": 6, "chunk_id": "c2", "op": "U", "content": "travel policy", "metadata": {}})
+        fresh_supabase, chain = self._supabase([], log=log)
+        fresh = BM25IndexManager(config)
+        restored = await fresh.warm(fresh_supabase)
+
+        assert "c1" in restored and "c2" in restored
+        chain.order.assert_not_called()
+
+        fresh.remove_chunks(["c1"])
+        assert [doc for doc, _ in restored.search("policy")] == ["c2"]
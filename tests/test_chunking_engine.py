@@ -0,0 +1,201 @@
+"""
+Empire v7.3 - Chunking Engine Tests
+Test executor-backed segmentation, parallel chunking and chunk streaming
+"""
+
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.chunking_engine import (
+    ChunkingEngine,
+    ChunkingEngineConfig,
+    ChunkJob,
+)
+from app.services.chunking_service import (
+    ChunkingService,
+    ChunkingStrategy,
+    MarkdownChunkerStrategy,
+    resolve_auto_strategy,
+)
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def engine():
+    """Thread-backed engine with small segments"""
+    engine = ChunkingEngine(ChunkingEngineConfig(
+        max_workers=2,
+        use_processes=False,
+        segment_chars=400,
+        offload_min_chars=800
+    ))
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def markdown_book():
+    """Markdown document with several top-level sections"""
+    sections = []
+    for i in range(6):
+        sections.append(f"# Chapter {i}\n\n## Part {i}.1\n\n" + f"Sentence {i}. " * 30)
+    return "\n\n".join(sections)
+
+
+def _split_words(text: str, size: int):
+    words = text.split()
+    return [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+
+# ============================================================================
+# Segmentation
+# ============================================================================
+
+class TestSplitSegments:
+    """Test splitting large documents on natural boundaries"""
+
+    def test_small_text_single_segment(self, engine):
+        segments = engine.split_segments("short text")
+        assert len(segments) == 1
+        assert segments[0].start_char == 0
+
+    def test_markdown_splits_at_top_level_headers(self, engine, markdown_book):
+        segments = engine.split_segments(markdown_book, markdown=True)
+
+        assert len(segments) > 1
+        assert "".join(s.text for s in segments) == markdown_book
+        for segment in segments:
+            assert segment.text.startswith("# Chapter")
+            assert markdown_book[segment.start_char:].startswith(segment.text)
+            assert segment.start_line == markdown_book.count("\n", 0, segment.start_char)
+
+    def test_plain_text_splits_at_paragraphs(self, engine):
+        text = "\n\n".join(f"Paragraph {i}. " * 20 for i in range(10))
+        segments = engine.split_segments(text, markdown=False)
+
+        assert len(segments) > 1
+        assert "".join(s.text for s in segments) == text
+
+
+# ============================================================================
+# Chunking
+# ============================================================================
+
+class TestChunkingEngine:
+    """Test chunk streaming and parallel execution"""
+
+    @pytest.mark.asyncio
+    async def test_stream_chunks_renumbers_in_document_order(self, engine, markdown_book):
+        chunks = [
+            chunk async for chunk in engine.stream_chunks(
+                markdown_book, "doc-1", strategy="markdown", chunk_size=512, chunk_overlap=50
+            )
+        ]
+
+        assert [c.metadata.chunk_index for c in chunks] == list(range(len(chunks)))
+        assert all(c.metadata.strategy == ChunkingStrategy.MARKDOWN for c in chunks)
+        headers = [c.metadata.section_header for c in chunks if c.metadata.header_level == 1]
+        assert headers == [f"# Chapter {i}" for i in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_auto_strategy_detects_markdown(self, engine, markdown_book):
+        chunks = await engine.chunk_document(markdown_book, "doc-1")
+        assert chunks[0].metadata.strategy == ChunkingStrategy.MARKDOWN
+
+    @pytest.mark.asyncio
+    async def test_chunk_many_groups_by_document(self, engine, markdown_book):
+        jobs = [
+            ChunkJob(document_id="a", text=markdown_book, strategy="markdown"),
+            ChunkJob(document_id="b", text=markdown_book, strategy="markdown"),
+        ]
+        results = await engine.chunk_many(jobs)
+
+        assert set(results) == {"a", "b"}
+        assert len(results["a"]) == len(results["b"]) > 0
+        assert all(c.metadata.source_document_id == "b" for c in results["b"])
+
+    @pytest.mark.asyncio
+    async def test_map_segments_concatenates_in_order(self, engine):
+        text = "\n\n".join(f"word{i} " * 50 for i in range(10))
+        pieces = await engine.map_segments(_split_words, text, 25)
+
+        assert " ".join(pieces).split() == text.split()
+
+    @pytest.mark.asyncio
+    async def test_map_segments_small_text_runs_inline(self, engine):
+        assert await engine.map_segments(_split_words, "a b c", 2) == ["a b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self, markdown_book):
+        engine = ChunkingEngine(ChunkingEngineConfig(
+            max_workers=2,
+            use_processes=True,
+            segment_chars=400
+        ))
+        try:
+            pieces = await engine.map(_split_words, [markdown_book, markdown_book], 10)
+        finally:
+            engine.shutdown()
+
+        assert pieces[0] == pieces[1] == _split_words(markdown_book, 10)
+        assert engine.uses_processes
+
+    def test_process_pool_uses_spawn(self):
+        engine = ChunkingEngine(ChunkingEngineConfig(max_workers=1, use_processes=True))
+        try:
+            executor = engine._get_executor()
+            assert executor._mp_context.get_start_method() == "spawn"
+        finally:
+            engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_shut_down_and_replaced(self, engine):
+        class BrokenPool(Executor):
+            shutdown_calls = 0
+
+            def submit(self, fn, *args, **kwargs):
+                future = Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+
+            def shutdown(self, wait=True, *, cancel_futures=False):
+                BrokenPool.shutdown_calls += 1
+
+        broken = BrokenPool()
+        engine._executor = broken
+
+        assert await engine.run(_split_words, "a b c", 2) == ["a b", "c"]
+        assert BrokenPool.shutdown_calls == 1
+        assert engine._executor is not broken
+
+
+def test_auto_strategy_shared_with_service(markdown_book):
+    assert resolve_auto_strategy(markdown_book) == "markdown"
+    assert resolve_auto_strategy("# Only one header\n\ntext") == "sentence"
+    assert MarkdownChunkerStrategy().is_markdown_content(markdown_book)
+
+
+class TestChunkingServiceOffload:
+    """Test ChunkingService delegating large texts to the engine"""
+
+    @pytest.mark.asyncio
+    async def test_large_markdown_uses_engine(self, engine, markdown_book):
+        service = ChunkingService(engine=engine)
+        chunks = await service.auto_chunk(markdown_book, "doc-1", chunk_size=512, chunk_overlap=50)
+
+        assert len(markdown_book) >= engine.config.offload_min_chars
+        assert [c.metadata.chunk_index for c in chunks] == list(range(len(chunks)))
+        assert chunks[0].metadata.strategy == ChunkingStrategy.MARKDOWN
+
+    @pytest.mark.asyncio
+    async def test_small_text_stays_inline(self, engine):
+        service = ChunkingService(engine=engine)
+        chunks = await service.chunk_markdown("# A\n\ntext\n\n## B\n\nmore", "doc-1")
+
+        assert len(chunks) >= 1
+        assert engine._executor is None
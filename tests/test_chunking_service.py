@@ -601,6 +601,82 @@ class TestChunkingService:
         assert len(chunks_small) >= len(chunks_large)
 
 
+# ============================================================================
+# Test Streaming Generators
+# ============================================================================
+
+class TestChunkGenerators:
+    """Test iter_chunks/aiter_chunks match the list-returning methods"""
+
+    @pytest.mark.asyncio
+    async def test_semantic_iter_matches_chunk_document(self, sample_document_text):
+        """Test sentence chunk generator yields the same chunks"""
+        with patch('app.services.chunking_service.LLAMAINDEX_SUPPORT', False):
+            chunker = SemanticChunker(chunk_size=100, chunk_overlap=20)
+
+            expected = await chunker.chunk_document(sample_document_text, "doc-iter")
+            streamed = [c async for c in chunker.aiter_chunks(sample_document_text, "doc-iter")]
+
+        assert [c.to_dict() for c in streamed] == [c.to_dict() for c in expected]
+        assert [c.to_dict() for c in chunker.iter_chunks(sample_document_text, "doc-iter")] == \
+            [c.to_dict() for c in expected]
+
+    @pytest.mark.asyncio
+    async def test_code_iter_matches_chunk_code(self, sample_python_code):
+        """Test code chunk generator yields the same chunks"""
+        chunker = CodeChunker(max_chunk_lines=10)
+
+        expected = await chunker.chunk_code(sample_python_code, "code-iter")
+        streamed = [c async for c in chunker.aiter_chunks(sample_python_code, "code-iter")]
+
+        assert [c.to_dict() for c in streamed] == [c.to_dict() for c in expected]
+
+    @pytest.mark.asyncio
+    async def test_transcript_iter_matches_chunk_transcript(self, sample_transcript):
+        """Test transcript chunk generator yields the same chunks"""
+        chunker = TranscriptChunker(time_window_seconds=15.0, use_topic_detection=True)
+
+        for strategy in ("time", "topic"):
+            expected = await chunker.chunk_transcript(sample_transcript, "t-iter", strategy)
+            streamed = list(chunker.iter_chunks(sample_transcript, "t-iter", strategy))
+            assert [c.to_dict() for c in streamed] == [c.to_dict() for c in expected]
+
+    def test_iter_chunks_is_lazy(self):
+        """Test the first chunk is produced without splitting the whole text"""
+        with patch('app.services.chunking_service.LLAMAINDEX_SUPPORT', False):
+            chunker = SemanticChunker(chunk_size=100, chunk_overlap=0)
+            chunks = chunker.iter_chunks("x" * 1000, "doc-lazy")
+
+            first = next(chunks)
+
+        assert first.metadata.chunk_index == 0
+        assert first.metadata.end_char == 100
+
+    def test_iter_text_windows_cover_text(self):
+        """Test windows are cut at paragraph breaks and cover the whole text"""
+        text = "\n\n".join(f"Paragraph {i}. " * 10 for i in range(20))
+
+        windows = list(chunking_module.iter_text_windows(text, window_chars=300))
+
+        assert len(windows) > 1
+        assert "".join(w for _, w in windows) == text
+        assert all(text[start:].startswith(w) for start, w in windows)
+
+    @pytest.mark.asyncio
+    async def test_service_aiter_chunks(self, sample_document_text):
+        """Test service generator yields chunks in document order"""
+        service = ChunkingService()
+
+        chunks = [
+            c async for c in service.aiter_chunks(
+                sample_document_text, "doc-stream", chunk_size=100, chunk_overlap=20
+            )
+        ]
+
+        assert len(chunks) > 0
+        assert [c.metadata.chunk_index for c in chunks] == list(range(len(chunks)))
+
+
 # ============================================================================
 # Test Singleton Pattern
 # ============================================================================
@@ -77,7 +77,7 @@ class TestPDFProcessing:
 
         with patch('app.services.document_processor.LLAMAPARSE_SUPPORT', False), \
              patch('app.services.document_processor.PDF_SUPPORT', True), \
-             patch('app.services.document_processor.PdfReader', return_value=mock_pdf_document, create=True):
+             patch('app.services.pdf_page_extractor.PdfReader', return_value=mock_pdf_document):
             result = await processor._process_pdf(
                 file_path="test.pdf",
                 extract_tables=True,
@@ -98,7 +98,7 @@ class TestPDFProcessing:
 
         with patch('app.services.document_processor.LLAMAPARSE_SUPPORT', False), \
              patch('app.services.document_processor.PDF_SUPPORT', True), \
-             patch('app.services.document_processor.PdfReader', return_value=mock_pdf_document, create=True):
+             patch('app.services.pdf_page_extractor.PdfReader', return_value=mock_pdf_document):
             result = await processor._process_pdf(
                 file_path="test.pdf",
                 extract_tables=False,
@@ -138,7 +138,7 @@ class TestPDFProcessing:
 
         with patch('app.services.document_processor.LLAMAPARSE_SUPPORT', False), \
              patch('app.services.document_processor.PDF_SUPPORT', True), \
-             patch('app.services.document_processor.PdfReader', return_value=mock_pdf_document_with_errors, create=True):
+             patch('app.services.pdf_page_extractor.PdfReader', return_value=mock_pdf_document_with_errors):
             result = await processor._process_pdf(
                 file_path="test.pdf",
                 extract_tables=True,
@@ -338,7 +338,7 @@ class TestDocumentProcessorWorkflow:
 
         with patch('app.services.document_processor.LLAMAPARSE_SUPPORT', False), \
              patch('app.services.document_processor.PDF_SUPPORT', True), \
-             patch('app.services.document_processor.PdfReader', return_value=mock_pdf_document, create=True), \
+             patch('app.services.pdf_page_extractor.PdfReader', return_value=mock_pdf_document), \
              patch('os.path.exists', return_value=True):
             result = await processor.process_document(
                 file_path="test.pdf",
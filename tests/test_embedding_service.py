@@ -223,6 +223,93 @@ class TestEmbeddingCacheManager:
         assert hash1 == hash2
         assert hash1 != hash3
 
+    @pytest.mark.asyncio
+    async def test_bulk_lookup_single_query(self):
+        """Test bulk lookup issues one IN query and fills the LRU"""
+        mock_storage = MagicMock()
+        cache_manager = EmbeddingCacheManager(mock_storage)
+        hashes = [cache_manager.hash_content(f"content {i}") for i in range(3)]
+
+        mock_result = MagicMock()
+        mock_result.data = [
+            {"content_hash": hashes[0], "embedding": [0.1] * 1024},
+            {"content_hash": hashes[2], "embedding": [0.3] * 1024},
+        ]
+        mock_eq = MagicMock()
+        mock_eq.execute = AsyncMock(return_value=mock_result)
+        mock_in = MagicMock()
+        mock_in.eq.return_value = mock_eq
+        mock_select = MagicMock()
+        mock_select.in_.return_value = mock_in
+        mock_table = MagicMock()
+        mock_table.select.return_value = mock_select
+        mock_storage.supabase.table.return_value = mock_table
+
+        found = await cache_manager.get_cached_embeddings_bulk(hashes, "bge-m3")
+
+        assert set(found) == {hashes[0], hashes[2]}
+        mock_select.in_.assert_called_once_with("content_hash", hashes)
+        assert mock_eq.execute.await_count == 1
+
+        # Second lookup for the hits is served from the LRU
+        found_again = await cache_manager.get_cached_embeddings_bulk(
+            [hashes[0], hashes[2]], "bge-m3"
+        )
+
+        assert found_again[hashes[2]][0] == 0.3
+        assert mock_eq.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test LRU drops least recently used entries"""
+        cache_manager = EmbeddingCacheManager(MagicMock(), lru_size=2)
+
+        cache_manager._lru_put("a", "bge-m3", [0.1])
+        cache_manager._lru_put("b", "bge-m3", [0.2])
+        assert cache_manager._lru_get("a", "bge-m3") == [0.1]
+        cache_manager._lru_put("c", "bge-m3", [0.3])
+
+        assert cache_manager._lru_get("b", "bge-m3") is None
+        assert cache_manager._lru_get("a", "bge-m3") == [0.1]
+        assert cache_manager._lru_get("c", "bge-m3") == [0.3]
+        assert cache_manager._lru_get("a", "other-model") is None
+
+    @pytest.mark.asyncio
+    async def test_process_batch_uses_bulk_lookup(self):
+        """Test batch generation looks up the cache once per batch"""
+        mock_storage = MagicMock()
+        config = EmbeddingConfig(
+            provider=EmbeddingProvider.OLLAMA,
+            model=EmbeddingModel.BGE_M3,
+            cache_enabled=True
+        )
+
+        with patch('app.services.embedding_service.OLLAMA_AVAILABLE', True):
+            with patch('app.services.embedding_service.OllamaEmbeddings') as mock_ollama:
+                mock_embedder = Mock()
+                mock_embedder.embed_documents = Mock(side_effect=lambda t: [[0.5] * 1024 for _ in t])
+                mock_ollama.return_value = mock_embedder
+
+                service = EmbeddingService(config, supabase_storage=mock_storage)
+                texts = [f"content {i}" for i in range(4)]
+                cached_hash = service.cache_manager.hash_content(texts[1])
+
+                service.cache_manager.get_cached_embeddings_bulk = AsyncMock(
+                    return_value={cached_hash: [0.9] * 1024}
+                )
+                service.cache_manager.get_cached_embedding = AsyncMock()
+                service.cache_manager.batch_cache_embeddings = AsyncMock()
+
+                results = await service.generate_embeddings_batch(texts)
+
+                service.cache_manager.get_cached_embeddings_bulk.assert_awaited_once()
+                service.cache_manager.get_cached_embedding.assert_not_called()
+                assert [r.cached for r in results] == [False, True, False, False]
+                assert results[1].embedding[0] == 0.9
+                mock_embedder.embed_documents.assert_called_once_with(
+                    [texts[0], texts[2], texts[3]]
+                )
+
 
 # ============================================================================
 # Test Embedding Service - Ollama
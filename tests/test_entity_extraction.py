@@ -312,8 +312,8 @@ class TestEntityExtractionService:
         )
 
         assert result.stored_in_graph is True
-        # Verify Neo4j was called
-        entity_extraction_service.neo4j.execute_query.assert_called()
+        # Verify Neo4j was called with one batched transaction
+        entity_extraction_service.neo4j.execute_batch.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_extract_entities_empty_content(self, entity_extraction_service):
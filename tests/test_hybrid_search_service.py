@@ -172,18 +172,47 @@ class TestHybridSearchService:
         ]
         mock_chain = Mock()
         mock_chain.execute = AsyncMock(return_value=mock_execute)
-        mock_storage.supabase.table.return_value.select.return_value.limit.return_value = mock_chain
+        select = mock_storage.supabase.table.return_value.select.return_value
+        # Index build (keyset page) and content fetch for the hits
+        select.order.return_value.limit.return_value = mock_chain
+        select.in_.return_value = mock_chain
+        # Empty chunk change log
+        mock_storage.supabase.rpc.side_effect = lambda name, params=None: Mock(
+            execute=AsyncMock(return_value=Mock(
+                data={"first_seq": 0, "last_seq": 0} if name == "get_chunk_changes_head" else []
+            ))
+        )
 
-        # Perform search
+        # The index is built at startup, not inside the request
+        await hybrid_search_service.warm_sparse_index()
+
+        # Perform search against the in-process index
         results = await hybrid_search_service.search(
             "insurance policy",
-            method=SearchMethod.SPARSE
+            method=SearchMethod.SPARSE,
+            custom_config=HybridSearchConfig(use_rpc=False)
         )
 
         assert len(results) > 0
         assert all(r.method == "sparse" for r in results)
         assert all(r.sparse_score is not None for r in results)
 
+    @pytest.mark.asyncio
+    async def test_sparse_search_uses_sql_while_index_warms(self, hybrid_search_service, mock_storage):
+        """Before the first build finishes, sparse search goes to the SQL RPC"""
+        hybrid_search_service.bm25.start_refresh = Mock()
+        mock_storage.supabase.rpc.return_value.execute = AsyncMock(return_value=Mock(data=[
+            {"chunk_id": "chunk-1", "content": "insurance policy", "rank": 0.4, "metadata": {}}
+        ]))
+        config = HybridSearchConfig(use_rpc=False)
+
+        results = await hybrid_search_service.search(
+            "insurance policy", method=SearchMethod.SPARSE, custom_config=config
+        )
+
+        assert [r.chunk_id for r in results] == ["chunk-1"]
+        assert mock_storage.supabase.rpc.call_args.args[0] == "search_chunks_bm25"
+
     @pytest.mark.asyncio
     async def test_fuzzy_search(self, hybrid_search_service, mock_storage):
         """Test fuzzy matching search"""
@@ -221,21 +250,6 @@ class TestHybridSearchService:
             assert all(r.method == "fuzzy" for r in results)
             assert all(r.fuzzy_score is not None for r in results)
 
-    def test_bm25_score(self, hybrid_search_service):
-        """Test BM25 scoring calculation"""
-        query = "insurance policy"
-        document = "This is an insurance policy document with multiple insurance terms and policy details"
-
-        score = hybrid_search_service._bm25_score(query, document)
-
-        assert score > 0
-        assert isinstance(score, float)
-
-        # Document without query terms should score 0
-        unrelated_doc = "This document has no matching terms"
-        score_zero = hybrid_search_service._bm25_score(query, unrelated_doc)
-        assert score_zero == 0.0
-
     def test_reciprocal_rank_fusion_single_list(self, hybrid_search_service, hybrid_config):
         """Test RRF with single result list"""
         results = [
@@ -0,0 +1,151 @@
+"""
+Tests for Neo4j bulk writer: UNWIND batching, per-batch retry and the
+single-transaction HTTP variant
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from neo4j.exceptions import CypherSyntaxError, ServiceUnavailable
+
+from app.services.neo4j_bulk_writer import (
+    AsyncNeo4jBulkWriter,
+    BulkStatement,
+    GraphWriteError,
+    Neo4jBulkWriter,
+)
+from app.services.neo4j_entity_service import EntityNode, Neo4jEntityService, RelationshipType
+
+QUERY = "UNWIND $rows AS row MERGE (e:Entity {entity_id: row.id}) RETURN e.entity_id as id"
+
+
+def _rows(count):
+    return [{"id": f"e{i}"} for i in range(count)]
+
+
+class TestNeo4jBulkWriter:
+    """Tests for the Bolt bulk writer"""
+
+    def test_rows_split_into_batches(self):
+        connection = Mock()
+        connection.execute_write = Mock(
+            side_effect=lambda query, params: [{"id": row["id"]} for row in params["rows"]]
+        )
+        writer = Neo4jBulkWriter(connection, batch_size=2)
+
+        records = writer.run(QUERY, _rows(5))
+
+        assert [len(call.args[1]["rows"]) for call in connection.execute_write.call_args_list] == [2, 2, 1]
+        assert [record["id"] for record in records] == [f"e{i}" for i in range(5)]
+        assert writer.stats.batches == 3
+
+    def test_failed_batch_retried(self):
+        connection = Mock()
+        connection.execute_write = Mock(side_effect=[ServiceUnavailable("leader switch"), [{"id": "e0"}]])
+        writer = Neo4jBulkWriter(connection, retry_backoff=0)
+
+        assert writer.run(QUERY, _rows(1)) == [{"id": "e0"}]
+        assert writer.stats.retries == 1
+
+    def test_raises_after_retries(self):
+        connection = Mock()
+        connection.execute_write = Mock(side_effect=ServiceUnavailable("down"))
+        writer = Neo4jBulkWriter(connection, max_retries=2, retry_backoff=0)
+
+        with pytest.raises(GraphWriteError):
+            writer.run(QUERY, _rows(1))
+        assert connection.execute_write.call_count == 3
+
+    def test_non_transient_error_not_retried(self):
+        connection = Mock()
+        connection.execute_write = Mock(side_effect=CypherSyntaxError("bad query"))
+        writer = Neo4jBulkWriter(connection, max_retries=2, retry_backoff=0)
+
+        with pytest.raises(GraphWriteError):
+            writer.run(QUERY, _rows(1))
+        assert connection.execute_write.call_count == 1
+        assert writer.stats.retries == 0
+
+    def test_failure_carries_committed_records(self):
+        connection = Mock()
+        connection.execute_write = Mock(side_effect=[
+            [{"id": "e0"}, {"id": "e1"}],
+            RuntimeError("constraint violated"),
+        ])
+        writer = Neo4jBulkWriter(connection, batch_size=2, retry_backoff=0)
+
+        with pytest.raises(GraphWriteError) as exc_info:
+            writer.run(QUERY, _rows(5))
+
+        assert exc_info.value.records == [{"id": "e0"}, {"id": "e1"}]
+        assert connection.execute_write.call_count == 2
+
+
+class TestAsyncNeo4jBulkWriter:
+    """Tests for the HTTP bulk writer"""
+
+    @pytest.mark.asyncio
+    async def test_all_batches_sent_in_one_transaction(self):
+        client = Mock()
+        client.execute_batch = AsyncMock(return_value=[[{"id": "e0"}], [{"id": "e2"}], []])
+        writer = AsyncNeo4jBulkWriter(client, batch_size=2)
+
+        results = await writer.run_many([
+            BulkStatement(QUERY, _rows(3)),
+            BulkStatement("UNWIND $rows AS row MERGE (t:Topic {name: row.id})", []),
+            BulkStatement("UNWIND $rows AS row MERGE (f:Fact {id: row.id})", _rows(1)),
+        ])
+
+        client.execute_batch.assert_awaited_once()
+        statements = client.execute_batch.call_args.args[0]
+        assert [len(s["parameters"]["rows"]) for s in statements] == [2, 1, 1]
+        assert results == [[{"id": "e0"}, {"id": "e2"}], [], []]
+
+    @pytest.mark.asyncio
+    async def test_transaction_retried(self):
+        client = Mock()
+        client.execute_batch = AsyncMock(side_effect=[RuntimeError("timeout"), [[]]])
+        writer = AsyncNeo4jBulkWriter(client, retry_backoff=0)
+
+        await writer.run_many([BulkStatement(QUERY, _rows(1))])
+
+        assert client.execute_batch.await_count == 2
+
+
+def test_relationships_grouped_by_type():
+    connection = Mock()
+    connection.execute_write = Mock(
+        side_effect=lambda query, params: [{"idx": row["idx"]} for row in params["rows"]]
+    )
+    service = Neo4jEntityService(connection=connection)
+
+    results = service.batch_create_relationships([
+        {"from_id": "d1", "from_type": "Document", "to_id": "e1", "to_type": "Entity",
+         "relationship_type": RelationshipType.MENTIONS},
+        {"from_id": "d1", "from_type": "Document", "to_id": "d2", "to_type": "Document",
+         "relationship_type": RelationshipType.REFERENCES},
+        {"from_id": "d1", "from_type": "Document", "to_id": "e2", "to_type": "Entity",
+         "relationship_type": RelationshipType.MENTIONS, "properties": {"count": 2}},
+        {"from_id": "d1", "from_type": "Invalid", "to_id": "e3", "to_type": "Entity",
+         "relationship_type": RelationshipType.MENTIONS},
+    ])
+
+    assert results == [True, True, True, False]
+    assert connection.execute_write.call_count == 2
+    mentions_rows = connection.execute_write.call_args_list[0].args[1]["rows"]
+    assert [row["to_id"] for row in mentions_rows] == ["e1", "e2"]
+
+
+def test_batch_create_entities_returns_ids_written_before_failure():
+    connection = Mock()
+    connection.execute_write = Mock(side_effect=[
+        [{"id": "e0"}, {"id": "e1"}],
+        RuntimeError("constraint violated"),
+    ])
+    service = Neo4jEntityService(connection=connection, batch_size=2)
+    entities = [
+        EntityNode(entity_id=f"e{i}", name=f"Entity {i}", entity_type="person")
+        for i in range(3)
+    ]
+
+    assert service.batch_create_entities(entities) == ["e0", "e1"]
@@ -25,6 +25,7 @@ def mock_connection():
     """Create mock Neo4j connection"""
     connection = Mock()
     connection.execute_query = Mock(return_value=[])
+    connection.execute_write = Mock(return_value=[])
     connection.get_session = Mock()
     return connection
 
@@ -224,14 +225,17 @@ def test_batch_create_document_nodes(entity_service, mock_connection):
         for i in range(5)
     ]
 
-    mock_connection.execute_query.return_value = [
+    mock_connection.execute_write.return_value = [
         {"id": f"doc{i}"} for i in range(5)
     ]
 
     results = entity_service.batch_create_document_nodes(documents)
 
     assert len(results) == 5
-    assert mock_connection.execute_query.called
+    mock_connection.execute_write.assert_called_once()
+    query, params = mock_connection.execute_write.call_args.args
+    assert "UNWIND $rows" in query
+    assert [row["doc_id"] for row in params["rows"]] == [f"doc{i}" for i in range(5)]
 
 
 def test_batch_create_entities(entity_service, mock_connection, sample_entity_nodes):
@@ -243,13 +247,14 @@ def test_batch_create_entities(entity_service, mock_connection, sample_entity_no
     - Different entity types handled
     - Batch size limits are respected
     """
-    mock_connection.execute_query.return_value = [
+    mock_connection.execute_write.return_value = [
         {"id": entity.entity_id} for entity in sample_entity_nodes
     ]
 
     results = entity_service.batch_create_entities(sample_entity_nodes)
 
     assert len(results) == len(sample_entity_nodes)
+    mock_connection.execute_write.assert_called_once()
 
 
 def test_batch_create_relationships(entity_service, mock_connection):
@@ -273,11 +278,12 @@ def test_batch_create_relationships(entity_service, mock_connection):
         for i in range(3)
     ]
 
-    mock_connection.execute_query.return_value = [{"created": True}] * 3
+    mock_connection.execute_write.return_value = [{"idx": i} for i in range(3)]
 
     results = entity_service.batch_create_relationships(relationships)
 
-    assert len(results) == 3
+    assert results == [True, True, True]
+    mock_connection.execute_write.assert_called_once()
 
 
 def test_link_document_to_entities(entity_service, mock_connection):
@@ -291,7 +297,7 @@ def test_link_document_to_entities(entity_service, mock_connection):
     """
     entity_ids = ["entity1", "entity2", "entity3"]
 
-    mock_connection.execute_query.return_value = [{"created": True}]
+    mock_connection.execute_write.return_value = [{"idx": i} for i in range(3)]
 
     count = entity_service.link_document_to_entities(
         doc_id="doc123",
@@ -328,12 +334,11 @@ def test_create_document_with_entities(entity_service, mock_connection, sample_d
     # First call: create document
     # Next calls: create entities
     # Final calls: create relationships
-    mock_connection.execute_query.side_effect = [
-        [{"id": sample_document_node.doc_id}],  # Document creation
-        [{"id": sample_entity_nodes[0].entity_id}],  # Entity 1 creation
-        [{"id": sample_entity_nodes[1].entity_id}],  # Entity 2 creation
-        [{"created": True}],  # Relationship 1
-        [{"created": True}],  # Relationship 2
+    mock_connection.execute_query.return_value = [{"id": sample_document_node.doc_id}]
+    # Batched writes: one statement for the entities, one for the relationships
+    mock_connection.execute_write.side_effect = [
+        [{"id": entity.entity_id} for entity in sample_entity_nodes],
+        [{"idx": 0}, {"idx": 1}],
     ]
 
     result = entity_service.create_document_with_entities(
@@ -343,6 +348,7 @@ def test_create_document_with_entities(entity_service, mock_connection, sample_d
 
     assert result is not None
     # Should have created document, entities, and relationships
+    assert mock_connection.execute_write.call_count == 2
 
 
 def test_update_document_node(entity_service, mock_connection, sample_document_node):
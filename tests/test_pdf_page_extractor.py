@@ -0,0 +1,162 @@
+"""
+Tests for page-sharded PDF extraction: shard planning, in-order streaming,
+bounded in-flight shards and the process pool path
+"""
+
+import asyncio
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from unittest.mock import Mock, patch
+
+from pypdf import PdfWriter
+
+from app.services.pdf_page_extractor import (
+    PdfExtractionConfig,
+    PdfPageExtractor,
+    extract_page_range,
+)
+
+
+def _mock_reader(page_count, failing=()):
+    pages = []
+    for index in range(page_count):
+        page = Mock()
+        if index + 1 in failing:
+            page.extract_text.side_effect = Exception("bad page")
+        else:
+            page.extract_text.return_value = f"page {index + 1}"
+        page.images = []
+        pages.append(page)
+
+    reader = Mock()
+    reader.pages = pages
+    reader.metadata = None
+    return reader
+
+
+def _thread_extractor(**config):
+    return PdfPageExtractor(PdfExtractionConfig(max_workers=2, use_processes=False, **config))
+
+
+class TestShardPlanning:
+    """Tests for splitting a page range into shards"""
+
+    def test_small_pdf_single_shard(self):
+        extractor = _thread_extractor(parallel_min_pages=50, pages_per_shard=10)
+
+        assert extractor.plan_shards(12) == [(0, 12)]
+
+    def test_large_pdf_split(self):
+        extractor = _thread_extractor(parallel_min_pages=10, pages_per_shard=4)
+
+        assert extractor.plan_shards(10) == [(0, 4), (4, 8), (8, 10)]
+
+    def test_empty_pdf(self):
+        assert _thread_extractor().plan_shards(0) == []
+
+
+def test_extract_page_range_records_page_errors():
+    with patch("app.services.pdf_page_extractor.PdfReader", return_value=_mock_reader(3, failing={2})):
+        pages = extract_page_range("test.pdf", 0, 3)
+
+    assert [page["page_number"] for page in pages] == [1, 2, 3]
+    assert pages[1]["error"] == "bad page"
+    assert pages[2]["text"] == "page 3"
+
+
+class TestIterPages:
+    """Tests for streaming pages from shards"""
+
+    @pytest.mark.asyncio
+    async def test_pages_streamed_in_order(self):
+        extractor = _thread_extractor(parallel_min_pages=4, pages_per_shard=3)
+
+        with patch("app.services.pdf_page_extractor.PdfReader", return_value=_mock_reader(10)):
+            pages = [page async for page in extractor.iter_pages("test.pdf")]
+
+        assert [page["page_number"] for page in pages] == list(range(1, 11))
+        assert pages[9]["text"] == "page 10"
+        extractor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_shards_bounded(self):
+        extractor = _thread_extractor(parallel_min_pages=2, pages_per_shard=1, max_shards_in_flight=2)
+        active = []
+        peak = []
+
+        async def fake_run(fn, file_path, start, end, extract_images):
+            active.append(start)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(start)
+            return [{"page_number": start + 1, "text": "", "images": [], "error": None}]
+
+        extractor._run = fake_run
+        pages = []
+        async for page in extractor.iter_pages("test.pdf", page_count=6):
+            pages.append(page["page_number"])
+            await asyncio.sleep(0.02)
+
+        assert pages == [1, 2, 3, 4, 5, 6]
+        assert max(peak) == 2
+
+    @pytest.mark.asyncio
+    async def test_process_pool_extraction(self, tmp_path):
+        writer = PdfWriter()
+        for _ in range(5):
+            writer.add_blank_page(width=200, height=200)
+        path = tmp_path / "blank.pdf"
+        with open(path, "wb") as f:
+            writer.write(f)
+
+        extractor = PdfPageExtractor(PdfExtractionConfig(
+            max_workers=2, parallel_min_pages=2, pages_per_shard=2
+        ))
+        info = await extractor.read_info(str(path))
+        pages = [page async for page in extractor.iter_pages(str(path), page_count=info["page_count"])]
+        extractor.shutdown()
+
+        assert info["page_count"] == 5
+        assert [page["page_number"] for page in pages] == [1, 2, 3, 4, 5]
+        assert all(page["error"] is None for page in pages)
+
+    @pytest.mark.asyncio
+    async def test_daemonic_process_extracts_sequentially(self):
+        extractor = _thread_extractor(parallel_min_pages=4, pages_per_shard=3)
+        extractor._run = Mock(side_effect=AssertionError("no executor in daemonic workers"))
+
+        with patch("app.services.pdf_page_extractor._in_daemonic_process", return_value=True), \
+             patch("app.services.pdf_page_extractor.PdfReader", return_value=_mock_reader(10)):
+            pages = [page async for page in extractor.iter_pages("test.pdf")]
+
+        assert [page["page_number"] for page in pages] == list(range(1, 11))
+
+
+class _BrokenPool(Executor):
+    def __init__(self):
+        self.shutdown_calls = 0
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shutdown_calls += 1
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_shut_down_and_replaced():
+    extractor = _thread_extractor()
+    broken = _BrokenPool()
+    extractor._executor = broken
+
+    with patch("app.services.pdf_page_extractor.PdfReader", return_value=_mock_reader(2)):
+        pages = await extractor._run(extract_page_range, "test.pdf", 0, 2, False)
+
+    assert [page["page_number"] for page in pages] == [1, 2]
+    assert broken.shutdown_calls == 1
+    assert extractor._executor is not broken
+    extractor.shutdown()
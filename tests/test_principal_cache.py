@@ -0,0 +1,260 @@
+"""
+Tests for the principal cache: TTL/LRU behaviour, API key and JWT caching,
+role and membership caching, and invalidation (local and over Pub/Sub)
+"""
+
+import base64
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import bcrypt
+import pytest
+
+from app.services.principal_cache import PrincipalCache, PrincipalCacheConfig, TTLCache
+
+
+def _jwt(exp):
+    """Unsigned token with an exp claim (only the payload is read)"""
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=").decode()
+    return f"header.{payload}.signature"
+
+
+@pytest.fixture
+def cache():
+    principal_cache = PrincipalCache(PrincipalCacheConfig(redis_url=None))
+    with patch("app.services.rbac_service.get_principal_cache", return_value=principal_cache), \
+            patch("app.services.organization_service.get_principal_cache", return_value=principal_cache), \
+            patch("app.middleware.auth.get_principal_cache", return_value=principal_cache), \
+            patch("app.services.user_service.get_principal_cache", return_value=principal_cache):
+        yield principal_cache
+
+
+@pytest.fixture
+def rbac(cache):
+    from app.services.rbac_service import RBACService
+
+    api_key = "emp_" + "a" * 60
+    key_record = {
+        "id": "key-1",
+        "user_id": "user-1",
+        "key_hash": bcrypt.hashpw(api_key.encode(), bcrypt.gensalt(rounds=4)).decode(),
+        "usage_count": 0,
+        "expires_at": None,
+    }
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = [key_record]
+    supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{"user_id": "user-1"}]
+
+    with patch("app.services.rbac_service.get_supabase_client", return_value=supabase):
+        service = RBACService()
+    return service, supabase, api_key
+
+
+class TestTTLCache:
+    """Tests for the underlying LRU"""
+
+    def test_entries_expire(self):
+        entries = TTLCache(max_size=10)
+        entries.set("a", 1, ttl=0.01)
+        assert entries.get("a") == 1
+        time.sleep(0.02)
+        assert entries.get("a") is None
+
+    def test_least_recently_used_evicted(self):
+        entries = TTLCache(max_size=2)
+        entries.set("a", 1, ttl=60)
+        entries.set("b", 2, ttl=60)
+        entries.get("a")
+        entries.set("c", 3, ttl=60)
+        assert entries.get("b") is None
+        assert entries.get("a") == 1
+
+    def test_non_positive_ttl_not_stored(self):
+        entries = TTLCache(max_size=10)
+        entries.set("a", 1, ttl=0)
+        assert len(entries) == 0
+
+
+class TestApiKeys:
+    """API key validation skips the lookup and bcrypt on repeat use"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_validation_served_from_cache(self, rbac):
+        service, supabase, api_key = rbac
+
+        with patch("app.services.rbac_service.bcrypt.checkpw", wraps=bcrypt.checkpw) as checkpw:
+            first = await service.validate_api_key(api_key)
+            second = await service.validate_api_key(api_key)
+
+        assert first["id"] == second["id"] == "key-1"
+        assert checkpw.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_plaintext_key_not_stored(self, rbac, cache):
+        service, _, api_key = rbac
+        await service.validate_api_key(api_key)
+
+        assert api_key not in repr(cache._principals._entries)
+
+    @pytest.mark.asyncio
+    async def test_revoked_key_invalid_immediately(self, rbac, cache):
+        service, supabase, api_key = rbac
+        await service.validate_api_key(api_key)
+
+        await service.revoke_api_key("key-1", "user-1", "compromised")
+        supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+
+        assert await service.validate_api_key(api_key) is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_capped_at_key_expiry(self, cache):
+        expires_at = (datetime.now(timezone.utc) + timedelta(seconds=0.05)).isoformat()
+        cache.set_api_key_principal("k", {"id": "key-1", "expires_at": expires_at})
+
+        assert cache.get_principal("k") is not None
+        time.sleep(0.1)
+        assert cache.get_principal("k") is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_key_not_cached(self, rbac, cache):
+        service, _, _ = rbac
+
+        assert await service.validate_api_key("emp_" + "b" * 60) is None
+        assert len(cache._principals) == 0
+
+
+class TestRolesAndMemberships:
+    """Role and membership lookups and their invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_roles_cached_until_role_revoked(self, rbac):
+        service, supabase, _ = rbac
+        query = supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.execute.return_value.data = [{"role": {"role_name": "editor"}}]
+
+        await service.get_user_roles("user-1")
+        await service.get_user_roles("user-1")
+        assert query.execute.call_count == 1
+
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{"id": "role-1"}]
+        await service.revoke_user_role("user-1", "editor", "admin-1")
+        query.execute.return_value.data = []
+
+        assert await service.get_user_roles("user-1") == []
+
+    @pytest.mark.asyncio
+    async def test_membership_cached_and_invalidated_on_removal(self, cache):
+        from app.services.organization_service import OrganizationService, OrgMembership
+
+        with patch("app.services.organization_service.get_supabase_storage"):
+            service = OrganizationService()
+        member = OrgMembership(id="m-1", org_id="org-1", user_id="user-2", role="member")
+        admin = OrgMembership(id="m-2", org_id="org-1", user_id="user-1", role="admin")
+        memberships = {"user-1": admin, "user-2": member}
+
+        async def get_membership(org_id, user_id):
+            return memberships.get(user_id)
+
+        with patch.object(service, "_get_membership", side_effect=get_membership) as lookup:
+            assert await service.verify_membership("org-1", "user-2") == "member"
+            assert await service.verify_membership("org-1", "user-2") == "member"
+            assert lookup.await_count == 1
+
+            service.supabase.client.table.return_value.delete.return_value.eq.return_value.eq.return_value \
+                .execute.return_value.data = [{"id": "m-1"}]
+            assert await service.remove_member("org-1", "user-1", "user-2")
+            del memberships["user-2"]
+
+            assert await service.verify_membership("org-1", "user-2") is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["delete_user", "gdpr_delete_user"])
+    async def test_deleted_user_keys_and_roles_invalidated(self, cache, method):
+        from app.services.user_service import UserService
+
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {"username": "alice"}
+        ]
+        keys_query = MagicMock()
+        keys_query.execute.return_value.data = [{"id": "key-1"}, {"id": "key-2"}]
+
+        def table(name):
+            if name == "api_keys":
+                query = MagicMock()
+                query.select.return_value.eq.return_value = keys_query
+                return query
+            return supabase.table.return_value
+
+        supabase.table.side_effect = table
+        with patch("app.services.user_service.get_supabase_client", return_value=supabase):
+            service = UserService()
+
+        cache._principals.set("cred-1", {"id": "key-1", "user_id": "user-1"}, 60)
+        cache._principals.set("cred-2", {"id": "key-2", "user_id": "user-1"}, 60)
+        cache._roles.set("user-1", ["editor"], 60)
+
+        with patch.object(service, "get_user", AsyncMock(return_value={"username": "alice"})), \
+                patch.object(service, "_log_activity", AsyncMock()):
+            await getattr(service, method)("user-1", deleted_by="admin-1")
+
+        assert cache._principals.get("cred-1") is None
+        assert cache._principals.get("cred-2") is None
+        assert cache._roles.get("user-1") is None
+
+
+class TestJwt:
+    """Verified JWTs are cached until they expire"""
+
+    @pytest.mark.asyncio
+    async def test_verified_token_reused(self, cache):
+        from app.middleware.auth import validate_token
+
+        token = _jwt(time.time() + 300)
+        cache.set_token_principal(cache.credential_key(token), "user-1", token)
+
+        # Served from the cache: Clerk is not consulted
+        with patch("app.middleware.auth.get_rbac_service"):
+            assert await validate_token(token) == "user-1"
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_or_unreadable_tokens_not_cached(self, cache):
+        cache.set_token_principal("expired", "user-1", _jwt(time.time() - 1))
+        cache.set_token_principal("opaque", "user-1", "not-a-jwt")
+
+        assert cache.get_principal("expired") is None
+        assert cache.get_principal("opaque") is None
+
+
+class TestPubSub:
+    """Invalidations from other pods"""
+
+    def test_remote_invalidation_applied(self, cache):
+        cache.set_api_key_principal("k", {"id": "key-1", "user_id": "user-1"})
+        cache.set_roles("user-1", [{"role": "admin"}])
+
+        cache._apply({"type": "api_key", "key_id": "key-1"})
+        cache._apply({"type": "user", "user_id": "user-1"})
+
+        assert cache.get_principal("k") is None
+        assert cache.get_roles("user-1") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_published(self, cache):
+        redis = MagicMock()
+        published = []
+
+        async def publish(channel, message):
+            published.append((channel, json.loads(message)))
+
+        redis.publish = publish
+        cache._redis = redis
+
+        await cache.invalidate_user("user-1")
+
+        assert published[0][0] == cache.config.channel
+        assert published[0][1]["type"] == "user"
+        assert published[0][1]["origin"] == cache._instance_id
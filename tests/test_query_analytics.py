@@ -21,6 +21,7 @@ from app.services.query_analytics_service import (
     QueryMetrics,
     AnalyticsConfig
 )
+from app.services.query_rollup_service import HOUR, RollupBucket
 
 
 @pytest.fixture
@@ -356,26 +357,21 @@ class TestMetricRetrieval:
         assert popular[0]["count"] == 50
 
     @pytest.mark.asyncio
-    async def test_get_latency_statistics(self, analytics_service, mock_storage):
-        """Test retrieving latency statistics"""
-        # Mock latency data
-        mock_result = MagicMock()
-        mock_result.data = [{
-            "avg_latency": 150.0,
-            "p50_latency": 125.0,
-            "p95_latency": 250.0,
-            "p99_latency": 400.0,
-            "max_latency": 500.0
-        }]
-
-        mock_storage.rpc.return_value.execute = AsyncMock(return_value=mock_result)
+    async def test_get_latency_statistics(self, analytics_service):
+        """Test retrieving latency statistics from rollups"""
+        # Rollup holding latencies 1..400 ms
+        bucket = RollupBucket(granularity=HOUR, bucket_start=datetime.now(timezone.utc))
+        for latency in range(1, 401):
+            bucket.add_query(latency_ms=float(latency), result_count=10)
+        analytics_service.rollups.read_rollups = AsyncMock(return_value=[bucket])
 
         stats = await analytics_service.get_latency_statistics()
 
-        assert stats["avg_latency"] == 150.0
-        assert stats["p50_latency"] == 125.0
-        assert stats["p95_latency"] == 250.0
-        assert stats["p99_latency"] == 400.0
+        assert stats["avg_latency"] == pytest.approx(200.5)
+        assert stats["p50_latency"] == pytest.approx(200, rel=0.05)
+        assert stats["p95_latency"] == pytest.approx(380, rel=0.05)
+        assert stats["p99_latency"] == pytest.approx(396, rel=0.05)
+        assert stats["max_latency"] == 400.0
 
     @pytest.mark.asyncio
     async def test_get_queries_by_date_range(self, analytics_service, mock_storage):
@@ -0,0 +1,220 @@
+"""
+Tests for the query embedding index: exact search, TTL-aware expiry and
+eviction, pipelined warm-up from Redis and QueryCacheService integration
+"""
+
+import json
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.services.query_embedding_index import (
+    NamespaceVectorIndex,
+    QueryEmbeddingIndex,
+    QueryEmbeddingIndexConfig,
+)
+
+
+def _config(**overrides):
+    return QueryEmbeddingIndexConfig(**{"ann_min_entries": 10_000, **overrides})
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakePipeline:
+    """Records queued GET/PTTL calls and answers them from a dict"""
+
+    def __init__(self, store, ttls, calls):
+        self.store = store
+        self.ttls = ttls
+        self.calls = calls
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.queued.append(self.store.get(key))
+
+    def pttl(self, key):
+        self.queued.append(self.ttls.get(key, -2))
+
+    async def execute(self):
+        self.calls.append(len(self.queued))
+        return self.queued
+
+
+def _redis_cache(entries, ttls):
+    store = {key: json.dumps(value).encode("utf-8") for key, value in entries.items()}
+    calls = []
+    cache = Mock()
+    cache.scan_keys = AsyncMock(return_value=list(entries))
+    cache.redis_client.pipeline = Mock(side_effect=lambda transaction: FakePipeline(store, ttls, calls))
+    return cache, calls
+
+
+class TestNamespaceVectorIndex:
+    """Tests for the per-namespace vector index"""
+
+    def test_search_returns_hits_above_threshold_best_first(self):
+        index = NamespaceVectorIndex(_config())
+        index.add("ns:a", _unit(1, 0, 0))
+        index.add("ns:b", _unit(0.9, 0.1, 0))
+        index.add("ns:c", _unit(0, 1, 0))
+
+        hits = index.search(_unit(1, 0.05, 0), threshold=0.95)
+
+        assert [key for key, _ in hits] == ["ns:a", "ns:b"]
+        assert hits[0][1] > hits[1][1] >= 0.95
+
+    def test_expired_entries_skipped_and_purged(self):
+        index = NamespaceVectorIndex(_config())
+        index.add("ns:old", _unit(1, 0), ttl=10, now=1000.0)
+        index.add("ns:new", _unit(1, 0.01), ttl=100, now=1000.0)
+
+        hits = index.search(_unit(1, 0), threshold=0.9, now=1020.0)
+
+        assert [key for key, _ in hits] == ["ns:new"]
+        assert "ns:old" not in index
+
+    def test_full_index_evicts_soonest_to_expire(self):
+        index = NamespaceVectorIndex(_config(max_entries=2))
+        index.add("ns:a", _unit(1, 0), ttl=50, now=0.0)
+        index.add("ns:b", _unit(0, 1), ttl=500, now=0.0)
+        index.add("ns:c", _unit(1, 1), ttl=100, now=0.0)
+
+        assert len(index) == 2
+        assert "ns:a" not in index
+        assert index.search(_unit(1, 1), threshold=0.99, now=1.0) == [("ns:c", pytest.approx(1.0))]
+
+    def test_eviction_uses_latest_ttl_of_replaced_entry(self):
+        index = NamespaceVectorIndex(_config(max_entries=2))
+        index.add("ns:a", _unit(1, 0), ttl=50, now=0.0)
+        index.add("ns:b", _unit(0, 1), ttl=100, now=0.0)
+        index.add("ns:a", _unit(1, 0), ttl=500, now=0.0)
+        index.add("ns:c", _unit(1, 1), ttl=200, now=0.0)
+
+        assert "ns:a" in index
+        assert "ns:b" not in index
+
+    def test_entry_expiring_between_purges_is_not_returned(self):
+        index = NamespaceVectorIndex(_config(purge_interval_seconds=3600))
+        index.add("ns:old", _unit(1, 0), ttl=10, now=1000.0)
+        index.add("ns:new", _unit(1, 0.01), ttl=100, now=1000.0)
+        assert len(index.search(_unit(1, 0), threshold=0.9, now=1001.0)) == 2
+
+        hits = index.search(_unit(1, 0), threshold=0.9, k=1, now=1020.0)
+
+        assert [key for key, _ in hits] == ["ns:new"]
+
+    def test_replace_and_remove(self):
+        index = NamespaceVectorIndex(_config())
+        index.add("ns:a", _unit(1, 0))
+        index.add("ns:a", _unit(0, 1))
+
+        assert len(index) == 1
+        assert index.search(_unit(1, 0), threshold=0.9) == []
+
+        assert index.remove("ns:a")
+        assert index.search(_unit(0, 1), threshold=0.9) == []
+
+    def test_dimension_mismatch_rejected(self):
+        index = NamespaceVectorIndex(_config())
+        index.add("ns:a", _unit(1, 0, 0))
+
+        assert not index.add("ns:b", _unit(1, 0))
+        assert index.search(_unit(1, 0), threshold=0.5) == []
+
+
+class TestWarmup:
+    """Tests for rebuilding a namespace from Redis"""
+
+    @pytest.mark.asyncio
+    async def test_warm_uses_one_pipeline_per_batch_and_mirrors_ttl(self):
+        entries = {
+            f"adaptive:{i}": {"query": f"q{i}", "result": {}, "embedding": _unit(1, i)}
+            for i in range(5)
+        }
+        entries["adaptive:noemb"] = {"query": "x", "result": {}}
+        ttls = {key: 60_000 for key in entries}
+        ttls["adaptive:0"] = -1
+        redis_cache, calls = _redis_cache(entries, ttls)
+        index = QueryEmbeddingIndex(_config(warm_batch_size=4))
+
+        indexed = await index.warm("adaptive", redis_cache)
+
+        assert indexed == 5
+        assert calls == [8, 4]  # GET + PTTL per key, 4 keys per round trip
+        assert index.is_warm("adaptive")
+        namespace = index._namespaces["adaptive"]
+        assert namespace._expires["adaptive:0"] == float("inf")
+        assert [key for key, _ in index.search("adaptive", _unit(1, 0), threshold=0.99)] == ["adaptive:0"]
+
+    @pytest.mark.asyncio
+    async def test_warm_is_idempotent_and_refresh_fetches_only_new_keys(self):
+        entries = {"ns:a": {"query": "a", "result": {}, "embedding": _unit(1, 0)}}
+        redis_cache, calls = _redis_cache(entries, {"ns:a": 1000})
+        index = QueryEmbeddingIndex(_config())
+
+        await index.warm("ns", redis_cache)
+        assert await index.warm("ns", redis_cache) == 0
+
+        redis_cache.scan_keys.return_value = ["ns:a", "ns:b"]
+        redis_cache.redis_client.pipeline.side_effect = lambda transaction: FakePipeline(
+            {"ns:b": json.dumps({"query": "b", "result": {}, "embedding": _unit(0, 1)})},
+            {"ns:b": 1000},
+            calls
+        )
+        assert await index.warm("ns", redis_cache, only_new=True) == 1
+        assert calls == [2, 2]
+
+
+class TestQueryCacheServiceIndex:
+    """Tests for semantic lookups through the index"""
+
+    def _service(self, index, cached):
+        from app.services.query_cache import QueryCacheService
+
+        tiered = Mock()
+        tiered.redis_cache = Mock()
+        tiered.get = AsyncMock(side_effect=lambda key: cached.get(key))
+        tiered.set = AsyncMock(return_value=True)
+        with patch("app.services.tiered_cache_service.get_tiered_cache_service", return_value=tiered), \
+                patch("app.services.query_embedding_index.get_query_embedding_index", return_value=index):
+            return QueryCacheService()
+
+    @pytest.mark.asyncio
+    async def test_hit_confirmed_and_stale_keys_dropped(self):
+        index = QueryEmbeddingIndex(_config())
+        index._warmed_at["adaptive"] = float("inf")
+        index.add("adaptive", "adaptive:gone", _unit(1, 0))
+        index.add("adaptive", "adaptive:live", _unit(1, 0.05))
+        service = self._service(index, {
+            "adaptive:live": {"query": "live query", "result": {"answer": 42}, "cached_at": "t"}
+        })
+
+        match = await service._find_similar_cached_query(np.array(_unit(1, 0)), "adaptive")
+
+        assert match["result"] == {"answer": 42}
+        assert match["original_query"] == "live query"
+        assert "adaptive:gone" not in index._namespaces["adaptive"]
+        service.cache.redis_cache.scan_keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_result_indexes_embedding_with_ttl(self):
+        index = QueryEmbeddingIndex(_config())
+        service = self._service(index, {})
+        service.embedding_service = Mock()
+        service.embedding_service.generate_embedding = AsyncMock(return_value=Mock(embedding=_unit(0, 1)))
+
+        await service.cache_result("what is covered", {"answer": 1}, cache_namespace="auto", ttl=1800)
+
+        key = f"auto:{service._hash_query('what is covered')}"
+        assert index.search("auto", _unit(0, 1), threshold=0.99) == [(key, pytest.approx(1.0))]
@@ -0,0 +1,445 @@
+"""
+Tests for query rollups: latency histogram percentiles, batched delta
+flushes, click attribution, minute/hour read planning, backfill and the
+QueryAnalyticsService / shutdown wiring
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.query_analytics_service import AnalyticsConfig, ClickEvent, QueryAnalyticsService, QueryLog
+from app.services.query_rollup_service import (
+    HOUR,
+    MINUTE,
+    UNKNOWN_SEARCH_TYPE,
+    QueryRollupService,
+    RollupBucket,
+    RollupConfig,
+)
+
+NOW = datetime.now(timezone.utc)
+T0 = NOW.replace(minute=0, second=0, microsecond=0) - timedelta(hours=5)
+
+
+class FakeQuery:
+    """Chainable stand-in for storage.table(); filters rows in memory"""
+
+    def __init__(self, storage, table):
+        self.storage = storage
+        self.table = table
+        self.filters = []
+        self.bounds = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: str(row.get(column)) >= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: str(row.get(column)) < value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column):
+        self.storage.orders.setdefault(self.table, []).append(column)
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end + 1)
+        return self
+
+    async def execute(self):
+        rows = [row for row in self.storage.tables.get(self.table, []) if all(f(row) for f in self.filters)]
+        if self.bounds:
+            rows = rows[self.bounds[0]:self.bounds[1]]
+        return MagicMock(data=rows)
+
+
+class FakeStorage:
+    """Tables as lists of rows; rpc() calls are recorded"""
+
+    def __init__(self, **tables):
+        self.tables = tables
+        self.rpc_calls = []
+        self.rpc_error = None
+        self.orders = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        async def execute():
+            if self.rpc_error:
+                raise self.rpc_error
+            self.rpc_calls.append((name, params))
+            return MagicMock(data=len((params or {}).get("p_deltas", [])))
+
+        query = MagicMock()
+        query.execute = execute
+        return query
+
+
+def _query_log(created_at, latency_ms=100.0, result_count=10, search_type="hybrid", department=None):
+    return QueryLog(
+        query_id=str(uuid4()),
+        query_text="insurance",
+        user_session_id="session-1",
+        created_at=created_at,
+        latency_ms=latency_ms,
+        result_count=result_count,
+        search_type=search_type,
+        metadata={"department": department} if department else {}
+    )
+
+
+def _click(query_id, clicked_at=None):
+    return ClickEvent(
+        click_id=str(uuid4()),
+        query_id=query_id,
+        result_id="chunk1",
+        result_rank=1,
+        clicked_at=clicked_at or NOW,
+        user_session_id="session-1"
+    )
+
+
+def _rows(storage):
+    """Rows of every apply_query_rollup_deltas call, keyed by (granularity, bucket_start)"""
+    rows = {}
+    for name, params in storage.rpc_calls:
+        if name == "apply_query_rollup_deltas":
+            for row in params["p_deltas"]:
+                rows[(row["granularity"], row["bucket_start"], row["search_type"], row["department"])] = row
+    return rows
+
+
+class TestHistogram:
+    """Latency histogram percentiles"""
+
+    def test_percentiles_within_five_percent(self):
+        rng = random.Random(3)
+        latencies = sorted(rng.lognormvariate(5, 1) for _ in range(5000))
+        bucket = RollupBucket(granularity=HOUR, bucket_start=T0)
+        for latency in latencies:
+            bucket.add_query(latency, result_count=1)
+
+        for quantile in (0.5, 0.95, 0.99):
+            exact = latencies[int(quantile * len(latencies)) - 1]
+            assert bucket.percentile(quantile) == pytest.approx(exact, rel=0.05)
+
+    def test_merge_equals_combined(self):
+        first = RollupBucket(granularity=HOUR, bucket_start=T0)
+        second = RollupBucket(granularity=HOUR, bucket_start=T0)
+        combined = RollupBucket(granularity=HOUR, bucket_start=T0)
+        for latency in range(1, 200):
+            (first if latency % 2 else second).add_query(float(latency), result_count=1)
+            combined.add_query(float(latency), result_count=1)
+
+        first.merge(second)
+
+        assert first.latency_stats() == combined.latency_stats()
+
+    def test_row_round_trip(self):
+        bucket = RollupBucket(granularity=MINUTE, bucket_start=T0, search_type="vector", department="Legal")
+        bucket.add_query(250.0, result_count=0)
+        bucket.clicks = 2
+
+        assert RollupBucket.from_row(bucket.to_row()) == bucket
+
+
+class TestWritePath:
+    """Accumulated deltas and batched flushes"""
+
+    @pytest.mark.asyncio
+    async def test_queries_merged_into_minute_and_hour_rows(self):
+        storage = FakeStorage()
+        rollups = QueryRollupService(storage, RollupConfig(batch_size=3))
+
+        rollups.record_query(_query_log(T0 + timedelta(minutes=1, seconds=5), latency_ms=100.0))
+        rollups.record_query(_query_log(T0 + timedelta(minutes=1, seconds=50), latency_ms=300.0))
+        assert await rollups.maybe_flush() == 0
+
+        rollups.record_query(_query_log(T0 + timedelta(minutes=2), latency_ms=200.0, result_count=0))
+        assert await rollups.maybe_flush() == 3
+
+        rows = _rows(storage)
+        hour = rows[(HOUR, T0.isoformat(), "hybrid", "")]
+        minute = rows[(MINUTE, (T0 + timedelta(minutes=1)).isoformat(), "hybrid", "")]
+        assert len(storage.rpc_calls) == 1
+        assert (hour["query_count"], hour["impressions"], hour["latency_sum_ms"]) == (3, 2, 600.0)
+        assert (minute["query_count"], minute["latency_max_ms"]) == (2, 300.0)
+
+    @pytest.mark.asyncio
+    async def test_flush_after_interval(self):
+        storage = FakeStorage()
+        rollups = QueryRollupService(storage, RollupConfig(batch_size=100, flush_interval_seconds=0))
+
+        rollups.record_query(_query_log(T0))
+
+        assert await rollups.maybe_flush() == 2
+
+    @pytest.mark.asyncio
+    async def test_background_flush_without_new_events(self):
+        storage = FakeStorage()
+        rollups = QueryRollupService(storage, RollupConfig(batch_size=100, flush_interval_seconds=0.02))
+
+        rollups.start()
+        rollups.record_query(_query_log(T0))
+        await asyncio.sleep(0.1)
+
+        assert len(storage.rpc_calls) == 1
+        assert await rollups.stop() == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self):
+        storage = FakeStorage()
+        rollups = QueryRollupService(storage)
+
+        rollups.start()
+        rollups.record_query(_query_log(T0))
+
+        assert await rollups.stop() == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_kept_for_next_flush(self):
+        storage = FakeStorage()
+        storage.rpc_error = ConnectionError("supabase down")
+        rollups = QueryRollupService(storage)
+
+        rollups.record_query(_query_log(T0))
+        assert await rollups.flush() == 0
+
+        storage.rpc_error = None
+        rollups.record_query(_query_log(T0))
+        assert await rollups.flush() == 2
+
+        assert _rows(storage)[(HOUR, T0.isoformat(), "hybrid", "")]["query_count"] == 2
+
+
+class TestClickAttribution:
+    """Clicks count towards their query's bucket and dimensions"""
+
+    @pytest.mark.asyncio
+    async def test_click_on_recent_query(self):
+        storage = FakeStorage()
+        rollups = QueryRollupService(storage)
+        query = _query_log(T0 + timedelta(minutes=7), department="Legal")
+
+        rollups.record_query(query)
+        await rollups.record_click(_click(query.query_id, clicked_at=NOW))
+        await rollups.flush()
+
+        hour = _rows(storage)[(HOUR, T0.isoformat(), "hybrid", "Legal")]
+        assert (hour["impressions"], hour["clicks"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_click_on_older_query_looked_up(self):
+        storage = FakeStorage(query_logs=[{
+            "query_id": "q-1",
+            "created_at": T0.isoformat(),
+            "search_type": "vector",
+            "metadata": {}
+        }])
+        rollups = QueryRollupService(storage)
+
+        await rollups.record_click(_click("q-1"))
+        await rollups.record_click(_click("q-unknown"))
+        await rollups.flush()
+
+        rows = _rows(storage)
+        assert rows[(HOUR, T0.isoformat(), "vector", "")]["clicks"] == 1
+        unknown_hour = NOW.replace(minute=0, second=0, microsecond=0).isoformat()
+        assert rows[(HOUR, unknown_hour, UNKNOWN_SEARCH_TYPE, "")]["clicks"] == 1
+
+
+class TestReadPath:
+    """Hour rows for whole hours, minute rows for the edges"""
+
+    @pytest.mark.asyncio
+    async def test_edges_read_from_minute_rows(self):
+        rollups = QueryRollupService(FakeStorage())
+        calls = []
+
+        async def select(granularity, start, end, search_type, department):
+            calls.append((granularity, start, end))
+            return []
+
+        rollups._select = select
+        await rollups.read_rollups(T0 + timedelta(minutes=15), T0 + timedelta(hours=3, minutes=40, seconds=30))
+
+        assert sorted(calls) == sorted([
+            (HOUR, T0 + timedelta(hours=1), T0 + timedelta(hours=3)),
+            (MINUTE, T0 + timedelta(minutes=15), T0 + timedelta(hours=1)),
+            (MINUTE, T0 + timedelta(hours=3), T0 + timedelta(hours=3, minutes=41)),
+        ])
+
+    @pytest.mark.asyncio
+    async def test_expired_minutes_fall_back_to_hours(self):
+        rollups = QueryRollupService(FakeStorage(), RollupConfig(minute_retention_hours=1))
+        calls = []
+
+        async def select(granularity, start, end, search_type, department):
+            calls.append((granularity, start, end))
+            return []
+
+        rollups._select = select
+        await rollups.read_rollups(T0 + timedelta(minutes=15), T0 + timedelta(minutes=40))
+
+        assert calls == [(HOUR, T0, T0 + timedelta(hours=1))]
+
+    @pytest.mark.asyncio
+    async def test_filtered_summary_from_stored_rows(self):
+        rows = []
+        for search_type, latency in (("hybrid", 100.0), ("vector", 900.0)):
+            bucket = RollupBucket(granularity=HOUR, bucket_start=T0, search_type=search_type)
+            bucket.add_query(latency, result_count=5)
+            rows.append(bucket.to_row())
+        rollups = QueryRollupService(FakeStorage(query_rollups=rows))
+
+        summary = await rollups.summarize(T0, T0 + timedelta(minutes=59, seconds=59), search_type="vector")
+
+        assert summary.query_count == 1
+        assert summary.latency_max_ms == 900.0
+
+    @pytest.mark.asyncio
+    async def test_paged_reads_ordered_by_whole_key(self):
+        rows = []
+        for search_type in ("hybrid", "vector", "keyword"):
+            bucket = RollupBucket(granularity=HOUR, bucket_start=T0, search_type=search_type)
+            bucket.add_query(100.0, result_count=5)
+            rows.append(bucket.to_row())
+        storage = FakeStorage(query_rollups=rows)
+        rollups = QueryRollupService(storage, RollupConfig(page_size=2))
+
+        summary = await rollups.summarize(T0, T0 + timedelta(minutes=59, seconds=59))
+
+        assert summary.query_count == 3
+        assert storage.orders["query_rollups"][:3] == ["bucket_start", "search_type", "department"]
+
+
+class TestBackfill:
+    """Recompute complete hours from raw logs"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_replaces_hours_idempotently(self):
+        query_logs = [
+            {
+                "query_id": f"q-{i}",
+                "created_at": (T0 + timedelta(minutes=10 * i)).isoformat(),
+                "latency_ms": 50.0 * (i + 1),
+                "result_count": 3,
+                "search_type": "hybrid",
+                "metadata": {"department": "Legal"} if i % 2 else {}
+            }
+            for i in range(9)  # Spans T0 .. T0 + 80 min
+        ]
+        click_events = [{"click_id": "c-1", "query_id": "q-1"}, {"click_id": "c-2", "query_id": "q-7"}]
+        storage = FakeStorage(query_logs=query_logs, click_events=click_events)
+        rollups = QueryRollupService(storage, RollupConfig(page_size=4))
+
+        totals = await rollups.backfill(T0, T0 + timedelta(hours=2))
+        first_run = list(storage.rpc_calls)
+        await rollups.backfill(T0, T0 + timedelta(hours=2))
+
+        assert totals["hours"] == 2
+        assert totals["queries"] == 9
+        assert totals["clicks"] == 2
+        assert [name for name, _ in first_run] == ["replace_query_rollups"] * 2
+        assert storage.rpc_calls[2:] == first_run
+
+        first_hour = {
+            (row["granularity"], row["department"]): row
+            for row in first_run[0][1]["p_rows"] if row["granularity"] == HOUR
+        }
+        assert first_hour[(HOUR, "")]["query_count"] == 3
+        assert first_hour[(HOUR, "Legal")]["query_count"] == 3
+        assert first_hour[(HOUR, "Legal")]["clicks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_skips_hours_with_pending_deltas(self):
+        """Hours that may still have unflushed deltas in live processes are left alone"""
+        storage = FakeStorage(query_logs=[], click_events=[])
+        rollups = QueryRollupService(
+            storage, RollupConfig(flush_interval_seconds=60, backfill_margin_seconds=3600)
+        )
+
+        totals = await rollups.backfill(T0, NOW)
+
+        last_end = max(params["p_end"] for _, params in storage.rpc_calls)
+        assert last_end <= rollups.backfill_horizon().isoformat()
+        assert totals["hours"] == len(storage.rpc_calls) in (3, 4)
+
+
+class TestAnalyticsServiceWiring:
+    """QueryAnalyticsService feeds the rollups and reads percentiles from them"""
+
+    @pytest.mark.asyncio
+    async def test_logged_queries_flushed_in_batches(self):
+        storage = FakeStorage()
+        storage.table = MagicMock()
+        storage.table.return_value.insert.return_value.execute = AsyncMock()
+        service = QueryAnalyticsService(storage=storage, config=AnalyticsConfig(batch_size=3))
+
+        for _ in range(3):
+            await service.log_query("insurance", latency_ms=120.0, result_count=4, user_session_id="s")
+
+        assert len(storage.rpc_calls) == 1
+        assert sum(row["query_count"] for row in storage.rpc_calls[0][1]["p_deltas"] if row["granularity"] == HOUR) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_log_not_counted(self):
+        storage = FakeStorage()
+        storage.table = MagicMock()
+        storage.table.return_value.insert.return_value.execute = AsyncMock(side_effect=ConnectionError("down"))
+        service = QueryAnalyticsService(storage=storage)
+
+        await service.log_query("insurance", latency_ms=120.0, result_count=4, user_session_id="s")
+
+        assert await service.flush_rollups() == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_data_flushes_rollups(self):
+        from app.core.graceful_shutdown import GracefulShutdown
+
+        service = MagicMock()
+        service.flush_rollups = AsyncMock(return_value=4)
+
+        with patch("app.services.query_analytics_service.get_query_analytics_service", return_value=service), \
+                patch("app.services.audit_log_sink.get_audit_log_sink"):
+            assert await GracefulShutdown().flush_data()
+
+        service.flush_rollups.assert_awaited_once()
+
+
+class TestRollupTasks:
+    """Celery tasks build their own rollup service over a Supabase client"""
+
+    def test_purge_task_uses_service_key_client(self, monkeypatch):
+        from app.tasks.query_rollup_tasks import purge_query_rollup_minutes
+
+        storage = FakeStorage()
+        storage.table = MagicMock()
+        storage.table.return_value.delete.return_value.eq.return_value.lt.return_value.execute = AsyncMock()
+        monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+        monkeypatch.setenv("SUPABASE_SERVICE_KEY", "service-key")
+
+        with patch("supabase.acreate_client", AsyncMock(return_value=storage)) as create:
+            result = purge_query_rollup_minutes.apply().get()
+
+        assert result["success"] is True
+        create.assert_awaited_once_with("http://supabase.test", "service-key")
+        storage.table.assert_called_once_with("query_rollups")
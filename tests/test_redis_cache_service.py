@@ -9,15 +9,17 @@ Run with: python3 -m pytest tests/test_redis_cache_service.py -v
 
 import pytest
 import time
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timedelta
 
 from app.services.redis_cache_service import (
+    AsyncRedisCacheService,
     RedisCacheService,
     RedisCacheConfig,
     CacheKey,
     CacheMetrics,
-    get_redis_cache_service
+    get_redis_cache_service,
+    make_cache_key
 )
 
 
@@ -523,3 +525,115 @@ def test_ttl_refresh_on_access(cache_service, mock_redis_client, sample_query_re
     # TTL should be refreshed
     if hasattr(cache_service, 'refresh_ttl'):
         mock_redis_client.expire.assert_called()
+
+
+# ============================================================================
+# Async Redis Cache Service
+# ============================================================================
+
+@pytest.fixture
+def mock_async_redis_client():
+    """Create mock redis.asyncio client with a pipeline"""
+    client = MagicMock()
+    client.get = AsyncMock(return_value=None)
+    client.setex = AsyncMock(return_value=True)
+    client.mget = AsyncMock(return_value=[])
+    client.delete = AsyncMock(return_value=1)
+
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(return_value=[])
+    client.pipeline = MagicMock(return_value=pipe)
+    return client
+
+
+@pytest.fixture
+def async_cache_service(cache_config, mock_async_redis_client):
+    """Create async cache service with mock client"""
+    return AsyncRedisCacheService(config=cache_config, redis_client=mock_async_redis_client)
+
+
+@pytest.mark.asyncio
+async def test_async_query_result_hit_and_miss(async_cache_service, mock_async_redis_client, sample_query_result):
+    """
+    Test async query lookups share the sync key format and track metrics
+    """
+    import json
+
+    mock_async_redis_client.get.return_value = json.dumps(sample_query_result).encode('utf-8')
+    result = await async_cache_service.get_cached_query_result("insurance policy claims")
+
+    assert result == sample_query_result
+    mock_async_redis_client.get.assert_awaited_once_with(
+        make_cache_key("insurance policy claims", "query")
+    )
+
+    mock_async_redis_client.get.return_value = None
+    assert await async_cache_service.get_cached_query_result("other") is None
+    assert async_cache_service.get_metrics() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_async_mget_single_round_trip(async_cache_service, mock_async_redis_client):
+    """
+    Test mget fetches all keys with one MGET and decodes each value
+    """
+    mock_async_redis_client.mget.return_value = [b'{"a": 1}', None, b"not json"]
+
+    values = await async_cache_service.mget(["k1", "k2", "k3"])
+
+    assert values == [{"a": 1}, None, None]
+    mock_async_redis_client.mget.assert_awaited_once_with(["k1", "k2", "k3"])
+    mock_async_redis_client.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_cache_multiple_uses_pipeline(async_cache_service, mock_async_redis_client):
+    """
+    Test bulk caching queues SETEX on one non-transactional pipeline
+    """
+    items = [(f"query{i}", {"results": []}) for i in range(3)]
+
+    results = await async_cache_service.cache_multiple(items, key_type="query")
+
+    assert results == [True, True, True]
+    mock_async_redis_client.pipeline.assert_called_once_with(transaction=False)
+    pipe = mock_async_redis_client.pipeline.return_value
+    assert pipe.setex.call_count == 3
+    pipe.execute.assert_awaited_once()
+    mock_async_redis_client.setex.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_delete_many(async_cache_service, mock_async_redis_client):
+    """
+    Test delete_many issues a single DEL for all keys
+    """
+    mock_async_redis_client.delete.return_value = 2
+
+    deleted = await async_cache_service.delete_many(["a", "b"])
+
+    assert deleted == 2
+    mock_async_redis_client.delete.assert_awaited_once_with("a", "b")
+
+
+def test_async_pools_of_closed_loops_are_disconnected(cache_config):
+    """
+    Test a new event loop gets its own pool and the closed loop's pool is disconnected
+    """
+    import asyncio
+
+    service = AsyncRedisCacheService(config=cache_config)
+
+    async def open_client():
+        return service.redis_client
+
+    first = asyncio.run(open_client())
+    disconnect = AsyncMock(side_effect=RuntimeError("Event loop is closed"))
+
+    with patch.object(first.connection_pool, "disconnect", disconnect):
+        second = asyncio.run(open_client())
+
+    assert second is not first
+    disconnect.assert_awaited_once_with(inuse_connections=True)
+    assert list(service._clients.values()) == [second]
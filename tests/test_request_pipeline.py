@@ -0,0 +1,246 @@
+"""
+Tests for the pure ASGI request middleware pipeline: single registration,
+identity resolved once and shared, streaming pass-through and the
+per-layer behaviours (size limit, audit errors, org validation, headers)
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from app.middleware.audit import AuditLoggingMiddleware
+from app.middleware.identity import IdentityMiddleware
+from app.middleware.input_validation import RequestSizeLimitMiddleware
+from app.middleware.org_context import OrgContextMiddleware
+from app.middleware.pipeline import (
+    RequestMetricsMiddleware,
+    RequestPipelineMiddleware,
+    configure_request_pipeline,
+)
+from app.middleware.request_tracing import RequestTracingMiddleware
+from app.middleware.rls_context import RLSContextMiddleware
+from app.middleware.security import SecurityHeadersMiddleware
+
+
+def _metrics():
+    latency = MagicMock()
+    count = MagicMock()
+    return latency, count
+
+
+@pytest.fixture
+def backends():
+    """Patch out the audit sink, Supabase (RLS) and authentication"""
+    audit_sink = MagicMock()
+    with patch("app.middleware.audit.get_audit_log_sink", return_value=audit_sink), \
+            patch.object(RLSContextMiddleware, "_set_rls_context", new_callable=AsyncMock) as set_rls, \
+            patch("app.middleware.identity.get_user_from_authorization",
+                  new_callable=AsyncMock, return_value="user-1") as authenticate, \
+            patch("app.middleware.identity.get_primary_role",
+                  new_callable=AsyncMock, return_value="editor"):
+        yield {"audit_sink": audit_sink, "set_rls": set_rls, "authenticate": authenticate}
+
+
+@pytest.fixture
+def app(backends):
+    test_app = FastAPI()
+    latency, count = _metrics()
+    configure_request_pipeline(test_app, request_latency=latency, request_count=count)
+    test_app.state.metrics = (latency, count)
+
+    @test_app.get("/api/whoami")
+    async def whoami(request: Request):
+        return {
+            "user_id": getattr(request.state, "user_id", None),
+            "user_role": getattr(request.state, "user_role", None),
+            "org_id": request.state.org_id,
+        }
+
+    @test_app.post("/api/upload")
+    async def upload():
+        return {"ok": True}
+
+    @test_app.get("/api/boom")
+    async def boom():
+        raise RuntimeError("kaboom")
+
+    return test_app
+
+
+class TestPipeline:
+    """Tests for composition and shared identity"""
+
+    def test_registered_as_single_middleware(self, app):
+        assert len(app.user_middleware) == 1
+        entry = app.user_middleware[0]
+        assert entry.cls is RequestPipelineMiddleware
+        assert [layer.cls for layer in entry.kwargs["layers"]] == [
+            RequestMetricsMiddleware,
+            IdentityMiddleware,
+            OrgContextMiddleware,
+            RequestTracingMiddleware,
+            AuditLoggingMiddleware,
+            RequestSizeLimitMiddleware,
+            RLSContextMiddleware,
+        ]
+
+    def test_layers_run_outermost_first(self):
+        calls = []
+
+        def layer(name):
+            class Layer:
+                def __init__(self, app):
+                    self.app = app
+
+                async def __call__(self, scope, receive, send):
+                    calls.append(name)
+                    await self.app(scope, receive, send)
+            return Layer
+
+        async def endpoint(scope, receive, send):
+            calls.append("app")
+
+        pipeline = RequestPipelineMiddleware(endpoint, layers=[Middleware(layer("a")), Middleware(layer("b"))])
+        asyncio.run(pipeline({"type": "http"}, None, None))
+
+        assert calls == ["a", "b", "app"]
+
+    def test_identity_resolved_once_and_shared(self, app, backends):
+        client = TestClient(app)
+
+        response = client.get("/api/whoami", headers={"Authorization": "Bearer token"})
+
+        assert response.json()["user_id"] == "user-1"
+        assert response.json()["user_role"] == "editor"
+        backends["authenticate"].assert_awaited_once()
+        assert backends["set_rls"].await_args.args[:2] == ("user-1", "editor")
+
+        audit_row = backends["audit_sink"].enqueue.call_args.args[0]
+        assert audit_row["user_id"] == "user-1"
+
+    def test_anonymous_request_not_reauthenticated(self, app, backends):
+        backends["authenticate"].return_value = None
+        client = TestClient(app)
+
+        response = client.get("/api/whoami", headers={"Authorization": "Bearer bad"})
+
+        assert response.json()["user_id"] is None
+        backends["authenticate"].assert_awaited_once()
+        assert backends["set_rls"].await_args.args[:2] == ("anonymous", "guest")
+
+    def test_metrics_and_tracing_headers(self, app):
+        client = TestClient(app)
+
+        response = client.get("/api/whoami", headers={"X-Request-ID": "req-123"})
+
+        assert response.headers["X-Request-ID"] == "req-123"
+        float(response.headers["X-Process-Time"])
+        latency, count = app.state.metrics
+        latency.labels.assert_called_once_with(method="GET", endpoint="/api/whoami")
+        count.labels.assert_called_once_with(method="GET", endpoint="/api/whoami", status=200)
+
+
+class TestLayers:
+    """Tests for behaviour of individual layers inside the pipeline"""
+
+    def test_oversized_body_rejected_with_413(self, app):
+        client = TestClient(app)
+
+        response = client.post("/api/upload", headers={"Content-Length": str(200 * 1024 * 1024)}, content=b"")
+
+        assert response.status_code == 413
+        assert response.json()["detail"]["error"] == "Request body too large"
+
+    def test_unhandled_error_returns_500_and_is_audited(self, app, backends):
+        client = TestClient(app, raise_server_exceptions=False)
+
+        response = client.get("/api/boom")
+
+        assert response.status_code == 500
+        assert response.json() == {"error": "Internal server error"}
+        audit_row = backends["audit_sink"].enqueue.call_args.args[0]
+        assert audit_row["event_type"] == "system_error"
+        assert audit_row["status"] == "failure"
+
+    def test_invalid_org_id_rejected(self, app):
+        client = TestClient(app)
+
+        response = client.get("/api/whoami", headers={"X-Org-Id": "not-a-uuid"})
+
+        assert response.status_code == 400
+
+    def test_org_membership_checked_with_resolved_identity(self, app):
+        org_id = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+        org_service = MagicMock()
+        org_service.verify_membership = AsyncMock(return_value="admin")
+        client = TestClient(app)
+
+        with patch("app.services.organization_service.get_organization_service", return_value=org_service):
+            response = client.get(
+                "/api/whoami",
+                headers={"Authorization": "Bearer token", "X-Org-Id": org_id}
+            )
+
+        assert response.json()["org_id"] == org_id
+        org_service.verify_membership.assert_awaited_once_with(org_id, "user-1")
+
+    def test_security_headers_added(self):
+        app = FastAPI()
+        app.add_middleware(SecurityHeadersMiddleware, enable_hsts=False)
+
+        @app.get("/api/data")
+        async def data():
+            return {}
+
+        response = TestClient(app).get("/api/data")
+
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "default-src 'self'" in response.headers["Content-Security-Policy"]
+        assert response.headers["Cache-Control"].startswith("no-store")
+
+
+class TestStreaming:
+    """Streaming responses pass through without buffering"""
+
+    @pytest.mark.asyncio
+    async def test_first_chunk_sent_before_stream_finishes(self, app):
+        release = asyncio.Event()
+
+        async def events():
+            yield b"data: first\n\n"
+            await release.wait()
+            yield b"data: second\n\n"
+
+        @app.get("/api/stream")
+        async def stream():
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        sent = []
+
+        async def receive():
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body") == b"data: first\n\n":
+                release.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/api/stream", "raw_path": b"/api/stream",
+            "root_path": "", "query_string": b"", "headers": [], "client": ("127.0.0.1", 1),
+            "server": ("testserver", 80),
+        }
+
+        # Deadlocks (and times out) if any layer waits for the full body
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+        bodies = [m.get("body") for m in sent if m["type"] == "http.response.body" and m.get("body")]
+        assert bodies == [b"data: first\n\n", b"data: second\n\n"]
+        start = next(m for m in sent if m["type"] == "http.response.start")
+        assert any(name == b"x-request-id" for name, _ in start["headers"])
@@ -8,6 +8,8 @@ Validates relevance improvements, ranking quality, and performance metrics.
 Run with: python3 -m pytest tests/test_reranking_service.py -v
 """
 
+import math
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from app.services.reranking_service import (
@@ -15,12 +17,22 @@ from app.services.reranking_service import (
     RerankingConfig,
     RerankingResult,
     RerankingProvider,
-    get_reranking_service
+    RerankScoreCache,
+    get_reranking_service,
+    reset_rerank_score_cache
 )
 from app.services.parallel_search_service import ParallelSearchResult
 from app.services.hybrid_search_service import SearchResult, SearchMethod
 
 
+@pytest.fixture(autouse=True)
+def reset_score_cache():
+    """Each test starts with an empty shared score cache"""
+    reset_rerank_score_cache()
+    yield
+    reset_rerank_score_cache()
+
+
 @pytest.fixture
 def reranking_config_dev():
     """Create test configuration for development (Ollama)"""
@@ -469,3 +481,196 @@ async def test_rerank_integration_with_parallel_search(
     for reranked in result.reranked_results:
         assert reranked.metadata is not None
         assert reranked.method in ["dense", "sparse", "fuzzy", "hybrid"]
+
+
+# ============================================================================
+# Batched cross-encoder provider, score cache and early exit
+# ============================================================================
+
+@pytest.fixture
+def reranking_config_batch():
+    """Create test configuration for the batched /rerank endpoint"""
+    return RerankingConfig(
+        provider=RerankingProvider.BATCH,
+        base_url="http://localhost:8080",
+        top_k=5,
+        max_input_results=30,
+        score_threshold=0.0
+    )
+
+
+def _rerank_http_client(payload):
+    """Mock httpx client returning a /rerank payload"""
+    response = Mock()
+    response.raise_for_status = Mock()
+    response.json = Mock(return_value=payload)
+    client = Mock()
+    client.post = AsyncMock(return_value=response)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_batch_rerank_single_request(reranking_config_batch, sample_search_results):
+    """
+    Test batched reranking scores all candidates in one HTTP call
+
+    Verifies:
+    - One POST to /rerank for all documents
+    - Scores are mapped back by index
+    """
+    results = sample_search_results[:10]
+    client = _rerank_http_client({
+        "results": [{"index": i, "relevance_score": i / 10} for i in range(10)]
+    })
+    service = RerankingService(config=reranking_config_batch, http_client=client)
+
+    result = await service.rerank(query="insurance policy", results=results)
+
+    client.post.assert_awaited_once()
+    assert client.post.call_args.args[0] == "http://localhost:8080/rerank"
+    assert len(client.post.call_args.kwargs["json"]["documents"]) == 10
+    assert [r.chunk_id for r in result.reranked_results] == [f"doc_{i}" for i in range(9, 4, -1)]
+    assert result.metrics.reranked_count == 10
+
+
+@pytest.mark.asyncio
+async def test_batch_rerank_normalizes_logits(reranking_config_batch, sample_search_results):
+    """
+    Test TEI-style raw logits are mapped into [0, 1]
+    """
+    client = _rerank_http_client([{"index": 0, "score": 4.0}, {"index": 1, "score": -4.0}])
+    service = RerankingService(config=reranking_config_batch, http_client=client)
+
+    result = await service.rerank(query="insurance policy", results=sample_search_results[:2])
+
+    scores = {r.chunk_id: r.score for r in result.reranked_results}
+    assert 0.98 < scores["doc_0"] < 1.0
+    assert 0.0 < scores["doc_1"] < 0.02
+
+
+@pytest.mark.asyncio
+async def test_score_cache_skips_scored_pairs(reranking_config_dev, sample_search_results, mock_ollama_client):
+    """
+    Test repeated queries only rerank chunks without a cached score
+
+    Verifies:
+    - Second call for the same query makes no provider calls for cached chunks
+    - Cache hits are reported in metrics
+    """
+    mock_ollama_client.generate = AsyncMock(return_value={"response": "0.9"})
+    service = RerankingService(config=reranking_config_dev, ollama_client=mock_ollama_client)
+
+    await service.rerank(query="insurance policy", results=sample_search_results[:5])
+    assert mock_ollama_client.generate.call_count == 5
+
+    result = await service.rerank(query="insurance policy", results=sample_search_results[:6])
+
+    assert mock_ollama_client.generate.call_count == 6
+    assert result.metrics.cache_hits == 5
+    assert result.metrics.reranked_count == 1
+
+
+def test_score_cache_ttl_and_lru():
+    """
+    Test cached scores expire and the cache is bounded
+    """
+    cache = RerankScoreCache(max_size=2)
+    docs = {"a": "text a", "b": "text b", "c": "text c"}
+    cache.put_many("m", "q", docs, {"a": 0.1, "b": 0.2, "c": 0.3})
+
+    assert len(cache) == 2
+    assert cache.get_many("m", "q", docs, ttl=60) == {"b": 0.2, "c": 0.3}
+    assert cache.get_many("m", "q", {"b": "text b"}, ttl=-1) == {}
+
+
+def test_score_cache_keyed_on_content():
+    """
+    Test a cached score is not reused for the same chunk id with other text
+    (client-supplied ids on /rerank, re-indexed chunks)
+    """
+    cache = RerankScoreCache()
+    cache.put_many("m", "q", {"doc-1": "private text"}, {"doc-1": 0.9})
+
+    assert cache.get_many("m", "q", {"doc-1": "other text"}, ttl=60) == {}
+    assert cache.get_many("m", "q", {"doc-1": "private text"}, ttl=60) == {"doc-1": 0.9}
+
+
+def test_score_scale_separates_providers_sharing_a_model():
+    """
+    Test Ollama and batch scores for the same model do not share cache entries
+    """
+    ollama = RerankingConfig(provider=RerankingProvider.OLLAMA)
+    batch = RerankingConfig(provider=RerankingProvider.BATCH)
+    raw_batch = RerankingConfig(provider=RerankingProvider.BATCH, logit_scores=False)
+
+    assert ollama.resolved_model == batch.resolved_model
+    assert len({ollama.score_scale, batch.score_scale, raw_batch.score_scale}) == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_rerank_sigmoid_handles_extreme_logits(reranking_config_batch, sample_search_results):
+    """
+    Test very negative logits map to ~0 instead of overflowing
+    """
+    client = _rerank_http_client([{"index": 0, "score": -1000.0}, {"index": 1, "score": 1000.0}])
+    service = RerankingService(config=reranking_config_batch, http_client=client)
+
+    result = await service.rerank(query="insurance policy", results=sample_search_results[:2])
+
+    assert result.metrics.error is None
+    scores = {r.chunk_id: r.score for r in result.reranked_results}
+    assert scores["doc_0"] == pytest.approx(0.0)
+    assert scores["doc_1"] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_llm_rerank_caches_only_returned_scores(reranking_config_llm, sample_search_results, mock_llm_client):
+    """
+    Test documents the LLM did not score are re-scored on the next call
+    """
+    mock_llm_client.generate.return_value = '{"relevance_scores": [0.9, 0.8]}'
+    service = RerankingService(config=reranking_config_llm, llm_client=mock_llm_client)
+
+    await service.rerank(query="insurance policy", results=sample_search_results[:4])
+    result = await service.rerank(query="insurance policy", results=sample_search_results[:4])
+
+    assert result.metrics.cache_hits == 2
+    assert result.metrics.reranked_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_rerank_sigmoid_is_per_model(reranking_config_batch, sample_search_results):
+    """
+    Test normalization does not depend on the returned score range
+    """
+    payload = [{"index": 0, "score": 0.9}, {"index": 1, "score": 0.1}]
+
+    service = RerankingService(config=reranking_config_batch, http_client=_rerank_http_client(payload))
+    result = await service.rerank(query="insurance policy", results=sample_search_results[:2])
+    scores = {r.chunk_id: r.score for r in result.reranked_results}
+    assert scores["doc_0"] == pytest.approx(1.0 / (1.0 + math.exp(-0.9)))
+
+    reranking_config_batch.logit_scores = False
+    service = RerankingService(config=reranking_config_batch, http_client=_rerank_http_client(payload))
+    result = await service.rerank(query="insurance policy", results=sample_search_results[2:4])
+    scores = {r.chunk_id: r.score for r in result.reranked_results}
+    assert scores["doc_2"] == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_early_exit_reranks_top_n_by_rrf(reranking_config_batch, sample_search_results):
+    """
+    Test rerank_top_n limits reranking to the best candidates by RRF score
+    """
+    for i, r in enumerate(sample_search_results):
+        r.rrf_score = i / 100  # Highest RRF at the end of the list
+    reranking_config_batch.rerank_top_n = 3
+    client = _rerank_http_client({
+        "results": [{"index": i, "relevance_score": 0.5} for i in range(3)]
+    })
+    service = RerankingService(config=reranking_config_batch, http_client=client)
+
+    result = await service.rerank(query="insurance policy", results=sample_search_results)
+
+    assert client.post.call_args.kwargs["json"]["top_n"] == 3
+    assert {r.chunk_id for r in result.reranked_results} == {"doc_29", "doc_28", "doc_27"}
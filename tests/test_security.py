@@ -361,7 +361,7 @@ class TestSecurityIntegration:
         # Check rate limiting
         assert "x-ratelimit-limit" in response.headers
 
-        # Check request timing (from track_requests middleware)
+        # Check request timing (from RequestMetricsMiddleware)
         assert "x-process-time" in response.headers
 
     def test_cors_configuration(self):
@@ -27,19 +27,21 @@ from app.services.semantic_cache_service import (
 
 @pytest.fixture
 def mock_redis_client():
-    """Create mock Redis client"""
+    """Create mock async Redis cache service"""
     redis = MagicMock()
-    redis.get = MagicMock(return_value=None)
-    redis.set = MagicMock(return_value=True)
-    redis.get_cached_query_result = MagicMock(return_value=None)
-    redis.cache_query_result = MagicMock(return_value=True)
-    redis.get_cached_embedding = MagicMock(return_value=None)
-    redis.cache_embedding = MagicMock(return_value=True)
-    redis.invalidate_cache = MagicMock(return_value=True)
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock(return_value=True)
+    redis.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+    redis.get_cached_query_result = AsyncMock(return_value=None)
+    redis.cache_query_result = AsyncMock(return_value=True)
+    redis.get_cached_embedding = AsyncMock(return_value=None)
+    redis.cache_embedding = AsyncMock(return_value=True)
+    redis.invalidate_cache = AsyncMock(return_value=True)
+    redis.delete = AsyncMock(return_value=True)
+    redis.delete_many = AsyncMock(side_effect=lambda keys: len(keys))
     redis.scan_keys = AsyncMock(return_value=[])
-    redis.redis_client = MagicMock()
-    redis.redis_client.ping = MagicMock(return_value=True)
-    redis.redis_client.delete = MagicMock(return_value=1)
+    redis.redis_client.get = AsyncMock(return_value=None)
+    redis.redis_client.incr = AsyncMock(return_value=1)
     return redis
 
 
@@ -465,6 +467,7 @@ class TestSemanticMatch:
         }
 
         mock_redis_client.scan_keys = AsyncMock(return_value=["search:sem:abc123"])
+        mock_redis_client.mget = AsyncMock(return_value=[cached_data])
         mock_redis_client.get.return_value = cached_data
 
         result = await service.get_semantic_match(
@@ -560,7 +563,11 @@ class TestCacheInvalidation:
         count = await service.clear_namespace("search")
 
         assert count == 3
-        assert mock_redis_client.redis_client.delete.call_count == 3
+        mock_redis_client.delete_many.assert_awaited_once_with([
+            "search:sem:abc",
+            "search:sem:def",
+            "search:exact:ghi"
+        ])
 
 
 # =============================================================================
@@ -646,3 +653,181 @@ class TestCacheWorkflow:
         # Verify reset
         assert service.metrics.total_requests == 0
         assert service.metrics.exact_hits == 0
+
+
+# =============================================================================
+# Vector Index Tests
+# =============================================================================
+
+class TestSemanticIndex:
+    """Tests for the in-process vector index behind semantic matching"""
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_indexed(self, service, mock_redis_client):
+        """Cached results are added to the namespace index"""
+        await service.cache_search_result(
+            query="test query",
+            result={"results": []},
+            embedding=[1.0, 0.0, 0.0]
+        )
+
+        index = service._indexes["search"]
+        assert len(index) == 1
+        assert f"search:sem:{service._hash_query('test query')}" in index
+
+    @pytest.mark.asyncio
+    async def test_lookup_uses_index_not_scan(self, service, mock_redis_client):
+        """Warm lookups do not SCAN Redis and only GET the best candidate"""
+        await service.cache_search_result(
+            query="cached query",
+            result={"results": [{"id": "doc1"}]},
+            embedding=[1.0, 0.0, 0.0]
+        )
+        await service.cache_search_result(
+            query="other query",
+            result={"results": [{"id": "doc2"}]},
+            embedding=[0.0, 1.0, 0.0]
+        )
+        mock_redis_client.scan_keys.reset_mock()
+        mock_redis_client.get.reset_mock()
+        mock_redis_client.mget = AsyncMock(return_value=[
+            {"query": "cached query", "result": {"results": [{"id": "doc1"}]}, "embedding": [1.0, 0.0, 0.0]},
+            {"query": "other query", "result": {"results": [{"id": "doc2"}]}, "embedding": [0.0, 1.0, 0.0]},
+        ])
+
+        result = await service.get_semantic_match(
+            "new query", query_embedding=[1.0, 0.01, 0.0]
+        )
+
+        assert result.tier == CacheMatchTier.EXACT
+        assert result.data == {"results": [{"id": "doc1"}]}
+        mock_redis_client.scan_keys.assert_not_called()
+        # Candidate payloads come from one MGET, best candidate first
+        mock_redis_client.mget.assert_awaited_once_with([
+            f"search:sem:{service._hash_query('cached query')}",
+            f"search:sem:{service._hash_query('other query')}",
+        ])
+        mock_redis_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_evicted_from_index(self, service, mock_redis_client):
+        """Entries whose Redis key has expired are dropped from the index"""
+        await service.cache_search_result(
+            query="cached query",
+            result={"results": []},
+            embedding=[1.0, 0.0, 0.0]
+        )
+        mock_redis_client.get.return_value = None
+
+        result = await service.get_semantic_match(
+            "new query", query_embedding=[1.0, 0.0, 0.0]
+        )
+
+        assert result.tier == CacheMatchTier.MISS
+        assert len(service._indexes["search"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_removes_from_index(self, service, mock_redis_client):
+        """Invalidation evicts the query from the index"""
+        await service.cache_search_result(
+            query="cached query",
+            result={"results": []},
+            embedding=[1.0, 0.0, 0.0]
+        )
+
+        await service.invalidate_query("cached query")
+
+        assert len(service._indexes["search"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_clear_namespace_drops_index(self, service, mock_redis_client):
+        """Clearing a namespace drops its index"""
+        await service.cache_search_result(
+            query="cached query",
+            result={"results": []},
+            embedding=[1.0, 0.0, 0.0]
+        )
+
+        await service.clear_namespace("search")
+
+        assert "search" not in service._indexes
+
+    @pytest.mark.asyncio
+    async def test_index_picks_up_entries_cached_by_other_processes(self, service, mock_redis_client):
+        """A version change in Redis re-syncs the index with the sem keys"""
+        service.config.index_refresh_seconds = 0
+        await service.get_semantic_match("first query", query_embedding=[0.0, 1.0, 0.0])
+        assert len(service._indexes["search"]) == 0
+
+        other_key = "search:sem:fromotherpod"
+        mock_redis_client.redis_client.get.return_value = b"1"
+        mock_redis_client.scan_keys.return_value = [other_key]
+        mock_redis_client.mget = AsyncMock(return_value=[{
+            "query": "cached elsewhere",
+            "result": {"results": [{"id": "doc1"}]},
+            "embedding": [1.0, 0.0, 0.0]
+        }])
+
+        result = await service.get_semantic_match("new query", query_embedding=[1.0, 0.0, 0.0])
+
+        assert result.tier == CacheMatchTier.EXACT
+        assert other_key in service._indexes["search"]
+        # One MGET to load the new key, one for the lookup's candidates
+        assert [c.args[0] for c in mock_redis_client.mget.await_args_list] == [[other_key], [other_key]]
+
+    @pytest.mark.asyncio
+    async def test_own_writes_do_not_trigger_resync(self, service, mock_redis_client):
+        """Writes that only this process made keep the index current without a SCAN"""
+        service.config.index_refresh_seconds = 0
+        await service.cache_search_result(
+            query="cached query",
+            result={"results": []},
+            embedding=[1.0, 0.0, 0.0]
+        )
+        mock_redis_client.redis_client.get.return_value = b"1"
+        mock_redis_client.scan_keys.reset_mock()
+
+        await service.get_semantic_match("new query", query_embedding=[1.0, 0.0, 0.0])
+
+        mock_redis_client.redis_client.incr.assert_awaited_once_with("search:sem_version")
+        mock_redis_client.scan_keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sync_drops_keys_gone_from_redis(self, service, mock_redis_client):
+        """Keys deleted elsewhere are removed from the index on re-sync"""
+        service.config.index_refresh_seconds = 0
+        await service.cache_search_result(
+            query="cached query",
+            result={"results": []},
+            embedding=[1.0, 0.0, 0.0]
+        )
+        mock_redis_client.redis_client.get.return_value = b"2"
+        mock_redis_client.scan_keys.return_value = []
+
+        await service.get_semantic_match("new query", query_embedding=[1.0, 0.0, 0.0])
+
+        assert len(service._indexes["search"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_capped_sync_keeps_unscanned_live_keys(self, service, mock_redis_client):
+        """When the scan hits its cap, only keys EXISTS reports gone are dropped"""
+        service.config.index_refresh_seconds = 0
+        service.config.index_warm_limit = 1
+        index = await service._get_index("search", mock_redis_client)
+        index.add("search:sem:live", [1.0, 0.0, 0.0])
+        index.add("search:sem:gone", [0.0, 1.0, 0.0])
+
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[1, 0])
+        mock_redis_client.redis_client.pipeline = MagicMock(return_value=pipe)
+        mock_redis_client.redis_client.get.return_value = b"3"
+        mock_redis_client.scan_keys.return_value = ["search:sem:other"]
+        mock_redis_client.mget = AsyncMock(return_value=[{"embedding": [0.0, 0.0, 1.0]}])
+
+        await service._get_index("search", mock_redis_client)
+
+        assert "search:sem:live" in index
+        assert "search:sem:gone" not in index
+        assert "search:sem:other" in index
+        assert [c.args[0] for c in pipe.exists.call_args_list] == ["search:sem:live", "search:sem:gone"]
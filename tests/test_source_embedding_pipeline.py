@@ -0,0 +1,235 @@
+"""
+Tests for the batched source embedding pipeline used by process_source
+"""
+
+import pytest
+import requests
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.source_embedding_pipeline import (
+    EmbeddingPipelineStats,
+    OllamaBatchEmbedder,
+    SourceEmbeddingConfig,
+    SourceEmbeddingPipeline,
+    compute_chunk_hash,
+)
+
+
+def _response(status_code=200, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    response.raise_for_status = MagicMock()
+    return response
+
+
+@pytest.fixture
+def config():
+    return SourceEmbeddingConfig(batch_size=2, max_concurrency=2)
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+
+    def post(url, json=None, timeout=None):
+        if url.endswith("/api/embed"):
+            return _response(payload={"embeddings": [[float(len(t))] for t in json["input"]]})
+        return _response(payload={"embedding": [float(len(json["prompt"]))]})
+
+    session.post = MagicMock(side_effect=post)
+    return session
+
+
+@pytest.fixture
+def cache():
+    cache = MagicMock()
+    cache.get_cached_embeddings_batch = AsyncMock(side_effect=lambda hashes: {h: None for h in hashes})
+    cache.cache_embeddings_batch = AsyncMock(return_value=0)
+    return cache
+
+
+class TestOllamaBatchEmbedder:
+    """Tests for the pooled /api/embed client"""
+
+    def test_embed_uses_batch_endpoint(self, config, session):
+        """Texts are sent in batch_size groups to /api/embed"""
+        embedder = OllamaBatchEmbedder(config, session=session)
+
+        embeddings = embedder.embed(["a", "bb", "ccc"])
+
+        assert embeddings == [[1.0], [2.0], [3.0]]
+        assert session.post.call_count == 2
+        assert session.post.call_args_list[0].args[0].endswith("/api/embed")
+
+    def test_falls_back_to_legacy_endpoint(self, config):
+        """Old Ollama servers without /api/embed use /api/embeddings"""
+        session = MagicMock()
+        missing_route = _response(status_code=404)
+        missing_route.json.side_effect = ValueError("404 page not found")
+        session.post = MagicMock(side_effect=[
+            missing_route,
+            _response(payload={"embedding": [0.1]}),
+            _response(payload={"embedding": [0.2]}),
+        ])
+        embedder = OllamaBatchEmbedder(config, session=session)
+
+        embeddings = embedder.embed_batch(["a", "b"])
+
+        assert embeddings == [[0.1], [0.2]]
+        assert embedder._batch_endpoint_supported is False
+
+    def test_missing_model_keeps_batch_endpoint(self, config):
+        """A 404 for an unknown model raises instead of disabling /api/embed"""
+        not_found = _response(status_code=404, payload={"error": 'model "nomic" not found'})
+        not_found.raise_for_status.side_effect = requests.HTTPError("404")
+        session = MagicMock()
+        session.post = MagicMock(return_value=not_found)
+        embedder = OllamaBatchEmbedder(config, session=session)
+
+        with pytest.raises(requests.HTTPError):
+            embedder.embed_batch(["a"])
+
+        assert embedder._batch_endpoint_supported is True
+        assert session.post.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_aembed_preserves_order(self, config, session):
+        """Concurrent batches are reassembled in input order"""
+        embedder = OllamaBatchEmbedder(config, session=session)
+        texts = ["a" * i for i in range(1, 8)]
+
+        embeddings, batches = await embedder.aembed(texts)
+
+        assert embeddings == [[float(i)] for i in range(1, 8)]
+        assert batches == 4
+
+
+class TestSourceEmbeddingPipeline:
+    """Tests for dedup and stats"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_chunks_embedded_once(self, config, session, cache):
+        """Identical chunks in one document are embedded once"""
+        pipeline = SourceEmbeddingPipeline(
+            config, embedder=OllamaBatchEmbedder(config, session=session), cache=cache
+        )
+
+        embeddings, stats = await pipeline.embed_chunks(["same", "same", "other"])
+
+        assert embeddings == [[4.0], [4.0], [5.0]]
+        assert stats.unique_chunks == 2
+        assert stats.generated == 2
+        cache.cache_embeddings_batch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reuses_cached_and_stored_embeddings(self, config, session, cache):
+        """Redis cache and source_embeddings hits are not regenerated"""
+        chunks = ["cached", "stored", "new"]
+        hashes = [compute_chunk_hash(c) for c in chunks]
+        cache.get_cached_embeddings_batch = AsyncMock(
+            return_value={hashes[0]: [9.0], hashes[1]: None, hashes[2]: None}
+        )
+
+        supabase = MagicMock()
+        query = supabase.table.return_value.select.return_value.in_.return_value
+        query.eq.return_value.execute.return_value = MagicMock(
+            data=[{"chunk_hash": hashes[1], "embedding": "[7.0]"}]
+        )
+
+        pipeline = SourceEmbeddingPipeline(
+            config, embedder=OllamaBatchEmbedder(config, session=session), cache=cache
+        )
+
+        embeddings, stats = await pipeline.embed_chunks(
+            chunks, supabase=supabase, project_id="project-1"
+        )
+
+        assert embeddings == [[9.0], [7.0], [3.0]]
+        assert stats.cache_hits == 1
+        assert stats.stored_hits == 1
+        assert stats.generated == 1
+        supabase.table.return_value.select.return_value.in_.assert_called_once_with(
+            "chunk_hash", [hashes[1], hashes[2]]
+        )
+        query.eq.assert_called_once_with("project_id", "project-1")
+        session.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_embed_chunk_stream_groups_and_combines_stats(self, config, session, cache):
+        """Streamed chunks are embedded group by group and reassembled in order"""
+        pipeline = SourceEmbeddingPipeline(
+            config, embedder=OllamaBatchEmbedder(config, session=session), cache=cache
+        )
+
+        async def produce():
+            for i in range(1, 6):
+                yield "x" * i
+
+        stored = []
+
+        async def on_group(index, group, embeddings):
+            stored.append((index, group, embeddings))
+
+        stats = await pipeline.embed_chunk_stream(produce(), on_group, group_size=2)
+
+        assert [index for index, _, _ in stored] == [0, 2, 4]
+        assert [text for _, group, _ in stored for text in group] == ["x" * i for i in range(1, 6)]
+        assert [e for _, _, embeddings in stored for e in embeddings] == [[float(i)] for i in range(1, 6)]
+        assert stats.total_chunks == 5
+        assert stats.generated == 5
+        assert cache.cache_embeddings_batch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_embed_chunk_stream_stores_before_input_is_exhausted(self, config, session, cache):
+        """Groups are stored while chunking continues, with bounded read-ahead"""
+        config.stream_max_pending = 1
+        pipeline = SourceEmbeddingPipeline(
+            config, embedder=OllamaBatchEmbedder(config, session=session), cache=cache
+        )
+        produced = []
+        produced_at_store = []
+
+        async def produce():
+            for i in range(1, 21):
+                produced.append(i)
+                yield "x" * i
+
+        async def on_group(index, group, embeddings):
+            produced_at_store.append(len(produced))
+
+        stats = await pipeline.embed_chunk_stream(produce(), on_group, group_size=2)
+
+        assert stats.total_chunks == 20
+        assert len(produced_at_store) == 10
+        # First group stored long before all 20 chunks were read
+        assert produced_at_store[0] < 10
+
+    @pytest.mark.asyncio
+    async def test_embed_chunk_stream_stops_when_storage_fails(self, config, session, cache):
+        """A storage error stops the stream and propagates"""
+        pipeline = SourceEmbeddingPipeline(
+            config, embedder=OllamaBatchEmbedder(config, session=session), cache=cache
+        )
+        produced = []
+
+        async def produce():
+            for i in range(1, 101):
+                produced.append(i)
+                yield "x" * i
+
+        async def on_group(index, group, embeddings):
+            raise RuntimeError("insert failed")
+
+        with pytest.raises(RuntimeError, match="insert failed"):
+            await pipeline.embed_chunk_stream(produce(), on_group, group_size=2)
+
+        assert len(produced) < 100
+
+    def test_stats_throughput(self):
+        """Embeddings/sec is derived from total chunks and duration"""
+        stats = EmbeddingPipelineStats(total_chunks=100, duration_ms=500, generated=50, generation_ms=250)
+
+        assert stats.embeddings_per_second == 200.0
+        assert stats.generated_per_second == 200.0
+        assert stats.to_dict()["embeddings_per_second"] == 200.0
@@ -0,0 +1,262 @@
+"""
+Tests for batched status broadcasting: progress coalescing, pipelined
+publishing, write-behind persistence and the per-process background loop
+"""
+
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.task_status import (
+    TaskType,
+    create_progress_status,
+    create_started_status,
+    create_success_status,
+)
+from app.services.status_batching import (
+    BackgroundLoop,
+    ProgressCoalescer,
+    StatusBatchConfig,
+    StatusWriteBuffer,
+)
+from app.services.status_broadcaster import StatusBroadcaster, SyncStatusBroadcaster
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _progress(task_id: str, current: int, document_id=None):
+    return create_progress_status(
+        task_id=task_id,
+        task_name="test_task",
+        current=current,
+        total=100,
+        message=f"{current}%",
+        document_id=document_id
+    )
+
+
+def _batched_broadcaster(**config):
+    broadcaster = StatusBroadcaster(StatusBatchConfig(enabled=True, **config))
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    broadcaster.redis_client = MagicMock()
+    broadcaster.redis_client.pipeline.return_value = pipe
+    broadcaster._connected = True
+    broadcaster._supabase = MagicMock()
+    return broadcaster, pipe
+
+
+class TestProgressCoalescer:
+    """Tests for per-task progress rate limiting"""
+
+    def test_first_progress_passes_then_held(self):
+        clock = FakeClock()
+        coalescer = ProgressCoalescer(max_per_second=2, clock=clock)
+
+        assert len(coalescer.offer(_progress("t1", 1))) == 1
+        assert coalescer.offer(_progress("t1", 2)) == []
+        assert coalescer.offer(_progress("t1", 3)) == []
+        assert coalescer.pending_count == 1
+
+    def test_due_releases_newest_after_interval(self):
+        clock = FakeClock()
+        coalescer = ProgressCoalescer(max_per_second=2, clock=clock)
+        coalescer.offer(_progress("t1", 1))
+        coalescer.offer(_progress("t1", 2))
+        coalescer.offer(_progress("t1", 3))
+
+        assert coalescer.due() == []
+        clock.now += 0.5
+        due = coalescer.due()
+
+        assert [m.progress.current for m in due] == [3]
+        assert coalescer.pending_count == 0
+
+    def test_tasks_limited_independently(self):
+        coalescer = ProgressCoalescer(max_per_second=1, clock=FakeClock())
+
+        assert coalescer.offer(_progress("t1", 1))
+        assert coalescer.offer(_progress("t2", 1))
+
+    def test_terminal_state_supersedes_pending_progress(self):
+        coalescer = ProgressCoalescer(max_per_second=1, clock=FakeClock())
+        coalescer.offer(_progress("t1", 1))
+        coalescer.offer(_progress("t1", 50))
+
+        ready = coalescer.offer(create_success_status(task_id="t1", task_name="test_task"))
+
+        assert len(ready) == 1
+        assert coalescer.pending_count == 0
+        assert coalescer.due() == []
+
+
+class TestStatusWriteBuffer:
+    """Tests for the write-behind buffer"""
+
+    def test_rows_coalesced_per_task_and_document(self):
+        buffer = StatusWriteBuffer(max_rows=10)
+        buffer.add_task_row({"task_id": "t1", "status": "progress"})
+        buffer.add_task_row({"task_id": "t1", "status": "success"})
+        buffer.add_document_update("doc-1", {"processing_status": "progress"})
+        buffer.add_document_update("doc-1", {"processing_status": "success"})
+
+        task_rows, document_rows = buffer.take()
+
+        assert task_rows == [{"task_id": "t1", "status": "success"}]
+        assert document_rows == {"doc-1": {"processing_status": "success"}}
+        assert len(buffer) == 0
+
+    def test_write_groups_upserts_by_column_set(self):
+        buffer = StatusWriteBuffer()
+        client = MagicMock()
+        rows = [
+            {"task_id": "t1", "status": "progress"},
+            {"task_id": "t2", "status": "progress"},
+            {"task_id": "t3", "status": "success", "completed_at": "now"},
+        ]
+
+        written = buffer.write(client, rows, {"doc-1": {"processing_status": "success"}})
+
+        upserts = client.table.return_value.upsert.call_args_list
+        assert sorted(len(call.args[0]) for call in upserts) == [1, 2]
+        assert all(call.kwargs["on_conflict"] == "task_id" for call in upserts)
+        client.table.return_value.update.return_value.eq.assert_called_once_with("id", "doc-1")
+        assert written == 4
+
+    def test_failed_rows_requeued_and_not_counted(self):
+        buffer = StatusWriteBuffer()
+        client = MagicMock()
+
+        def upsert(rows, on_conflict):
+            if any(row["task_id"] == "bad" for row in rows):
+                raise RuntimeError("constraint violation")
+            return MagicMock()
+
+        client.table.return_value.upsert.side_effect = upsert
+        client.table.return_value.update.return_value.eq.return_value.execute.side_effect = RuntimeError("timeout")
+        rows = [{"task_id": "ok", "status": "success"}, {"task_id": "bad", "status": "failure"}]
+
+        written = buffer.write(client, rows, {"doc-1": {"processing_status": "success"}})
+
+        assert written == 1
+        assert buffer.rows_written == 1
+        task_rows, document_rows = buffer.take()
+        assert task_rows == [{"task_id": "bad", "status": "failure"}]
+        assert document_rows == {"doc-1": {"processing_status": "success"}}
+
+    def test_requeue_keeps_newer_rows(self):
+        buffer = StatusWriteBuffer()
+        buffer.add_task_row({"task_id": "t1", "status": "progress"})
+        task_rows, document_rows = buffer.take()
+        buffer.add_task_row({"task_id": "t1", "status": "success"})
+
+        buffer.requeue(task_rows, document_rows)
+
+        assert buffer.take()[0] == [{"task_id": "t1", "status": "success"}]
+
+
+class TestBatchedBroadcaster:
+    """Tests for StatusBroadcaster in batched mode"""
+
+    @pytest.mark.asyncio
+    async def test_publishes_all_channels_in_one_pipeline(self):
+        broadcaster, pipe = _batched_broadcaster()
+        message = create_started_status(
+            task_id="t1",
+            task_name="test_task",
+            task_type=TaskType.DOCUMENT_PROCESSING,
+            document_id="doc-1",
+            user_id="user-1"
+        )
+
+        await broadcaster.broadcast_status(message, persist_to_db=False)
+
+        channels = [call.args[0] for call in pipe.publish.call_args_list]
+        assert channels == [channel for channel, _ in broadcaster._channels_for(message)]
+        pipe.execute.assert_awaited_once()
+        await broadcaster.aclose_batching()
+
+    @pytest.mark.asyncio
+    async def test_progress_ticks_coalesced_and_persisted_in_bulk(self):
+        broadcaster, pipe = _batched_broadcaster(max_progress_per_second=1, flush_interval=60)
+
+        for current in range(10):
+            await broadcaster.broadcast_status(_progress("t1", current, document_id="doc-1"))
+
+        assert pipe.execute.await_count == 1
+        table = broadcaster._supabase.client.table
+        table.return_value.upsert.assert_not_called()
+
+        await broadcaster.flush()
+
+        assert pipe.execute.await_count == 2
+        published = pipe.publish.call_args_list[-1].args[1]
+        assert '"current": 9' in published
+        upserted = table.return_value.upsert.call_args.args[0]
+        assert [row["progress"]["current"] for row in upserted] == [9]
+        await broadcaster.aclose_batching()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_rows_for_next_flush(self):
+        broadcaster, _ = _batched_broadcaster(max_progress_per_second=1, flush_interval=60)
+        broadcaster._write_buffer.add_task_row({"task_id": "t1", "status": "success"})
+
+        with patch("asyncio.to_thread", AsyncMock(side_effect=RuntimeError("connection reset"))):
+            assert await broadcaster._flush_database() == 0
+
+        assert len(broadcaster._write_buffer) == 1
+        assert await broadcaster._flush_database() == 1
+        assert len(broadcaster._write_buffer) == 0
+        await broadcaster.aclose_batching()
+
+    @pytest.mark.asyncio
+    async def test_flush_loop_publishes_held_progress(self):
+        broadcaster, pipe = _batched_broadcaster(max_progress_per_second=50, flush_interval=0.02)
+
+        await broadcaster.broadcast_status(_progress("t1", 1))
+        await broadcaster.broadcast_status(_progress("t1", 2))
+        await asyncio.sleep(0.1)
+
+        assert pipe.execute.await_count == 2
+        broadcaster._supabase.client.table.return_value.upsert.assert_called()
+        await broadcaster.aclose_batching()
+
+
+class TestSyncBackgroundLoop:
+    """Tests for the long-lived loop used by SyncStatusBroadcaster"""
+
+    def test_loop_reused_across_calls(self):
+        background = BackgroundLoop()
+
+        async def current_loop():
+            return asyncio.get_running_loop(), threading.current_thread()
+
+        first = background.submit(current_loop()).result(timeout=1)
+        second = background.submit(current_loop()).result(timeout=1)
+        background.stop()
+
+        assert first == second
+        assert first[1] is not threading.current_thread()
+        assert not background.running
+
+    def test_sync_broadcaster_runs_on_background_loop(self):
+        sync_broadcaster = SyncStatusBroadcaster()
+        broadcaster = MagicMock()
+        broadcaster.batched = False
+        broadcaster.batch_config = StatusBatchConfig()
+        broadcaster.broadcast_started = AsyncMock()
+        sync_broadcaster._async_broadcaster = broadcaster
+
+        sync_broadcaster.broadcast_started(task_id="t1", task_name="test_task")
+        sync_broadcaster.broadcast_started(task_id="t2", task_name="test_task")
+
+        assert broadcaster.broadcast_started.await_count == 2
+        sync_broadcaster._background.stop()
@@ -0,0 +1,206 @@
+"""
+Tests for SupabaseBulkWriter and the bulk embedding storage paths
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from postgrest.exceptions import APIError
+
+from app.services.supabase_bulk_writer import (
+    BulkWriteError,
+    SupabaseBulkWriter,
+)
+
+
+def _rows(n):
+    return [{"id": f"id-{i}", "chunk_hash": f"h{i}", "chunk_index": i} for i in range(n)]
+
+
+@pytest.fixture
+def supabase():
+    client = MagicMock()
+    client.table.return_value.insert.return_value.execute.side_effect = (
+        lambda: MagicMock(data=None)
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("app.services.supabase_bulk_writer.time.sleep"):
+        yield
+
+
+class TestSupabaseBulkWriter:
+    """Tests for batching and retries"""
+
+    def test_writes_in_batches(self, supabase):
+        """Rows are inserted batch_size at a time"""
+        writer = SupabaseBulkWriter(supabase, "source_embeddings", batch_size=500)
+
+        stats = writer.write(_rows(1200))
+
+        inserts = supabase.table.return_value.insert.call_args_list
+        assert [len(c.args[0]) for c in inserts] == [500, 500, 200]
+        assert stats.rows_written == 1200
+        assert stats.batches == 3
+
+    def test_streaming_add_flushes_when_full(self, supabase):
+        """add() flushes every batch_size rows and the context manager flushes the rest"""
+        with SupabaseBulkWriter(supabase, "source_embeddings", batch_size=2) as writer:
+            for row in _rows(3):
+                writer.add(row)
+            assert supabase.table.return_value.insert.call_count == 1
+
+        assert supabase.table.return_value.insert.call_count == 2
+        assert writer.stats.rows_written == 3
+
+    def test_flush_path_timed(self, supabase):
+        """Batches written via add_many()/flush() count toward duration_ms"""
+        writer = SupabaseBulkWriter(supabase, "source_embeddings", batch_size=2)
+
+        with patch("app.services.supabase_bulk_writer.time.time", side_effect=[0.0, 0.5, 1.0, 1.25]):
+            writer.add_many(_rows(3))
+            writer.flush()
+
+        assert writer.stats.duration_ms == 750.0
+
+    def test_retry_skips_rows_already_written(self, supabase):
+        """A retried batch only inserts rows whose keys are not stored yet"""
+        batch_calls = []
+
+        def batch_fn(batch):
+            batch_calls.append([row["id"] for row in batch])
+            if len(batch_calls) == 1:
+                raise TimeoutError("gateway timeout")
+            return len(batch)
+
+        lookup = supabase.table.return_value.select.return_value.in_.return_value
+        lookup.eq.return_value.execute.return_value = MagicMock(
+            data=[{"chunk_hash": "h0", "chunk_index": 0}]
+        )
+
+        writer = SupabaseBulkWriter(
+            supabase,
+            "source_embeddings",
+            idempotency_keys=("chunk_hash", "chunk_index"),
+            scope={"source_id": "src-1"},
+            batch_fn=batch_fn
+        )
+        stats = writer.write(_rows(3))
+
+        assert batch_calls == [["id-0", "id-1", "id-2"], ["id-1", "id-2"]]
+        lookup.eq.assert_called_once_with("source_id", "src-1")
+        assert stats.retries == 1
+        assert stats.rows_skipped == 1
+        assert stats.rows_written == 2
+
+    def test_raises_after_max_retries(self, supabase):
+        """BulkWriteError carries stats once retries are exhausted"""
+        def batch_fn(batch):
+            raise ConnectionError("down")
+
+        writer = SupabaseBulkWriter(
+            supabase, "source_embeddings", batch_size=2, max_retries=2, batch_fn=batch_fn
+        )
+
+        with pytest.raises(BulkWriteError) as exc_info:
+            writer.write(_rows(4))
+
+        assert exc_info.value.stats.retries == 2
+        assert exc_info.value.stats.rows_written == 0
+
+
+class TestStoreEmbeddings:
+    """Tests for callers of the bulk writer"""
+
+    def test_source_embeddings_bulk_insert(self, supabase):
+        """process_source stores embeddings with a single insert per batch"""
+        from app.tasks.source_processing import _store_embeddings
+
+        _store_embeddings(
+            supabase=supabase,
+            source_id="src-1",
+            project_id="proj-1",
+            user_id="user-1",
+            chunks=[f"chunk {i}" for i in range(3)],
+            embeddings=[[0.1] * 4 for _ in range(3)]
+        )
+
+        insert = supabase.table.return_value.insert
+        insert.assert_called_once()
+        rows = insert.call_args.args[0]
+        assert [row["chunk_index"] for row in rows] == [0, 1, 2]
+        assert all(row["source_id"] == "src-1" for row in rows)
+
+    def test_source_embeddings_rollback_on_failure(self, supabase):
+        """Rows from a failed store are deleted so a retry starts clean"""
+        from app.tasks.source_processing import _store_embeddings
+
+        supabase.table.return_value.insert.return_value.execute.side_effect = ConnectionError("down")
+
+        with pytest.raises(BulkWriteError):
+            _store_embeddings(
+                supabase=supabase,
+                source_id="src-1",
+                project_id="proj-1",
+                user_id="user-1",
+                chunks=["a", "b"],
+                embeddings=[[0.1], [0.2]]
+            )
+
+        supabase.table.return_value.delete.return_value.in_.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_chunk_embeddings_use_rpc(self):
+        """Embedding generation stores a batch with one RPC call"""
+        from app.tasks.embedding_generation import _store_embeddings_in_chunks
+
+        storage = MagicMock()
+        storage.supabase.rpc.return_value.execute.return_value = MagicMock(
+            data=["c-0", "c-1"]
+        )
+        results = [MagicMock(chunk_id=f"c-{i}", embedding=[0.1]) for i in range(2)]
+
+        stored = await _store_embeddings_in_chunks(storage, results)
+
+        assert stored == 2
+        storage.supabase.rpc.assert_called_once()
+        assert storage.supabase.rpc.call_args.args[0] == "bulk_update_chunk_embeddings"
+        storage.supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_chunk_embeddings_fallback_per_row(self):
+        """Without the RPC, embeddings are updated row by row"""
+        from app.tasks.embedding_generation import _store_embeddings_in_chunks
+
+        storage = MagicMock()
+        storage.supabase.rpc.return_value.execute.side_effect = APIError({
+            "code": "PGRST202",
+            "message": "Could not find the function public.bulk_update_chunk_embeddings"
+        })
+        results = [MagicMock(chunk_id=f"c-{i}", embedding=[0.1]) for i in range(3)]
+
+        stored = await _store_embeddings_in_chunks(storage, results)
+
+        assert stored == 3
+        assert storage.supabase.table.return_value.update.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_chunk_embeddings_retry_transient_rpc_errors(self):
+        """A transient RPC error is retried instead of disabling the RPC"""
+        from app.tasks.embedding_generation import _store_embeddings_in_chunks
+
+        storage = MagicMock()
+        storage.supabase.rpc.return_value.execute.side_effect = [
+            APIError({"code": "57014", "message": "canceling statement due to statement timeout"}),
+            MagicMock(data=["c-0", "c-1"]),
+        ]
+        results = [MagicMock(chunk_id=f"c-{i}", embedding=[0.1]) for i in range(2)]
+
+        stored = await _store_embeddings_in_chunks(storage, results)
+
+        assert stored == 2
+        assert storage.supabase.rpc.call_count == 2
+        storage.supabase.table.assert_not_called()
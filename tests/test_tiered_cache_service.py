@@ -35,12 +35,12 @@ def cache_config():
 
 @pytest.fixture
 def mock_redis_cache():
-    """Create mock Redis cache service"""
+    """Create mock async Redis cache service"""
     cache = Mock()
-    cache.get_cached_query_result = Mock(return_value=None)
-    cache.cache_query_result = Mock(return_value=True)
-    cache.get_cached_embedding = Mock(return_value=None)
-    cache.cache_embedding = Mock(return_value=True)
+    cache.get_cached_query_result = AsyncMock(return_value=None)
+    cache.cache_query_result = AsyncMock(return_value=True)
+    cache.get_cached_embedding = AsyncMock(return_value=None)
+    cache.cache_embedding = AsyncMock(return_value=True)
     cache.get_metrics = Mock(return_value={"hits": 0, "misses": 0})
     return cache
 
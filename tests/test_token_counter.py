@@ -0,0 +1,97 @@
+"""
+Tests for TokenCounter memoization and batch counting
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.token_counter import TokenCounter, get_token_counter
+
+
+@pytest.fixture
+def encoding():
+    """Fake tiktoken encoding: one token per word"""
+    encoding = MagicMock()
+    encoding.encode = MagicMock(side_effect=lambda text: text.split())
+    encoding.encode_batch = MagicMock(
+        side_effect=lambda texts, num_threads=8: [text.split() for text in texts]
+    )
+    return encoding
+
+
+@pytest.fixture
+def counter(encoding):
+    counter = TokenCounter()
+    counter._encoding = encoding
+    return counter
+
+
+def _messages(*contents):
+    return [{"role": "user", "content": content} for content in contents]
+
+
+class TestMemoization:
+    """Tests for the content-hash keyed LRU"""
+
+    def test_repeated_text_encoded_once(self, counter, encoding):
+        assert counter.count_tokens("one two three") == 3
+        assert counter.count_tokens("one two three") == 3
+        assert encoding.encode.call_count == 1
+
+    def test_lru_evicts_oldest(self, counter, encoding):
+        counter._count_cache_size = 2
+        counter.count_tokens("a")
+        counter.count_tokens("b")
+        counter.count_tokens("a")
+        counter.count_tokens("c")
+
+        counter.count_tokens("a")
+        assert encoding.encode.call_count == 3
+        counter.count_tokens("b")
+        assert encoding.encode.call_count == 4
+
+    def test_clear_cache(self, counter, encoding):
+        counter.count_tokens("a b")
+        counter.clear_cache()
+        counter.count_tokens("a b")
+        assert encoding.encode.call_count == 2
+
+
+class TestBatchCounting:
+    """Tests for count_tokens_batch"""
+
+    def test_batch_counts_in_order(self, counter, encoding):
+        counts = counter.count_tokens_batch(["a", "a b", "", "a b c"])
+
+        assert counts == [1, 2, 0, 3]
+        encoding.encode_batch.assert_called_once()
+
+    def test_batch_skips_cached_and_duplicate_texts(self, counter, encoding):
+        counter.count_tokens("cached text")
+
+        counts = counter.count_tokens_batch(["cached text", "new", "new"])
+
+        assert counts == [2, 1, 1]
+        assert encoding.encode_batch.call_args.args[0] == ["new"]
+
+    def test_batch_falls_back_to_estimation(self, counter, encoding):
+        encoding.encode_batch.side_effect = RuntimeError("boom")
+
+        assert counter.count_tokens_batch(["abcdefgh"]) == [2]
+
+
+def test_repeated_history_reuses_memoized_counts(counter, encoding):
+    history = _messages("a b", "c d e")
+    first = counter.count_messages_tokens(history)
+    calls = encoding.encode.call_count
+
+    second = counter.count_messages_tokens(history + _messages("f"))
+
+    assert first == 2 + 3 + 8  # content + role overhead
+    assert second == first + 1 + 4
+    assert encoding.encode.call_count == calls + 1
+
+
+def test_get_token_counter_cached_per_model():
+    assert get_token_counter("claude-2.0") is get_token_counter("claude-2.0")
+    assert get_token_counter("claude-2.0") is not get_token_counter()
@@ -0,0 +1,109 @@
+"""
+Tests for the in-process VectorIndex used by the semantic caches
+"""
+
+import pytest
+import numpy as np
+
+from app.services.vector_index import VectorIndex, VectorIndexConfig
+
+
+@pytest.fixture
+def index():
+    """Small index that grows past its initial capacity"""
+    return VectorIndex(config=VectorIndexConfig(initial_capacity=2, use_ann=False))
+
+
+class TestVectorIndex:
+    """Tests for add/remove/search"""
+
+    def test_empty_search(self, index):
+        """Searching an empty index returns nothing"""
+        assert index.search([1.0, 0.0, 0.0], k=3) == []
+
+    def test_add_and_search_orders_by_similarity(self, index):
+        """Results are sorted by cosine similarity"""
+        index.add("a", [1.0, 0.0, 0.0])
+        index.add("b", [0.9, 0.1, 0.0])
+        index.add("c", [0.0, 1.0, 0.0])
+
+        results = index.search([1.0, 0.0, 0.0], k=2)
+
+        assert [key for key, _ in results] == ["a", "b"]
+        assert results[0][1] == pytest.approx(1.0)
+
+    def test_vectors_are_normalized(self, index):
+        """Magnitude does not affect similarity"""
+        index.add("a", [10.0, 0.0])
+
+        results = index.search([0.5, 0.0], k=1)
+
+        assert results[0][1] == pytest.approx(1.0)
+
+    def test_matches_numpy_cosine(self, index):
+        """Scores match a reference cosine similarity"""
+        rng = np.random.default_rng(42)
+        vectors = rng.normal(size=(50, 16))
+        for i, vec in enumerate(vectors):
+            index.add(f"k{i}", vec)
+        query = rng.normal(size=16)
+
+        results = index.search(query, k=50)
+
+        expected = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+        assert results[0][0] == f"k{int(np.argmax(expected))}"
+        assert results[0][1] == pytest.approx(float(np.max(expected)), abs=1e-5)
+
+    def test_remove_swaps_last_row(self, index):
+        """Removing a key keeps the remaining rows searchable"""
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.0, 1.0])
+        index.add("c", [0.7, 0.7])
+
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert len(index) == 2
+        assert "a" not in index
+
+        assert index.search([0.0, 1.0], k=1)[0][0] == "b"
+        assert index.search([1.0, 1.0], k=1)[0][0] == "c"
+
+    def test_replace_existing_key(self, index):
+        """Re-adding a key overwrites its vector"""
+        index.add("a", [1.0, 0.0])
+        index.add("a", [0.0, 1.0])
+
+        assert len(index) == 1
+        assert index.search([0.0, 1.0], k=1)[0][1] == pytest.approx(1.0)
+
+    def test_zero_vector_ignored(self, index):
+        """Zero vectors cannot be normalized and are not indexed"""
+        assert index.add("zero", [0.0, 0.0]) is False
+        assert len(index) == 0
+
+    def test_dimension_mismatch(self, index):
+        """Queries with a different dimension return nothing; adds reset"""
+        index.add("a", [1.0, 0.0])
+
+        assert index.search([1.0, 0.0, 0.0], k=1) == []
+
+        index.add("b", [1.0, 0.0, 0.0])
+        assert index.keys() == ["b"]
+        assert index.dimension == 3
+
+    def test_min_similarity(self, index):
+        """Results below the floor are dropped"""
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.0, 1.0])
+
+        results = index.search([1.0, 0.0], k=2, min_similarity=0.5)
+
+        assert [key for key, _ in results] == ["a"]
+
+    def test_clear(self, index):
+        """Clear empties the index"""
+        index.add("a", [1.0, 0.0])
+        index.clear()
+
+        assert len(index) == 0
+        assert index.search([1.0, 0.0], k=1) == []
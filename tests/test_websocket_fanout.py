@@ -0,0 +1,232 @@
+"""
+Tests for WebSocket fan-out: per-connection queues and slow-consumer policy
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.websocket_fanout import (
+    ConnectionSender,
+    FanoutConfig,
+    OutboundMessage,
+    SlowConsumerPolicy,
+    serialize_message,
+)
+from app.services.websocket_manager import ConnectionManager
+
+
+def _progress(task_id: str, progress: int) -> OutboundMessage:
+    return OutboundMessage.from_message(
+        {"type": "progress_update", "task_id": task_id, "progress": progress}
+    )
+
+
+def _sender(policy: SlowConsumerPolicy, queue_size: int = 2, on_failure=None):
+    websocket = AsyncMock()
+    config = FanoutConfig(queue_size=queue_size, policy=policy)
+    # Not started: messages stay queued so the policy can be observed
+    return ConnectionSender("conn-1", websocket, config, on_failure=on_failure), websocket
+
+
+class TestOutboundMessage:
+    """Tests for one-time serialization"""
+
+    def test_serialized_once_with_coalesce_key(self):
+        message = OutboundMessage.from_message({"type": "progress_update", "task_id": "t1"})
+
+        assert message.text == serialize_message({"type": "progress_update", "task_id": "t1"})
+        assert message.coalesce_key == "progress_update:t1"
+
+    def test_regular_messages_not_coalesced(self):
+        message = OutboundMessage.from_message({"type": "task_notification", "task_id": "t1"})
+        assert message.coalesce_key is None
+
+
+class TestSlowConsumerPolicy:
+    """Tests for queue overflow handling"""
+
+    def test_coalesce_replaces_pending_progress(self):
+        sender, _ = _sender(SlowConsumerPolicy.COALESCE)
+
+        sender.enqueue(_progress("t1", 10))
+        sender.enqueue(_progress("t1", 20))
+
+        assert sender.queue_depth == 1
+        assert sender.coalesced == 1
+        assert '"progress":20' in sender._queue[0].text
+
+    def test_coalesce_drops_progress_before_other_messages(self):
+        sender, _ = _sender(SlowConsumerPolicy.COALESCE)
+        notice = OutboundMessage.from_message({"type": "task_notification"})
+
+        sender.enqueue(notice)
+        sender.enqueue(_progress("t1", 10))
+        sender.enqueue(_progress("t2", 10))
+
+        assert [m.coalesce_key for m in sender._queue] == [None, "progress_update:t2"]
+        assert sender.dropped == 1
+
+    def test_coalesce_keeps_order_with_other_messages(self):
+        sender, _ = _sender(SlowConsumerPolicy.COALESCE, queue_size=10)
+        notice = OutboundMessage.from_message({"type": "task_notification"})
+
+        sender.enqueue(_progress("t1", 10))
+        sender.enqueue(notice)
+        sender.enqueue(_progress("t1", 20))
+
+        assert [m.message_type for m in sender._queue] == ["task_notification", "progress_update"]
+        assert '"progress":20' in sender._queue[1].text
+
+    @pytest.mark.asyncio
+    async def test_coalesce_never_drops_other_messages(self):
+        on_failure = AsyncMock()
+        sender, _ = _sender(SlowConsumerPolicy.COALESCE, on_failure=on_failure)
+        for i in range(2):
+            sender.enqueue(OutboundMessage.from_message({"type": "task_notification", "i": i}))
+
+        assert sender.enqueue(_progress("t1", 10)) is False
+        assert sender.queue_depth == 2 and not sender.closed
+
+        assert sender.enqueue(OutboundMessage.from_message({"type": "task_notification", "i": 2})) is False
+        await asyncio.sleep(0)
+        assert sender.closed
+        on_failure.assert_awaited_once_with("conn-1", "slow_consumer")
+
+    def test_drop_oldest(self):
+        sender, _ = _sender(SlowConsumerPolicy.DROP_OLDEST)
+
+        for i in range(3):
+            sender.enqueue(OutboundMessage.from_message({"type": "n", "i": i}))
+
+        assert [m.text for m in sender._queue] == [
+            serialize_message({"type": "n", "i": 1}),
+            serialize_message({"type": "n", "i": 2}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_on_overflow(self):
+        on_failure = AsyncMock()
+        sender, _ = _sender(SlowConsumerPolicy.DISCONNECT, on_failure=on_failure)
+
+        for i in range(3):
+            accepted = sender.enqueue(OutboundMessage.from_message({"type": "n", "i": i}))
+        await asyncio.sleep(0)
+
+        assert accepted is False
+        assert sender.closed
+        on_failure.assert_awaited_once_with("conn-1", "slow_consumer")
+
+
+class TestConnectionSender:
+    """Tests for the writer task"""
+
+    @pytest.mark.asyncio
+    async def test_sends_in_order_and_records_stats(self):
+        sender, websocket = _sender(SlowConsumerPolicy.COALESCE, queue_size=10)
+        sender.start()
+
+        for i in range(3):
+            sender.enqueue(OutboundMessage.from_message({"type": "n", "i": i}))
+        assert await sender.drain(timeout=1)
+
+        assert [c.args[0] for c in websocket.send_text.call_args_list] == [
+            serialize_message({"type": "n", "i": i}) for i in range(3)
+        ]
+        stats = sender.get_stats()
+        assert stats["sent"] == 3
+        assert stats["queue_depth"] == 0
+        await sender.close()
+
+    @pytest.mark.asyncio
+    async def test_close_delivers_queued_messages(self):
+        sender, websocket = _sender(SlowConsumerPolicy.COALESCE, queue_size=10)
+
+        async def slow_send(text):
+            await asyncio.sleep(0.01)
+
+        websocket.send_text.side_effect = slow_send
+        sender.start()
+        for i in range(3):
+            sender.enqueue(OutboundMessage.from_message({"type": "n", "i": i}))
+
+        await sender.close()
+
+        assert websocket.send_text.call_count == 3
+        assert sender.enqueue(OutboundMessage.from_message({"type": "n"})) is False
+
+    @pytest.mark.asyncio
+    async def test_close_discards_after_drain_timeout(self):
+        sender, websocket = _sender(SlowConsumerPolicy.COALESCE, queue_size=10)
+
+        async def stuck_send(text):
+            await asyncio.sleep(1)
+
+        websocket.send_text.side_effect = stuck_send
+        sender.start()
+        for i in range(3):
+            sender.enqueue(OutboundMessage.from_message({"type": "n", "i": i}))
+
+        await sender.close(drain_timeout=0.05)
+
+        assert sender.closed
+        assert sender.queue_depth == 0
+        assert websocket.send_text.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_send_failure_reported(self):
+        on_failure = AsyncMock()
+        sender, websocket = _sender(SlowConsumerPolicy.COALESCE, on_failure=on_failure)
+        websocket.send_text.side_effect = RuntimeError("closed")
+        sender.start()
+
+        sender.enqueue(OutboundMessage.from_message({"type": "n"}))
+        await sender.drain(timeout=1)
+        await asyncio.sleep(0)
+
+        on_failure.assert_awaited_once_with("conn-1", "send_error")
+
+
+class TestConnectionManagerFanout:
+    """Tests for concurrent fan-out through ConnectionManager"""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        manager = ConnectionManager(FanoutConfig(queue_size=10))
+        slow_sent = asyncio.Event()
+
+        async def slow_send(text):
+            await slow_sent.wait()
+
+        slow, fast = AsyncMock(), AsyncMock()
+        slow.send_text.side_effect = slow_send
+        await manager.connect(slow, "slow")
+        await manager.connect(fast, "fast")
+        await manager.flush(["fast"])
+
+        await manager.broadcast({"type": "news"}, publish_to_redis=False)
+        await manager.flush(["fast"], timeout=1)
+
+        fast.send_text.assert_called_with(serialize_message({"type": "news"}))
+        assert manager.get_queue_stats()["slow"]["queue_depth"] >= 1
+
+        slow_sent.set()
+        await manager.flush(timeout=1)
+        assert manager.get_stats()["queued_messages"] == 0
+
+        await manager.disconnect("slow")
+        await manager.disconnect("fast")
+
+    @pytest.mark.asyncio
+    async def test_failed_connection_is_disconnected(self):
+        manager = ConnectionManager(FanoutConfig(queue_size=10))
+        websocket = AsyncMock()
+        websocket.send_text.side_effect = RuntimeError("gone")
+
+        await manager.connect(websocket, "conn-1", user_id="user-1")
+        await manager.flush(timeout=1)
+        await asyncio.sleep(0)
+
+        assert "conn-1" not in manager.active_connections
+        assert "user-1" not in manager.user_connections
@@ -18,6 +18,7 @@ from datetime import datetime
 
 from app.main import app
 from app.services.websocket_manager import ConnectionManager, get_connection_manager
+from app.services.websocket_fanout import serialize_message
 from app.services.redis_pubsub_service import RedisPubSubService
 from app.utils.websocket_notifications import (
     send_task_notification,
@@ -165,13 +166,15 @@ class TestConnectionManager:
         )
 
         # Reset mock to clear the initial connection message call
-        mock_ws.send_json.reset_mock()
+        await manager.flush()
+        mock_ws.send_text.reset_mock()
 
         message = {"type": "test", "data": "hello"}
         await manager.send_to_document(message, document_id)
+        await manager.flush()
 
         # Verify message was sent
-        mock_ws.send_json.assert_called_once_with(message)
+        mock_ws.send_text.assert_called_once_with(serialize_message(message))
 
     @pytest.mark.asyncio
     async def test_broadcast_to_all(self):
@@ -184,15 +187,17 @@ class TestConnectionManager:
         await manager.connect(mock_ws2, "conn2", connection_type="general")
 
         # Reset mocks to clear the initial connection message calls
-        mock_ws1.send_json.reset_mock()
-        mock_ws2.send_json.reset_mock()
+        await manager.flush()
+        mock_ws1.send_text.reset_mock()
+        mock_ws2.send_text.reset_mock()
 
         message = {"type": "broadcast", "data": "announcement"}
         await manager.broadcast(message, publish_to_redis=False)
+        await manager.flush()
 
         # Both should receive the message
-        mock_ws1.send_json.assert_called_once_with(message)
-        mock_ws2.send_json.assert_called_once_with(message)
+        mock_ws1.send_text.assert_called_once_with(serialize_message(message))
+        mock_ws2.send_text.assert_called_once_with(serialize_message(message))
 
     @pytest.mark.asyncio
     async def test_disconnect_cleanup(self):
@@ -394,16 +399,18 @@ class TestMessageRouting:
         )
 
         # Reset mocks to clear the initial connection message calls
-        mock_ws_doc.send_json.reset_mock()
-        mock_ws_other.send_json.reset_mock()
+        await manager.flush()
+        mock_ws_doc.send_text.reset_mock()
+        mock_ws_other.send_text.reset_mock()
 
         # Send to document subscribers
         message = {"type": "document_update", "doc_id": "doc123"}
         await manager.send_to_document(message, "doc123")
+        await manager.flush()
 
         # Only document subscriber should receive
-        mock_ws_doc.send_json.assert_called_once_with(message)
-        mock_ws_other.send_json.assert_not_called()
+        mock_ws_doc.send_text.assert_called_once_with(serialize_message(message))
+        mock_ws_other.send_text.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_user_specific_routing(self):
@@ -426,16 +433,18 @@ class TestMessageRouting:
         )
 
         # Reset mocks to clear the initial connection message calls
-        mock_ws_user.send_json.reset_mock()
-        mock_ws_other.send_json.reset_mock()
+        await manager.flush()
+        mock_ws_user.send_text.reset_mock()
+        mock_ws_other.send_text.reset_mock()
 
         # Send to specific user
         message = {"type": "user_notification", "user_id": "user123"}
         await manager.send_to_user(message, "user123")
+        await manager.flush()
 
         # Only user subscriber should receive
-        mock_ws_user.send_json.assert_called_once_with(message)
-        mock_ws_other.send_json.assert_not_called()
+        mock_ws_user.send_text.assert_called_once_with(serialize_message(message))
+        mock_ws_other.send_text.assert_not_called()
 
 
 if __name__ == "__main__":
@@ -314,6 +314,133 @@ class TestWorkflowStateManager:
         assert await state_manager.load_state(workflow_state.workflow_id) is None
 
 
+class TestWorkflowListingIndexes:
+    """Tests for indexed, cursor-paginated workflow listing"""
+
+    async def _save_many(self, manager, count):
+        for i in range(count):
+            await manager.save_state(WorkflowState(
+                workflow_id=f"wf-{i:03d}",
+                workflow_type="even" if i % 2 == 0 else "odd",
+                status=WorkflowStatus.RUNNING if i % 3 == 0 else WorkflowStatus.COMPLETED
+            ))
+
+    async def _all_pages(self, manager, **filters):
+        seen, cursor = [], None
+        while True:
+            page, cursor = await manager.list_workflows_page(limit=4, cursor=cursor, **filters)
+            seen.extend(w.workflow_id for w in page)
+            if cursor is None:
+                return seen
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", [StorageBackend.FILE, StorageBackend.MEMORY])
+    async def test_pages_cover_all_newest_first(self, backend, temp_storage_path):
+        manager = WorkflowStateManager(backend=backend, storage_path=temp_storage_path)
+        await self._save_many(manager, 10)
+
+        ids = await self._all_pages(manager)
+
+        assert ids == [f"wf-{i:03d}" for i in reversed(range(10))]
+        running = await self._all_pages(manager, status=WorkflowStatus.RUNNING, workflow_type="even")
+        assert running == ["wf-006", "wf-000"]
+
+    @pytest.mark.asyncio
+    async def test_file_index_tracks_status_change_and_delete(self, state_manager, workflow_state):
+        await state_manager.save_state(workflow_state)
+        workflow_state.status = WorkflowStatus.COMPLETED
+        await state_manager.save_state(workflow_state)
+
+        assert await state_manager.list_workflows(status=WorkflowStatus.RUNNING) == []
+        assert len(await state_manager.list_workflows(status=WorkflowStatus.COMPLETED)) == 1
+
+        await state_manager.delete_state(workflow_state.workflow_id)
+        assert await state_manager.list_workflows() == []
+
+    @pytest.mark.asyncio
+    async def test_file_index_built_from_existing_states(self, temp_storage_path, workflow_state):
+        Path(temp_storage_path).mkdir(parents=True)
+        with open(Path(temp_storage_path) / f"{workflow_state.workflow_id}.json", "w") as f:
+            json.dump(workflow_state.to_dict(), f)
+
+        manager = WorkflowStateManager(backend=StorageBackend.FILE, storage_path=temp_storage_path)
+
+        assert [w.workflow_id for w in await manager.list_workflows()] == [workflow_state.workflow_id]
+
+    @pytest.mark.asyncio
+    async def test_list_limit(self, state_manager):
+        await self._save_many(state_manager, 6)
+
+        assert len(await state_manager.list_workflows(limit=3)) == 3
+
+    def test_invalid_cursor_rejected(self):
+        from app.services.workflow_management import decode_list_cursor
+
+        with pytest.raises(ValueError):
+            decode_list_cursor("not-a-cursor")
+
+
+class TestRedisWorkflowIndexes:
+    """Tests for the Redis sorted-set indexes"""
+
+    @pytest.fixture
+    def redis_manager(self):
+        manager = WorkflowStateManager(backend=StorageBackend.REDIS, redis_url="redis://test")
+        manager._redis = MagicMock()
+        manager._redis.pipeline.return_value.execute = AsyncMock()
+        manager._initialized = True
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_save_updates_indexes_in_one_pipeline(self, redis_manager, workflow_state):
+        await redis_manager.save_state(workflow_state)
+
+        pipe = redis_manager._redis.pipeline.return_value
+        zadd_keys = [c.args[0] for c in pipe.zadd.call_args_list]
+        assert zadd_keys == [
+            "workflow:index:updated",
+            "workflow:index:status:running",
+            "workflow:index:type:document_analysis",
+        ]
+        assert "workflow:index:status:running" not in [c.args[0] for c in pipe.zrem.call_args_list]
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_save_trims_expired_entries_from_every_index(self, redis_manager, workflow_state):
+        from app.services.workflow_management import STATE_TTL_SECONDS, _updated_score
+
+        await redis_manager.save_state(workflow_state)
+
+        pipe = redis_manager._redis.pipeline.return_value
+        trimmed = {c.args[0]: c.args[2] for c in pipe.zremrangebyscore.call_args_list}
+        min_score = _updated_score(workflow_state.to_dict()) - STATE_TTL_SECONDS
+        assert trimmed == {
+            "workflow:index:updated": min_score,
+            "workflow:index:type:document_analysis": min_score,
+            **{f"workflow:index:status:{status.value}": min_score for status in WorkflowStatus},
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_uses_index_and_mget_and_prunes_expired(self, redis_manager, workflow_state):
+        workflow_state.updated_at = datetime.utcnow().isoformat()
+        redis_manager._redis.zrevrangebyscore = AsyncMock(side_effect=[
+            [("wf-test-123", 200.0), ("wf-expired", 100.0)],
+            [],
+        ])
+        redis_manager._redis.mget = AsyncMock(return_value=[json.dumps(workflow_state.to_dict()), None])
+        redis_manager._redis.zrem = AsyncMock()
+        redis_manager._redis.keys = AsyncMock()
+
+        workflows, cursor = await redis_manager.list_workflows_page(status=WorkflowStatus.RUNNING, limit=10)
+
+        assert [w.workflow_id for w in workflows] == ["wf-test-123"]
+        assert cursor is None
+        assert redis_manager._redis.zrevrangebyscore.call_args_list[0].args[0] == "workflow:index:status:running"
+        redis_manager._redis.mget.assert_awaited_once_with(["workflow:state:wf-test-123", "workflow:state:wf-expired"])
+        redis_manager._redis.zrem.assert_awaited_once_with("workflow:index:status:running", "wf-expired")
+        redis_manager._redis.keys.assert_not_called()
+
+
 # =============================================================================
 # GRACEFUL SHUTDOWN HANDLER TESTS
 # =============================================================================
@@ -11,6 +11,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
 from app.services.graph_enhanced_rag_service import (
+    ChunkNodeCache,
     GraphEnhancedRAGService,
     GraphRAGError,
     EntityExtractionError,
@@ -74,7 +75,7 @@ def mock_neo4j():
 @pytest.fixture
 def service(mock_neo4j):
     """Create GraphEnhancedRAGService with mocked dependencies."""
-    return GraphEnhancedRAGService(neo4j_client=mock_neo4j)
+    return GraphEnhancedRAGService(neo4j_client=mock_neo4j, single_round_trip=False)
 
 
 @pytest.fixture
@@ -611,6 +612,107 @@ class TestReranking:
         assert score >= 0.5
 
 
+class TestSingleRoundTrip:
+    """Tests for single-transaction expansion, chunk caching and vectorized scoring."""
+
+    @pytest.fixture
+    def batched_service(self, mock_neo4j):
+        return GraphEnhancedRAGService(neo4j_client=mock_neo4j, single_round_trip=True)
+
+    @pytest.mark.asyncio
+    async def test_expansion_is_one_transaction(self, batched_service, sample_chunks):
+        """All expansion queries go out in one execute_batch call."""
+        chunk_row = {"document_id": "doc1", "content": "More text", "position": 2, "rel_count": 4}
+        batched_service.neo4j.execute_batch.return_value = [
+            [{"id": "entity3", "name": "Related Corp", "type": "organization"}],
+            [{"from_id": "e1", "to_id": "entity3", "rel_type": "PARTNER_OF", "confidence": 0.8}],
+            [{"id": "chunk3", **chunk_row}],
+            [{"id": "chunk1", "rel_count": 7}, {"id": "chunk2", "rel_count": 1}],
+            [{"id": "chunk3", **chunk_row}, {"id": "chunk4", **chunk_row}, {"id": "chunk5", **chunk_row}],
+        ]
+
+        result = await batched_service.expand_results(chunks=sample_chunks, max_expanded=3)
+
+        batched_service.neo4j.execute_batch.assert_awaited_once()
+        batched_service.neo4j.execute_query.assert_not_called()
+        assert len(batched_service.neo4j.execute_batch.call_args.args[0]) == 5
+        assert [c.id for c in result.expanded_chunks] == ["chunk3", "chunk4", "chunk5"]
+        assert [e.id for e in result.related_entities] == ["entity3"]
+        assert result.relationship_paths == [["e1", "--[PARTNER_OF]-->", "entity3"]]
+
+        cached = batched_service.chunk_cache.get_many(["chunk1", "chunk3"])
+        assert cached["chunk1"][1] == 7
+        assert cached["chunk3"][0].content == "More text"
+
+    @pytest.mark.asyncio
+    async def test_expansion_failure_degrades_gracefully(self, batched_service, sample_chunks):
+        batched_service.neo4j.execute_batch.side_effect = Exception("timeout")
+
+        result = await batched_service.expand_results(chunks=sample_chunks)
+
+        assert result.expanded_chunks == []
+        assert result.related_entities == []
+
+    @pytest.mark.asyncio
+    async def test_rerank_uses_cached_connectivity(self, batched_service, sample_chunks):
+        """Scores match the per-chunk formula without per-chunk queries."""
+        expanded = [ChunkNode(id="chunk3", document_id="doc2", content="Acme Corporation news", position=0)]
+        for chunk_id, rel_count in (("chunk1", 10), ("chunk2", 0), ("chunk3", 10)):
+            batched_service.chunk_cache.put(chunk_id, rel_count=rel_count)
+
+        reranked = await batched_service._rerank_results(
+            query="Acme Corporation",
+            original_results=list(reversed(sample_chunks)),
+            expanded_results=expanded,
+        )
+
+        batched_service.neo4j.execute_query.assert_not_called()
+        # chunk1: 0.5 + 0.3 + 0.2; chunk2 (0.5) and chunk3 (0.3 + 0.2) tie and keep their order
+        assert [c.id for c in reranked] == ["chunk1", "chunk2", "chunk3"]
+
+    @pytest.mark.asyncio
+    async def test_chunks_by_ids_fetches_only_cache_misses(self, batched_service):
+        batched_service.chunk_cache.put(
+            "chunk1", ChunkNode(id="chunk1", document_id="doc1", content="Cached", position=0)
+        )
+        batched_service.neo4j.execute_query.return_value = [
+            {"id": "chunk2", "document_id": "doc1", "content": "Fetched", "position": 1, "rel_count": 2}
+        ]
+
+        chunks = await batched_service._get_chunks_by_ids(["chunk2", "chunk1"])
+
+        assert [c.content for c in chunks] == ["Fetched", "Cached"]
+        assert batched_service.neo4j.execute_query.call_args.args[1] == {"chunk_ids": ["chunk2"]}
+
+
+class TestChunkNodeCache:
+    """Tests for the chunk node LRU."""
+
+    def test_entries_expire(self):
+        cache = ChunkNodeCache(ttl=10)
+        with patch("app.services.graph_enhanced_rag_service.time.time", return_value=100.0):
+            cache.put("chunk1", rel_count=3)
+        with patch("app.services.graph_enhanced_rag_service.time.time", return_value=111.0):
+            assert cache.get_many(["chunk1"]) == {}
+
+    def test_least_recently_used_evicted(self):
+        cache = ChunkNodeCache(max_size=2)
+        cache.put("a", rel_count=1)
+        cache.put("b", rel_count=2)
+        cache.get_many(["a"])
+        cache.put("c", rel_count=3)
+
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_partial_update_keeps_known_fields(self):
+        cache = ChunkNodeCache()
+        chunk = ChunkNode(id="a", document_id="doc1", content="text", position=0)
+        cache.put("a", chunk)
+        cache.put("a", rel_count=5)
+
+        assert cache.get_many(["a"])["a"] == (chunk, 5)
+
+
 class TestUtilityMethods:
     """Tests for utility methods."""
 